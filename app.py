@@ -4,6 +4,11 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
+from services.json_provider import FastJSONProvider, init_response_compression
+from services.instrumentation import init_instrumentation
+from services.profiler import init_profiler
+from services.database_config import RoutingSession, configure_database
+from services.schema import sync_schema
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -11,19 +16,20 @@ logging.basicConfig(level=logging.DEBUG)
 class Base(DeclarativeBase):
     pass
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={'class_': RoutingSession})
 
 # Create the app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+app.json = FastJSONProvider(app)
+# Registered first so request timing includes the compression hook
+init_instrumentation(app)
+init_profiler(app)
+init_response_compression(app)
 
-# Configure the database
-app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///thesis_intelligence.db")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
+# Configure the database (pool sizing, SQLite pragmas, read replica)
+configure_database(app, os.environ.get("DATABASE_URL", "sqlite:///thesis_intelligence.db"))
 
 # Initialize the app with the extension
 db.init_app(app)
@@ -33,7 +39,8 @@ from routes import *
 import models
 
 with app.app_context():
-    db.create_all()
+    # Also adds new nullable columns and indexes to existing tables
+    sync_schema(db.engine, db.metadata)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,45 @@
+"""
+Tag theses that have no segment/company tags for their current version.
+
+New theses are tagged when they are published; this covers theses published
+before tagging moved there, and those whose extraction failed more than
+ThesisTagService.RETRY_AFTER ago. Theses are tagged in batches of
+ThesisTagService.BACKFILL_LIMIT, newest first; a failed extraction is recorded
+and not retried within the same run.
+
+Usage: python backfill_thesis_tags.py [--limit N]
+"""
+
+import argparse
+import logging
+
+from services.thesis_tag_service import ThesisTagService
+
+
+def backfill(service: ThesisTagService, limit: int = 0) -> dict:
+    """Tag pending theses in batches; returns theses tagged and failed"""
+    tagged = attempted = 0
+    seen = set()
+    while not limit or attempted < limit:
+        batch_size = ThesisTagService.BACKFILL_LIMIT
+        if limit:
+            batch_size = min(batch_size, limit - attempted)
+        theses = service.untagged_theses(batch_size)
+        if not theses or seen.issuperset(thesis.id for thesis in theses):
+            # Done, or the last batch could not be stored
+            break
+        seen.update(thesis.id for thesis in theses)
+        tagged += service.backfill(theses)
+        attempted += len(theses)
+    return {'tagged': tagged, 'failed': attempted - tagged}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--limit', type=int, default=0, help='stop after N theses (0 = all)')
+    args = parser.parse_args()
+
+    from app import app
+    logging.basicConfig(level=logging.INFO)
+    with app.app_context():
+        print(backfill(ThesisTagService(), args.limit))
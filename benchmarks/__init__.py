@@ -0,0 +1 @@
+# Benchmarks for the Investment Thesis Intelligence System
@@ -0,0 +1,137 @@
+"""
+Monitoring dashboard throughput under concurrent load, per engine configuration
+
+Runs the dashboard read mix (/monitoring, thesis monitor pages, status and
+thesis data APIs) from many users while a background writer updates signal
+values the way the monitoring sweep does, once with the previous plain
+engine options (DB_ENGINE_TUNING_ENABLED=false) and once tuned (pool sized
+for the users, SQLite WAL, synchronous=NORMAL, mmap). Each configuration
+runs in its own interpreter on a scratch SQLite database:
+
+    python -m benchmarks.bench_database [--users 16] [--duration 15] [--signals 500]
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from benchmarks import fixtures
+from benchmarks.load_scenario import LoadRunner, start_local_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGURATIONS = ('baseline', 'tuned')
+DASHBOARD_WEIGHTS = {'monitoring': 3, 'monitor': 3, 'status': 2, 'thesis_data': 2}
+WRITE_BATCH = 200
+
+
+class SignalWriter(threading.Thread):
+    """Updates a batch of signal values per transaction until stopped"""
+
+    def __init__(self, app, thesis_id: int):
+        super().__init__(daemon=True)
+        self.app = app
+        self.thesis_id = thesis_id
+        self.commits = 0
+        self.errors = 0
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        from sqlalchemy import select, update
+        from app import db
+        from models import SignalMonitoring
+
+        with self.app.app_context():
+            ids = db.session.execute(select(SignalMonitoring.id).where(
+                SignalMonitoring.thesis_analysis_id == self.thesis_id)).scalars().all()
+            offset = 0
+            while not self.stopped.is_set():
+                batch = ids[offset:offset + WRITE_BATCH] or ids[:WRITE_BATCH]
+                offset = (offset + WRITE_BATCH) % max(len(ids), 1)
+                try:
+                    db.session.execute(update(SignalMonitoring).where(SignalMonitoring.id.in_(batch)).values(
+                        current_value=SignalMonitoring.threshold_value * 1.01, last_checked=datetime.utcnow()))
+                    db.session.commit()
+                    self.commits += 1
+                except Exception:
+                    db.session.rollback()
+                    self.errors += 1
+
+
+def run_configuration(configuration: str, users: int, duration: float, signals: int) -> Dict[str, Any]:
+    """One configuration in this interpreter; the app must not be imported yet"""
+    with tempfile.TemporaryDirectory(prefix='thesis-db-bench-') as scratch:
+        os.environ['DB_ENGINE_TUNING_ENABLED'] = 'true' if configuration == 'tuned' else 'false'
+        base_url = start_local_server(scratch, threads=users)
+        from app import app
+
+        runner = LoadRunner(base_url, users, duration, weights=DASHBOARD_WEIGHTS)
+        thesis_id = runner.seed_thesis()
+        with app.app_context():
+            fixtures.seed_signals(thesis_id, signals)
+
+        writer = SignalWriter(app, thesis_id)
+        writer.start()
+        report = runner.run()
+        writer.stopped.set()
+        writer.join()
+
+    requests_total = sum(row['requests'] for row in report.values())
+    return {
+        'configuration': configuration,
+        'users': users,
+        'duration': duration,
+        'rps': round(requests_total / duration, 1),
+        'errors': sum(row['errors'] for row in report.values()),
+        'writer_commits_per_second': round(writer.commits / duration, 1),
+        'writer_errors': writer.errors,
+        'tasks': report
+    }
+
+
+def run(users: int, duration: float, signals: int) -> Dict[str, Dict[str, Any]]:
+    """Every configuration, each in a fresh interpreter"""
+    results = {}
+    for configuration in CONFIGURATIONS:
+        completed = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_database', '--configuration', configuration,
+             '--users', str(users), '--duration', str(duration), '--signals', str(signals)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        results[configuration] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Monitoring dashboard throughput per engine configuration')
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15, help='seconds per configuration')
+    parser.add_argument('--signals', type=int, default=500)
+    parser.add_argument('--configuration', choices=CONFIGURATIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.configuration:
+        print(json.dumps(run_configuration(args.configuration, args.users, args.duration, args.signals)))
+        sys.exit(0)
+
+    started = time.perf_counter()
+    results = run(args.users, args.duration, args.signals)
+    print(f"{args.users} users, {args.duration:g}s each, {args.signals} signals\n")
+    print(f"{'configuration':<14} {'req/s':>8} {'errors':>7} {'writes/s':>9} {'write errs':>11}  p95 ms by task")
+    for name, result in results.items():
+        p95 = ', '.join(f"{task} {row['p95_ms']}" for task, row in result['tasks'].items())
+        print(f"{name:<14} {result['rps']:>8} {result['errors']:>7} {result['writer_commits_per_second']:>9} "
+              f"{result['writer_errors']:>11}  {p95}")
+    baseline, tuned = results['baseline'], results['tuned']
+    if baseline['rps'] and baseline['writer_commits_per_second']:
+        print(f"\nTuned vs baseline: reads x{tuned['rps'] / baseline['rps']:.2f}, writes "
+              f"x{tuned['writer_commits_per_second'] / baseline['writer_commits_per_second']:.2f} "
+              f"({time.perf_counter() - started:.0f}s total)")
@@ -0,0 +1,251 @@
+"""
+Hot-path benchmark suite with regression tracking
+
+Times the main request paths against local fixtures (see fixtures.py) with
+the LLM stubbed out:
+
+- DocumentProcessor.process_document on large PDF, XLSX and CSV files
+- FinancialPositionExtractor rule extraction
+- SignalClassifier.extract_signals_from_ai_analysis
+- MLSimulationService._generate_ml_price_forecast
+- BacktestingService.run_thesis_backtest
+- SignalExtractor.check_all_signals over 10,000 seeded signals
+- the full /analyze route
+
+Each run uses a throwaway SQLite database and upload folder, so it must
+start in a fresh interpreter. Results are written as JSON to
+benchmarks/results/ (one file per run, named by commit) and compared with
+the previous run of the same size; medians slower by more than the
+threshold are flagged. Run with:
+
+    python -m benchmarks.bench_hot_paths [--quick] [--only NAME,...] [--compare FILE]
+"""
+
+import argparse
+import glob
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import fixtures
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+
+FULL_SIZES = {'pdf_pages': 60, 'csv_rows': 20000, 'xlsx_rows': 6000, 'text_paragraphs': 400,
+              'signals': 10000, 'forecast_years': 5, 'analyze_pdf_pages': 10}
+QUICK_SIZES = {'pdf_pages': 4, 'csv_rows': 500, 'xlsx_rows': 300, 'text_paragraphs': 40,
+               'signals': 200, 'forecast_years': 2, 'analyze_pdf_pages': 2}
+
+
+def prepare_environment(scratch: str) -> None:
+    """Point the app at a scratch database and upload folder before it is imported"""
+    if 'app' in sys.modules:
+        raise RuntimeError('Run benchmarks in a fresh interpreter: the app is already bound to its database')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(scratch, 'benchmark.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(scratch, 'uploads')
+    os.environ['ARTIFACT_WARMING_ENABLED'] = 'false'
+
+
+def build_cases(scratch: str, sizes: Dict[str, int]) -> Dict[str, Callable[[], Any]]:
+    """Name -> zero-argument callable for each benchmark, fixtures created up front"""
+    from app import app, db
+    from models import ThesisAnalysis
+    from services.backtesting_service import BacktestingService
+    from services.document_processor import DocumentProcessor
+    from services.financial_position_extractor import FinancialPositionExtractor
+    from services.ml_simulation_service import MLSimulationService
+    from services.reliable_analysis_service import ReliableAnalysisService
+    from services.signal_classifier import SignalClassifier
+    from services.signal_extraction import SignalExtractor
+
+    fixtures.install_stub_llm()
+
+    pdf = fixtures.write_research_pdf(os.path.join(scratch, 'research.pdf'), sizes['pdf_pages'])
+    csv_path = fixtures.write_research_csv(os.path.join(scratch, 'model.csv'), sizes['csv_rows'])
+    xlsx = fixtures.write_research_xlsx(os.path.join(scratch, 'model.xlsx'), sizes['xlsx_rows'])
+    text = fixtures.research_text(sizes['text_paragraphs'])
+    analyze_pdf = fixtures.write_research_pdf(os.path.join(scratch, 'upload.pdf'), sizes['analyze_pdf_pages'])
+    with open(analyze_pdf, 'rb') as f:
+        analyze_pdf_bytes = f.read()
+
+    processor = DocumentProcessor()
+    extractor = FinancialPositionExtractor()
+    classifier = SignalClassifier()
+    simulation = MLSimulationService()
+    backtesting = BacktestingService()
+
+    processed_documents = [{'filename': 'research.pdf', 'data': processor.process_document(pdf)},
+                           {'filename': 'model.csv', 'data': processor.process_document(csv_path)}]
+    analysis = ReliableAnalysisService()._generate_local_analysis(text[:4000])
+    forecast_params = simulation._get_default_parameters('base', 'medium')
+
+    with app.app_context():
+        thesis = ThesisAnalysis(title='Benchmark thesis', original_thesis=text[:2000], core_claim=text[:300],
+                                mental_model='Growth')
+        db.session.add(thesis)
+        db.session.commit()
+        thesis_id = thesis.id
+        fixtures.seed_signals(thesis_id, sizes['signals'])
+
+    client = app.test_client()
+
+    def in_app_context(fn):
+        def run():
+            with app.app_context():
+                return fn()
+        return run
+
+    def analyze():
+        response = client.post('/analyze', data={
+            'focus_primary_signals': 'on',
+            'research_files': [(io.BytesIO(analyze_pdf_bytes), 'upload.pdf'),
+                               (io.BytesIO(b'period,price\n2024-01,900\n2024-02,950\n'), 'prices.csv')]
+        }, content_type='multipart/form-data')
+        assert response.status_code == 200, response.get_data(as_text=True)[:200]
+
+    return {
+        'document_processor.pdf': lambda: processor.process_document(pdf),
+        'document_processor.xlsx': lambda: processor.process_document(xlsx),
+        'document_processor.csv': lambda: processor.process_document(csv_path),
+        'position_extractor.rules': lambda: extractor._extract_position_with_rules(text),
+        'signal_classifier.extract_signals': lambda: classifier.extract_signals_from_ai_analysis(
+            analysis, processed_documents, focus_primary=True),
+        'ml_simulation.price_forecast': lambda: simulation._generate_ml_price_forecast(
+            forecast_params, sizes['forecast_years'], 'base', 'medium', seed=42),
+        'backtesting.run_thesis_backtest': in_app_context(lambda: backtesting.run_thesis_backtest(
+            thesis_id, {'time_horizon': 12, 'seed': 42})),
+        'signal_extractor.check_all_signals': in_app_context(lambda: SignalExtractor().check_all_signals()),
+        'route.analyze': analyze,
+    }
+
+
+# Slow cases run fewer times so a full suite stays in the minutes
+REPEAT_OVERRIDES = {'signal_extractor.check_all_signals': 3, 'route.analyze': 5}
+
+
+def time_case(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs': repeat,
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'stdev_ms': round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(quick: bool = False, repeat: int = 10, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the suite in a scratch environment; returns the results document"""
+    sizes = QUICK_SIZES if quick else FULL_SIZES
+    with tempfile.TemporaryDirectory(prefix='thesis-bench-') as scratch:
+        prepare_environment(scratch)
+        cases = build_cases(scratch, sizes)
+        results = {}
+        for name, fn in cases.items():
+            if only and name not in only:
+                continue
+            runs = min(repeat, REPEAT_OVERRIDES.get(name, repeat))
+            results[name] = time_case(fn, runs, warmup=0 if quick else 1)
+
+    return {
+        'commit': git_commit(),
+        'created_at': datetime.utcnow().isoformat(),
+        'quick': quick,
+        'sizes': sizes,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def save(document: Dict[str, Any], directory: str = RESULTS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(directory, f"{stamp}-{document['commit']}{'-quick' if document['quick'] else ''}.json")
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def previous_run(document: Dict[str, Any], directory: str = RESULTS_DIR) -> Optional[str]:
+    """Newest stored run of the same size, excluding ``document`` itself"""
+    for path in sorted(glob.glob(os.path.join(directory, '*.json')), reverse=True):
+        with open(path) as f:
+            stored = json.load(f)
+        if stored.get('quick') == document['quick'] and stored.get('created_at') != document['created_at']:
+            return path
+    return None
+
+
+def compare(document: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Median ratio per shared case; ``regressed`` when slower by more than ``threshold``"""
+    rows = []
+    for name, result in document['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before or not before['median_ms']:
+            continue
+        ratio = result['median_ms'] / before['median_ms']
+        rows.append({'case': name, 'baseline_ms': before['median_ms'], 'median_ms': result['median_ms'],
+                     'ratio': round(ratio, 3), 'regressed': ratio > 1 + threshold})
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hot-path benchmark suite')
+    parser.add_argument('--quick', action='store_true', help='small fixtures, for smoke runs')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--only', help='comma-separated case names')
+    parser.add_argument('--compare', help='baseline results file (default: previous run of the same size)')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed median slowdown, e.g. 0.2 = 20%%')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    document = run(args.quick, args.repeat, args.only.split(',') if args.only else None)
+
+    print(f"{'case':<38} {'runs':>5} {'median ms':>11} {'min ms':>10} {'stdev ms':>10}")
+    for name, result in document['results'].items():
+        print(f"{name:<38} {result['runs']:>5} {result['median_ms']:>11} {result['min_ms']:>10} {result['stdev_ms']:>10}")
+
+    baseline_path = args.compare or previous_run(document)
+    if not args.no_save:
+        print(f"\nSaved {os.path.relpath(save(document), REPO_ROOT)}")
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline.get('commit')} ({os.path.basename(baseline_path)}):")
+        for row in compare(document, baseline, args.threshold):
+            flag = '  REGRESSION' if row['regressed'] else ''
+            print(f"  {row['case']:<38} {row['baseline_ms']:>10} -> {row['median_ms']:>10} ms  x{row['ratio']}{flag}")
+            if row['regressed']:
+                regressions.append(row['case'])
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
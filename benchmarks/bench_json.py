@@ -0,0 +1,108 @@
+"""
+JSON serialisation benchmark
+
+Times the stdlib encoder Flask used before against FastJSONProvider on
+payloads shaped like the largest API responses (simulation, backtest and
+thesis data), and reports gzip sizes. Run with:
+
+    python -m benchmarks.bench_json [--repeat N]
+"""
+
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from services.json_provider import COMPRESSION_LEVEL, FastJSONProvider, orjson
+from services.ml_simulation_service import MLSimulationService
+
+
+def simulation_payload(years: int = 5) -> dict:
+    """Full-resolution /simulate result for a long horizon"""
+    service = MLSimulationService()
+    params = service._get_default_parameters('base', 'moderate')
+    performance = service._generate_ml_price_forecast(params, years, 'base', 'moderate')
+    return {
+        'performance_data': performance,
+        'timeline': service._generate_timeline_labels(years),
+        'events': [{'month': month, 'date': service._month_to_date_string(month), 'impact': 'positive',
+                    'description': f'Scheduled event {month}'} for month in range(0, years * 12, 2)],
+        'generated_at': datetime.utcnow()
+    }
+
+
+def backtest_payload(days: int = 2520) -> dict:
+    """/backtest-sized daily records with datetimes and NumPy values"""
+    rng = np.random.default_rng(7)
+    start = datetime(2015, 1, 1)
+    prices = 100 * np.cumprod(1 + rng.normal(0.0004, 0.015, days))
+    return {
+        'daily': [{'date': start + timedelta(days=i), 'price': prices[i], 'return': prices[i] / prices[0] - 1,
+                   'signals_triggered': int(i % 17 == 0)} for i in range(days)],
+        'drawdown': np.minimum.accumulate(prices) / np.maximum.accumulate(prices) - 1,
+        'metrics': {'sharpe': np.float64(1.21), 'max_drawdown': np.float64(-0.31)}
+    }
+
+
+def thesis_data_payload(signals: int = 300) -> dict:
+    """/api/thesis/<id>/data with a large monitoring plan"""
+    return {
+        'thesis': {'id': 1, 'title': 'Benchmark thesis', 'created_at': datetime.utcnow(),
+                   'monitoring_plan': {'data_pulls': [{'metric': f'metric_{i}', 'frequency': 'monthly',
+                                                       'thresholds': list(range(10))} for i in range(signals)]}},
+        'signals': [{'id': i, 'signal_name': f'Signal {i}', 'current_value': i * 1.5,
+                     'last_checked': datetime.utcnow(), 'status': 'active'} for i in range(signals)]
+    }
+
+
+def _stdlib_ready(payload):
+    """What routes had to do before: convert NumPy and datetimes for the stdlib encoder"""
+    return json.loads(json.dumps(payload, default=FastJSONProvider.default))
+
+
+def _time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(repeat: int = 20) -> list:
+    """Best-of-``repeat`` serialisation time in milliseconds for each payload"""
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    results = []
+
+    for name, payload in (('simulation', simulation_payload()), ('backtest', backtest_payload()),
+                          ('thesis_data', thesis_data_payload())):
+        plain = _stdlib_ready(payload)
+        body = fast.dumps_bytes(payload)
+        results.append({
+            'payload': name,
+            'bytes': len(body),
+            'gzip_bytes': len(gzip.compress(body, compresslevel=COMPRESSION_LEVEL)),
+            'stdlib_ms': round(_time(lambda: stdlib.dumps(plain, separators=(',', ':')), repeat), 3),
+            'fast_ms': round(_time(lambda: fast.dumps_bytes(payload), repeat), 3),
+            'gzip_ms': round(_time(lambda: gzip.compress(body, compresslevel=COMPRESSION_LEVEL), repeat), 3)
+        })
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='JSON serialisation benchmark')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    print(f"{'payload':<12} {'bytes':>10} {'gzip':>9} {'stdlib ms':>10} {'fast ms':>9} {'gzip ms':>9}")
+    for row in run(args.repeat):
+        print(f"{row['payload']:<12} {row['bytes']:>10} {row['gzip_bytes']:>9} "
+              f"{row['stdlib_ms']:>10} {row['fast_ms']:>9} {row['gzip_ms']:>9}")
@@ -0,0 +1,81 @@
+"""
+Startup benchmark and import-time profile
+
+Boots the application in fresh interpreters (as a gunicorn worker would) and
+reports the median boot time, the slowest imports from ``python -X
+importtime``, and how long each lazily registered service takes to construct
+on first use (including imports no earlier service had already paid for).
+Run with:
+
+    python -m benchmarks.bench_startup [--runs N] [--top N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT_SCRIPT = """
+import time
+start = time.perf_counter()
+import app
+print(time.perf_counter() - start)
+"""
+
+SERVICES_SCRIPT = """
+import json, logging
+logging.disable(logging.CRITICAL)
+import app
+from services.service_registry import registry
+for name in registry.stats()['registered']:
+    registry.get(name)
+print(json.dumps(registry.stats()['constructed']))
+"""
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, '-c', code], cwd=REPO_ROOT,
+                          capture_output=True, text=True, check=True)
+
+
+def boot_seconds(runs: int = 5) -> list:
+    """Wall time of ``import app`` in ``runs`` fresh interpreters"""
+    return [float(_run(BOOT_SCRIPT).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def import_profile(top: int = 15) -> list:
+    """Modules with the largest cumulative import time, as (microseconds, module)"""
+    rows = []
+    for line in _run('import app', '-X', 'importtime').stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def service_construction_ms() -> dict:
+    """First-use construction time of every registered service"""
+    return json.loads(_run(SERVICES_SCRIPT).stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Application startup benchmark')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    times = boot_seconds(args.runs)
+    print(f"import app: median {statistics.median(times) * 1000:.0f} ms over {len(times)} runs")
+
+    print(f"\nSlowest imports (cumulative):")
+    for microseconds, module in import_profile(args.top):
+        print(f"{microseconds / 1000:>9.1f} ms  {module}")
+
+    print("\nService construction on first use:")
+    for name, milliseconds in sorted(service_construction_ms().items(), key=lambda item: -item[1]):
+        print(f"{milliseconds:>9.1f} ms  {name}")
@@ -0,0 +1,143 @@
+"""
+Benchmark fixtures
+
+Deterministic local inputs for the hot-path benchmarks: synthetic research
+documents (PDF, XLSX, CSV) written to a scratch directory, seeded monitoring
+signals, and the local replay LLM backend answering instantly with canned
+JSON so timings measure this code rather than the network.
+"""
+
+import csv
+import os
+import random
+from typing import List
+
+import openpyxl
+
+COMPANIES = ('NVIDIA', 'Microsoft', 'Snowflake', 'Adobe', 'Salesforce', 'ServiceNow', 'Datadog', 'Workday')
+
+PARAGRAPHS = (
+    "We reiterate our BUY rating on {company} with a 12-month price target of ${target}, "
+    "implying {upside}% upside from the current price of ${price}.",
+    "Revenue growth accelerated to {growth}% year over year as data center demand and AI workloads "
+    "expanded; gross margin improved {margin} basis points on mix.",
+    "Key risks include competitive pressure, customer concentration, export restrictions and a "
+    "slowdown in enterprise IT budgets that could compress valuation multiples.",
+    "Management raised guidance for the fiscal year and we expect operating leverage, free cash flow "
+    "conversion above 90% and continued market share gains over the next 2-3 years.",
+    "Our thesis rests on durable competitive advantages: a developer ecosystem, platform network effects "
+    "and switching costs that protect pricing power through the cycle.",
+)
+
+
+def research_text(paragraphs: int, seed: int = 7) -> str:
+    """Broker-research style prose, reproducible for a given seed"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(paragraphs):
+        price = rng.randint(50, 900)
+        lines.append(PARAGRAPHS[i % len(PARAGRAPHS)].format(
+            company=rng.choice(COMPANIES), price=price, target=int(price * 1.28),
+            upside=28, growth=rng.randint(8, 60), margin=rng.randint(50, 400)))
+    return '\n'.join(lines)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_research_pdf(path: str, pages: int, lines_per_page: int = 40) -> str:
+    """A text PDF (Helvetica, one content stream per page) written without a PDF library"""
+    text = research_text(pages * lines_per_page // 2).split('\n')
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in range(pages):
+        chunk = text[(page * lines_per_page // 2) % len(text):][:lines_per_page // 2]
+        wrapped = [line[start:start + 95] for line in chunk for start in range(0, len(line), 95)]
+        stream = 'BT /F1 9 Tf 11 TL 40 800 Td ' + ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in wrapped) + ' ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        content_id = len(objects)
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {pages} >>'
+
+    body = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += f'{number} 0 obj\n{obj}\nendobj\n'.encode('latin-1')
+    xref = len(body)
+    body += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    body += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    body += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(body)
+    return path
+
+
+def _financial_rows(rows: int, seed: int = 11) -> List[list]:
+    rng = random.Random(seed)
+    return [[f'2020-{(i % 12) + 1:02d}', rng.choice(COMPANIES), round(rng.uniform(50, 900), 2),
+             round(rng.uniform(-0.1, 0.6), 4), round(rng.uniform(0.3, 0.8), 4), rng.randint(10 ** 5, 10 ** 7),
+             rng.choice(('BUY', 'HOLD', 'SELL'))] for i in range(rows)]
+
+
+HEADER = ['period', 'company', 'price', 'revenue_growth', 'gross_margin', 'volume', 'rating']
+
+
+def write_research_csv(path: str, rows: int) -> str:
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(_financial_rows(rows))
+    return path
+
+
+def write_research_xlsx(path: str, rows: int, sheets: int = 3) -> str:
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for sheet in range(sheets):
+        worksheet = workbook.create_sheet(f'Model {sheet + 1}')
+        worksheet.append(HEADER)
+        for row in _financial_rows(rows // sheets, seed=sheet):
+            worksheet.append(row)
+    workbook.save(path)
+    return path
+
+
+# Recorded responses for the replay LLM backend: position JSON for extraction prompts, '{}' otherwise
+REPLAY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_replay.jsonl')
+
+
+def install_stub_llm(**options):
+    """
+    Point the shared LLM client at the replay backend for every service;
+    instant and error-free unless ``options`` say otherwise
+    """
+    from services.azure_openai_service import AzureOpenAIService
+    from services.llm_backends import ReplayLLMClient
+
+    settings = {'latency': 'fixed:0', 'truncation_rate': 0, 'error_rate': 0, **options}
+    client = ReplayLLMClient(path=REPLAY_PATH, **settings)
+    AzureOpenAIService._shared_client = client
+    AzureOpenAIService._shared_client_ready = True
+    return client
+
+
+def seed_signals(thesis_id: int, count: int, seed: int = 3) -> None:
+    """Bulk-insert ``count`` active monitoring signals for a thesis"""
+    from app import db
+    from models import SignalMonitoring
+
+    rng = random.Random(seed)
+    types = ('price', 'volume', 'sentiment', 'economic', 'fundamental')
+    db.session.execute(SignalMonitoring.__table__.insert(), [{
+        'thesis_analysis_id': thesis_id,
+        'signal_name': f'{rng.choice(COMPANIES)} signal {i}',
+        'signal_type': types[i % len(types)],
+        'threshold_value': round(rng.uniform(1, 100), 2),
+        'threshold_type': rng.choice(('above', 'below', 'change_percent')),
+        'status': 'active'
+    } for i in range(count)])
+    db.session.commit()
@@ -0,0 +1,213 @@
+"""
+Load scenario for /analyze and the thesis pages
+
+Simulated analysts upload research to /analyze and browse the resulting
+thesis pages, with task weights mirroring real traffic (reads far outnumber
+uploads). Runs against a live server, or with ``--local`` against an
+in-process server on a scratch database with the replay LLM backend, so the
+real parsing and orchestration are exercised without Azure credentials:
+
+    python -m benchmarks.load_scenario --local --users 8 --duration 30 \\
+        --llm-latency lognormal:800,0.4 --llm-error-rate 0.05
+
+The same tasks run under locust with benchmarks/locustfile.py.
+"""
+
+import argparse
+import io
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks import fixtures
+
+# task -> relative weight
+TASK_WEIGHTS = {'analyze': 1, 'view_thesis': 4, 'thesis_data': 3, 'monitor': 2, 'dashboard': 2}
+
+_upload_cache: Dict[int, bytes] = {}
+
+
+def analyze_upload(pages: int = 4) -> Tuple[Dict[str, str], List[tuple]]:
+    """Form fields and ``requests``-style files for one /analyze upload"""
+    if pages not in _upload_cache:
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            path = fixtures.write_research_pdf(os.path.join(directory, 'research.pdf'), pages)
+            with open(path, 'rb') as f:
+                _upload_cache[pages] = f.read()
+    files = [('research_files', ('research.pdf', io.BytesIO(_upload_cache[pages]), 'application/pdf')),
+             ('research_files', ('prices.csv', io.BytesIO(b'period,price\n2024-01,900\n2024-02,950\n'), 'text/csv'))]
+    return {'focus_primary_signals': 'on'}, files
+
+
+def thesis_path(task: str, thesis_id: int) -> str:
+    return {
+        'view_thesis': f'/thesis/{thesis_id}',
+        'thesis_data': f'/api/thesis/{thesis_id}/data',
+        'monitor': f'/thesis/{thesis_id}/monitor',
+        'status': f'/api/thesis/{thesis_id}/status',
+        'monitoring': '/monitoring',
+        'dashboard': '/',
+    }[task]
+
+
+class LoadRunner:
+    """
+    Closed-loop users on threads: each picks a task by ``weights`` (default
+    TASK_WEIGHTS), issues it and waits ``think_time`` seconds before the next
+    """
+
+    def __init__(self, base_url: str, users: int, duration: float, think_time: float = 0.0, seed: int = 0,
+                 weights: Optional[Dict[str, int]] = None):
+        self.base_url = base_url.rstrip('/')
+        self.users = users
+        self.duration = duration
+        self.think_time = think_time
+        self.seed = seed
+        self.weights = weights or TASK_WEIGHTS
+        self.thesis_ids: List[int] = []
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _request(self, session, task: str) -> Optional[Any]:
+        if task == 'analyze':
+            data, files = analyze_upload()
+            return session.post(f'{self.base_url}/analyze', data=data, files=files, timeout=120)
+        with self._lock:
+            thesis_id = random.choice(self.thesis_ids) if self.thesis_ids else None
+        if thesis_id is None:
+            return None
+        return session.get(self.base_url + thesis_path(task, thesis_id), timeout=60)
+
+    def _user(self, number: int, deadline: float) -> None:
+        import requests
+
+        rng = random.Random(f'{self.seed}:{number}')
+        tasks, weights = zip(*self.weights.items())
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                task = rng.choices(tasks, weights)[0]
+                start = time.perf_counter()
+                response = None
+                try:
+                    response = self._request(session, task)
+                    ok = response is None or response.status_code < 400
+                    if task == 'analyze' and ok:
+                        thesis_id = response.json().get('thesis_id')
+                        if thesis_id:
+                            with self._lock:
+                                self.thesis_ids.append(thesis_id)
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    if response is not None or not ok:
+                        self.samples[task].append(elapsed)
+                    if not ok:
+                        self.errors[task] += 1
+                if self.think_time:
+                    time.sleep(rng.expovariate(1 / self.think_time))
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Per-task request count, error count, throughput and latency percentiles"""
+        # One upload first so thesis pages have something to show
+        if not self.thesis_ids:
+            self.seed_thesis()
+
+        deadline = time.monotonic() + self.duration
+        threads = [threading.Thread(target=self._user, args=(number, deadline), daemon=True)
+                   for number in range(self.users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarise(self.samples, self.errors, self.duration)
+
+    def seed_thesis(self) -> int:
+        """Publish one thesis through /analyze; returns its id"""
+        import requests
+
+        data, files = analyze_upload()
+        response = requests.post(f'{self.base_url}/analyze', data=data, files=files, timeout=120)
+        response.raise_for_status()
+        self.thesis_ids.append(response.json()['thesis_id'])
+        return self.thesis_ids[-1]
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarise(samples: Dict[str, List[float]], errors: Dict[str, int], duration: float) -> Dict[str, Dict[str, Any]]:
+    report = {}
+    for task, latencies in sorted(samples.items()):
+        ordered = sorted(latencies)
+        report[task] = {
+            'requests': len(ordered),
+            'errors': errors.get(task, 0),
+            'rps': round(len(ordered) / duration, 2),
+            **{f'p{int(q * 100)}_ms': round(percentile(ordered, q) * 1000, 1) for q in (0.5, 0.95, 0.99)}
+        }
+    return report
+
+
+def start_local_server(scratch: str, llm_latency: str = 'fixed:0', llm_error_rate: float = 0.0,
+                       llm_truncation_rate: float = 0.0, threads: int = 8) -> str:
+    """
+    Serve the app in this process on a scratch database with the replay LLM
+    backend; the connection pool is sized for ``threads`` concurrent requests
+    """
+    from benchmarks.bench_hot_paths import prepare_environment
+
+    prepare_environment(scratch)
+    os.environ.update({
+        'GUNICORN_THREADS': str(threads),
+        'LLM_BACKEND': 'replay',
+        'LLM_REPLAY_PATH': fixtures.REPLAY_PATH,
+        'LLM_REPLAY_LATENCY': llm_latency,
+        'LLM_REPLAY_ERROR_RATE': str(llm_error_rate),
+        'LLM_REPLAY_TRUNCATION_RATE': str(llm_truncation_rate),
+    })
+    from werkzeug.serving import make_server
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+if __name__ == '__main__':
+    import logging
+    import tempfile
+
+    parser = argparse.ArgumentParser(description='Load scenario for /analyze and the thesis pages')
+    parser.add_argument('--host', help='base URL of a running server')
+    parser.add_argument('--local', action='store_true', help='serve the app in-process with the replay LLM backend')
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30, help='seconds')
+    parser.add_argument('--think-time', type=float, default=0.0, help='mean seconds between a user\'s requests')
+    parser.add_argument('--llm-latency', default='lognormal:800,0.4')
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-truncation-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if not args.host and not args.local:
+        parser.error('pass --host URL or --local')
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory(prefix='thesis-load-') as scratch:
+        base_url = args.host or start_local_server(scratch, args.llm_latency, args.llm_error_rate,
+                                                   args.llm_truncation_rate, threads=args.users)
+        report = LoadRunner(base_url, args.users, args.duration, args.think_time).run()
+
+    print(f"{'task':<13} {'requests':>9} {'errors':>7} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for task, row in report.items():
+        print(f"{task:<13} {row['requests']:>9} {row['errors']:>7} {row['rps']:>7} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
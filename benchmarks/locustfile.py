@@ -0,0 +1,55 @@
+"""
+Locust version of the load scenario in load_scenario.py
+
+Same tasks and weights, for distributed runs or the locust web UI. locust is
+not an application dependency; install it separately, then point it at a
+server started with LLM_BACKEND=replay for offline runs:
+
+    LLM_BACKEND=replay LLM_REPLAY_PATH=benchmarks/llm_replay.jsonl \\
+        LLM_REPLAY_LATENCY=lognormal:800,0.4 python main.py
+    locust -f benchmarks/locustfile.py --host http://localhost:5000
+"""
+
+import random
+
+from locust import HttpUser, between, task
+
+from benchmarks.load_scenario import TASK_WEIGHTS, analyze_upload, thesis_path
+
+thesis_ids = []
+
+
+class Analyst(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        if not thesis_ids:
+            self.analyze()
+
+    @task(TASK_WEIGHTS['analyze'])
+    def analyze(self):
+        data, files = analyze_upload()
+        with self.client.post('/analyze', data=data, files=files, catch_response=True) as response:
+            if response.ok and response.json().get('thesis_id'):
+                thesis_ids.append(response.json()['thesis_id'])
+
+    def _view(self, name):
+        if thesis_ids:
+            thesis_id = random.choice(thesis_ids)
+            self.client.get(thesis_path(name, thesis_id), name=thesis_path(name, 0).replace('/0', '/[id]'))
+
+    @task(TASK_WEIGHTS['view_thesis'])
+    def view_thesis(self):
+        self._view('view_thesis')
+
+    @task(TASK_WEIGHTS['thesis_data'])
+    def thesis_data(self):
+        self._view('thesis_data')
+
+    @task(TASK_WEIGHTS['monitor'])
+    def monitor(self):
+        self._view('monitor')
+
+    @task(TASK_WEIGHTS['dashboard'])
+    def dashboard(self):
+        self.client.get('/')
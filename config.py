@@ -7,6 +7,34 @@ class Config:
     AZURE_OPENAI_API_VERSION = os.environ.get('AZURE_OPENAI_API_VERSION', '2024-12-01-preview')
     AZURE_OPENAI_DEPLOYMENT_NAME = os.environ.get('AZURE_OPENAI_DEPLOYMENT_NAME', 'gpt-35-turbo')
     
+    # LLM Backend Configuration ('azure', 'replay' for the local stand-in, 'record' to capture replays)
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'azure').lower()
+    LLM_REPLAY_PATH = os.environ.get('LLM_REPLAY_PATH', 'llm_recordings.jsonl')
+    LLM_REPLAY_LATENCY = os.environ.get('LLM_REPLAY_LATENCY', 'fixed:0')  # fixed:MS, uniform:MIN,MAX, lognormal:MEDIAN,SIGMA
+    LLM_REPLAY_TOKENS_PER_SECOND = float(os.environ.get('LLM_REPLAY_TOKENS_PER_SECOND', 0))  # 0 = instant
+    LLM_REPLAY_TRUNCATION_RATE = float(os.environ.get('LLM_REPLAY_TRUNCATION_RATE', 0))
+    LLM_REPLAY_ERROR_RATE = float(os.environ.get('LLM_REPLAY_ERROR_RATE', 0))
+    LLM_REPLAY_ERROR_KINDS = os.environ.get('LLM_REPLAY_ERROR_KINDS', 'timeout,rate_limit,empty').split(',')
+    LLM_REPLAY_SEED = int(os.environ.get('LLM_REPLAY_SEED', 0))
+    
+    # Database Engine Configuration (see services/database_config.py)
+    DB_ENGINE_TUNING_ENABLED = os.environ.get('DB_ENGINE_TUNING_ENABLED', 'true').lower() == 'true'
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    # Pushed page updates (services/event_bus.py) hold a request thread per open page,
+    # so threaded (gthread) workers are the default while they are enabled
+    EVENT_STREAM_ENABLED = os.environ.get('EVENT_STREAM_ENABLED', 'true').lower() == 'true'
+    GUNICORN_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+    GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 8 if EVENT_STREAM_ENABLED else 1))
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0))  # 0 = threads per worker + background
+    DB_POOL_BACKGROUND = int(os.environ.get('DB_POOL_BACKGROUND', 2))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', -1))  # -1 = same as the pool size
+    DB_MAX_CONNECTIONS = int(os.environ.get('DB_MAX_CONNECTIONS', 0))  # server-side budget across workers, 0 = none
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_QUERY_CACHE_SIZE = int(os.environ.get('DB_QUERY_CACHE_SIZE', 1200))
+    PG_PREPARE_THRESHOLD = int(os.environ.get('PG_PREPARE_THRESHOLD', 5))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    
     # File Upload Configuration
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
@@ -27,6 +55,25 @@ class Config:
     SIGNAL_CHECK_INTERVAL = int(os.environ.get('SIGNAL_CHECK_INTERVAL', 300))  # 5 minutes
     PRICE_CHANGE_THRESHOLD = float(os.environ.get('PRICE_CHANGE_THRESHOLD', 0.05))  # 5%
     
+    # Derived Artifact Configuration
+    ARTIFACT_WARMING_ENABLED = os.environ.get('ARTIFACT_WARMING_ENABLED', 'true').lower() == 'true'
+    
+    # JSON Response Configuration
+    JSON_COMPRESSION_ENABLED = os.environ.get('JSON_COMPRESSION_ENABLED', 'true').lower() == 'true'
+    JSON_COMPRESSION_MIN_BYTES = int(os.environ.get('JSON_COMPRESSION_MIN_BYTES', 1024))
+    
+    # Instrumentation Configuration
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    
+    # Profiler Configuration (request profiling is disabled until an admin token is set)
+    PROFILER_ADMIN_TOKEN = os.environ.get('PROFILER_ADMIN_TOKEN')
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('instance', 'profiles'))
+    PROFILE_RETENTION = int(os.environ.get('PROFILE_RETENTION', 50))
+    PROFILER_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILER_SAMPLE_INTERVAL_MS', 5))
+    ROLLING_SAMPLER_ENABLED = os.environ.get('ROLLING_SAMPLER_ENABLED', 'false').lower() == 'true'
+    ROLLING_SAMPLER_INTERVAL_MS = float(os.environ.get('ROLLING_SAMPLER_INTERVAL_MS', 50))
+    ROLLING_SAMPLER_WINDOW_SECONDS = float(os.environ.get('ROLLING_SAMPLER_WINDOW_SECONDS', 60))
+    
     @staticmethod
     def init_app(app):
         pass
@@ -0,0 +1,15 @@
+"""
+Gunicorn settings, loaded automatically from the working directory
+
+Workers and threads come from WEB_CONCURRENCY and GUNICORN_THREADS, the
+same settings services/database_config.py sizes each worker's connection
+pool from. Threads default to 8 while EVENT_STREAM_ENABLED is on, so the
+worker class is gthread and an open event stream does not hold a worker's
+only thread. Command-line flags still override these.
+"""
+
+from config import Config
+
+workers = max(1, Config.GUNICORN_WORKERS)
+threads = max(1, Config.GUNICORN_THREADS)
+worker_class = 'gthread' if threads > 1 else 'sync'
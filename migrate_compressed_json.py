@@ -0,0 +1,81 @@
+"""
+Convert existing large JSON columns to the CompressedJSON storage format.
+
+ThesisAnalysis.causal_chain/metrics_to_track/monitoring_plan and
+DocumentUpload.processed_data are now binary columns holding compressed JSON.
+On PostgreSQL the columns are first retyped from json to bytea (app startup
+does this too, see services/schema.py); on every database the rows are then
+rewritten in id-ordered batches. Rows already in the new format are left
+untouched, so the migration can be re-run safely.
+
+Usage: python migrate_compressed_json.py [--batch-size N]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import text
+
+from models import CompressedJSON
+from services.schema import retype_postgres_columns
+
+COMPRESSED_COLUMNS = {
+    'thesis_analysis': ('causal_chain', 'metrics_to_track', 'monitoring_plan'),
+    'document_upload': ('processed_data',),
+}
+DEFAULT_BATCH_SIZE = 200
+
+
+def migrate(engine, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Rewrite every stored value in the compressed format; returns rows rewritten per table"""
+    column_type = CompressedJSON()
+    rewritten = {}
+
+    for table, columns in COMPRESSED_COLUMNS.items():
+        if engine.dialect.name == 'postgresql':
+            with engine.begin() as connection:
+                retype_postgres_columns(connection, table, columns)
+
+        rewritten[table] = 0
+        last_id = 0
+        while True:
+            with engine.begin() as connection:
+                rows = connection.execute(text(
+                    f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit"
+                ), {'last_id': last_id, 'limit': batch_size}).all()
+                if not rows:
+                    break
+
+                for row in rows:
+                    updates = {}
+                    for column, stored in zip(columns, row[1:]):
+                        if stored is None:
+                            continue
+                        value = column_type.process_result_value(stored, engine.dialect)
+                        encoded = column_type.process_bind_param(value, engine.dialect)
+                        current = stored.encode('utf-8') if isinstance(stored, str) else bytes(stored)
+                        if encoded != current:
+                            updates[column] = encoded
+
+                    if updates:
+                        assignments = ', '.join(f'{column} = :{column}' for column in updates)
+                        connection.execute(text(f'UPDATE {table} SET {assignments} WHERE id = :id'),
+                                           dict(updates, id=row[0]))
+                        rewritten[table] += 1
+
+                last_id = rows[-1][0]
+
+        logging.info(f"Compressed JSON migration: rewrote {rewritten[table]} rows in {table}")
+
+    return rewritten
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from app import app, db
+    logging.basicConfig(level=logging.INFO)
+    with app.app_context():
+        print(migrate(db.engine, args.batch_size))
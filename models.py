@@ -1,7 +1,42 @@
 from app import db
 from datetime import datetime
-from sqlalchemy import Text, JSON
+from sqlalchemy import Text, JSON, LargeBinary
+from sqlalchemy.orm import deferred
+from sqlalchemy.types import TypeDecorator
 import json
+import zlib
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON stored as a binary blob: values above COMPRESS_THRESHOLD bytes are
+    zlib-compressed behind a format prefix, smaller ones stay plain UTF-8 JSON.
+    Rows written as plain JSON before the switch are read unchanged until
+    migrate_compressed_json.py rewrites them.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    PREFIX = b'\x00zj1'
+    COMPRESS_THRESHOLD = 512
+    COMPRESSION_LEVEL = 6
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        raw = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+        if len(raw) < self.COMPRESS_THRESHOLD:
+            return raw
+        return self.PREFIX + zlib.compress(raw, self.COMPRESSION_LEVEL)
+    
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, (dict, list)):
+            # Drivers decode columns still typed as JSON themselves
+            return value
+        if isinstance(value, memoryview):
+            value = value.tobytes()
+        if isinstance(value, bytes) and value.startswith(self.PREFIX):
+            value = zlib.decompress(value[len(self.PREFIX):])
+        return json.loads(value)
 
 class ThesisAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -9,15 +44,22 @@ class ThesisAnalysis(db.Model):
     original_thesis = db.Column(Text, nullable=False)
     core_claim = db.Column(Text)
     core_analysis = db.Column(Text)
-    causal_chain = db.Column(JSON)
+    causal_chain = deferred(db.Column(CompressedJSON), group='payload')
     assumptions = db.Column(JSON)
     mental_model = db.Column(db.String(255))
     counter_thesis = db.Column(JSON)
-    metrics_to_track = db.Column(JSON)
-    monitoring_plan = db.Column(JSON)
+    metrics_to_track = deferred(db.Column(CompressedJSON), group='payload')
+    monitoring_plan = deferred(db.Column(CompressedJSON), group='payload')
+    # SHA-256 of the publish idempotency key; retried publishes find the existing row
+    publish_key = db.Column(db.String(64))
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_thesis_analysis_created', 'created_at', 'id'),
+        db.Index('ux_thesis_analysis_publish_key', 'publish_key', unique=True),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -41,13 +83,17 @@ class DocumentUpload(db.Model):
     file_type = db.Column(db.String(50), nullable=False)
     file_size = db.Column(db.Integer)
     upload_path = db.Column(db.String(500))
-    processed_data = db.Column(JSON)
+    processed_data = deferred(db.Column(CompressedJSON))
     document_metadata = db.Column(JSON)
     thesis_analysis_id = db.Column(db.Integer, db.ForeignKey('thesis_analysis.id'))
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     thesis_analysis = db.relationship('ThesisAnalysis', backref='documents')
     
+    __table_args__ = (
+        db.Index('ix_document_upload_created', 'created_at', 'id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -74,6 +120,11 @@ class SignalMonitoring(db.Model):
     
     thesis_analysis = db.relationship('ThesisAnalysis', backref='signals')
     
+    __table_args__ = (
+        db.Index('ix_signal_monitoring_status', 'status', 'created_at'),
+        db.Index('ix_signal_monitoring_thesis', 'thesis_analysis_id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -109,3 +160,91 @@ class NotificationLog(db.Model):
             'sent_at': self.sent_at.isoformat() if self.sent_at else None,
             'acknowledged': self.acknowledged
         }
+
+class SimulationResult(db.Model):
+    """Memoised simulation/backtest output keyed by thesis version, parameters and seed"""
+    id = db.Column(db.Integer, primary_key=True)
+    thesis_analysis_id = db.Column(db.Integer, db.ForeignKey('thesis_analysis.id'), nullable=False)
+    simulation_kind = db.Column(db.String(50), nullable=False)  # 'ml_simulation', 'backtest'
+    thesis_updated_at = db.Column(db.DateTime, nullable=False)
+    params_hash = db.Column(db.String(64), nullable=False)
+    seed = db.Column(db.Integer)
+    payload = db.Column(LargeBinary, nullable=False)  # zlib-compressed JSON result
+    payload_size = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Rows not loaded in the session are deleted with the thesis by services/simulation_store.py
+    thesis_analysis = db.relationship('ThesisAnalysis', backref=db.backref(
+        'simulation_results', cascade='all, delete', passive_deletes=True))
+    
+    __table_args__ = (
+        db.Index('ix_simulation_result_lookup', 'thesis_analysis_id', 'simulation_kind', 'params_hash'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'thesis_analysis_id': self.thesis_analysis_id,
+            'simulation_kind': self.simulation_kind,
+            'thesis_updated_at': self.thesis_updated_at.isoformat() if self.thesis_updated_at else None,
+            'params_hash': self.params_hash,
+            'seed': self.seed,
+            'payload_size': self.payload_size,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class ThesisTag(db.Model):
+    """Segment and company tags extracted once per thesis version"""
+    id = db.Column(db.Integer, primary_key=True)
+    thesis_analysis_id = db.Column(db.Integer, db.ForeignKey('thesis_analysis.id'), nullable=False)
+    tag_type = db.Column(db.String(20), nullable=False)  # 'segment', 'company', 'none' (tagged, nothing found)
+    value = db.Column(db.String(255))
+    thesis_updated_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    thesis_analysis = db.relationship('ThesisAnalysis', backref='tags')
+    
+    __table_args__ = (
+        db.Index('ix_thesis_tag_type_value', 'tag_type', 'value'),
+        db.Index('ix_thesis_tag_thesis', 'thesis_analysis_id', 'thesis_updated_at'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'thesis_analysis_id': self.thesis_analysis_id,
+            'tag_type': self.tag_type,
+            'value': self.value,
+            'thesis_updated_at': self.thesis_updated_at.isoformat() if self.thesis_updated_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class DerivedArtifact(db.Model):
+    """Precomputed per-thesis output (sparklines, evaluations, mappings) keyed by thesis version"""
+    id = db.Column(db.Integer, primary_key=True)
+    thesis_analysis_id = db.Column(db.Integer, db.ForeignKey('thesis_analysis.id'), nullable=False)
+    artifact_type = db.Column(db.String(50), nullable=False)  # 'sparklines', 'market_sentiment', ...
+    thesis_updated_at = db.Column(db.DateTime, nullable=False)
+    generator_version = db.Column(db.String(20), nullable=False)
+    payload = db.Column(LargeBinary, nullable=False)  # zlib-compressed JSON artifact
+    payload_size = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Rows not loaded in the session are deleted with the thesis by services/artifact_store.py
+    thesis_analysis = db.relationship('ThesisAnalysis', backref=db.backref(
+        'derived_artifacts', cascade='all, delete', passive_deletes=True))
+    
+    __table_args__ = (
+        db.Index('ix_derived_artifact_lookup', 'thesis_analysis_id', 'artifact_type'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'thesis_analysis_id': self.thesis_analysis_id,
+            'artifact_type': self.artifact_type,
+            'thesis_updated_at': self.thesis_updated_at.isoformat() if self.thesis_updated_at else None,
+            'generator_version': self.generator_version,
+            'payload_size': self.payload_size,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
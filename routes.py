@@ -1,131 +1,238 @@
 import os
 import logging
 import json
-from flask import render_template, request, redirect, url_for, flash, jsonify, session
+import hashlib
+import time
+import uuid
+from datetime import datetime
+from flask import render_template, request, redirect, url_for, flash, jsonify, session, Response, stream_with_context
 from werkzeug.utils import secure_filename
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, selectinload
 from app import app, db
 from models import ThesisAnalysis, DocumentUpload, SignalMonitoring, NotificationLog
-from services.thesis_analyzer import ThesisAnalyzer
-from services.document_processor import DocumentProcessor
-from services.signal_classifier import SignalClassifier
-from services.notification_service import NotificationService
-from services.query_parser_service import QueryParserService
-from services.data_validation_service import DataValidationService
-from services.sparkline_service import SparklineService
-from services.alternative_company_service import AlternativeCompanyService
-from services.metric_selector import MetricSelector
-from services.data_adapter_service import DataAdapter
-from services.analysis_workflow_service import AnalysisWorkflowService
-from services.thesis_evaluator import ThesisEvaluator
-from services.significance_mapping_service import SignificanceMappingService
-from services.smart_prioritization_service import SmartPrioritizationService
-from services.reliable_analysis_service import ReliableAnalysisService
+from services.service_registry import registry
+from services.simulation_store import SimulationStore
+from services.artifact_store import ArtifactStore, ArtifactWarmer, evaluation_inputs
+from services.series_codec import COMPACT_FORMAT, SERIES_KEYS, compact_simulation_payload, parse_max_points
+from services.event_bus import (
+    MONITORING_CHANNEL, event_bus, publish_on_commit, push_available, stream_capacity
+)
+from services.pagination import keyset_page, page_size_arg
+from services.database_config import read_replica
 from config import Config
 
-# Initialize services
-thesis_analyzer = ThesisAnalyzer()
-document_processor = DocumentProcessor()
-signal_classifier = SignalClassifier()
-notification_service = NotificationService()
-query_parser = QueryParserService()
-data_validator = DataValidationService()
-sparkline_service = SparklineService()
-alternative_company_service = AlternativeCompanyService()
-metric_selector = MetricSelector()
-data_adapter = DataAdapter()
-analysis_workflow_service = AnalysisWorkflowService()
-thesis_evaluator = ThesisEvaluator()
-significance_mapper = SignificanceMappingService()
-smart_prioritizer = SmartPrioritizationService()
-
-def save_thesis_analysis(thesis_text, analysis_result, signals_result):
-    """Save completed analysis to database for monitoring"""
-    try:
-        # Ensure proper UTF-8 encoding for text fields
-        def clean_text(text):
-            if isinstance(text, str):
-                return text.encode('utf-8', errors='ignore').decode('utf-8')
-            return str(text) if text is not None else ''
-        
-        # Create thesis record
-        thesis_analysis = ThesisAnalysis(
-            title=clean_text(analysis_result.get('core_claim', 'Untitled Thesis'))[:255],
-            original_thesis=clean_text(thesis_text),
-            core_claim=clean_text(analysis_result.get('core_claim', '')),
-            core_analysis=clean_text(analysis_result.get('core_analysis', '')),
-            causal_chain=analysis_result.get('causal_chain', []),
-            assumptions=analysis_result.get('assumptions', []),
-            mental_model=clean_text(analysis_result.get('mental_model', 'unknown')),
-            counter_thesis=analysis_result.get('counter_thesis_scenarios', []),
-            metrics_to_track=analysis_result.get('metrics_to_track', []),
-            monitoring_plan=analysis_result.get('monitoring_plan', {})
-        )
-        
-        db.session.add(thesis_analysis)
-        db.session.flush()  # Get the ID
-        
-        # Create signal monitoring records
-        for signal in signals_result.get('raw_signals', []):
-            signal_monitor = SignalMonitoring(
-                thesis_analysis_id=thesis_analysis.id,
-                signal_name=clean_text(signal.get('name', 'Unknown Signal'))[:255],
-                signal_type=clean_text(signal.get('level', 'unknown'))[:100],
-                threshold_value=signal.get('threshold', 0),
-                threshold_type=clean_text(signal.get('threshold_type', 'change_percent'))[:50],
-                status='active'
-            )
-            db.session.add(signal_monitor)
-        
-        db.session.commit()
-        logging.info(f"Published thesis analysis: {thesis_analysis.title} (ID: {thesis_analysis.id})")
-        return thesis_analysis.id
-        
-    except Exception as e:
-        db.session.rollback()
-        logging.error(f"Error saving thesis analysis: {str(e)}")
-        
-        # Try to reconnect and retry once
+# Services are constructed on first use (see services/service_registry.py)
+thesis_analyzer = registry.lazy('thesis_analyzer', 'services.thesis_analyzer:ThesisAnalyzer')
+document_processor = registry.lazy('document_processor', 'services.document_processor:DocumentProcessor')
+signal_classifier = registry.lazy('signal_classifier', 'services.signal_classifier:SignalClassifier')
+notification_service = registry.lazy('notification_service', 'services.notification_service:NotificationService')
+query_parser = registry.lazy('query_parser', 'services.query_parser_service:QueryParserService')
+data_validator = registry.lazy('data_validator', 'services.data_validation_service:DataValidationService')
+sparkline_service = registry.lazy('sparkline_service', 'services.sparkline_service:SparklineService')
+alternative_company_service = registry.lazy('alternative_company_service',
+                                            'services.alternative_company_service:AlternativeCompanyService')
+metric_selector = registry.lazy('metric_selector', 'services.metric_selector:MetricSelector')
+data_adapter = registry.lazy('data_adapter', 'services.data_adapter_service:DataAdapter')
+analysis_workflow_service = registry.lazy('analysis_workflow_service',
+                                          'services.analysis_workflow_service:AnalysisWorkflowService')
+thesis_evaluator = registry.lazy('thesis_evaluator', 'services.thesis_evaluator:ThesisEvaluator')
+significance_mapper = registry.lazy('significance_mapper', 'services.significance_mapping_service:SignificanceMappingService')
+smart_prioritizer = registry.lazy('smart_prioritizer', 'services.smart_prioritization_service:SmartPrioritizationService')
+reliable_analysis_service = registry.lazy('reliable_analysis_service',
+                                          'services.reliable_analysis_service:ReliableAnalysisService')
+position_extractor = registry.lazy('position_extractor',
+                                   'services.financial_position_extractor:FinancialPositionExtractor')
+simulation_store = SimulationStore()
+artifact_store = ArtifactStore()
+thesis_tag_service = registry.lazy('thesis_tag_service', 'services.thesis_tag_service:ThesisTagService')
+# Published theses are tagged on the warmer thread, so the segments endpoint only aggregates
+artifact_warmer = ArtifactWarmer(app, artifact_store, tasks=[lambda thesis: thesis_tag_service.tag_thesis(thesis)])
+app.jinja_env.globals['event_push_available'] = push_available
+
+ACTIVE_SIGNAL_LIMIT = 50
+
+PUBLISH_ATTEMPTS = 2
+# Seconds during which an identical /publish_thesis payload without an
+# Idempotency-Key counts as a resubmission rather than a new publish
+PUBLISH_DEDUP_WINDOW = 600
+
+def publish_thesis_event(thesis_id, thesis_row, signal_count):
+    """Tell connected dashboards about a newly published thesis once it commits"""
+    publish_on_commit(db.session, 'thesis_published', {
+        'thesis_id': thesis_id,
+        'title': thesis_row['title'],
+        'summary': (thesis_row['original_thesis'] or '')[:150],
+        'mental_model': thesis_row['mental_model'],
+        'signal_count': signal_count,
+        'created_at': datetime.utcnow().isoformat()
+    })
+
+def clean_text(text):
+    """Ensure proper UTF-8 encoding for text fields"""
+    if isinstance(text, str):
+        return text.encode('utf-8', errors='ignore').decode('utf-8')
+    return str(text) if text is not None else ''
+
+def publish_key_for(payload, window=None):
+    """
+    Idempotency key derived from a publish payload, for clients that send
+    none; it changes every PUBLISH_DEDUP_WINDOW seconds (``window`` numbers
+    the period, default the current one) so a deliberate later re-publish
+    creates a new thesis
+    """
+    if window is None:
+        window = int(time.time() // PUBLISH_DEDUP_WINDOW)
+    return f"{json.dumps(payload, sort_keys=True, default=str)}@{window}"
+
+def publish_key_hash(idempotency_key):
+    """Value stored in ThesisAnalysis.publish_key for an idempotency key"""
+    return hashlib.sha256(idempotency_key.encode('utf-8')).hexdigest()
+
+def find_published_thesis(publish_key):
+    """ID of the thesis already published under ``publish_key``, if any"""
+    return db.session.execute(
+        select(ThesisAnalysis.id).where(ThesisAnalysis.publish_key == publish_key)
+    ).scalar()
+
+def insert_thesis_analysis(thesis_text, analysis_result, signals_result, publish_key):
+    """
+    Insert the thesis (RETURNING its id) and then all of its signals as one
+    multi-row INSERT, in the session's current transaction
+    """
+    thesis_row = {
+        'title': clean_text(analysis_result.get('core_claim', 'Untitled Thesis'))[:255],
+        'original_thesis': clean_text(thesis_text),
+        'core_claim': clean_text(analysis_result.get('core_claim', '')),
+        'core_analysis': clean_text(analysis_result.get('core_analysis', '')),
+        'causal_chain': analysis_result.get('causal_chain', []),
+        'assumptions': analysis_result.get('assumptions', []),
+        'mental_model': clean_text(analysis_result.get('mental_model', 'unknown')),
+        'counter_thesis': analysis_result.get('counter_thesis_scenarios', []),
+        'metrics_to_track': analysis_result.get('metrics_to_track', []),
+        'monitoring_plan': analysis_result.get('monitoring_plan', {}),
+        'publish_key': publish_key
+    }
+    thesis_id = db.session.execute(
+        insert(ThesisAnalysis).values(**thesis_row).returning(ThesisAnalysis.id)
+    ).scalar_one()
+    
+    signal_rows = [{
+        'thesis_analysis_id': thesis_id,
+        'signal_name': clean_text(signal.get('name', 'Unknown Signal'))[:255],
+        'signal_type': clean_text(signal.get('level', 'unknown'))[:100],
+        'threshold_value': signal.get('threshold', 0),
+        'threshold_type': clean_text(signal.get('threshold_type', 'change_percent'))[:50],
+        'status': 'active'
+    } for signal in signals_result.get('raw_signals', [])]
+    if signal_rows:
+        db.session.execute(insert(SignalMonitoring), signal_rows)
+    
+    publish_thesis_event(thesis_id, thesis_row, len(signal_rows))
+    return thesis_id, thesis_row['title']
+
+def save_thesis_analysis(thesis_text, analysis_result, signals_result, idempotency_key=None):
+    """
+    Save completed analysis to database for monitoring, retrying once on a
+    fresh connection. Publishing is idempotent per ``idempotency_key`` (a new
+    key per call by default): a key already published returns that thesis id,
+    so a retry after a commit whose acknowledgement was lost adds nothing.
+    """
+    publish_key = publish_key_hash(idempotency_key or uuid.uuid4().hex)
+    
+    for attempt in range(1, PUBLISH_ATTEMPTS + 1):
         try:
-            db.session.close()
-            db.session.remove()
-            
-            # Retry the save operation
-            thesis_analysis = ThesisAnalysis(
-                title=clean_text(analysis_result.get('core_claim', 'Untitled Thesis'))[:255],
-                original_thesis=clean_text(thesis_text),
-                core_claim=clean_text(analysis_result.get('core_claim', '')),
-                core_analysis=clean_text(analysis_result.get('core_analysis', '')),
-                causal_chain=analysis_result.get('causal_chain', []),
-                assumptions=analysis_result.get('assumptions', []),
-                mental_model=clean_text(analysis_result.get('mental_model', 'unknown')),
-                counter_thesis=analysis_result.get('counter_thesis', {}),
-                metrics_to_track=analysis_result.get('metrics_to_track', []),
-                monitoring_plan=analysis_result.get('monitoring_plan', {})
-            )
-            
-            db.session.add(thesis_analysis)
-            db.session.flush()
-            
-            # Create signal monitoring records
-            for signal in signals_result.get('raw_signals', []):
-                signal_monitor = SignalMonitoring(
-                    thesis_analysis_id=thesis_analysis.id,
-                    signal_name=clean_text(signal.get('name', 'Unknown Signal'))[:255],
-                    signal_type=clean_text(signal.get('level', 'unknown'))[:100],
-                    threshold_value=signal.get('threshold', 0),
-                    threshold_type=clean_text(signal.get('threshold_type', 'change_percent'))[:50],
-                    status='active'
-                )
-                db.session.add(signal_monitor)
+            existing_id = find_published_thesis(publish_key)
+            if existing_id is not None:
+                logging.info(f"Thesis analysis already published (ID: {existing_id})")
+                return existing_id
             
+            thesis_id, title = insert_thesis_analysis(thesis_text, analysis_result, signals_result, publish_key)
             db.session.commit()
-            logging.info(f"Successfully saved thesis analysis on retry: {thesis_analysis.title}")
-            return thesis_analysis
+            logging.info(f"Published thesis analysis: {title} (ID: {thesis_id})")
+            artifact_warmer.enqueue(thesis_id)
+            return thesis_id
+            
+        except IntegrityError:
+            # A concurrent publish with the same key committed first
+            db.session.rollback()
+            existing_id = find_published_thesis(publish_key)
+            if existing_id is None:
+                raise
+            return existing_id
             
-        except Exception as retry_error:
+        except Exception as e:
             db.session.rollback()
-            logging.error(f"Retry failed: {str(retry_error)}")
-            raise
+            if attempt == PUBLISH_ATTEMPTS:
+                logging.error(f"Retry failed: {str(e)}")
+                raise
+            logging.error(f"Error saving thesis analysis: {str(e)}")
+            
+            # Reconnect before retrying
+            db.session.close()
+            db.session.remove()
+
+def build_simulation_response(result, data, store_params, seed, max_points=None):
+    """Apply the requested payload format to a simulation result"""
+    if data.get('payload_format') != COMPACT_FORMAT or not isinstance(result, dict) or result.get('error'):
+        return result
+    
+    compact = compact_simulation_payload(result, max_points)
+    # Reference for fetching full-resolution series from the simulation store
+    compact['series_ref'] = {
+        'params_hash': simulation_store.build_params_hash(store_params),
+        'seed': seed
+    }
+    return compact
+
+def normalise_time_horizon(value):
+    """Time horizon in years, whole values as int (1.0 -> 1) so equal requests hash alike"""
+    horizon = float(value)
+    if horizon <= 0:
+        raise ValueError(f"time_horizon must be positive, got {value!r}")
+    return int(horizon) if horizon.is_integer() else horizon
+
+def simulation_params(source, simulation_type=None):
+    """
+    (time_horizon, scenario, volatility, include_events) for a simulation
+    request, read from a JSON body or a query string with the defaults of its
+    simulation type. Raises ValueError for an invalid time_horizon.
+    """
+    time_horizon = normalise_time_horizon(source.get('time_horizon', 1 if simulation_type else 3))
+    if simulation_type == 'forecast':
+        return time_horizon, source.get('scenario_type', 'base'), source.get('volatility', 'moderate'), True
+    if simulation_type == 'event':
+        # Event simulations use a stress scenario focused on events
+        return time_horizon, source.get('scenario_type', 'stress'), 'high', True
+    
+    include_events = source.get('include_events', True)
+    if isinstance(include_events, str):
+        include_events = include_events.lower() != 'false'
+    return time_horizon, source.get('scenario', 'base'), source.get('volatility', 'medium'), include_events
+
+def simulation_store_params(simulation_type, time_horizon, scenario, volatility, include_events, monitoring_plan):
+    """Simulation store parameters, built the same way by the POST and streaming routes"""
+    if simulation_type in ('forecast', 'event'):
+        return {
+            'simulation_type': simulation_type,
+            'time_horizon': time_horizon,
+            'scenario': scenario,
+            'volatility': volatility,
+            'include_events': True
+        }
+    return {
+        'time_horizon': time_horizon,
+        'scenario': scenario,
+        'volatility': volatility,
+        'include_events': include_events,
+        'monitoring_plan': bool(monitoring_plan)
+    }
+
+def sse_message(event, payload, event_id=None):
+    """Format one Server-Sent Events message"""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {app.json.dumps(payload)}\n\n"
 
 def allowed_file(filename):
     return '.' in filename and \
@@ -136,95 +243,50 @@ def index():
     """Main analysis interface for investment thesis and signal extraction"""
     return render_template('analysis.html')
 
-@app.route('/analyze', methods=['POST'])
-def analyze():
-    """Main analysis endpoint for document-based thesis and signal extraction"""
-    try:
-        focus_primary_signals = request.form.get('focus_primary_signals') == 'on'
-        
-        # Process uploaded research files - now required for thesis extraction
-        processed_documents = []
-        research_files = request.files.getlist('research_files')
-        
-        if not research_files or len(research_files) == 0 or not research_files[0].filename:
-            return jsonify({'error': 'Research documents are required for analysis'}), 400
-        
-        # Extract financial position from documents
-        from services.financial_position_extractor import FinancialPositionExtractor
-        position_extractor = FinancialPositionExtractor()
-        
-        # Process each document and extract positions
-        document_positions = []
-        combined_content = ""
-        
-        for file in research_files:
-            if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                
-                # Create upload directory if it doesn't exist
-                upload_dir = Config.UPLOAD_FOLDER
-                if not os.path.exists(upload_dir):
-                    os.makedirs(upload_dir)
-                
-                file_path = os.path.join(upload_dir, filename)
-                file.save(file_path)
-                
-                # Process the document
-                processed_data = document_processor.process_document(file_path)
-                processed_documents.append({
-                    'filename': filename,
-                    'data': processed_data
-                })
-                
-                # Extract financial position from this document
-                if processed_data:
-                    content = None
-                    
-                    # Extract content based on document type and structure
-                    if 'text_content' in processed_data:
-                        # PDF documents
-                        content = processed_data['text_content']
-                    elif 'data' in processed_data and isinstance(processed_data['data'], list):
-                        # CSV/Excel documents - extract from data rows
-                        data_rows = processed_data['data']
-                        content_parts = []
-                        for row in data_rows:
-                            if isinstance(row, dict):
-                                for key, value in row.items():
-                                    if isinstance(value, str) and len(value.strip()) > 20:
-                                        content_parts.append(value)
-                            elif isinstance(row, str):
-                                content_parts.append(row)
-                        content = "\n".join(content_parts)
-                    elif 'content' in processed_data:
-                        content = processed_data['content']
-                    
-                    logging.info(f"Document {filename} - Keys: {list(processed_data.keys())}, Content length: {len(content) if content else 0}")
-                    
-                    if content and len(content.strip()) > 20:
-                        combined_content += f"\n\n--- Document: {filename} ---\n{content}"
-                        
-                        position_data = position_extractor.extract_financial_position(content, filename)
-                        document_positions.append({
-                            'filename': filename,
-                            'position': position_data
-                        })
-                        logging.info(f"Extracted position for {filename}: {position_data.get('investment_position', 'Unknown')} (confidence: {position_data.get('confidence_level', 'Unknown')})")
-                    else:
-                        logging.warning(f"Insufficient content in {filename} for position extraction")
-        
-        # Select the primary financial position (highest confidence or first document)
-        primary_position = None
-        if document_positions:
-            # Sort by confidence level and select the best one
-            confidence_order = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
-            sorted_positions = sorted(document_positions, 
-                                    key=lambda x: confidence_order.get(x['position'].get('confidence_level', 'LOW'), 0), 
-                                    reverse=True)
-            primary_position = sorted_positions[0]['position']
-            
-            # Generate comprehensive thesis text from extracted position
-            thesis_text = f"""
+class AnalysisInputError(ValueError):
+    """Raised when uploaded research cannot be turned into a thesis"""
+
+def save_research_files(research_files):
+    """Store uploaded research files; returns (filename, path) for each allowed file"""
+    upload_dir = Config.UPLOAD_FOLDER
+    if not os.path.exists(upload_dir):
+        os.makedirs(upload_dir)
+    
+    saved = []
+    for file in research_files:
+        if file and file.filename and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            file_path = os.path.join(upload_dir, filename)
+            file.save(file_path)
+            saved.append((filename, file_path))
+    return saved
+
+def document_text(processed_data):
+    """Text content of a processed document, by document type"""
+    if not processed_data:
+        return None
+    
+    if 'text_content' in processed_data:
+        # PDF documents
+        return processed_data['text_content']
+    if 'data' in processed_data and isinstance(processed_data['data'], list):
+        # CSV/Excel documents - extract from data rows
+        content_parts = []
+        for row in processed_data['data']:
+            if isinstance(row, dict):
+                for key, value in row.items():
+                    if isinstance(value, str) and len(value.strip()) > 20:
+                        content_parts.append(value)
+            elif isinstance(row, str):
+                content_parts.append(row)
+        return "\n".join(content_parts)
+    if 'content' in processed_data:
+        return processed_data['content']
+    return None
+
+def position_thesis_text(primary_position, document_count):
+    """Thesis text generated from the extracted primary position"""
+    return f"""
 Investment Position: {primary_position.get('investment_position', 'HOLD')}
 Company: {primary_position.get('company_name', 'Target Company')}
 Sector: {primary_position.get('sector', 'Various')}
@@ -241,95 +303,205 @@ Key Arguments:
 Risk Factors:
 {chr(10).join(f"• {risk}" for risk in primary_position.get('risk_factors', []))}
 
-Supporting Research: {len(processed_documents)} documents analyzed
-            """.strip()
-        else:
-            return jsonify({'error': 'Could not extract financial position from uploaded documents'}), 400
+Supporting Research: {document_count} documents analyzed
+    """.strip()
+
+def iter_analysis_stages(saved_files, focus_primary_signals, stream_llm=False, idempotency_key=None):
+    """
+    Run document-based thesis analysis as a sequence of (stage, payload) pairs:
+    document, position (preceded by position_delta chunks when stream_llm is
+    set), analysis, signals and finally complete with the combined result.
+    The thesis is published under idempotency_key (see save_thesis_analysis).
+    Raises AnalysisInputError when no financial position can be extracted.
+    """
+    processed_documents = []
+    document_positions = []
+    
+    for index, (filename, file_path) in enumerate(saved_files, 1):
+        # Process the document
+        processed_data = document_processor.process_document(file_path)
+        processed_documents.append({
+            'filename': filename,
+            'data': processed_data
+        })
         
-        # Use Azure OpenAI for dynamic analysis with Eagle API integration
-        from services.azure_openai_service import AzureOpenAIService
-        from services.reliable_analysis_service import ReliableAnalysisService
+        content = document_text(processed_data)
+        if processed_data:
+            logging.info(f"Document {filename} - Keys: {list(processed_data.keys())}, Content length: {len(content) if content else 0}")
         
-        # Use reliable analysis service with smart Azure fallback
-        reliable_service = ReliableAnalysisService()
-        analysis_result = reliable_service.analyze_thesis(thesis_text)
+        has_content = bool(content and len(content.strip()) > 20)
+        yield 'document', {'filename': filename, 'index': index, 'total': len(saved_files), 'has_content': has_content}
         
-        # Enhance analysis result with extracted position data
-        if isinstance(analysis_result, dict) and primary_position:
-            analysis_result['extracted_position'] = primary_position
-            analysis_result['document_count'] = len(processed_documents)
-            
-            # Update core claim with extracted thesis if available
-            if primary_position.get('thesis_statement'):
-                analysis_result['core_claim'] = primary_position['thesis_statement']
+        if not has_content:
+            logging.warning(f"Insufficient content in {filename} for position extraction")
+            continue
         
-        logging.info(f"Analysis completed using document-extracted thesis from {len(processed_documents)} documents")
+        # Extract financial position from this document
+        if stream_llm:
+            position_data = None
+            for kind, value in position_extractor.stream_financial_position(content, filename):
+                if kind == 'delta':
+                    yield 'position_delta', {'filename': filename, 'text': value}
+                else:
+                    position_data = value
+        else:
+            position_data = position_extractor.extract_financial_position(content, filename)
         
-        # Always add Eagle API signals regardless of analysis source
-        try:
-            reliable_service = ReliableAnalysisService()
-            eagle_signals = reliable_service.extract_eagle_signals_for_thesis(thesis_text)
-            if eagle_signals and isinstance(analysis_result, dict):
-                if 'metrics_to_track' not in analysis_result:
-                    analysis_result['metrics_to_track'] = []
-                if isinstance(analysis_result['metrics_to_track'], list):
-                    analysis_result['metrics_to_track'].extend(eagle_signals)
-        except Exception as eagle_error:
-            logging.warning(f"Eagle API signals unavailable: {eagle_error}")
-        
-        # Extract signals from AI analysis and documents using the classification hierarchy
-        # Ensure analysis_result is a dictionary before processing
-        if not isinstance(analysis_result, dict):
-            logging.warning("Analysis result not in expected format, using fallback")
-            reliable_service = ReliableAnalysisService()
-            analysis_result = reliable_service.analyze_thesis_comprehensive(thesis_text)
-        
-        signals_result = signal_classifier.extract_signals_from_ai_analysis(
-            analysis_result, 
-            processed_documents, 
-            focus_primary=focus_primary_signals
-        )
+        document_positions.append({
+            'filename': filename,
+            'position': position_data
+        })
+        logging.info(f"Extracted position for {filename}: {position_data.get('investment_position', 'Unknown')} (confidence: {position_data.get('confidence_level', 'Unknown')})")
+        yield 'position', {'filename': filename, 'position': position_data}
+    
+    if not document_positions:
+        raise AnalysisInputError('Could not extract financial position from uploaded documents')
+    
+    # Select the primary financial position (highest confidence or first document)
+    confidence_order = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+    sorted_positions = sorted(document_positions, 
+                            key=lambda x: confidence_order.get(x['position'].get('confidence_level', 'LOW'), 0), 
+                            reverse=True)
+    primary_position = sorted_positions[0]['position']
+    
+    # Generate comprehensive thesis text from extracted position
+    thesis_text = position_thesis_text(primary_position, len(processed_documents))
+    
+    # Use reliable analysis service with smart Azure fallback
+    analysis_result = reliable_analysis_service.analyze_thesis(thesis_text)
+    
+    # Enhance analysis result with extracted position data
+    if isinstance(analysis_result, dict):
+        analysis_result['extracted_position'] = primary_position
+        analysis_result['document_count'] = len(processed_documents)
+        
+        # Update core claim with extracted thesis if available
+        if primary_position.get('thesis_statement'):
+            analysis_result['core_claim'] = primary_position['thesis_statement']
+    
+    logging.info(f"Analysis completed using document-extracted thesis from {len(processed_documents)} documents")
+    
+    # Always add Eagle API signals regardless of analysis source
+    try:
+        eagle_signals = reliable_analysis_service.extract_eagle_signals_for_thesis(thesis_text)
+        if eagle_signals and isinstance(analysis_result, dict):
+            if 'metrics_to_track' not in analysis_result:
+                analysis_result['metrics_to_track'] = []
+            if isinstance(analysis_result['metrics_to_track'], list):
+                analysis_result['metrics_to_track'].extend(eagle_signals)
+    except Exception as eagle_error:
+        logging.warning(f"Eagle API signals unavailable: {eagle_error}")
+    
+    # Ensure analysis_result is a dictionary before processing
+    if not isinstance(analysis_result, dict):
+        logging.warning("Analysis result not in expected format, using fallback")
+        analysis_result = reliable_analysis_service.analyze_thesis_comprehensive(thesis_text)
+    
+    yield 'analysis', analysis_result
+    
+    # Extract signals from AI analysis and documents using the classification hierarchy
+    signals_result = signal_classifier.extract_signals_from_ai_analysis(
+        analysis_result, 
+        processed_documents, 
+        focus_primary=focus_primary_signals
+    )
+    yield 'signals', signals_result
+    
+    # Save analysis to database for monitoring
+    thesis_id = save_thesis_analysis(thesis_text, analysis_result, signals_result, idempotency_key)
+    
+    yield 'complete', {
+        'thesis_analysis': analysis_result,
+        'signal_extraction': signals_result,
+        'processed_documents': len(processed_documents),
+        'focus_primary_signals': focus_primary_signals,
+        'thesis_id': thesis_id,
+        'published': True
+    }
+
+def analysis_error_response(error_message):
+    """Error payload and status for a failed analysis"""
+    # Provide specific error messages for common issues
+    if any(keyword in error_message.lower() for keyword in ['timeout', 'connection', 'network', 'ssl', 'recv']):
+        return {
+            'error': 'Analysis service temporarily unavailable due to network issues. Please try again in a moment.',
+            'error_type': 'network_timeout',
+            'retry_suggested': True
+        }, 503
+    elif 'content_filter' in error_message.lower():
+        return {
+            'error': 'Content was filtered by AI safety policies. Please revise your thesis text.',
+            'error_type': 'content_filter'
+        }, 400
+    elif 'credentials' in error_message.lower() or 'authorization' in error_message.lower():
+        return {
+            'error': 'AI service configuration issue. Please contact support.',
+            'error_type': 'auth_error'
+        }, 500
+    else:
+        return {
+            'error': f'Analysis failed: {error_message}',
+            'error_type': 'general_error'
+        }, 500
+
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    """Main analysis endpoint for document-based thesis and signal extraction"""
+    try:
+        focus_primary_signals = request.form.get('focus_primary_signals') == 'on'
         
-        # Save analysis to database for monitoring
-        thesis_id = save_thesis_analysis(thesis_text, analysis_result, signals_result)
+        # Process uploaded research files - now required for thesis extraction
+        research_files = request.files.getlist('research_files')
         
-        # Combine results
-        combined_result = {
-            'thesis_analysis': analysis_result,
-            'signal_extraction': signals_result,
-            'processed_documents': len(processed_documents),
-            'focus_primary_signals': focus_primary_signals,
-            'thesis_id': thesis_id,
-            'published': True
-        }
+        if not research_files or len(research_files) == 0 or not research_files[0].filename:
+            return jsonify({'error': 'Research documents are required for analysis'}), 400
+        
+        combined_result = None
+        for stage, payload in iter_analysis_stages(save_research_files(research_files), focus_primary_signals,
+                                                   idempotency_key=request.headers.get('Idempotency-Key')):
+            if stage == 'complete':
+                combined_result = payload
         
         return jsonify(combined_result)
         
+    except AnalysisInputError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        error_message = str(e)
-        
-        # Provide specific error messages for common issues
-        if any(keyword in error_message.lower() for keyword in ['timeout', 'connection', 'network', 'ssl', 'recv']):
-            return jsonify({
-                'error': 'Analysis service temporarily unavailable due to network issues. Please try again in a moment.',
-                'error_type': 'network_timeout',
-                'retry_suggested': True
-            }), 503
-        elif 'content_filter' in error_message.lower():
-            return jsonify({
-                'error': 'Content was filtered by AI safety policies. Please revise your thesis text.',
-                'error_type': 'content_filter'
-            }), 400
-        elif 'credentials' in error_message.lower() or 'authorization' in error_message.lower():
-            return jsonify({
-                'error': 'AI service configuration issue. Please contact support.',
-                'error_type': 'auth_error'
-            }), 500
-        else:
-            return jsonify({
-                'error': f'Analysis failed: {error_message}',
-                'error_type': 'general_error'
-            }), 500
+        payload, status = analysis_error_response(str(e))
+        return jsonify(payload), status
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Streaming variant of /analyze: progress stages and the LLM position
+    extraction are sent over Server-Sent Events as they are produced
+    """
+    focus_primary_signals = request.form.get('focus_primary_signals') == 'on'
+    research_files = request.files.getlist('research_files')
+    
+    if not research_files or len(research_files) == 0 or not research_files[0].filename:
+        return jsonify({'error': 'Research documents are required for analysis'}), 400
+    
+    # Uploads and headers are read from the request before streaming starts
+    saved_files = save_research_files(research_files)
+    idempotency_key = request.headers.get('Idempotency-Key')
+    
+    def generate():
+        try:
+            for stage, payload in iter_analysis_stages(saved_files, focus_primary_signals, stream_llm=True,
+                                                       idempotency_key=idempotency_key):
+                yield sse_message(stage, payload)
+        except AnalysisInputError as e:
+            yield sse_message('error', {'error': str(e)})
+        except Exception as e:
+            logging.error(f"Streaming analysis failed: {str(e)}")
+            yield sse_message('error', analysis_error_response(str(e))[0])
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 # Route removed - analysis functionality consolidated into dashboard
 
@@ -407,27 +579,56 @@ def upload_document():
             flash('Invalid file type. Please upload PDF, Excel, or CSV files.', 'error')
     
     # Get list of existing theses for association
-    theses = ThesisAnalysis.query.order_by(ThesisAnalysis.created_at.desc()).all()
+    theses = ThesisAnalysis.query.options(
+        load_only(ThesisAnalysis.id, ThesisAnalysis.title)
+    ).order_by(ThesisAnalysis.created_at.desc()).all()
     return render_template('document_upload.html', theses=theses)
 
 @app.route('/documents')
 def document_list():
-    """List all uploaded documents"""
-    documents = DocumentUpload.query.order_by(DocumentUpload.created_at.desc()).all()
-    return render_template('document_upload.html', documents=documents, list_mode=True)
+    """List uploaded documents, newest first, one keyset page at a time"""
+    documents_query = DocumentUpload.query.options(
+        # processed_data can hold entire parsed workbooks; the list never needs it
+        load_only(DocumentUpload.id, DocumentUpload.filename, DocumentUpload.file_type,
+                  DocumentUpload.file_size, DocumentUpload.thesis_analysis_id, DocumentUpload.created_at),
+        selectinload(DocumentUpload.thesis_analysis).load_only(ThesisAnalysis.id, ThesisAnalysis.title)
+    )
+    page = keyset_page(documents_query, DocumentUpload, request.args.get('cursor'),
+                       page_size_arg(request.args.get('limit', type=int)))
+    
+    return render_template('document_upload.html', documents=page.items, page=page,
+                           total_documents=db.session.query(func.count(DocumentUpload.id)).scalar(),
+                           list_mode=True)
 
 @app.route('/monitoring')
+@read_replica
 def monitoring_dashboard():
     """Monitoring dashboard showing published thesis analyses and active signals"""
     try:
-        # Get all published thesis analyses
-        thesis_analyses = ThesisAnalysis.query.order_by(ThesisAnalysis.created_at.desc()).all()
+        # One keyset page of published thesis analyses, without the JSON columns
+        thesis_query = ThesisAnalysis.query.options(
+            load_only(ThesisAnalysis.id, ThesisAnalysis.title, ThesisAnalysis.core_claim, ThesisAnalysis.created_at)
+        )
+        page = keyset_page(thesis_query, ThesisAnalysis, request.args.get('cursor'),
+                           page_size_arg(request.args.get('limit', type=int)))
+        
+        # Signal counts for the theses on this page in one grouped query
+        page_ids = [thesis.id for thesis in page.items]
+        signal_counts = dict(
+            db.session.query(SignalMonitoring.thesis_analysis_id, func.count(SignalMonitoring.id))
+            .filter(SignalMonitoring.thesis_analysis_id.in_(page_ids))
+            .group_by(SignalMonitoring.thesis_analysis_id)
+            .all()
+        ) if page_ids else {}
         
-        # Get active signals with thesis context
+        # Most recent active signals with thesis context
         active_signals = db.session.query(SignalMonitoring, ThesisAnalysis.title)\
             .join(ThesisAnalysis)\
+            .options(load_only(SignalMonitoring.id, SignalMonitoring.signal_name, SignalMonitoring.signal_type,
+                               SignalMonitoring.status, SignalMonitoring.last_checked))\
             .filter(SignalMonitoring.status == 'active')\
             .order_by(SignalMonitoring.created_at.desc())\
+            .limit(ACTIVE_SIGNAL_LIMIT)\
             .all()
         
         # Get recent notifications
@@ -435,16 +636,24 @@ def monitoring_dashboard():
             .order_by(NotificationLog.sent_at.desc())\
             .limit(20).all()
         
-        # Calculate monitoring statistics
+        # Calculate monitoring statistics in SQL
+        status_counts = dict(
+            db.session.query(SignalMonitoring.status, func.count(SignalMonitoring.id))
+            .filter(SignalMonitoring.status.in_(['active', 'triggered']))
+            .group_by(SignalMonitoring.status)
+            .all()
+        )
         stats = {
-            'total_published': len(thesis_analyses),
-            'active_signals': len(active_signals),
-            'triggered_signals': SignalMonitoring.query.filter_by(status='triggered').count(),
+            'total_published': db.session.query(func.count(ThesisAnalysis.id)).scalar(),
+            'active_signals': status_counts.get('active', 0),
+            'triggered_signals': status_counts.get('triggered', 0),
             'recent_notifications': len(recent_notifications)
         }
         
         return render_template('monitoring.html', 
-                             thesis_analyses=thesis_analyses,
+                             thesis_analyses=page.items,
+                             signal_counts=signal_counts,
+                             page=page,
                              active_signals=active_signals,
                              recent_notifications=recent_notifications,
                              stats=stats)
@@ -452,17 +661,14 @@ def monitoring_dashboard():
         return f"Error loading monitoring dashboard: {str(e)}", 500
 
 @app.route('/thesis/<int:id>/monitor')
+@read_replica
 def monitor_thesis(id):
     """View monitoring status for a specific published thesis"""
     try:
         thesis = ThesisAnalysis.query.get_or_404(id)
         signals = SignalMonitoring.query.filter_by(thesis_analysis_id=id).all()
         
-        # Debug logging
-        print(f"Loading monitoring for thesis {id}")
-        print(f"Found {len(signals)} signals")
-        for signal in signals:
-            print(f"Signal: {signal.signal_name}, Status: {signal.status}, Type: {signal.signal_type}")
+        logging.debug(f"Loading monitoring for thesis {id}: {len(signals)} signals")
         
         # Get notifications with better error handling
         notifications = []
@@ -473,11 +679,9 @@ def monitor_thesis(id):
                 .order_by(NotificationLog.sent_at.desc())\
                 .all()
         except Exception as notif_error:
-            print(f"Error loading notifications: {notif_error}")
+            logging.error(f"Error loading notifications: {notif_error}")
             notifications = []
         
-        print(f"Found {len(notifications)} notifications")
-        
         # Convert signals to dictionaries to avoid JSON serialization issues
         signals_data = []
         for signal in signals:
@@ -511,10 +715,11 @@ def monitor_thesis(id):
                              signals_json=signals_data,
                              notifications_json=notifications_data)
     except Exception as e:
-        print(f"Error in monitor_thesis: {str(e)}")
+        logging.error(f"Error in monitor_thesis: {str(e)}")
         return f"Error loading thesis monitoring: {str(e)}", 500
 
 @app.route('/api/thesis/<int:id>/status')
+@read_replica
 def get_thesis_status(id):
     """Get current monitoring status for a published thesis"""
     try:
@@ -644,15 +849,12 @@ def get_market_sentiment(thesis_id):
                 'error': 'Thesis not found'
             }), 404
         
-        # Generate market sentiment using Azure OpenAI
-        from services.market_sentiment_service import MarketSentimentService
-        sentiment_service = MarketSentimentService()
-        
-        market_sentiment = sentiment_service.generate_market_sentiment(thesis.original_thesis, thesis.core_claim)
+        market_sentiment, artifact = artifact_store.get(thesis, 'market_sentiment')
         
         return jsonify({
             'success': True,
-            'market_sentiment': market_sentiment
+            'market_sentiment': market_sentiment,
+            'artifact': artifact
         })
         
     except Exception as e:
@@ -836,65 +1038,13 @@ def get_comprehensive_analytics():
 def get_thesis_segments():
     """Get available segments and companies from thesis data"""
     try:
-        from services.azure_openai_service import AzureOpenAIService
-        
-        # Get all theses
-        theses = ThesisAnalysis.query.order_by(ThesisAnalysis.created_at.desc()).all()
-        
-        # Extract segments and companies using AI
-        openai_service = AzureOpenAIService()
-        
-        segments = set()
-        companies = set()
-        
-        for thesis in theses[:50]:  # Limit to recent theses for performance
-            if thesis.title and thesis.core_claim:
-                # Use AI to extract segment and company information
-                analysis_prompt = f"""
-                Analyze this investment thesis and extract:
-                1. Primary industry segment
-                2. Company names mentioned
-                
-                Thesis: {thesis.title}
-                Core Claim: {thesis.core_claim[:500]}
-                
-                Return JSON: {{
-                    "segment": "primary_industry_segment",
-                    "companies": ["company1", "company2"]
-                }}
-                """
-                
-                try:
-                    response = openai_service.generate_completion(
-                        [{"role": "user", "content": analysis_prompt}], 
-                        temperature=0.3
-                    )
-                    
-                    # Parse response
-                    import json
-                    start_idx = response.find('{')
-                    end_idx = response.rfind('}') + 1
-                    
-                    if start_idx != -1 and end_idx != -1:
-                        json_str = response[start_idx:end_idx]
-                        data = json.loads(json_str)
-                        
-                        if data.get('segment'):
-                            segments.add(data['segment'])
-                        
-                        if data.get('companies'):
-                            for company in data['companies']:
-                                if company and len(company) > 2:
-                                    companies.add(company)
-                                    
-                except Exception as e:
-                    logging.warning(f"Failed to analyze thesis {thesis.id}: {str(e)}")
-                    continue
+        # Tags are written when a thesis is published (see artifact_warmer)
+        tags = thesis_tag_service.aggregate()
         
         return jsonify({
             'success': True,
-            'segments': sorted(list(segments)),
-            'companies': sorted(list(companies))
+            'segments': tags['segments'],
+            'companies': tags['companies']
         })
         
     except Exception as e:
@@ -917,10 +1067,21 @@ def run_thesis_backtest(thesis_id):
             'stress_tests': data.get('stress_tests', True),
             'include_signals': data.get('include_signals', True)
         }
+        seed = data.get('seed')
+        if seed is not None:
+            backtest_params['seed'] = seed
         
-        # Run backtesting
+        # Run backtesting, serving repeat requests for an unchanged thesis from storage
         backtesting_service = BacktestingService()
-        results = backtesting_service.run_thesis_backtest(thesis_id, backtest_params)
+        thesis = ThesisAnalysis.query.get(thesis_id)
+        if thesis:
+            results = simulation_store.get_or_compute(
+                thesis, 'backtest', backtest_params,
+                lambda: backtesting_service.run_thesis_backtest(thesis_id, backtest_params),
+                seed=seed
+            )
+        else:
+            results = backtesting_service.run_thesis_backtest(thesis_id, backtest_params)
         
         if 'error' in results:
             return jsonify({
@@ -939,6 +1100,48 @@ def run_thesis_backtest(thesis_id):
             'error': f'Backtesting failed: {str(e)}'
         }), 500
 
+@app.route('/api/stress-test/portfolio')
+def run_portfolio_stress_test():
+    """Stress every published thesis against the historical shock library in one pass"""
+    try:
+        from sqlalchemy import func
+        from services.stress_test_library import SCENARIOS, StressTestLibrary, UnknownScenarioError
+        
+        scenarios = request.args.getlist('scenarios')
+        try:
+            library = StressTestLibrary(scenarios or None)
+        except UnknownScenarioError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'unknown_scenarios': e.names,
+                'available_scenarios': list(SCENARIOS)
+            }), 400
+        
+        theses = ThesisAnalysis.query.with_entities(
+            ThesisAnalysis.id, ThesisAnalysis.title, ThesisAnalysis.core_claim, ThesisAnalysis.mental_model
+        ).order_by(ThesisAnalysis.created_at.desc()).all()
+        
+        signal_counts = dict(
+            db.session.query(SignalMonitoring.thesis_analysis_id, func.count(SignalMonitoring.id))
+            .group_by(SignalMonitoring.thesis_analysis_id)
+            .all()
+        )
+        
+        report = library.portfolio_report(theses, [signal_counts.get(thesis.id, 0) for thesis in theses])
+        
+        return jsonify({
+            'success': True,
+            'stress_test': report
+        })
+        
+    except Exception as e:
+        logging.error(f"Portfolio stress test failed: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Portfolio stress test failed: {str(e)}'
+        }), 500
+
 @app.route('/backtest')
 def backtest_list():
     """List all theses available for backtesting"""
@@ -993,6 +1196,7 @@ def thesis_backtest_page(thesis_id):
         return f"Error loading backtesting page: {str(e)}", 500
 
 @app.route('/analytics')
+@read_replica
 def analytics_dashboard():
     """Advanced analytics dashboard page"""
     try:
@@ -1034,12 +1238,21 @@ def publish_thesis():
         if not thesis_data.get('core_claim'):
             return jsonify({'success': False, 'error': 'Invalid thesis data'}), 400
         
-        # Save thesis analysis
-        thesis_id = save_thesis_analysis(
-            thesis_data.get('original_thesis', 'Published thesis'), 
-            thesis_data, 
-            signal_data
-        )
+        # Save thesis analysis; resubmitting the same payload shortly after returns the same thesis
+        idempotency_key = request.headers.get('Idempotency-Key')
+        thesis_id = None
+        if not idempotency_key:
+            window = int(time.time() // PUBLISH_DEDUP_WINDOW)
+            idempotency_key = publish_key_for(data, window)
+            # A resubmission just after a window boundary still finds the first publish
+            thesis_id = find_published_thesis(publish_key_hash(publish_key_for(data, window - 1)))
+        if thesis_id is None:
+            thesis_id = save_thesis_analysis(
+                thesis_data.get('original_thesis', 'Published thesis'), 
+                thesis_data, 
+                signal_data,
+                idempotency_key
+            )
         
         return jsonify({
             'success': True, 
@@ -1070,28 +1283,40 @@ def simulate_thesis(thesis_id):
         # Get thesis details
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
         
+        try:
+            max_points = parse_max_points(data.get('max_points'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Extract simulation parameters
-        time_horizon = data.get('time_horizon', 3)
-        scenario = data.get('scenario', 'base')
-        volatility = data.get('volatility', 'medium')
-        include_events = data.get('include_events', True)
-        simulation_type = data.get('simulation_type', 'performance')
+        try:
+            time_horizon, scenario, volatility, include_events = simulation_params(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid time_horizon: {e}'}), 400
         
         # Initialize ML-enhanced simulation service
         from services.ml_simulation_service import MLSimulationService
         sim_service = MLSimulationService()
+        seed = data.get('seed', MLSimulationService.DEFAULT_SEED)
         
         # Get monitoring plan for thesis-specific events
         monitoring_plan = thesis.monitoring_plan if hasattr(thesis, 'monitoring_plan') and thesis.monitoring_plan else None
         
-        # Generate LLM-driven simulation with monitoring plan
-        result = sim_service.generate_thesis_simulation(
-            thesis=thesis,
-            time_horizon=time_horizon,
-            scenario=scenario,
-            volatility=volatility,
-            include_events=include_events,
-            monitoring_plan=monitoring_plan
+        # Generate LLM-driven simulation with monitoring plan, reusing stored results
+        store_params = simulation_store_params(None, time_horizon, scenario, volatility, include_events,
+                                               monitoring_plan)
+        result = simulation_store.get_or_compute(
+            thesis, 'ml_simulation', store_params,
+            lambda: sim_service.generate_thesis_simulation(
+                thesis=thesis,
+                time_horizon=time_horizon,
+                scenario=scenario,
+                volatility=volatility,
+                include_events=include_events,
+                monitoring_plan=monitoring_plan,
+                seed=seed
+            ),
+            seed=seed
         )
         
         # Check if simulation returned an error due to missing Azure OpenAI credentials
@@ -1104,7 +1329,7 @@ def simulate_thesis(thesis_id):
                 'credential_setup_required': True
             }), 400
         
-        return jsonify(result)
+        return jsonify(build_simulation_response(result, data, store_params, seed, max_points))
         
     except Exception as e:
         print(f"Error in thesis simulation: {str(e)}")
@@ -1124,6 +1349,11 @@ def run_simulation():
         
         if not simulation_type or not thesis_id:
             return jsonify({'error': 'Missing simulation type or thesis ID'}), 400
+        
+        try:
+            max_points = parse_max_points(data.get('max_points'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
             
         # Get thesis data
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
@@ -1131,34 +1361,137 @@ def run_simulation():
         # Import ML-enhanced simulation service
         from services.ml_simulation_service import MLSimulationService
         simulation_service = MLSimulationService()
+        seed = data.get('seed', MLSimulationService.DEFAULT_SEED)
         
-        if simulation_type == 'forecast':
-            time_horizon = data.get('time_horizon', 1)
-            scenario_type = data.get('scenario_type', 'base')
-            volatility = data.get('volatility', 'moderate')
-            
-            result = simulation_service.generate_thesis_simulation(
-                thesis, time_horizon, scenario_type, volatility, include_events=True
-            )
-            
-        elif simulation_type == 'event':
-            # For event simulation, use shorter time horizon focused on events
-            time_horizon = data.get('time_horizon', 1)
-            scenario_type = data.get('scenario_type', 'stress')
-            
-            result = simulation_service.generate_thesis_simulation(
-                thesis, time_horizon, scenario_type, 'high', include_events=True
-            )
-            
-        else:
+        if simulation_type not in ('forecast', 'event'):
             return jsonify({'error': 'Invalid simulation type'}), 400
+        
+        try:
+            time_horizon, scenario_type, volatility, _ = simulation_params(data, simulation_type)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid time_horizon: {e}'}), 400
+        
+        store_params = simulation_store_params(simulation_type, time_horizon, scenario_type, volatility, True, None)
+        result = simulation_store.get_or_compute(
+            thesis, 'ml_simulation', store_params,
+            lambda: simulation_service.generate_thesis_simulation(
+                thesis, time_horizon, scenario_type, volatility, include_events=True, seed=seed
+            ),
+            seed=seed
+        )
             
-        return jsonify(result)
+        return jsonify(build_simulation_response(result, data, store_params, seed, max_points))
         
     except Exception as e:
         logging.error(f"Error running simulation: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/thesis/<int:thesis_id>/simulate/stream')
+def stream_thesis_simulation(thesis_id):
+    """Stream simulation stages over Server-Sent Events as they complete"""
+    thesis = ThesisAnalysis.query.get_or_404(thesis_id)
+    
+    from services.ml_simulation_service import MLSimulationService
+    sim_service = MLSimulationService()
+    
+    # Same parameters as /api/thesis/<id>/simulate and /api/simulation/run so stored results are shared
+    simulation_type = request.args.get('simulation_type')
+    if simulation_type not in ('forecast', 'event'):
+        simulation_type = None
+    seed = request.args.get('seed', MLSimulationService.DEFAULT_SEED, type=int)
+    try:
+        time_horizon, scenario, volatility, include_events = simulation_params(request.args, simulation_type)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid time_horizon: {e}'}), 400
+    monitoring_plan = None if simulation_type else thesis.monitoring_plan or None
+    store_params = simulation_store_params(simulation_type, time_horizon, scenario, volatility, include_events,
+                                           monitoring_plan)
+    
+    compact = request.args.get('payload_format') == COMPACT_FORMAT
+    try:
+        max_points = parse_max_points(request.args.get('max_points'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def forecast_payload(forecast):
+        if not compact:
+            return forecast
+        packed = compact_simulation_payload({'performance_data': forecast['performance_data']}, max_points)
+        return dict(forecast, performance_data=packed['performance_data'], series=packed['series'],
+                    payload_format=COMPACT_FORMAT)
+    
+    def generate():
+        cached = simulation_store.get(thesis, 'ml_simulation', store_params, seed)
+        if cached:
+            yield sse_message('parameters', cached.get('thesis_parameters', {}))
+            yield sse_message('forecast', forecast_payload({
+                'performance_data': cached.get('performance_data', {}),
+                'timeline': cached.get('timeline', []),
+                'fan_bands': cached.get('fan_bands', {})
+            }))
+            yield sse_message('events', cached.get('events', []))
+            yield sse_message('alerts', cached.get('alert_triggers', []))
+            yield sse_message('narrative', cached.get('scenario_analysis', {}))
+            yield sse_message('metadata', cached.get('simulation_metadata', {}))
+            yield sse_message('complete', {'cached': True})
+            return
+        
+        stages = {}
+        try:
+            for stage, payload in sim_service.iter_simulation_stages(
+                thesis, time_horizon, scenario, volatility, include_events, monitoring_plan, seed
+            ):
+                stages[stage] = payload
+                yield sse_message(stage, forecast_payload(payload) if stage == 'forecast' else payload)
+            
+            simulation_store.put(
+                thesis, 'ml_simulation', store_params, sim_service.assemble_simulation_result(stages), seed
+            )
+            yield sse_message('complete', {'cached': False})
+        
+        except Exception as e:
+            logging.error(f"Streaming simulation failed for thesis {thesis_id}: {str(e)}")
+            yield sse_message('error', {
+                'error': True,
+                'message': 'ML simulation failed',
+                'description': f'Hybrid simulation generation encountered an error: {str(e)}',
+                'completed_stages': list(stages)
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/thesis/<int:thesis_id>/simulation/series/<params_hash>')
+def get_simulation_series(thesis_id, params_hash):
+    """Fetch full-resolution simulation series on demand from the simulation store"""
+    try:
+        thesis = ThesisAnalysis.query.get_or_404(thesis_id)
+        seed = request.args.get('seed', type=int)
+        names = request.args.getlist('series') or list(SERIES_KEYS)
+        
+        result = simulation_store.get_by_hash(thesis, 'ml_simulation', params_hash, seed)
+        if not result:
+            return jsonify({'error': 'Simulation result not found or thesis has changed'}), 404
+        
+        performance_data = result.get('performance_data', {})
+        series = compact_simulation_payload(
+            {'performance_data': {name: performance_data[name] for name in names if name in performance_data}}
+        )['series']
+        
+        return jsonify({
+            'thesis_id': thesis_id,
+            'params_hash': params_hash,
+            'payload_format': COMPACT_FORMAT,
+            'series': series
+        })
+        
+    except Exception as e:
+        logging.error(f"Error fetching simulation series: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/validate-signal', methods=['POST'])
 def validate_signal():
     """Initiate data validation for a Level 0 signal"""
@@ -1177,10 +1510,17 @@ def validate_signal():
         if jwt_token:
             data_validator.set_auth_token(jwt_token)
         
+        # Events after this cursor are replayed to the page's subscription, so a fast completion is not missed
+        event_cursor = event_bus.last_id
+        
         # Initiate validation request with signal description and company name
         validation_request = data_validator.initiate_validation(query_structure, signal_name, signal_description, company_name)
+        # Without push the page polls /api/validation-status, which checks the request itself
+        push_updates = push_available() and data_validator.watch_validation(validation_request.request_id)
         
         return jsonify({
+            'event_cursor': event_cursor,
+            'push_updates': push_updates,
             'request_id': validation_request.request_id,
             'chat_id': validation_request.chat_id,
             'callback_url': validation_request.callback_url,
@@ -1202,23 +1542,49 @@ def get_validation_status(request_id):
         if not validation_request:
             return jsonify({'error': 'Validation request not found'}), 404
         
-        response = {
-            'request_id': validation_request.request_id,
-            'status': validation_request.status,
-            'signal_name': validation_request.signal_name,
-            'created_at': validation_request.created_at.isoformat() if validation_request.created_at else None,
-            'completed_at': validation_request.completed_at.isoformat() if validation_request.completed_at else None
-        }
-        
-        if validation_request.result:
-            response['result'] = validation_request.result
-            
-        return jsonify(response)
+        return jsonify(data_validator.status_payload(validation_request))
         
     except Exception as e:
         logging.error(f"Error getting validation status: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/events/stream')
+def stream_events():
+    """
+    Server-Sent Events channel for monitoring deltas (signal sweeps,
+    notifications, published theses) and validation outcomes. Reconnecting
+    clients resume from Last-Event-ID; ``since`` does the same for a cursor
+    taken before an operation started. Answers 204, which stops
+    EventSource from reconnecting, when pushed events would not arrive or
+    every stream slot is taken; pages then fall back to polling.
+    """
+    if not push_available() or event_bus.subscriber_count() >= stream_capacity():
+        return '', 204
+    
+    channels = [channel for channel in request.args.get('channels', MONITORING_CHANNEL).split(',')
+                if channel == MONITORING_CHANNEL or channel.startswith('validation:')]
+    if not channels:
+        return jsonify({'error': 'No supported channels requested'}), 400
+    
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+    
+    def generate():
+        # Ask EventSource to wait a few seconds before reconnecting
+        yield "retry: 5000\n\n"
+        for message in event_bus.subscribe(channels, since):
+            if message is None:
+                yield ": keepalive\n\n"
+            else:
+                yield sse_message(message['event'], message['data'], message['id'])
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/test-query-parser', methods=['POST'])
 def test_query_parser():
     """Test endpoint for Level 0 query parsing functionality"""
@@ -1263,14 +1629,8 @@ def get_investment_sparklines(thesis_id):
     try:
         # Get thesis and signals
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
-        signals = SignalMonitoring.query.filter_by(thesis_analysis_id=thesis_id).all()
         
-        # Convert to dictionaries
-        thesis_dict = thesis.to_dict()
-        signals_dict = [signal.to_dict() for signal in signals]
-        
-        # Generate sparklines
-        sparkline_data = sparkline_service.generate_investment_sparklines(thesis_dict, signals_dict)
+        sparkline_data, artifact = artifact_store.get(thesis, 'sparklines')
         
         return jsonify({
             'success': True,
@@ -1278,7 +1638,8 @@ def get_investment_sparklines(thesis_id):
             'sparklines': sparkline_data['sparklines'],
             'ai_insights': sparkline_data['ai_insights'],
             'generated_at': sparkline_data['generated_at'],
-            'metrics_count': sparkline_data['metrics_count']
+            'metrics_count': sparkline_data['metrics_count'],
+            'artifact': artifact
         })
         
     except Exception as e:
@@ -1310,28 +1671,20 @@ def get_alternative_companies(thesis_id):
     try:
         # Get thesis and signals
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
-        signals = SignalMonitoring.query.filter_by(thesis_analysis_id=thesis_id).all()
         
-        # Convert to dictionaries
-        thesis_dict = thesis.to_dict()
-        signals_dict = [signal.to_dict() for signal in signals]
-        
-        # Import and use alternative company service
-        from services.alternative_company_service import AlternativeCompanyService
-        alternative_service = AlternativeCompanyService()
-        
-        # Generate alternative company analysis with fallback
+        # Serve stored alternative company analysis, generating it with fallback when missing
         try:
-            alternatives_data = alternative_service.find_alternative_companies(thesis_dict, signals_dict)
+            alternatives_data, artifact = artifact_store.get(thesis, 'alternative_companies')
         except Exception as service_error:
             logging.warning(f"Alternative company service failed: {service_error}")
             # Provide fallback structure when service fails
-            alternatives_data = []
+            alternatives_data, artifact = [], None
         
         return jsonify({
             'success': True,
             'thesis_id': thesis_id,
-            'alternative_companies': alternatives_data  # Match expected frontend structure
+            'alternative_companies': alternatives_data,  # Match expected frontend structure
+            'artifact': artifact
         })
         
     except Exception as e:
@@ -1446,6 +1799,93 @@ def check_data_source_status():
         logging.error(f"Failed to check data source status: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/llm/parse-stats')
+def get_llm_parse_stats():
+    """Parsed, repaired and failed LLM JSON responses per call site"""
+    from services.llm_json import parse_stats
+    
+    stats = parse_stats()
+    return jsonify({
+        'success': True,
+        'call_sites': stats,
+        'total_failures': sum(site['failed'] for site in stats.values()),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/api/llm/token-usage')
+def get_llm_token_usage():
+    """Prompt and completion tokens per LLM call site"""
+    from services.prompt_budget import token_usage_stats
+    
+    usage = token_usage_stats()
+    return jsonify({
+        'success': True,
+        'call_sites': usage,
+        'total_prompt_tokens': sum(site['prompt_tokens'] for site in usage.values()),
+        'total_completion_tokens': sum(site['completion_tokens'] for site in usage.values()),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request, LLM, data-source and SQL timings in the Prometheus text format"""
+    from services.instrumentation import metrics
+    
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def profiler_admin_denied():
+    """403 response unless the request carries the profiler admin token"""
+    from services.profiler import admin_authorized
+    
+    if admin_authorized(request.headers.get('X-Profile-Token') or request.args.get('_profile_token')):
+        return None
+    return jsonify({'error': 'Profiler admin token required'}), 403
+
+@app.route('/admin/profiles')
+def list_profiles():
+    """Stored request profiles and rolling flame graphs, newest first"""
+    denied = profiler_admin_denied()
+    if denied:
+        return denied
+    from services.profiler import profile_store, rolling_sampler
+    
+    return jsonify({
+        'success': True,
+        'profiles': profile_store.list(),
+        'rolling_sampler': rolling_sampler.status()
+    })
+
+@app.route('/admin/profiles/<name>')
+def download_profile(name):
+    """Download one profile (.pstats, .speedscope.json or .folded)"""
+    denied = profiler_admin_denied()
+    if denied:
+        return denied
+    from flask import send_file
+    from services.profiler import profile_store
+    
+    path = profile_store.path(name)
+    if not path:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_file(path, as_attachment=True, download_name=name)
+
+@app.route('/admin/profiler/sampler', methods=['POST'])
+def control_rolling_sampler():
+    """Start or stop this worker's rolling sampler: {"action": "start" | "stop"}"""
+    denied = profiler_admin_denied()
+    if denied:
+        return denied
+    from services.profiler import rolling_sampler
+    
+    action = (request.get_json(silent=True) or {}).get('action')
+    if action == 'start':
+        rolling_sampler.start()
+    elif action == 'stop':
+        rolling_sampler.stop()
+    else:
+        return jsonify({'error': "action must be 'start' or 'stop'"}), 400
+    return jsonify({'success': True, 'rolling_sampler': rolling_sampler.status()})
+
 @app.route('/internal-data-analysis')
 def internal_data_analysis():
     """Internal data analysis dashboard page"""
@@ -1458,7 +1898,6 @@ def test_eagle_response():
         ticker = request.args.get('ticker', 'NVDA')
         sedol_id = request.args.get('sedol_id', '2379504')
         
-        data_adapter = DataAdapter()
         test_response = data_adapter.get_test_eagle_response(
             company_ticker=ticker,
             sedol_id=sedol_id
@@ -1493,32 +1932,13 @@ def evaluate_thesis_strength(thesis_id):
     try:
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
         
-        # Get thesis data for evaluation
-        thesis_data = {
-            'core_claim': thesis.core_claim,
-            'core_analysis': thesis.core_analysis,
-            'assumptions': thesis.assumptions or [],
-            'causal_chain': thesis.causal_chain or [],
-            'counter_thesis': thesis.counter_thesis or [],
-            'metrics_to_track': thesis.metrics_to_track or [],
-            'mental_model': thesis.mental_model
-        }
-        
-        # Get document count for research quality assessment
-        document_count = DocumentUpload.query.filter_by(thesis_analysis_id=thesis_id).count()
+        # Document and Eagle API signal counts for the metadata block
+        _, document_count, eagle_signal_count = evaluation_inputs(thesis)
         
-        # Count Eagle API signals
-        eagle_signal_count = 0
-        if thesis.metrics_to_track:
-            for metric in thesis.metrics_to_track:
-                if isinstance(metric, dict) and metric.get('eagle_api'):
-                    eagle_signal_count += 1
-        
-        # Run comprehensive evaluation
-        strength_evaluation = thesis_evaluator.evaluate_thesis_strength(thesis_data)
-        quality_assessment = thesis_evaluator.generate_research_quality_score(
-            thesis_data, document_count, eagle_signal_count
-        )
+        # Serve the stored comprehensive evaluation (strength analysis and research quality)
+        evaluation, artifact = artifact_store.get(thesis, 'thesis_evaluation')
+        strength_evaluation = evaluation['strength_analysis']
+        quality_assessment = evaluation['quality_assessment']
         
         return jsonify({
             'thesis_evaluation': {
@@ -1532,7 +1952,8 @@ def evaluate_thesis_strength(thesis_id):
                     'eagle_signals': eagle_signal_count,
                     'total_metrics': len(thesis.metrics_to_track or []),
                     'mental_model': thesis.mental_model
-                }
+                },
+                'artifact': artifact
             }
         })
         
@@ -1565,16 +1986,15 @@ def get_significance_mapping(thesis_id):
     """
     try:
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
-        thesis_data = thesis.to_dict()
         
-        mapping_data = significance_mapper.generate_significance_map(thesis_data)
-        insights = significance_mapper.get_connection_insights(mapping_data)
+        significance, artifact = artifact_store.get(thesis, 'significance_mapping')
         
         return jsonify({
             'success': True,
-            'mapping_data': mapping_data,
-            'insights': insights,
-            'thesis_id': thesis_id
+            'mapping_data': significance['mapping_data'],
+            'insights': significance['insights'],
+            'thesis_id': thesis_id,
+            'artifact': artifact
         })
         
     except Exception as e:
@@ -1590,14 +2010,14 @@ def get_smart_prioritization(thesis_id):
     """
     try:
         thesis = ThesisAnalysis.query.get_or_404(thesis_id)
-        thesis_data = thesis.to_dict()
         
-        prioritization_result = smart_prioritizer.generate_dual_prioritization(thesis_data)
+        prioritization_result, artifact = artifact_store.get(thesis, 'smart_prioritization')
         
         return jsonify({
             'success': True,
             'prioritization': prioritization_result,
-            'thesis_id': thesis_id
+            'thesis_id': thesis_id,
+            'artifact': artifact
         })
         
     except Exception as e:
@@ -1639,6 +2059,31 @@ def generate_one_pager(thesis_id):
         app.logger.error(f"Error generating one pager for thesis {thesis_id}: {str(e)}")
         return f"Error generating one pager: {str(e)}", 500
 
+@app.route('/api/thesis/<int:thesis_id>/one-pager/stream')
+def stream_one_pager(thesis_id):
+    """Stream one-pager report sections over Server-Sent Events as each is built"""
+    thesis = ThesisAnalysis.query.get_or_404(thesis_id)
+    
+    from services.one_pager_service import OnePagerService
+    one_pager_service = OnePagerService()
+    
+    def generate():
+        sections = []
+        try:
+            for name, data in one_pager_service.iter_report_sections(thesis):
+                sections.append(name)
+                yield sse_message('section', {'name': name, 'data': data})
+            yield sse_message('complete', {'sections': sections})
+        except Exception as e:
+            app.logger.error(f"Error streaming one pager for thesis {thesis_id}: {str(e)}")
+            yield sse_message('error', {'error': str(e), 'completed_sections': sections})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.errorhandler(404)
 def not_found_error(error):
     return render_template('404.html'), 404
@@ -7,18 +7,44 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import random
 from services.azure_openai_service import AzureOpenAIService
+from services.llm_json import parse_llm_json
+from services.prompt_budget import fit_text
+from services.peer_index import PeerIndex
+from services.alternative_scoring import score_candidates
 
 class AlternativeCompanyService:
-    def __init__(self):
+    CORE_CLAIM_TOKEN_BUDGET = 250
+    SHORTLIST_SIZE = 8
+
+    def __init__(self, score_weights: Optional[Dict[str, float]] = None):
         self.azure_service = AzureOpenAIService()
+        self.peer_index = PeerIndex.load()
+        # Overrides for alternative_scoring.DEFAULT_WEIGHTS
+        self.score_weights = score_weights
         
     def find_alternative_companies(self, thesis_analysis: Dict, signals: List[Dict]) -> Dict[str, Any]:
-        """Find alternative companies matching thesis patterns using LLM analysis"""
+        """Find alternative companies matching thesis patterns: local peer shortlist, annotated by the LLM"""
         try:
             # Extract thesis characteristics for analysis
             thesis_characteristics = self._extract_thesis_characteristics(thesis_analysis, signals)
             
-            # Use LLM to generate authentic alternative companies
+            # Deterministic peer shortlist from the security universe
+            shortlist = self.peer_index.nearest(
+                thesis_characteristics, self.SHORTLIST_SIZE, exclude_text=thesis_analysis.get('core_claim', '')
+            )
+            if shortlist:
+                annotated = self._annotate_shortlist(shortlist, thesis_characteristics, thesis_analysis)
+                alternatives = self._score_alternatives(annotated, thesis_characteristics, self.SHORTLIST_SIZE)
+                return {
+                    'thesis_characteristics': thesis_characteristics,
+                    'alternative_companies': alternatives,
+                    'total_found': len(alternatives),
+                    'analysis_criteria': self._get_analysis_criteria(thesis_characteristics),
+                    'peer_source': 'security_universe',
+                    'generated_at': datetime.utcnow().isoformat()
+                }
+            
+            # No universe available: ask the LLM to propose companies
             from services.azure_openai_service import AzureOpenAIService
             openai_service = AzureOpenAIService()
             
@@ -32,7 +58,9 @@ class AlternativeCompanyService:
             
             # Generate LLM analysis with proper error handling
             try:
-                response = openai_service.generate_completion(messages, temperature=0.7)
+                response = openai_service.generate_completion(
+                    messages, temperature=0.7, call_site='alternative_companies'
+                )
                 alternatives = self._parse_llm_companies(response)
                 
                 if alternatives and len(alternatives) > 0:
@@ -98,9 +126,74 @@ class AlternativeCompanyService:
             'signal_patterns': self._analyze_signal_patterns(signals)
         }
     
+    def _shortlist_company(self, security: Dict) -> Dict[str, Any]:
+        """Universe record in the shape the scoring and templates expect"""
+        metrics = security.get('metrics', {})
+        return {
+            'name': security['name'],
+            'ticker': security['ticker'],
+            'sector': security['sector'],
+            'business_model': security['business_model'],
+            'market_cap': metrics.get('market_cap_billions_usd', 0),
+            'description': security.get('description', ''),
+            'key_metrics': {
+                'revenue_growth': metrics.get('revenue_growth_this_yr', 0),
+                'gross_margin': metrics.get('gross_margin_next_yr', 0.3),
+                'operating_margin': metrics.get('operating_margin_this_yr', 0),
+                'ev_sales': metrics.get('enterprise_value_over_sales_this_yr')
+            },
+            'similarity_score': round(security.get('similarity', 0) * 100, 1),
+            'unloved_factors': [],
+            'hidden_strengths': []
+        }
+    
+    def _annotate_shortlist(self, shortlist: List[Dict], characteristics: Dict,
+                            thesis_analysis: Dict) -> List[Dict[str, Any]]:
+        """Ask the LLM to explain the shortlisted peers; it cannot add or drop companies"""
+        companies = [self._shortlist_company(security) for security in shortlist]
+        core_claim = fit_text(thesis_analysis.get('core_claim', ''), self.CORE_CLAIM_TOKEN_BUDGET)
+        peer_lines = '\n'.join(
+            f"- {company['ticker']}: {company['name']} ({company['business_model']}, {company['description']})"
+            for company in companies
+        )
+        prompt = f"""
+THESIS CORE CLAIM: {core_claim}
+VALUE DRIVERS: {', '.join(characteristics.get('value_drivers', [])) or 'Not specified'}
+
+These peer companies were shortlisted as alternatives to the thesis:
+{peer_lines}
+
+For each ticker above, explain why the market may be overlooking it and which strengths align with the thesis.
+Return a JSON array with one object per ticker, using only the tickers listed:
+[{{"ticker": "TICK", "unloved_factors": ["Reason 1", "Reason 2"], "hidden_strengths": ["Strength 1", "Strength 2"], "thesis_fit": "One sentence"}}]
+"""
+        messages = [
+            {"role": "system", "content": "You are an expert investment analyst. Annotate the given peer companies; do not add others."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        try:
+            response = self.azure_service.generate_completion(
+                messages, temperature=0.3, call_site='alternative_annotations'
+            )
+            annotations = parse_llm_json(response, "alternative_companies.annotations", [dict]) or []
+        except Exception as e:
+            logging.warning(f"Alternative company annotation failed, returning unannotated peers: {e}")
+            annotations = []
+        
+        by_ticker = {str(note.get('ticker', '')).upper(): note for note in annotations}
+        for company in companies:
+            note = by_ticker.get(company['ticker'], {})
+            for field in ('unloved_factors', 'hidden_strengths'):
+                if isinstance(note.get(field), list):
+                    company[field] = [str(item) for item in note[field][:3]]
+            if isinstance(note.get('thesis_fit'), str):
+                company['thesis_fit'] = note['thesis_fit']
+        return companies
+    
     def _create_comprehensive_analysis_prompt(self, characteristics: Dict, thesis_analysis: Dict) -> str:
         """Create comprehensive prompt for LLM alternative company analysis"""
-        core_claim = thesis_analysis.get('core_claim', '')
+        core_claim = fit_text(thesis_analysis.get('core_claim', ''), self.CORE_CLAIM_TOKEN_BUDGET)
         sector = characteristics.get('sector', 'Technology')
         business_model = characteristics.get('business_model', 'SaaS')
         value_drivers = characteristics.get('value_drivers', [])
@@ -148,46 +241,11 @@ Format as JSON array:
     
     def _parse_llm_companies(self, response: str) -> List[Dict[str, Any]]:
         """Parse LLM response to extract authentic company data"""
-        import json
-        import re
-        
         try:
-            # Handle empty or invalid responses
-            if not response or not response.strip():
-                logging.error("Empty response from Azure OpenAI")
-                return self._get_fallback_companies()
-            
-            # Clean the response to extract JSON
-            response_cleaned = response.strip()
-            
-            # Check for very short responses that indicate timeout/error
-            if len(response_cleaned) < 20:
-                logging.warning(f"Response too short ({len(response_cleaned)} chars) - likely timeout")
+            companies_data = parse_llm_json(response, "alternative_companies.comprehensive", list)
+            if companies_data is None:
                 return self._get_fallback_companies()
             
-            # Remove markdown formatting
-            if '```json' in response_cleaned:
-                match = re.search(r'```json\s*(.*?)\s*```', response_cleaned, re.DOTALL)
-                if match:
-                    response_cleaned = match.group(1)
-            elif '```' in response_cleaned:
-                match = re.search(r'```\s*(.*?)\s*```', response_cleaned, re.DOTALL)
-                if match:
-                    response_cleaned = match.group(1)
-            
-            # Additional cleanup for JSON parsing
-            response_cleaned = response_cleaned.strip()
-            if not response_cleaned:
-                logging.error("Cleaned response is empty")
-                return self._get_fallback_companies()
-            
-            # Parse JSON array
-            companies_data = json.loads(response_cleaned)
-            
-            if not isinstance(companies_data, list):
-                logging.error("LLM response is not a list")
-                return []
-            
             # Enhance and validate each company
             enhanced_companies = []
             for company in companies_data:
@@ -214,10 +272,6 @@ Format as JSON array:
             
             return enhanced_companies
             
-        except json.JSONDecodeError as e:
-            logging.error(f"Failed to parse LLM JSON response: {e}")
-            logging.error(f"Raw response content: {response[:500]}")
-            return self._get_fallback_companies()
         except Exception as e:
             logging.error(f"Error processing LLM response: {e}")
             return self._get_fallback_companies()
@@ -271,7 +325,9 @@ Format as JSON array:
                 {"role": "user", "content": prompt}
             ]
             
-            response = openai_service.generate_completion(messages, temperature=0.7)
+            response = openai_service.generate_completion(
+                messages, temperature=0.7, call_site='alternative_companies'
+            )
             return self._parse_llm_response(response)
             
         except Exception as e:
@@ -280,7 +336,7 @@ Format as JSON array:
     
     def _create_alternative_analysis_prompt(self, characteristics: Dict, thesis_analysis: Dict) -> str:
         """Create detailed prompt for LLM alternative company analysis"""
-        core_claim = thesis_analysis.get('core_claim', '')
+        core_claim = fit_text(thesis_analysis.get('core_claim', ''), self.CORE_CLAIM_TOKEN_BUDGET)
         sector = characteristics.get('sector', 'Technology')
         business_model = characteristics.get('business_model', 'SaaS')
         value_drivers = characteristics.get('value_drivers', [])
@@ -329,16 +385,9 @@ Format response as JSON array with this structure:
     def _parse_llm_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse LLM response to extract company data"""
         try:
-            import json
-            
-            # Try to extract JSON from response
-            response_cleaned = response.strip()
-            if response_cleaned.startswith('```json'):
-                response_cleaned = response_cleaned[7:-3]
-            elif response_cleaned.startswith('```'):
-                response_cleaned = response_cleaned[3:-3]
-            
-            companies = json.loads(response_cleaned)
+            companies = parse_llm_json(response, "alternative_companies.alternatives", [dict])
+            if companies is None:
+                return []
             
             # Validate and enhance the data
             enhanced_companies = []
@@ -488,42 +537,32 @@ Format response as JSON array with this structure:
         
         return model_companies[:12]  # Return top 12 candidates
     
-    def _score_alternatives(self, alternatives: List[Dict], characteristics: Dict) -> List[Dict[str, Any]]:
-        """Score and rank alternative companies"""
-        scored_alternatives = []
-        
-        for company in alternatives:
-            # Calculate pattern match score
-            pattern_score = self._calculate_pattern_match_score(company, characteristics)
-            
-            # Calculate undervaluation score
-            undervaluation_score = self._calculate_undervaluation_score(company)
-            
-            # Calculate hidden potential score
-            potential_score = self._calculate_potential_score(company, characteristics)
-            
-            # Composite score
-            composite_score = (
-                pattern_score * 0.4 +
-                undervaluation_score * 0.35 +
-                potential_score * 0.25
-            )
-            
+    def _score_alternatives(self, alternatives: List[Dict], characteristics: Dict,
+                            top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Score candidates column-wise and return the top-k, best first. Ranking
+        uses peer similarity and metric-derived scores only; LLM annotations
+        ride along for display.
+        """
+        scores = score_candidates(alternatives, characteristics, self.score_weights, top_k)
+        
+        ranked = []
+        for i in scores['ranking']:
+            company = alternatives[i]
+            composite_score = float(scores['composite'][i])
             company_with_score = company.copy()
             company_with_score.update({
-                'pattern_match_score': round(pattern_score, 1),
-                'undervaluation_score': round(undervaluation_score, 1),
-                'potential_score': round(potential_score, 1),
+                'pattern_match_score': round(float(scores['pattern_match'][i]), 1),
+                'undervaluation_score': round(float(scores['undervaluation'][i]), 1),
+                'potential_score': round(float(scores['potential'][i]), 1),
                 'composite_score': round(composite_score, 1),
                 'recommendation_strength': self._get_recommendation_strength(composite_score),
                 'risk_factors': self._generate_risk_factors(company),
                 'catalyst_timeline': self._generate_catalyst_timeline(company)
             })
-            
-            scored_alternatives.append(company_with_score)
+            ranked.append(company_with_score)
         
-        # Sort by composite score
-        return sorted(scored_alternatives, key=lambda x: x['composite_score'], reverse=True)
+        return ranked
     
     def _identify_sector(self, core_claim: str) -> str:
         """Identify sector from thesis core claim"""
@@ -613,80 +652,6 @@ Format response as JSON array with this structure:
             'monitoring_intensity': 'High' if total_count > 8 else 'Medium' if total_count > 4 else 'Low'
         }
     
-    def _calculate_pattern_match_score(self, company: Dict, characteristics: Dict) -> float:
-        """Calculate how well company matches thesis patterns"""
-        base_score = 60.0
-        
-        # Business model alignment
-        if characteristics.get('sector') == 'Technology' and 'technology' in company.get('description', '').lower():
-            base_score += 15
-        
-        # Growth characteristics
-        company_growth = company.get('key_metrics', {}).get('revenue_growth', 0)
-        if company_growth > 0.2:  # >20% growth
-            base_score += 10
-        elif company_growth > 0.1:  # >10% growth
-            base_score += 5
-        
-        # Market position
-        market_cap = company.get('market_cap', 0)
-        if 10 < market_cap < 100:  # Mid-cap sweet spot
-            base_score += 8
-        elif market_cap > 100:  # Large cap penalty for "unloved" factor
-            base_score -= 5
-        
-        return min(95, max(30, base_score))
-    
-    def _calculate_undervaluation_score(self, company: Dict) -> float:
-        """Calculate undervaluation/unloved score"""
-        base_score = 50.0
-        
-        # Number of unloved factors (more = higher score)
-        unloved_factors = len(company.get('unloved_factors', []))
-        base_score += unloved_factors * 8
-        
-        # Market cap consideration (smaller = more unloved potential)
-        market_cap = company.get('market_cap', 0)
-        if market_cap < 20:
-            base_score += 15
-        elif market_cap < 50:
-            base_score += 10
-        elif market_cap < 100:
-            base_score += 5
-        
-        # Revenue growth (negative growth = more unloved)
-        growth = company.get('key_metrics', {}).get('revenue_growth', 0)
-        if growth < 0:
-            base_score += 12
-        elif growth < 0.1:
-            base_score += 6
-        
-        return min(95, max(20, base_score))
-    
-    def _calculate_potential_score(self, company: Dict, characteristics: Dict) -> float:
-        """Calculate hidden potential score"""
-        base_score = 55.0
-        
-        # Hidden strengths count
-        hidden_strengths = len(company.get('hidden_strengths', []))
-        base_score += hidden_strengths * 7
-        
-        # Gross margin quality
-        gross_margin = company.get('key_metrics', {}).get('gross_margin', 0.3)
-        if gross_margin > 0.7:
-            base_score += 12
-        elif gross_margin > 0.5:
-            base_score += 8
-        elif gross_margin > 0.3:
-            base_score += 4
-        
-        # Platform/moat characteristics
-        description = company.get('description', '').lower()
-        if any(keyword in description for keyword in ['platform', 'network', 'ecosystem']):
-            base_score += 10
-        
-        return min(95, max(25, base_score))
-    
     def _get_recommendation_strength(self, composite_score: float) -> str:
         """Get recommendation strength based on score"""
         if composite_score >= 80:
@@ -0,0 +1,111 @@
+"""
+Alternative Company Scoring
+
+Columnar composite scoring for alternative company candidates. Candidates are
+unpacked once into NumPy columns (peer similarity, market cap, growth,
+margins, EV/sales, description flags); pattern-match, undervaluation and
+potential scores are each one vectorised expression over those columns, and
+the top-k are picked with argpartition, so screening thousands of names costs
+a few array passes instead of per-company dict lookups and a full sort.
+
+Only deterministic inputs are scored. LLM annotations (unloved_factors,
+hidden_strengths) are for display and never change the ranking.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_WEIGHTS = {'similarity': 0.3, 'pattern_match': 0.25, 'undervaluation': 0.25, 'potential': 0.2}
+
+MOAT_KEYWORDS = ('platform', 'network', 'ecosystem')
+
+
+def candidate_columns(companies: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Unpack the fields the scores read into one array per field"""
+    metrics = [company.get('key_metrics') or {} for company in companies]
+    descriptions = np.array([(company.get('description') or '').lower() for company in companies], dtype=str)
+
+    def has_any(keywords):
+        found = np.zeros(len(companies), dtype=bool)
+        for keyword in keywords:
+            found |= np.char.find(descriptions, keyword) >= 0
+        return found
+
+    def number(value):
+        return value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+    return {
+        'similarity': np.array([company.get('similarity_score') or 0 for company in companies], dtype=float),
+        'market_cap': np.array([company.get('market_cap') or 0 for company in companies], dtype=float),
+        'revenue_growth': np.array([m.get('revenue_growth') or 0 for m in metrics], dtype=float),
+        'gross_margin': np.array([m.get('gross_margin', 0.3) or 0 for m in metrics], dtype=float),
+        # Missing EV/sales and operating margin score nothing (NaN fails every threshold)
+        'operating_margin': np.array([number(m.get('operating_margin')) for m in metrics], dtype=float),
+        'ev_sales': np.array([number(m.get('ev_sales')) for m in metrics], dtype=float),
+        'technology': has_any(('technology',)),
+        'moat': has_any(MOAT_KEYWORDS),
+    }
+
+
+def pattern_match_scores(columns: Dict[str, np.ndarray], characteristics: Dict[str, Any]) -> np.ndarray:
+    """How well each company matches the thesis pattern"""
+    growth, market_cap = columns['revenue_growth'], columns['market_cap']
+    score = 60.0 + np.where(columns['technology'] & (characteristics.get('sector') == 'Technology'), 15, 0)
+    score += np.select([growth > 0.2, growth > 0.1], [10, 5], 0)
+    # Mid caps are the sweet spot; large caps are rarely "unloved"
+    score += np.select([(market_cap > 10) & (market_cap < 100), market_cap > 100], [8, -5], 0)
+    return np.clip(score, 30, 95)
+
+
+def undervaluation_scores(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """How unloved each company is: low EV/sales, small size, weak growth"""
+    growth, market_cap, ev_sales = columns['revenue_growth'], columns['market_cap'], columns['ev_sales']
+    score = 50.0 + np.select([ev_sales < 2, ev_sales < 5, ev_sales < 10], [16, 10, 4], 0)
+    score += np.select([market_cap < 20, market_cap < 50, market_cap < 100], [15, 10, 5], 0)
+    score += np.select([growth < 0, growth < 0.1], [12, 6], 0)
+    return np.clip(score, 20, 95)
+
+
+def potential_scores(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Hidden potential: operating leverage, gross margin quality and moat language"""
+    margin, operating_margin = columns['gross_margin'], columns['operating_margin']
+    score = 55.0 + np.select([operating_margin > 0.25, operating_margin > 0.1, operating_margin > 0], [14, 9, 4], 0)
+    score += np.select([margin > 0.7, margin > 0.5, margin > 0.3], [12, 8, 4], 0)
+    score += np.where(columns['moat'], 10, 0)
+    return np.clip(score, 25, 95)
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first, ties in input order"""
+    k = len(scores) if k is None else min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=int)
+    if k < len(scores):
+        # Keep every score tied with the k-th so the cut below is stable
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        top = np.flatnonzero(scores >= kth)
+    else:
+        top = np.arange(len(scores))
+    return top[np.lexsort((top, -scores[top]))][:k]
+
+
+def score_candidates(companies: List[Dict[str, Any]], characteristics: Dict[str, Any],
+                     weights: Optional[Dict[str, float]] = None,
+                     top_k: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Component and composite scores for every candidate plus the ranked
+    top-``k`` indices. ``weights`` override DEFAULT_WEIGHTS per component.
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    columns = candidate_columns(companies)
+    scores = {
+        # Cosine similarity from the peer index, already on a 0-100 scale
+        'similarity': columns['similarity'],
+        'pattern_match': pattern_match_scores(columns, characteristics),
+        'undervaluation': undervaluation_scores(columns),
+        'potential': potential_scores(columns),
+    }
+    scores['composite'] = sum(scores[component] * weights[component] for component in DEFAULT_WEIGHTS)
+    scores['ranking'] = top_k_indices(scores['composite'], top_k)
+    return scores
@@ -0,0 +1,322 @@
+"""
+Derived Artifact Store
+
+Persists per-thesis derived output (sparklines, significance mapping, smart
+prioritization, thesis evaluation, market sentiment, alternative companies)
+so the thesis pages read stored results instead of re-running several LLM
+calls on every request.
+
+Artifacts are keyed by thesis id, artifact type, thesis ``updated_at`` and the
+generator version. A stored artifact whose thesis has since changed is still
+served, flagged as stale, once the serving process's own warmer has queued it
+for regeneration; when that warmer cannot take it, it is regenerated inline.
+Deleting a thesis deletes its artifacts. An artifact from another generator version
+may have a different shape and is never served. ArtifactWarmer generates
+artifacts on a background thread right after a thesis is published.
+"""
+
+import json
+import logging
+import queue
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, event
+
+from app import db
+from config import Config
+from models import DerivedArtifact, DocumentUpload, SignalMonitoring, ThesisAnalysis
+
+
+def _thesis_signals(thesis: ThesisAnalysis):
+    signals = SignalMonitoring.query.filter_by(thesis_analysis_id=thesis.id).all()
+    return [signal.to_dict() for signal in signals]
+
+
+def generate_sparklines(thesis: ThesisAnalysis) -> Dict[str, Any]:
+    from services.sparkline_service import SparklineService
+    return SparklineService().generate_investment_sparklines(thesis.to_dict(), _thesis_signals(thesis))
+
+
+def generate_significance_mapping(thesis: ThesisAnalysis) -> Dict[str, Any]:
+    from services.significance_mapping_service import SignificanceMappingService
+    mapper = SignificanceMappingService()
+    mapping_data = mapper.generate_significance_map(thesis.to_dict())
+    return {
+        'mapping_data': mapping_data,
+        'insights': mapper.get_connection_insights(mapping_data)
+    }
+
+
+def generate_smart_prioritization(thesis: ThesisAnalysis) -> Dict[str, Any]:
+    from services.smart_prioritization_service import SmartPrioritizationService
+    return SmartPrioritizationService().generate_dual_prioritization(thesis.to_dict())
+
+
+def evaluation_inputs(thesis: ThesisAnalysis) -> Tuple[Dict[str, Any], int, int]:
+    """Thesis data, document count and Eagle signal count used by the evaluator"""
+    thesis_data = {
+        'core_claim': thesis.core_claim,
+        'core_analysis': thesis.core_analysis,
+        'assumptions': thesis.assumptions or [],
+        'causal_chain': thesis.causal_chain or [],
+        'counter_thesis': thesis.counter_thesis or [],
+        'metrics_to_track': thesis.metrics_to_track or [],
+        'mental_model': thesis.mental_model
+    }
+    document_count = DocumentUpload.query.filter_by(thesis_analysis_id=thesis.id).count()
+    eagle_signal_count = sum(
+        1 for metric in (thesis.metrics_to_track or [])
+        if isinstance(metric, dict) and metric.get('eagle_api')
+    )
+    return thesis_data, document_count, eagle_signal_count
+
+
+def generate_thesis_evaluation(thesis: ThesisAnalysis) -> Dict[str, Any]:
+    from services.thesis_evaluator import ThesisEvaluator
+    evaluator = ThesisEvaluator()
+    thesis_data, document_count, eagle_signal_count = evaluation_inputs(thesis)
+    return {
+        'strength_analysis': evaluator.evaluate_thesis_strength(thesis_data),
+        'quality_assessment': evaluator.generate_research_quality_score(
+            thesis_data, document_count, eagle_signal_count
+        )
+    }
+
+
+def generate_market_sentiment(thesis: ThesisAnalysis) -> Dict[str, Any]:
+    from services.market_sentiment_service import MarketSentimentService
+    return MarketSentimentService().generate_market_sentiment(thesis.original_thesis, thesis.core_claim)
+
+
+def generate_alternative_companies(thesis: ThesisAnalysis) -> Dict[str, Any]:
+    from services.alternative_company_service import AlternativeCompanyService
+    return AlternativeCompanyService().find_alternative_companies(thesis.to_dict(), _thesis_signals(thesis))
+
+
+# artifact_type -> (generator version, generator). Bump the version when a
+# generator's output changes so stored artifacts are regenerated.
+ARTIFACT_GENERATORS: Dict[str, Tuple[str, Callable[[ThesisAnalysis], Dict[str, Any]]]] = {
+    'sparklines': ('1', generate_sparklines),
+    'significance_mapping': ('2', generate_significance_mapping),
+    'smart_prioritization': ('2', generate_smart_prioritization),
+    'thesis_evaluation': ('1', generate_thesis_evaluation),
+    'market_sentiment': ('1', generate_market_sentiment),
+    'alternative_companies': ('2', generate_alternative_companies)
+}
+
+
+class ArtifactStore:
+    """
+    Database-backed store of derived per-thesis artifacts
+    """
+
+    COMPRESSION_LEVEL = 6
+
+    def __init__(self, generators: Optional[Dict[str, Tuple[str, Callable]]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.generators = generators if generators is not None else ARTIFACT_GENERATORS
+        self.warmer: Optional['ArtifactWarmer'] = None
+
+    @property
+    def persistence_enabled(self) -> bool:
+        # Without LLM credentials every generator returns its fallback; never persist those
+        return bool(Config.AZURE_OPENAI_API_KEY and Config.AZURE_OPENAI_ENDPOINT)
+
+    def version(self, artifact_type: str) -> str:
+        return self.generators[artifact_type][0]
+
+    def lookup(self, thesis: ThesisAnalysis, artifact_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest stored artifact with its metadata, or None.
+        ``stale`` is set when the thesis changed since it was built and
+        ``current_version`` when it came from the current generator version.
+        """
+        try:
+            stored = DerivedArtifact.query.filter_by(
+                thesis_analysis_id=thesis.id,
+                artifact_type=artifact_type
+            ).order_by(DerivedArtifact.created_at.desc()).first()
+
+            if not stored:
+                return None
+
+            return {
+                'payload': json.loads(zlib.decompress(stored.payload).decode('utf-8')),
+                'generated_at': stored.created_at.isoformat(),
+                'generator_version': stored.generator_version,
+                'stale': stored.thesis_updated_at != thesis.updated_at,
+                'current_version': stored.generator_version == self.version(artifact_type)
+            }
+
+        except Exception as e:
+            self.logger.warning(f"Artifact lookup failed for thesis {thesis.id} ({artifact_type}): {str(e)}")
+            return None
+
+    def put(self, thesis: ThesisAnalysis, artifact_type: str, payload: Dict[str, Any]) -> None:
+        """Store an artifact for the current thesis version, replacing older ones"""
+        if not self.persistence_enabled or (isinstance(payload, dict) and payload.get('error')):
+            return
+
+        try:
+            blob = zlib.compress(
+                json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8'),
+                self.COMPRESSION_LEVEL
+            )
+
+            DerivedArtifact.query.filter_by(
+                thesis_analysis_id=thesis.id,
+                artifact_type=artifact_type
+            ).delete(synchronize_session=False)
+
+            db.session.add(DerivedArtifact(
+                thesis_analysis_id=thesis.id,
+                artifact_type=artifact_type,
+                thesis_updated_at=thesis.updated_at,
+                generator_version=self.version(artifact_type),
+                payload=blob,
+                payload_size=len(blob)
+            ))
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.warning(f"Artifact write failed for thesis {thesis.id} ({artifact_type}): {str(e)}")
+
+    def generate(self, thesis: ThesisAnalysis, artifact_type: str) -> Dict[str, Any]:
+        """Run the generator for an artifact and store its output"""
+        payload = self.generators[artifact_type][1](thesis)
+        self.put(thesis, artifact_type, payload)
+        return payload
+
+    def get(self, thesis: ThesisAnalysis, artifact_type: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Serve an artifact as (payload, metadata). Stored artifacts are returned
+        immediately; stale ones only while the warmer regenerates them. When
+        nothing usable is stored the artifact is generated inline.
+        """
+        stored = self.lookup(thesis, artifact_type)
+        if stored is not None and not stored['current_version']:
+            # Another generator version may have produced a different shape
+            stored = None
+        if stored is not None and stored['stale']:
+            queued = self.warmer is not None and self.warmer.enqueue(thesis.id, [artifact_type])
+            if not queued:
+                stored = None
+
+        if stored is not None:
+            return stored['payload'], {
+                'generated_at': stored['generated_at'],
+                'generator_version': stored['generator_version'],
+                'stale': stored['stale'],
+                'stored': True
+            }
+
+        payload = self.generate(thesis, artifact_type)
+        return payload, {
+            'generated_at': None,
+            'generator_version': self.version(artifact_type),
+            'stale': False,
+            'stored': False
+        }
+
+    def missing_or_stale(self, thesis: ThesisAnalysis,
+                         artifact_types: Optional[Iterable[str]] = None) -> list:
+        """Artifact types with no stored result for the current thesis version"""
+        pending = []
+        for artifact_type in artifact_types or self.generators:
+            stored = self.lookup(thesis, artifact_type)
+            if stored is None or stored['stale'] or not stored['current_version']:
+                pending.append(artifact_type)
+        return pending
+
+
+@event.listens_for(ThesisAnalysis, 'before_delete')
+def _drop_artifacts_of_deleted_thesis(mapper, connection, thesis):
+    connection.execute(delete(DerivedArtifact).where(DerivedArtifact.thesis_analysis_id == thesis.id))
+
+
+class ArtifactWarmer:
+    """
+    Single background thread generating artifacts for queued theses. A full
+    warm (no artifact types given, as after a publish) also runs each of
+    ``tasks`` on the thesis.
+    """
+
+    def __init__(self, app, store: ArtifactStore,
+                 tasks: Optional[Iterable[Callable[[ThesisAnalysis], Any]]] = None):
+        self.app = app
+        self.store = store
+        self.tasks = list(tasks or [])
+        self.logger = logging.getLogger(__name__)
+        self._queue: 'queue.Queue[Tuple[int, Optional[Tuple[str, ...]]]]' = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        store.warmer = self
+
+    def enqueue(self, thesis_id: int, artifact_types: Optional[Iterable[str]] = None) -> bool:
+        """
+        Queue a thesis for warming; duplicate requests are collapsed. Returns
+        whether the thesis is queued, False when warming is disabled.
+        """
+        if not Config.ARTIFACT_WARMING_ENABLED or not self.store.persistence_enabled:
+            return False
+
+        key = (thesis_id, tuple(artifact_types) if artifact_types else None)
+        with self._lock:
+            if key in self._pending:
+                return True
+            self._pending.add(key)
+            self._ensure_thread()
+
+        self._queue.put(key)
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='artifact-warmer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            thesis_id, artifact_types = key
+            try:
+                self.warm(thesis_id, artifact_types)
+            except Exception as e:
+                self.logger.error(f"Artifact warming failed for thesis {thesis_id}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                self._queue.task_done()
+
+    def warm(self, thesis_id: int, artifact_types: Optional[Iterable[str]] = None) -> list:
+        """Generate missing or stale artifacts for one thesis; returns the types generated"""
+        with self.app.app_context():
+            try:
+                thesis = db.session.get(ThesisAnalysis, thesis_id)
+                if not thesis:
+                    return []
+
+                generated = []
+                for artifact_type in self.store.missing_or_stale(thesis, artifact_types):
+                    try:
+                        self.store.generate(thesis, artifact_type)
+                        generated.append(artifact_type)
+                    except Exception as e:
+                        self.logger.warning(f"Failed to warm {artifact_type} for thesis {thesis_id}: {str(e)}")
+
+                if artifact_types is None:
+                    for task in self.tasks:
+                        try:
+                            task(thesis)
+                        except Exception as e:
+                            db.session.rollback()
+                            self.logger.warning(f"Warm task failed for thesis {thesis_id}: {str(e)}")
+
+                self.logger.info(f"Warmed {len(generated)} artifacts for thesis {thesis_id}")
+                return generated
+            finally:
+                db.session.remove()
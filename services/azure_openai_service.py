@@ -1,26 +1,66 @@
 import os
 import logging
 import json
-from openai import AzureOpenAI
+import threading
 from config import Config
+from services.prompt_budget import count_tokens, record_token_usage
+from services.instrumentation import record_llm_outcome, span
+from services.llm_backends import build_llm_client
 
 class AzureOpenAIService:
+    # One HTTP client per process, shared by every service that wraps this class
+    _shared_client = None
+    _shared_client_ready = False
+    _shared_client_lock = threading.Lock()
+    
     def __init__(self):
-        self.client = None
-        self.api_key = None
+        self.api_key = Config.AZURE_OPENAI_API_KEY
         self.deployment_name = Config.AZURE_OPENAI_DEPLOYMENT_NAME
-        self._initialize_client()
+        self._client = None
+        self._client_resolved = False
+    
+    @property
+    def client(self):
+        """The shared Azure OpenAI client, created on first use"""
+        if not self._client_resolved:
+            self._client = self._get_shared_client()
+            self._client_resolved = True
+        return self._client
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
+        self._client_resolved = True
     
-    def _initialize_client(self):
-        """Initialize the Azure OpenAI client"""
+    @classmethod
+    def _get_shared_client(cls):
+        if not cls._shared_client_ready:
+            with cls._shared_client_lock:
+                if not cls._shared_client_ready:
+                    cls._shared_client = cls._initialize_client()
+                    cls._shared_client_ready = True
+        return cls._shared_client
+    
+    @staticmethod
+    def _initialize_client():
+        """Client for the configured LLM backend (see services/llm_backends.py)"""
         try:
-            self.api_key = Config.AZURE_OPENAI_API_KEY
+            return build_llm_client(Config.LLM_BACKEND, AzureOpenAIService._initialize_azure_client)
+        except Exception as e:
+            logging.error(f"Failed to initialize LLM backend '{Config.LLM_BACKEND}': {str(e)}")
+            return None
+    
+    @staticmethod
+    def _initialize_azure_client():
+        """Create the Azure OpenAI client; the SDK is imported here to keep it off the startup path"""
+        try:
+            api_key = Config.AZURE_OPENAI_API_KEY
             endpoint = Config.AZURE_OPENAI_ENDPOINT
             api_version = Config.AZURE_OPENAI_API_VERSION
             
-            if not self.api_key or not endpoint:
+            if not api_key or not endpoint:
                 logging.error("Azure OpenAI credentials not found in environment variables")
-                return
+                return None
             
             # Fix endpoint format - extract base URL if full API URL provided
             if endpoint and '/openai/deployments/' in endpoint:
@@ -29,8 +69,9 @@ class AzureOpenAIService:
                 logging.info(f"Correcting endpoint from {endpoint} to {base_endpoint}")
                 endpoint = base_endpoint
             
-            self.client = AzureOpenAI(
-                api_key=self.api_key,
+            from openai import AzureOpenAI
+            client = AzureOpenAI(
+                api_key=api_key,
                 api_version=api_version,
                 azure_endpoint=endpoint,
                 timeout=5.0,    # Very short timeout to prevent blocking
@@ -38,49 +79,36 @@ class AzureOpenAIService:
             )
             
             logging.info("Azure OpenAI client initialized successfully")
+            return client
             
         except Exception as e:
             logging.error(f"Failed to initialize Azure OpenAI client: {str(e)}")
-            self.client = None
+            return None
     
-    def generate_completion(self, prompt, temperature=1.0, max_tokens=2000):
-        """Generate a completion using Azure OpenAI with robust timeout and retry handling"""
+    def generate_completion(self, prompt, temperature=1.0, max_tokens=2000, json_mode=False, call_site=None):
+        """
+        Generate a completion using Azure OpenAI with robust timeout and retry handling.
+        json_mode requests a JSON object response on models that support it;
+        call_site labels the prompt/completion token counts that are recorded.
+        """
         if not self.client:
             logging.error("Azure OpenAI client not initialized")
+            record_llm_outcome(call_site, 'unavailable')
             return None
         
         try:
-            # Convert string prompt to proper message format
-            if isinstance(prompt, str):
-                messages = [{"role": "user", "content": prompt}]
-            else:
-                messages = prompt
+            messages = self._to_messages(prompt)
             
-            model_name = self.deployment_name.lower()
-            
-            if 'o1' in model_name or 'o4' in model_name:
-                response = self.client.chat.completions.create(
-                    messages=messages,
-                    model=self.deployment_name
-                )
-            elif 'gpt-4o' in model_name:
-                response = self.client.chat.completions.create(
-                    messages=messages,
-                    model=self.deployment_name,
-                    max_completion_tokens=max_tokens
-                )
-            else:
+            with span('llm', call_site or 'unspecified'):
                 response = self.client.chat.completions.create(
-                    messages=messages,
-                    model=self.deployment_name,
-                    temperature=temperature,
-                    max_tokens=max_tokens
+                    **self._completion_args(messages, temperature, max_tokens, json_mode)
                 )
                 
             logging.info("Azure OpenAI response received")
             
             if not response.choices:
                 logging.error("No choices in Azure OpenAI response")
+                record_llm_outcome(call_site, 'empty')
                 return None
             
             choice = response.choices[0]
@@ -90,16 +118,97 @@ class AzureOpenAIService:
             
             if not content or content.strip() == "":
                 logging.error(f"Empty content from Azure OpenAI (finish_reason: {choice.finish_reason})")
+                record_llm_outcome(call_site, 'empty')
                 return None
             
             logging.info(f"Received valid response: {len(content)} characters")
+            self._record_usage(call_site, messages, content, getattr(response, 'usage', None))
+            record_llm_outcome(call_site, 'success')
             return content
             
         except Exception as e:
             error_message = str(e)
             logging.error(f"Azure OpenAI API call failed: {error_message}")
+            record_llm_outcome(call_site, 'error')
             return None
     
+    def _to_messages(self, prompt):
+        """Convert a string prompt to the chat message format"""
+        if isinstance(prompt, str):
+            return [{"role": "user", "content": prompt}]
+        return prompt
+    
+    def _completion_args(self, messages, temperature, max_tokens, json_mode):
+        """Model-specific arguments for chat.completions.create"""
+        model_name = self.deployment_name.lower()
+        args = {'messages': messages, 'model': self.deployment_name}
+        
+        if json_mode and 'o1' not in model_name:
+            args['response_format'] = {'type': 'json_object'}
+        
+        if 'o1' in model_name or 'o4' in model_name:
+            return args
+        if 'gpt-4o' in model_name:
+            args['max_completion_tokens'] = max_tokens
+        else:
+            args['temperature'] = temperature
+            args['max_tokens'] = max_tokens
+        
+        return args
+    
+    def stream_completion(self, prompt, temperature=1.0, max_tokens=2000, json_mode=False, call_site=None):
+        """
+        Generate a completion incrementally, yielding content chunks as the
+        model produces them. Yields nothing when the client is unavailable;
+        a failure mid-stream ends the stream after the chunks already sent.
+        """
+        if not self.client:
+            logging.error("Azure OpenAI client not initialized")
+            record_llm_outcome(call_site, 'unavailable')
+            return
+        
+        messages = self._to_messages(prompt)
+        parts = []
+        usage = None
+        failed = False
+        
+        try:
+            # Timed until the stream opens; chunks then arrive at the caller's pace
+            with span('llm', call_site or 'unspecified'):
+                stream = self.client.chat.completions.create(
+                    stream=True,
+                    **self._completion_args(messages, temperature, max_tokens, json_mode)
+                )
+            
+            for chunk in stream:
+                usage = getattr(chunk, 'usage', None) or usage
+                if not chunk.choices:
+                    continue
+                delta = getattr(chunk.choices[0].delta, 'content', None)
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+        except Exception as e:
+            logging.error(f"Azure OpenAI streaming call failed: {str(e)}")
+            failed = True
+        
+        finally:
+            if parts:
+                content = ''.join(parts)
+                logging.info(f"Streamed response: {len(content)} characters")
+                self._record_usage(call_site, messages, content, usage)
+            record_llm_outcome(call_site, 'success' if parts else 'error' if failed else 'empty')
+    
+    def _record_usage(self, call_site, messages, content, usage):
+        """Record reported token usage, or a local estimate when the API omits it"""
+        call_site = call_site or 'unspecified'
+        if usage is not None and getattr(usage, 'prompt_tokens', None) is not None:
+            record_token_usage(call_site, usage.prompt_tokens, usage.completion_tokens or 0)
+        else:
+            prompt_tokens = sum(count_tokens(message.get('content', '')) for message in messages)
+            record_token_usage(call_site, prompt_tokens, count_tokens(content), estimated=True)
+    
     def _generate_structured_fallback(self, messages):
         """Generate structured fallback response for empty API responses"""
         try:
@@ -4,8 +4,8 @@ Backtesting service for investment thesis validation using historical market sce
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-import json
 import random
+from services.llm_json import parse_llm_json
 
 class BacktestingService:
     """
@@ -35,6 +35,10 @@ class BacktestingService:
             scenarios = backtest_params.get('scenarios', ['bull_market', 'bear_market', 'sideways'])
             stress_tests = backtest_params.get('stress_tests', True)
             
+            # A private generator for the scenario models, so a stored result can be
+            # reproduced from its seed whatever other requests draw meanwhile
+            rng = random.Random(backtest_params.get('seed'))
+            
             # Initialize AI service for scenario analysis
             openai_service = AzureOpenAIService()
             
@@ -56,13 +60,15 @@ class BacktestingService:
             for scenario in scenarios:
                 try:
                     scenario_result = self._run_scenario_backtest(
-                        thesis, signals, scenario, time_horizon, openai_service
+                        thesis, signals, scenario, time_horizon, openai_service, rng
                     )
                     backtest_results['scenario_results'][scenario] = scenario_result
                 except Exception as e:
                     # Provide intelligent fallback for failed scenarios
                     self.logger.warning(f"Scenario {scenario} failed, using fallback: {str(e)}")
-                    backtest_results['scenario_results'][scenario] = self._get_fallback_scenario_result(scenario, time_horizon)
+                    backtest_results['scenario_results'][scenario] = self._get_fallback_scenario_result(
+                        scenario, time_horizon, rng
+                    )
             
             # Generate performance summary
             backtest_results['performance_summary'] = self._calculate_performance_summary(
@@ -75,7 +81,7 @@ class BacktestingService:
             )
             
             # Validate signals against historical patterns (mathematical model)
-            backtest_results['signal_validation'] = self._validate_signals_mathematically(signals)
+            backtest_results['signal_validation'] = self._validate_signals_mathematically(signals, rng)
             
             # Run stress tests if enabled (mathematical model)
             if stress_tests:
@@ -90,7 +96,8 @@ class BacktestingService:
             self.logger.error(f"Backtesting failed for thesis {thesis_id}: {str(e)}")
             return {'error': str(e)}
     
-    def _run_scenario_backtest(self, thesis, signals, scenario: str, time_horizon: int, openai_service) -> Dict[str, Any]:
+    def _run_scenario_backtest(self, thesis, signals, scenario: str, time_horizon: int, openai_service,
+                               rng: random.Random) -> Dict[str, Any]:
         """
         Run backtesting for a specific market scenario using mathematical models
         """
@@ -126,11 +133,11 @@ class BacktestingService:
             config = scenario_configs.get(scenario, scenario_configs['sideways'])
             
             # Calculate thesis performance using quantitative models
-            thesis_score = self._calculate_thesis_performance_score(thesis, config, signals)
-            market_outperformance = self._calculate_market_outperformance(thesis, config)
-            thesis_validity = self._calculate_thesis_validity(thesis, config)
+            thesis_score = self._calculate_thesis_performance_score(thesis, config, signals, rng)
+            market_outperformance = self._calculate_market_outperformance(thesis, config, rng)
+            thesis_validity = self._calculate_thesis_validity(thesis, config, rng)
             risk_level = self._determine_risk_level(config, len(signals))
-            signal_triggers = self._estimate_signal_triggers(signals, config)
+            signal_triggers = self._estimate_signal_triggers(signals, config, rng)
             
             # Generate key factors and drivers
             key_factors = self._generate_key_factors(thesis, config)
@@ -148,17 +155,17 @@ class BacktestingService:
                 'potential_downside': 1.0 - thesis_validity,
                 'time_horizon_months': time_horizon,
                 'market_conditions': config,
-                'simulated_returns': self._simulate_returns(config, time_horizon),
-                'signal_performance': self._simulate_signal_performance(signals, config)
+                'simulated_returns': self._simulate_returns(config, time_horizon, rng),
+                'signal_performance': self._simulate_signal_performance(signals, config, rng)
             }
             
             return scenario_data
             
         except Exception as e:
             self.logger.error(f"Scenario {scenario} backtesting failed: {str(e)}")
-            return self._get_fallback_scenario_result(scenario, time_horizon)
+            return self._get_fallback_scenario_result(scenario, time_horizon, rng)
     
-    def _simulate_returns(self, config: Dict, time_horizon: int) -> Dict[str, Any]:
+    def _simulate_returns(self, config: Dict, time_horizon: int, rng: random.Random) -> Dict[str, Any]:
         """
         Simulate realistic returns based on scenario configuration
         """
@@ -172,7 +179,7 @@ class BacktestingService:
         
         for month in range(time_horizon):
             # Add some randomness with scenario bias
-            random_factor = random.gauss(0, monthly_volatility)
+            random_factor = rng.gauss(0, monthly_volatility)
             monthly_return = (base_return / 12) + random_factor
             
             monthly_returns.append(monthly_return)
@@ -186,7 +193,7 @@ class BacktestingService:
             'sharpe_ratio': (cumulative_return / time_horizon) / (monthly_volatility * (12**0.5)) if monthly_volatility > 0 else 0
         }
     
-    def _simulate_signal_performance(self, signals: List, config: Dict) -> Dict[str, Any]:
+    def _simulate_signal_performance(self, signals: List, config: Dict, rng: random.Random) -> Dict[str, Any]:
         """
         Simulate how signals would perform in the given scenario
         """
@@ -209,10 +216,10 @@ class BacktestingService:
             base_probability = 0.3  # Base 30% chance
             adjusted_probability = min(base_probability * impact_factor, 1.0)
             
-            if random.random() < adjusted_probability:
+            if rng.random() < adjusted_probability:
                 triggered_count += 1
                 # Simulate accuracy (higher in favorable scenarios)
-                accuracy = random.uniform(0.6, 0.9) * impact_factor
+                accuracy = rng.uniform(0.6, 0.9) * impact_factor
                 accuracy_scores.append(min(accuracy, 1.0))
         
         return {
@@ -297,7 +304,8 @@ class BacktestingService:
             
             response = openai_service.generate_completion(
                 [{"role": "user", "content": signal_analysis_prompt}], 
-                temperature=0.3
+                temperature=0.3,
+                json_mode=True
             )
             
             return self._parse_json_response(response, "signal_validation")
@@ -311,65 +319,6 @@ class BacktestingService:
                 'error': str(e)
             }
     
-    def _run_stress_tests(self, thesis, signals: List, openai_service) -> Dict[str, Any]:
-        """
-        Run stress tests on the thesis under extreme market conditions
-        """
-        try:
-            stress_scenarios = [
-                'market_crash_2008',
-                'covid_pandemic_2020',
-                'dot_com_bubble_2000',
-                'inflation_spike_1970s',
-                'black_monday_1987'
-            ]
-            
-            stress_results = {}
-            
-            for scenario in stress_scenarios:
-                stress_prompt = f"""
-                Analyze how this investment thesis would perform during {scenario}:
-                
-                Thesis: {thesis.title}
-                Core Claim: {thesis.core_claim}
-                
-                Historical Event: {scenario}
-                
-                Evaluate:
-                1. Thesis resilience during crisis
-                2. Recovery potential
-                3. Defensive characteristics
-                4. Correlation with market stress
-                
-                Return JSON: {{
-                    "stress_score": 0.0-100.0,
-                    "resilience": 0.0-1.0,
-                    "recovery_time": 1-36,
-                    "defensive_strength": 0.0-1.0
-                }}
-                """
-                
-                response = openai_service.generate_completion(
-                    [{"role": "user", "content": stress_prompt}], 
-                    temperature=0.3
-                )
-                
-                stress_results[scenario] = self._parse_json_response(response, f"stress_{scenario}")
-            
-            # Calculate overall stress test score
-            scores = [result.get('stress_score', 50) for result in stress_results.values()]
-            overall_score = sum(scores) / len(scores) if scores else 50
-            
-            return {
-                'overall_stress_score': overall_score,
-                'scenario_results': stress_results,
-                'stress_resistance': 'high' if overall_score > 70 else 'medium' if overall_score > 40 else 'low'
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Stress testing failed: {str(e)}")
-            return {'overall_stress_score': 50, 'error': str(e)}
-    
     def _generate_backtest_recommendations(self, backtest_results: Dict, openai_service) -> List[str]:
         """
         Generate actionable recommendations based on backtesting results
@@ -396,7 +345,8 @@ class BacktestingService:
             
             response = openai_service.generate_completion(
                 [{"role": "user", "content": recommendation_prompt}], 
-                temperature=0.5
+                temperature=0.5,
+                json_mode=True
             )
             
             result = self._parse_json_response(response, "recommendations")
@@ -414,7 +364,7 @@ class BacktestingService:
                 'Monitor market conditions closely'
             ]
     
-    def _get_fallback_scenario_result(self, scenario: str, time_horizon: int) -> Dict[str, Any]:
+    def _get_fallback_scenario_result(self, scenario: str, time_horizon: int, rng: random.Random) -> Dict[str, Any]:
         """
         Generate realistic fallback scenario results when AI analysis fails
         """
@@ -431,30 +381,16 @@ class BacktestingService:
             'scenario_score': config['score'],
             'thesis_validity': config['validity'],
             'risk_level': config['risk'],
-            'signal_triggers': random.randint(1, 5),
-            'market_outperformance': random.uniform(-10, 20),
+            'signal_triggers': rng.randint(1, 5),
+            'market_outperformance': rng.uniform(-10, 20),
             'simulated_returns': {
-                'cumulative_return': config['return'] + random.uniform(-0.05, 0.05),
-                'volatility': random.uniform(0.1, 0.3),
-                'max_drawdown': random.uniform(-0.15, -0.05)
-            }
-        }
-    
-    def _get_fallback_stress_results(self) -> Dict[str, Any]:
-        """
-        Generate fallback stress test results
-        """
-        return {
-            'overall_stress_score': random.uniform(40, 70),
-            'stress_resistance': 'medium',
-            'scenario_results': {
-                'market_crash_2008': {'stress_score': random.uniform(20, 60)},
-                'covid_pandemic_2020': {'stress_score': random.uniform(30, 70)},
-                'inflation_spike_1970s': {'stress_score': random.uniform(25, 65)}
+                'cumulative_return': config['return'] + rng.uniform(-0.05, 0.05),
+                'volatility': rng.uniform(0.1, 0.3),
+                'max_drawdown': rng.uniform(-0.15, -0.05)
             }
         }
     
-    def _calculate_thesis_performance_score(self, thesis, config: Dict, signals: List) -> float:
+    def _calculate_thesis_performance_score(self, thesis, config: Dict, signals: List, rng: random.Random) -> float:
         """Calculate thesis performance score based on scenario and thesis characteristics"""
         base_score = config['base_score']
         
@@ -470,25 +406,25 @@ class BacktestingService:
             age_adjustment = 5
         
         # Random variation for realism
-        random_factor = random.uniform(-5, 5)
+        random_factor = rng.uniform(-5, 5)
         
         final_score = base_score + signal_adjustment + age_adjustment + random_factor
         return max(0, min(100, final_score))
     
-    def _calculate_market_outperformance(self, thesis, config: Dict) -> float:
+    def _calculate_market_outperformance(self, thesis, config: Dict, rng: random.Random) -> float:
         """Calculate expected market outperformance"""
         base_outperformance = config['growth_rate'] * 100
         
         # Add thesis-specific factors
         if hasattr(thesis, 'mental_model') and thesis.mental_model:
             if any(word in thesis.mental_model.lower() for word in ['growth', 'innovation', 'disruption']):
-                base_outperformance += random.uniform(5, 15)
+                base_outperformance += rng.uniform(5, 15)
             elif any(word in thesis.mental_model.lower() for word in ['value', 'dividend', 'defensive']):
-                base_outperformance += random.uniform(-5, 5)
+                base_outperformance += rng.uniform(-5, 5)
         
-        return base_outperformance + random.uniform(-10, 10)
+        return base_outperformance + rng.uniform(-10, 10)
     
-    def _calculate_thesis_validity(self, thesis, config: Dict) -> float:
+    def _calculate_thesis_validity(self, thesis, config: Dict, rng: random.Random) -> float:
         """Calculate thesis validity in the given scenario"""
         base_validity = config['validity_multiplier'] * 0.7
         
@@ -498,7 +434,7 @@ class BacktestingService:
             if claim_length > 50:  # More detailed = potentially more robust
                 base_validity += 0.1
         
-        return max(0.1, min(1.0, base_validity + random.uniform(-0.1, 0.1)))
+        return max(0.1, min(1.0, base_validity + rng.uniform(-0.1, 0.1)))
     
     def _determine_risk_level(self, config: Dict, signal_count: int) -> str:
         """Determine risk level based on scenario and signals"""
@@ -511,7 +447,7 @@ class BacktestingService:
         else:
             return 'medium'
     
-    def _estimate_signal_triggers(self, signals: List, config: Dict) -> int:
+    def _estimate_signal_triggers(self, signals: List, config: Dict, rng: random.Random) -> int:
         """Estimate number of signals likely to trigger"""
         if not signals:
             return 0
@@ -522,7 +458,7 @@ class BacktestingService:
         multiplier = scenario_multiplier.get(config.get('market_trend', 'sideways'), 1.0)
         expected_triggers = len(signals) * base_rate * multiplier
         
-        return max(0, min(len(signals), int(expected_triggers + random.uniform(-1, 2))))
+        return max(0, min(len(signals), int(expected_triggers + rng.uniform(-1, 2))))
     
     def _generate_key_factors(self, thesis, config: Dict) -> List[str]:
         """Generate key factors affecting thesis performance"""
@@ -553,7 +489,7 @@ class BacktestingService:
         
         return scenario_drivers.get(config.get('market_trend', 'sideways'), scenario_drivers['sideways'])[:3]
     
-    def _validate_signals_mathematically(self, signals: List) -> Dict[str, Any]:
+    def _validate_signals_mathematically(self, signals: List, rng: random.Random) -> Dict[str, Any]:
         """Validate signals using mathematical models instead of AI"""
         if not signals:
             return {'validation_score': 0.5, 'reliable_signals': 0, 'historical_accuracy': 0.5, 'market_correlation': 0.5}
@@ -562,64 +498,26 @@ class BacktestingService:
         signal_diversity = len(set(signal.signal_type for signal in signals))
         threshold_reasonableness = sum(1 for signal in signals if signal.threshold_value and 0.01 <= abs(signal.threshold_value) <= 1000) / len(signals)
         
-        validation_score = min(1.0, (signal_diversity / 5.0) + (threshold_reasonableness * 0.5) + random.uniform(0.1, 0.3))
+        validation_score = min(1.0, (signal_diversity / 5.0) + (threshold_reasonableness * 0.5) + rng.uniform(0.1, 0.3))
         reliable_signals = int(len(signals) * validation_score)
         
         return {
             'validation_score': validation_score,
             'reliable_signals': reliable_signals,
-            'historical_accuracy': validation_score * 0.8 + random.uniform(0.1, 0.2),
-            'market_correlation': validation_score * 0.9 + random.uniform(0.05, 0.15),
+            'historical_accuracy': validation_score * 0.8 + rng.uniform(0.1, 0.2),
+            'market_correlation': validation_score * 0.9 + rng.uniform(0.05, 0.15),
             'recommended_adjustments': ['Increase signal diversity', 'Validate threshold levels'] if validation_score < 0.7 else []
         }
     
     def _run_mathematical_stress_tests(self, thesis, signals: List) -> Dict[str, Any]:
-        """Run stress tests using mathematical models"""
-        stress_scenarios = {
-            'market_crash_2008': {'volatility': 0.8, 'decline': -0.45, 'recovery_months': 18},
-            'covid_pandemic_2020': {'volatility': 0.6, 'decline': -0.35, 'recovery_months': 12},
-            'dot_com_bubble_2000': {'volatility': 0.7, 'decline': -0.50, 'recovery_months': 24},
-            'inflation_spike_1970s': {'volatility': 0.4, 'decline': -0.25, 'recovery_months': 36},
-            'black_monday_1987': {'volatility': 0.9, 'decline': -0.20, 'recovery_months': 6}
-        }
-        
-        scenario_results = {}
-        stress_scores = []
-        
-        for scenario, config in stress_scenarios.items():
-            # Calculate thesis resilience based on characteristics
-            base_resilience = 0.5
-            
-            # Adjust based on signal count (more signals = better diversification)
-            signal_adjustment = min(len(signals) * 0.05, 0.2)
-            
-            # Adjust based on thesis type
-            if hasattr(thesis, 'mental_model') and thesis.mental_model:
-                if any(word in thesis.mental_model.lower() for word in ['defensive', 'value', 'dividend']):
-                    base_resilience += 0.2
-                elif any(word in thesis.mental_model.lower() for word in ['growth', 'tech', 'speculative']):
-                    base_resilience -= 0.1
-            
-            resilience = max(0.1, min(1.0, base_resilience + signal_adjustment + random.uniform(-0.1, 0.1)))
-            
-            # Calculate stress score (inverse relationship with market decline)
-            stress_score = max(0, 100 * (1 - abs(config['decline'])) * resilience * (1 - config['volatility'] * 0.3))
-            stress_scores.append(stress_score)
-            
-            scenario_results[scenario] = {
-                'stress_score': stress_score,
-                'resilience': resilience,
-                'recovery_time': config['recovery_months'] * (2 - resilience),  # Lower resilience = longer recovery
-                'defensive_strength': resilience
-            }
+        """Run stress tests by applying the historical shock library to the thesis exposures"""
+        from services.stress_test_library import StressTestLibrary
         
-        overall_score = sum(stress_scores) / len(stress_scores)
+        library = StressTestLibrary()
+        exposures = library.build_exposures([thesis])
+        results = library.run(exposures, [len(signals)])
         
-        return {
-            'overall_stress_score': overall_score,
-            'scenario_results': scenario_results,
-            'stress_resistance': 'high' if overall_score > 60 else 'medium' if overall_score > 35 else 'low'
-        }
+        return library.thesis_report(results)
     
     def _generate_mathematical_recommendations(self, thesis, backtest_results: Dict) -> List[str]:
         """Generate recommendations based on mathematical analysis"""
@@ -687,20 +585,4 @@ class BacktestingService:
         """
         Parse JSON response with error handling
         """
-        try:
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = response[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                self.logger.warning(f"No JSON found in {context} response")
-                return {}
-                
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON parsing failed for {context}: {str(e)}")
-            return {}
-        except Exception as e:
-            self.logger.error(f"Response parsing failed for {context}: {str(e)}")
-            return {}
\ No newline at end of file
+        return parse_llm_json(response, f"backtesting.{context}", dict) or {}
\ No newline at end of file
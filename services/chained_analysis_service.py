@@ -1,8 +1,15 @@
-import json
 import logging
 from typing import Dict, Any, List
 from services.azure_openai_service import AzureOpenAIService
 from services.market_sentiment_service import MarketSentimentService
+from services.llm_json import parse_llm_json
+
+# Expected top-level JSON shape per analysis step
+STEP_SCHEMAS = {
+    'core_analysis': dict,
+    'signals': list,
+    'monitoring_plan': dict
+}
 
 class ChainedAnalysisService:
     """
@@ -135,7 +142,7 @@ class ChainedAnalysisService:
                 response = self.azure_openai.generate_completion([
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
-                ], max_tokens=800, temperature=0.5)
+                ], max_tokens=800, temperature=0.5, json_mode=True)
             finally:
                 signal.alarm(0)  # Cancel timeout
             
@@ -391,7 +398,7 @@ Focus on metrics that can be tracked via FactSet/Xpressfeed APIs with specific q
             response = self.azure_openai.generate_completion([
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
-            ], max_tokens=3000, temperature=0.2)
+            ], max_tokens=3000, temperature=0.2, json_mode=True)
         finally:
             signal.alarm(0)  # Cancel timeout
         
@@ -622,24 +629,12 @@ Focus on metrics that can be tracked via FactSet/Xpressfeed APIs with specific q
 
     def _parse_json_response(self, response: str, step_name: str):
         """Parse JSON response with fallback handling"""
-        try:
-            parsed = json.loads(response)
-            logging.info(f"Successfully parsed JSON for {step_name}")
-            return parsed
-        except json.JSONDecodeError:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}|\[.*\]', response, re.DOTALL)
-            if json_match:
-                try:
-                    parsed = json.loads(json_match.group())
-                    logging.info(f"Extracted JSON for {step_name}")
-                    return parsed
-                except json.JSONDecodeError:
-                    pass
-            
-            logging.warning(f"Failed to parse JSON for {step_name}")
+        parsed = parse_llm_json(response, f"chained_analysis.{step_name}", STEP_SCHEMAS.get(step_name))
+        if parsed is None:
             return self._get_fallback_structure(step_name)
+        
+        logging.info(f"Successfully parsed JSON for {step_name}")
+        return parsed
     
     def _get_fallback_structure(self, step_name: str):
         """Provide fallback structure when JSON parsing fails"""
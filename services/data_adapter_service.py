@@ -9,6 +9,8 @@ import logging
 import json
 from datetime import datetime
 from .test_eagle_api_responses import TestEagleAPIResponses
+from .metric_catalogue import CATEGORIES
+from .instrumentation import record_outbound_status, span
 
 if TYPE_CHECKING:
     from services.metric_selector import MetricSelector
@@ -33,13 +35,15 @@ class DataAdapter:
             return self.test_api.get_test_response_for_company()
             
         try:
-            response = requests.post(
-                self.eagle_url,
-                headers=self.headers,
-                json={'query': query},
-                verify=False,
-                timeout=30
-            )
+            with span('http', 'eagle'):
+                response = requests.post(
+                    self.eagle_url,
+                    headers=self.headers,
+                    json={'query': query},
+                    verify=False,
+                    timeout=30
+                )
+            record_outbound_status('eagle', response.status_code)
             
             if response.status_code == 200:
                 result = response.json()
@@ -74,6 +78,7 @@ class DataAdapter:
                 
         except requests.exceptions.RequestException as e:
             logging.error(f"Request Error: {str(e)}")
+            record_outbound_status('eagle', 'error')
             return {'error': 'Network request failed', 'details': str(e)}
         except Exception as e:
             logging.error(f"Unexpected error: {str(e)}")
@@ -192,11 +197,7 @@ class DataAdapter:
             # Get metrics for specific categories
             all_metrics = []
             for category in metric_categories:
-                category_metrics = selector.get_metrics_by_category(category)
-                if category_metrics and 'metrics' in category_metrics:
-                    category_metric_names = []
-                    selector._extract_primary_metric_names(category_metrics['metrics'], category_metric_names)
-                    all_metrics.extend(category_metric_names)
+                all_metrics.extend(selector.get_category_metric_names(category))
         else:
             # Get comprehensive metrics for thesis analysis
             comprehensive = selector.get_comprehensive_metrics_for_thesis()
@@ -246,24 +247,13 @@ class DataAdapter:
     
     def _organize_metrics_by_category(self, metrics: Dict[str, Any], selector: 'MetricSelector') -> Dict[str, Dict[str, Any]]:
         """Organize metrics by their categories"""
-        organized = {
-            'growth_metrics': {},
-            'valuation_metrics': {},
-            'profitability_metrics': {},
-            'risk_metrics': {},
-            'market_metrics': {}
-        }
+        organized = {category: {} for category in CATEGORIES}
         
-        # Map each metric to its category
-        for category in organized.keys():
-            category_data = selector.get_metrics_by_category(category.replace('_metrics', '_metrics'))
-            if category_data and 'metrics' in category_data:
-                category_metric_names = []
-                selector._extract_primary_metric_names(category_data['metrics'], category_metric_names)
-                
-                for metric_name in category_metric_names:
-                    if metric_name in metrics:
-                        organized[category][metric_name] = metrics[metric_name]
+        # Map each metric to its category with one catalogue lookup
+        for metric_name, value in metrics.items():
+            category = selector.get_metric_category(metric_name)
+            if category in organized:
+                organized[category][metric_name] = value
         
         return organized
     
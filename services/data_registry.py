@@ -4,6 +4,7 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from config import Config
+from services.instrumentation import record_outbound_status, span
 
 class DataRegistry:
     """
@@ -139,7 +140,9 @@ class DataRegistry:
             else:
                 return None
             
-            response = requests.get(endpoint, headers=headers, params=params, timeout=10)
+            with span('http', 'factset'):
+                response = requests.get(endpoint, headers=headers, params=params, timeout=10)
+            record_outbound_status('factset', response.status_code)
             
             if response.status_code == 200:
                 data = response.json()
@@ -148,6 +151,10 @@ class DataRegistry:
                 logging.error(f"FactSet API error: {response.status_code} - {response.text}")
                 return None
                 
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error fetching from FactSet: {str(e)}")
+            record_outbound_status('factset', 'error')
+            return None
         except Exception as e:
             logging.error(f"Error fetching from FactSet: {str(e)}")
             return None
@@ -174,7 +181,9 @@ class DataRegistry:
             else:
                 return None
             
-            response = requests.get(endpoint, headers=headers, params=params, timeout=10)
+            with span('http', 'xpressfeed'):
+                response = requests.get(endpoint, headers=headers, params=params, timeout=10)
+            record_outbound_status('xpressfeed', response.status_code)
             
             if response.status_code == 200:
                 data = response.json()
@@ -183,6 +192,10 @@ class DataRegistry:
                 logging.error(f"Xpressfeed API error: {response.status_code} - {response.text}")
                 return None
                 
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error fetching from Xpressfeed: {str(e)}")
+            record_outbound_status('xpressfeed', 'error')
+            return None
         except Exception as e:
             logging.error(f"Error fetching from Xpressfeed: {str(e)}")
             return None
@@ -5,12 +5,14 @@ Integrates with external API to validate structured queries against real data
 
 import json
 import logging
+import threading
 import time
 import uuid
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import requests
 from dataclasses import dataclass
+from services.event_bus import event_bus, validation_channel
 
 @dataclass
 class ValidationRequest:
@@ -261,9 +263,48 @@ class DataValidationService:
         if validation_request.status == 'processing':
             validation_request = self.check_validation_status(validation_request)
             self.active_requests[request_id] = validation_request
+            if validation_request.status in ['completed', 'failed']:
+                self._publish_status(validation_request)
             
         return validation_request
     
+    def status_payload(self, validation_request: ValidationRequest) -> Dict[str, Any]:
+        """Status of a validation request as returned to the browser"""
+        payload = {
+            'request_id': validation_request.request_id,
+            'status': validation_request.status,
+            'signal_name': validation_request.signal_name,
+            'created_at': validation_request.created_at.isoformat() if validation_request.created_at else None,
+            'completed_at': validation_request.completed_at.isoformat() if validation_request.completed_at else None
+        }
+        
+        if validation_request.result:
+            payload['result'] = validation_request.result
+        
+        return payload
+    
+    def _publish_status(self, validation_request: ValidationRequest):
+        """Push a validation outcome to pages subscribed to its channel"""
+        event_bus.publish('validation', self.status_payload(validation_request),
+                          validation_channel(validation_request.request_id))
+    
+    def watch_validation(self, request_id: str, max_wait_time: int = 60) -> bool:
+        """
+        Poll a processing validation on a background thread; the outcome is
+        published to the event bus instead of being polled by the browser
+        """
+        validation_request = self.active_requests.get(request_id)
+        if not validation_request or validation_request.status != 'processing':
+            return False
+        
+        threading.Thread(
+            target=self.process_validation_async,
+            args=(request_id, max_wait_time),
+            name=f'validation-watch-{request_id}',
+            daemon=True
+        ).start()
+        return True
+    
     def simulate_validation_result(self, query_structure: Dict[str, Any], signal_name: str) -> Dict[str, Any]:
         """
         Simulate a validation result for testing when API is not available
@@ -337,5 +378,7 @@ class DataValidationService:
                 break
                 
             time.sleep(5)  # Wait 5 seconds before next check
-            
+        
+        # A request still processing here has timed out; subscribers are told either way
+        self._publish_status(validation_request)
         return validation_request
\ No newline at end of file
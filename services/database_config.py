@@ -0,0 +1,148 @@
+"""
+Database Engine Configuration
+
+Engine options for the primary database, sized from the gunicorn worker
+model (WEB_CONCURRENCY workers x GUNICORN_THREADS threads, as read by
+gunicorn.conf.py):
+
+- pool: each worker process has its own pool, with one connection per
+  request thread plus DB_POOL_BACKGROUND for background threads (artifact
+  warmer, samplers) and the same again as overflow for bursts. When
+  DB_MAX_CONNECTIONS is set, the pool is capped so that all workers
+  together stay within it.
+- SQLite: WAL journaling (readers no longer block on the writer),
+  synchronous=NORMAL (safe under WAL, no fsync per commit), a memory-mapped
+  read window and a busy timeout, applied on every new connection
+- Postgres: a larger compiled-statement cache and, on psycopg 3, server-side
+  prepared statements after PG_PREPARE_THRESHOLD executions (psycopg2 has no
+  prepared statement support)
+
+With DATABASE_REPLICA_URL set, views wrapped in ``read_replica`` run their
+queries on the replica through RoutingSession; flushes and DML statements
+still go to the primary. Only views that can tolerate replication lag
+should be wrapped, so pages opened right after a publish stay on the primary.
+
+DB_ENGINE_TUNING_ENABLED=false restores the previous plain options.
+"""
+
+import contextvars
+import logging
+from functools import wraps
+from typing import Any, Dict, Tuple
+
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from config import Config
+
+REPLICA_BIND = 'replica'
+
+_read_replica = contextvars.ContextVar('read_replica', default=False)
+_pragmas_installed = False
+
+
+def worker_model() -> Tuple[int, int]:
+    """(worker processes, threads per worker) the app is served with"""
+    return max(1, Config.GUNICORN_WORKERS), max(1, Config.GUNICORN_THREADS)
+
+
+def pool_settings(workers: int, threads: int) -> Dict[str, int]:
+    """Per-process pool size and overflow for the worker model"""
+    pool_size = Config.DB_POOL_SIZE or threads + Config.DB_POOL_BACKGROUND
+    max_overflow = Config.DB_MAX_OVERFLOW if Config.DB_MAX_OVERFLOW >= 0 else pool_size
+    if Config.DB_MAX_CONNECTIONS:
+        budget = max(1, Config.DB_MAX_CONNECTIONS // workers)
+        pool_size = min(pool_size, budget)
+        max_overflow = min(max_overflow, budget - pool_size)
+    return {'pool_size': pool_size, 'max_overflow': max_overflow}
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """SQLALCHEMY_ENGINE_OPTIONS for ``database_url``"""
+    options: Dict[str, Any] = {'pool_recycle': 300, 'pool_pre_ping': True}
+    if not Config.DB_ENGINE_TUNING_ENABLED:
+        return options
+
+    url = make_url(database_url)
+    if _is_memory_sqlite(url):
+        # A single shared connection; pool sizing does not apply
+        return options
+
+    options.update(pool_settings(*worker_model()))
+    options['pool_timeout'] = Config.DB_POOL_TIMEOUT
+
+    if url.get_backend_name() == 'postgresql':
+        options['query_cache_size'] = Config.DB_QUERY_CACHE_SIZE
+        if url.get_driver_name() == 'psycopg':
+            options['connect_args'] = {'prepare_threshold': Config.PG_PREPARE_THRESHOLD}
+    elif url.get_backend_name() == 'sqlite':
+        # Pooled connections move between request threads
+        options['connect_args'] = {'check_same_thread': False, 'timeout': Config.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    if type(dbapi_connection).__module__.split('.')[0] not in ('sqlite3', 'pysqlite2'):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA mmap_size={int(Config.SQLITE_MMAP_SIZE)}')
+        cursor.execute(f'PRAGMA busy_timeout={int(Config.SQLITE_BUSY_TIMEOUT_MS)}')
+    finally:
+        cursor.close()
+
+
+def install_sqlite_pragmas() -> None:
+    """Apply the SQLite pragmas on every new connection of every engine"""
+    global _pragmas_installed
+    if _pragmas_installed:
+        return
+    event.listen(Engine, 'connect', _set_sqlite_pragmas)
+    _pragmas_installed = True
+
+
+def configure_database(app, database_url: str) -> None:
+    """Set the database URI, engine options and replica bind before db.init_app"""
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(database_url)
+    if Config.DATABASE_REPLICA_URL:
+        app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: {
+            'url': Config.DATABASE_REPLICA_URL, **engine_options(Config.DATABASE_REPLICA_URL)}}
+
+    if Config.DB_ENGINE_TUNING_ENABLED:
+        install_sqlite_pragmas()
+        workers, threads = worker_model()
+        options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        logging.info(f"Database pool for {workers} worker(s) x {threads} thread(s): "
+                     f"size {options.get('pool_size')}, overflow {options.get('max_overflow')}")
+
+
+class RoutingSession(FlaskSession):
+    """Sends reads inside ``read_replica`` views to the replica engine"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        writing = self._flushing or getattr(clause, 'is_dml', False)
+        if bind is None and _read_replica.get() and not writing:
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_replica(view):
+    """Run a read-only view's queries on the replica, when one is configured"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _read_replica.set(True)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _read_replica.reset(token)
+    return wrapper
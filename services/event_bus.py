@@ -0,0 +1,177 @@
+"""
+Monitoring Event Bus
+
+In-process publish/subscribe channel pushing small monitoring deltas (signal
+sweeps, notification inserts, published theses, validation completions) to
+connected dashboards over Server-Sent Events, so open tabs no longer reload
+pages or poll endpoints that re-run the monitoring queries.
+
+Events are numbered and kept in a bounded replay buffer: a client that
+reconnects with ``Last-Event-ID`` (or subscribes with a cursor taken before
+it started an operation) receives the events it missed.
+
+Database-originated events are published only after the transaction commits;
+``publish_on_commit`` queues them on the session and a rollback drops them.
+
+The bus lives in one process, and every open stream holds a request thread.
+Pages only rely on it when ``push_available`` (a single threaded worker);
+otherwise they poll as before. Streams beyond ``stream_capacity`` are refused
+so they cannot take every request thread.
+"""
+
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import Config
+from models import NotificationLog
+
+MONITORING_CHANNEL = 'monitoring'
+
+
+def validation_channel(request_id: str) -> str:
+    return f'validation:{request_id}'
+
+
+def push_available() -> bool:
+    """
+    Whether events published here reach the pages that subscribe: with
+    several workers a stream can land on a worker that never sees the event,
+    and a sync worker would spend its only thread on the stream
+    """
+    return Config.EVENT_STREAM_ENABLED and Config.GUNICORN_WORKERS <= 1 and Config.GUNICORN_THREADS > 1
+
+
+def stream_capacity() -> int:
+    """Streams allowed open at once; the other request threads stay free for requests"""
+    return max(1, Config.GUNICORN_THREADS // 2)
+
+
+class EventBus:
+    """
+    Numbered events fanned out to subscriber queues, with a replay buffer
+    """
+
+    BUFFER_SIZE = 500
+    SUBSCRIBER_QUEUE_SIZE = 100
+    HEARTBEAT_SECONDS = 15.0
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._buffer: deque = deque(maxlen=buffer_size or self.BUFFER_SIZE)
+        self._subscribers: Dict[int, Dict[str, Any]] = {}
+        self._next_subscriber = 0
+        self.last_id = 0
+
+    def publish(self, event_type: str, payload: Dict[str, Any], channel: str = MONITORING_CHANNEL) -> int:
+        """Number an event, buffer it and hand it to matching subscribers"""
+        with self._lock:
+            self.last_id += 1
+            message = {'id': self.last_id, 'event': event_type, 'channel': channel, 'data': payload}
+            self._buffer.append(message)
+            subscribers = [sub for sub in self._subscribers.values() if channel in sub['channels']]
+
+        for subscriber in subscribers:
+            try:
+                subscriber['queue'].put_nowait(message)
+            except queue.Full:
+                # A stalled client must not block publishers; it resyncs from the buffer on reconnect
+                subscriber['overflowed'] = True
+        return message['id']
+
+    def replay(self, channels: Iterable[str], since: int) -> List[Dict[str, Any]]:
+        """Buffered events after ``since`` on the given channels"""
+        channels = set(channels)
+        with self._lock:
+            return [message for message in self._buffer
+                    if message['id'] > since and message['channel'] in channels]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self, channels: Iterable[str], since: Optional[int] = None,
+                  heartbeat: Optional[float] = None) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Yield events on ``channels`` as they are published, starting with
+        buffered events after ``since``. Yields None when ``heartbeat`` seconds
+        pass without an event so the caller can keep the connection alive.
+        """
+        channels = set(channels)
+        subscriber = {
+            'channels': channels,
+            'queue': queue.Queue(maxsize=self.SUBSCRIBER_QUEUE_SIZE),
+            'overflowed': False
+        }
+
+        with self._lock:
+            subscriber_id = self._next_subscriber
+            self._next_subscriber += 1
+            self._subscribers[subscriber_id] = subscriber
+            start = self.last_id if since is None else since
+
+        try:
+            delivered = start
+            for message in self.replay(channels, start):
+                delivered = message['id']
+                yield message
+
+            while True:
+                if subscriber['overflowed']:
+                    # Dropped messages are still in the buffer; resend from the last delivered id
+                    subscriber['overflowed'] = False
+                    for message in self.replay(channels, delivered):
+                        delivered = message['id']
+                        yield message
+
+                try:
+                    message = subscriber['queue'].get(timeout=heartbeat or self.HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield None
+                    continue
+
+                if message['id'] <= delivered:
+                    continue  # Already sent from the replay buffer
+                delivered = message['id']
+                yield message
+
+        finally:
+            with self._lock:
+                self._subscribers.pop(subscriber_id, None)
+
+
+event_bus = EventBus()
+
+
+def publish_on_commit(session, event_type: str, payload: Dict[str, Any],
+                      channel: str = MONITORING_CHANNEL) -> None:
+    """Publish an event once the session's current transaction commits"""
+    session.info.setdefault('pending_events', []).append((event_type, payload, channel))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_committed_events(session):
+    for event_type, payload, channel in session.info.pop('pending_events', []):
+        event_bus.publish(event_type, payload, channel)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_rolled_back_events(session, previous_transaction):
+    session.info.pop('pending_events', None)
+
+
+@event.listens_for(NotificationLog, 'after_insert')
+def _queue_notification_event(mapper, connection, notification):
+    publish_on_commit(Session.object_session(notification), 'notification', {
+        'id': notification.id,
+        'signal_monitoring_id': notification.signal_monitoring_id,
+        'notification_type': notification.notification_type,
+        'message': notification.message,
+        'sent_at': notification.sent_at.isoformat() if notification.sent_at else None
+    })
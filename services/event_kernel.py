@@ -0,0 +1,275 @@
+"""
+Event Kernel for Thesis Simulations
+
+Discrete-event engine shared by SimulationService and MLSimulationService.
+Monitoring-plan components (validation framework, alert system, decision
+framework, counter-thesis monitoring) become scheduled events in a priority
+queue. Each event's jump is drawn once from its distribution and the same
+draws are applied to every set of paths the kernel is applied to (the thesis
+path and its Monte Carlo fan), so the events reported to the user are the
+same events that moved the simulated prices.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Mean relative price jump by event direction
+DIRECTION_JUMP_MEAN = {
+    'positive': 0.03,
+    'neutral': 0.0,
+    'negative': -0.04
+}
+
+# Scale applied to the mean jump by event magnitude
+MAGNITUDE_SCALE = {
+    'low': 0.5,
+    'moderate': 1.0,
+    'high': 1.6,
+    'substantial': 1.6,
+    'major': 2.2
+}
+
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """Event queued at a simulation step with its price-jump distribution"""
+    step: int
+    sequence: int
+    month: int = field(compare=False)
+    title: str = field(compare=False)
+    description: str = field(compare=False, default='')
+    event_category: str = field(compare=False, default='general')
+    direction: str = field(compare=False, default='neutral')
+    magnitude: str = field(compare=False, default='moderate')
+    severity: Optional[str] = field(compare=False, default=None)
+    action: Optional[str] = field(compare=False, default=None)
+    signals_affected: List[str] = field(compare=False, default_factory=list)
+    jump_mean: float = field(compare=False, default=0.0)
+    jump_std: float = field(compare=False, default=0.01)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'month': self.month,
+            'title': self.title,
+            'description': self.description,
+            'impact_type': self.direction,
+            'magnitude': self.magnitude,
+            'severity': self.severity,
+            'action': self.action,
+            'signals_affected': self.signals_affected,
+            'event_category': self.event_category
+        }
+
+
+class EventKernel:
+    """
+    Priority-queue event scheduler applying vectorised jumps to price paths
+    """
+
+    MIN_MONTH_SPACING = 1
+
+    def __init__(self, total_months: int, steps_per_month: int = 21, seed: Optional[int] = None):
+        self.total_months = max(1, int(total_months))
+        self.steps_per_month = max(1, int(steps_per_month))
+        self.rng = np.random.default_rng(seed)
+        self._queue: List[ScheduledEvent] = []
+        self._sequence = itertools.count()
+        self._used_months = set()
+        self._drawn: List[Tuple[ScheduledEvent, float]] = []
+        self.applied_events: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def allocate_month(self, preferred_month: int) -> int:
+        """
+        Deterministically place an event at the preferred month, or the nearest
+        free month respecting MIN_MONTH_SPACING when the preferred slot is taken.
+        """
+        preferred = max(1, min(int(preferred_month), self.total_months))
+
+        for offset in range(self.total_months):
+            for candidate in (preferred + offset, preferred - offset):
+                if 1 <= candidate <= self.total_months and all(
+                    abs(candidate - used) >= self.MIN_MONTH_SPACING for used in self._used_months
+                ):
+                    return candidate
+
+        return preferred
+
+    def schedule(self, month: int, title: str, direction: str = 'neutral',
+                 magnitude: str = 'moderate', **details) -> ScheduledEvent:
+        """Queue an event and derive its jump distribution from direction and magnitude"""
+        month = self.allocate_month(month)
+        self._used_months.add(month)
+
+        jump_mean = DIRECTION_JUMP_MEAN.get(direction, 0.0) * MAGNITUDE_SCALE.get(magnitude, 1.0)
+        event = ScheduledEvent(
+            step=(month - 1) * self.steps_per_month,
+            sequence=next(self._sequence),
+            month=month,
+            title=title,
+            direction=direction,
+            magnitude=magnitude,
+            jump_mean=details.pop('jump_mean', jump_mean),
+            jump_std=details.pop('jump_std', 0.5 * abs(jump_mean) + 0.01),
+            **details
+        )
+        heapq.heappush(self._queue, event)
+        return event
+
+    def schedule_monitoring_plan(self, monitoring_plan: Dict[str, Any], limit: Optional[int] = None) -> int:
+        """Queue events for every monitoring-plan component; returns the number scheduled"""
+        if not isinstance(monitoring_plan, dict):
+            return 0
+
+        candidates = (
+            self._validation_events(monitoring_plan)
+            + self._alert_events(monitoring_plan)
+            + self._decision_events(monitoring_plan)
+            + self._counter_thesis_events(monitoring_plan)
+        )
+        candidates.sort(key=lambda candidate: candidate['month'])
+
+        if limit is not None:
+            candidates = candidates[:limit]
+
+        for candidate in candidates:
+            self.schedule(**candidate)
+
+        return len(candidates)
+
+    def draw(self) -> List[Tuple[ScheduledEvent, float]]:
+        """
+        Drain the queue in time order, drawing one jump per event. Events are
+        drawn only once, so later calls return the same jumps.
+        """
+        while self._queue:
+            event = heapq.heappop(self._queue)
+
+            jump = float(self.rng.normal(event.jump_mean, event.jump_std))
+            # Keep each jump on the side of zero its direction implies
+            if event.direction == 'positive':
+                jump = abs(jump)
+            elif event.direction == 'negative':
+                jump = -abs(jump)
+
+            self._drawn.append((event, jump))
+            applied = event.to_dict()
+            applied['applied_jump'] = round(jump, 4)
+            self.applied_events.append(applied)
+
+        return self._drawn
+
+    def apply(self, paths: np.ndarray, floor: Optional[float] = None) -> np.ndarray:
+        """
+        Apply the drawn jumps to ``paths`` (shape (n_paths, n_steps)) in place,
+        each from its event's step onwards. Every call replays the same draws;
+        ``impact_value`` in ``applied_events`` is the mean price of the first
+        paths applied.
+        """
+        paths = np.atleast_2d(paths)
+        n_steps = paths.shape[1]
+
+        for (event, jump), applied in zip(self.draw(), self.applied_events):
+            step = min(event.step, n_steps - 1)
+
+            paths[:, step:] *= 1.0 + jump
+            if floor is not None:
+                np.maximum(paths[:, step:], floor, out=paths[:, step:])
+
+            applied.setdefault('impact_value', round(float(paths[:, step].mean()), 2))
+
+        return paths
+
+    def _spread_month(self, index: int, divisor: int, start: int = 1) -> int:
+        return max(1, min((index + start) * max(1, self.total_months // divisor), self.total_months))
+
+    def _validation_events(self, monitoring_plan: Dict) -> List[Dict]:
+        """Events from the validation framework"""
+        events = []
+        framework = monitoring_plan.get('validation_framework', {}) or {}
+
+        for i, metric in enumerate((framework.get('core_claim_metrics') or [])[:2]):
+            events.append({
+                'month': self._spread_month(i, 4),
+                'title': f"Core Validation: {metric.get('metric', 'Performance')}",
+                'description': f"Validating {metric.get('metric')} against {metric.get('target_threshold')} threshold using {metric.get('data_source')} data",
+                'direction': 'positive',
+                'signals_affected': [metric.get('metric', 'Core Signal')],
+                'event_category': 'validation'
+            })
+
+        for i, test in enumerate((framework.get('assumption_tests') or [])[:2]):
+            events.append({
+                'month': self._spread_month(i, 5, start=2),
+                'title': f"Assumption Test: {test.get('test_metric', 'Market Test')}",
+                'description': f"Testing key assumption via {test.get('test_metric')} - Success threshold: {test.get('success_threshold')}",
+                'direction': 'neutral',
+                'magnitude': 'low',
+                'signals_affected': [test.get('test_metric', 'Assumption Signal')],
+                'event_category': 'assumption'
+            })
+
+        return events
+
+    def _alert_events(self, monitoring_plan: Dict) -> List[Dict]:
+        """Events from the alert system"""
+        events = []
+
+        for i, alert in enumerate((monitoring_plan.get('alert_system') or [])[:3]):
+            trigger_name = alert.get('trigger_name', 'Performance Alert')
+            high_severity = alert.get('severity') == 'high'
+            events.append({
+                'month': self._spread_month(i, 3),
+                'title': trigger_name if 'Alert' in trigger_name else f"Alert: {trigger_name}",
+                'description': f"Triggered condition: {alert.get('condition')} | Required action: {alert.get('action')}",
+                'direction': 'negative' if high_severity else 'neutral',
+                'magnitude': 'substantial' if high_severity else 'low',
+                'severity': alert.get('severity'),
+                'action': alert.get('action'),
+                'signals_affected': [trigger_name],
+                'event_category': 'alert'
+            })
+
+        return events
+
+    def _decision_events(self, monitoring_plan: Dict) -> List[Dict]:
+        """Events from the decision framework"""
+        events = []
+
+        for i, decision in enumerate((monitoring_plan.get('decision_framework') or [])[:2]):
+            action = decision.get('action', 'review')
+            events.append({
+                'month': self._spread_month(i, 2),
+                'title': f"Decision Point: {decision.get('scenario', 'Performance Review')}",
+                'description': f"Analysis indicates: {action.upper()} signal based on {decision.get('condition')} (Confidence: {decision.get('confidence_threshold')})",
+                'direction': 'positive' if action == 'buy' else 'negative' if action == 'sell' else 'neutral',
+                'action': action,
+                'signals_affected': ['Decision Framework'],
+                'event_category': 'decision'
+            })
+
+        return events
+
+    def _counter_thesis_events(self, monitoring_plan: Dict) -> List[Dict]:
+        """Events from counter-thesis monitoring"""
+        events = []
+
+        for i, risk in enumerate((monitoring_plan.get('counter_thesis_monitoring') or [])[:2]):
+            events.append({
+                'month': max(1, min((self.total_months // 3) * (i + 2), self.total_months)),
+                'title': f"Risk Alert: {risk.get('risk_scenario', 'Counter-Thesis Risk')}",
+                'description': f"Early warning detected via {risk.get('early_warning_metric')} below {risk.get('threshold')} threshold. {risk.get('mitigation_action')}",
+                'direction': 'negative',
+                'magnitude': 'substantial',
+                'signals_affected': [risk.get('early_warning_metric', 'Risk Signal')],
+                'event_category': 'risk'
+            })
+
+        return events
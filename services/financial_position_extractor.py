@@ -4,10 +4,10 @@ Extracts key financial positions and thesis statements from research documents
 """
 
 import logging
-import json
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from services.azure_openai_service import AzureOpenAIService
+from services.llm_json import parse_llm_json
 
 
 class FinancialPositionExtractor:
@@ -52,68 +52,110 @@ class FinancialPositionExtractor:
             logging.error(f"Financial position extraction failed: {str(e)}")
             return self._create_fallback_position(document_content)
     
+    def _build_extraction_messages(self, content: str) -> List[Dict[str, str]]:
+        """Chat messages asking the LLM for the primary financial position"""
+        extraction_prompt = f"""
+        Analyze this investment research document and extract the key financial position or investment thesis.
+        
+        Look for:
+        1. Investment recommendation (BUY/SELL/HOLD/TRIM/etc.)
+        2. Price targets and expected returns
+        3. Core investment thesis or key message
+        4. Key supporting arguments
+        5. Risk factors and scenarios
+        6. Time horizon for the position
+        
+        Document Content:
+        {content[:4000]}  # Limit content to avoid token limits
+        
+        Return a JSON response with this structure:
+        {{
+            "investment_position": "BUY/SELL/HOLD/TRIM",
+            "confidence_level": "HIGH/MEDIUM/LOW",
+            "thesis_statement": "Clear, concise investment thesis statement",
+            "expected_return": "Expected return percentage or target price",
+            "time_horizon": "Investment time frame",
+            "key_arguments": ["argument1", "argument2", "argument3"],
+            "risk_factors": ["risk1", "risk2"],
+            "company_name": "Primary company being analyzed",
+            "sector": "Industry sector",
+            "price_target": "Target price if mentioned",
+            "current_price": "Current price if mentioned"
+        }}
+        
+        Focus on extracting the most prominent investment position. If multiple positions exist, prioritize the primary recommendation.
+        Ensure the thesis_statement is concise but comprehensive, capturing the core investment rationale.
+        """
+        
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an expert financial analyst specializing in extracting investment positions from research documents. Return only valid JSON responses."
+            },
+            {
+                "role": "user",
+                "content": extraction_prompt
+            }
+        ]
+        
+        return messages
+    
     def _extract_position_with_ai(self, content: str, filename: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Use Azure OpenAI to extract financial position from document"""
         try:
-            extraction_prompt = f"""
-            Analyze this investment research document and extract the key financial position or investment thesis.
-            
-            Look for:
-            1. Investment recommendation (BUY/SELL/HOLD/TRIM/etc.)
-            2. Price targets and expected returns
-            3. Core investment thesis or key message
-            4. Key supporting arguments
-            5. Risk factors and scenarios
-            6. Time horizon for the position
-            
-            Document Content:
-            {content[:4000]}  # Limit content to avoid token limits
-            
-            Return a JSON response with this structure:
-            {{
-                "investment_position": "BUY/SELL/HOLD/TRIM",
-                "confidence_level": "HIGH/MEDIUM/LOW",
-                "thesis_statement": "Clear, concise investment thesis statement",
-                "expected_return": "Expected return percentage or target price",
-                "time_horizon": "Investment time frame",
-                "key_arguments": ["argument1", "argument2", "argument3"],
-                "risk_factors": ["risk1", "risk2"],
-                "company_name": "Primary company being analyzed",
-                "sector": "Industry sector",
-                "price_target": "Target price if mentioned",
-                "current_price": "Current price if mentioned"
-            }}
+            messages = self._build_extraction_messages(content)
             
-            Focus on extracting the most prominent investment position. If multiple positions exist, prioritize the primary recommendation.
-            Ensure the thesis_statement is concise but comprehensive, capturing the core investment rationale.
-            """
-            
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an expert financial analyst specializing in extracting investment positions from research documents. Return only valid JSON responses."
-                },
-                {
-                    "role": "user",
-                    "content": extraction_prompt
-                }
-            ]
-            
-            response = self.azure_service.generate_completion(messages, temperature=0.3, max_tokens=2000)
-            
-            if response:
-                try:
-                    return json.loads(response)
-                except json.JSONDecodeError:
-                    logging.warning("AI response was not valid JSON, attempting to parse")
-                    return self._parse_ai_response_text(response)
-            
-            return None
+            response = self.azure_service.generate_completion(
+                messages, temperature=0.3, max_tokens=2000, json_mode=True,
+                call_site='financial_position'
+            )
+            return self._interpret_ai_response(response)
             
         except Exception as e:
             logging.error(f"AI position extraction failed: {str(e)}")
             return None
     
+    def _interpret_ai_response(self, response: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Parse the LLM extraction response, falling back to line-by-line parsing"""
+        if not response:
+            return None
+        
+        parsed = parse_llm_json(response, "financial_position.extraction", dict)
+        if parsed is not None:
+            return parsed
+        logging.warning("AI response was not valid JSON, attempting to parse")
+        return self._parse_ai_response_text(response)
+    
+    def stream_financial_position(self, document_content: str,
+                                  filename: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming variant of extract_financial_position. Yields ('delta', text)
+        for each chunk of the LLM response as it arrives, then ('position', dict)
+        with the same combined result the blocking call returns.
+        """
+        try:
+            parts = []
+            for chunk in self.azure_service.stream_completion(
+                self._build_extraction_messages(document_content),
+                temperature=0.3, max_tokens=2000, json_mode=True,
+                call_site='financial_position'
+            ):
+                parts.append(chunk)
+                yield 'delta', chunk
+            
+            ai_position = self._interpret_ai_response(''.join(parts))
+            
+            if ai_position:
+                rule_based_position = self._extract_position_with_rules(document_content)
+                yield 'position', self._combine_extraction_results(ai_position, rule_based_position, document_content)
+            else:
+                logging.warning("AI extraction failed, using rule-based approach")
+                yield 'position', self._extract_position_with_rules(document_content)
+        
+        except Exception as e:
+            logging.error(f"Financial position extraction failed: {str(e)}")
+            yield 'position', self._create_fallback_position(document_content)
+    
     def _extract_position_with_rules(self, content: str) -> Dict[str, Any]:
         """Extract financial position using rule-based pattern matching"""
         content_lower = content.lower()
@@ -0,0 +1,323 @@
+"""
+Instrumentation
+
+In-process latency and throughput metrics exported in the Prometheus text
+format at ``/metrics``:
+
+- request timing per route (count, sum and p50/p95/p99 over a rolling window)
+- spans around LLM completions, outbound data-source HTTP calls and SQL
+  statements, recorded both globally and per route so the time a request
+  spends waiting on each dependency shows up next to its total latency
+- LLM outcomes per call site (a call that returns nothing sends the caller
+  down its fallback path), plus the token and JSON-parse counters kept by
+  prompt_budget and llm_json
+
+No client library is needed; the registry renders the exposition format
+itself. Quantiles come from the last WINDOW_SIZE observations of each series.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import Config
+
+PREFIX = 'thesis_'
+QUANTILES = (0.5, 0.95, 0.99)
+WINDOW_SIZE = 1024
+
+LabelValues = Tuple[str, ...]
+
+# Span seconds by kind for the request being handled on this thread/task
+_request_spans: ContextVar[Optional[Dict[str, float]]] = ContextVar('request_spans', default=None)
+
+
+def _quantiles(values) -> List[float]:
+    """QUANTILES of ``values`` with linear interpolation (numpy's default method)"""
+    ordered = sorted(values)
+    result = []
+    for quantile in QUANTILES:
+        position = quantile * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        result.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+    return result
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: LabelValues, values: LabelValues) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: LabelValues = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f'{self.name}{_labels(self.labelnames, labels)} {value:g}'
+                    for labels, value in sorted(self._values.items())]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Summary:
+    """Count, sum and rolling-window quantiles per label set"""
+
+    kind = 'summary'
+
+    def __init__(self, name: str, documentation: str, labelnames: LabelValues = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series: Dict[LabelValues, Tuple[List[float], deque]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0, 0.0], deque(maxlen=WINDOW_SIZE))
+            totals, window = series
+            totals[0] += 1
+            totals[1] += value
+            window.append(value)
+
+    def quantiles(self, *labels: str) -> Dict[float, float]:
+        with self._lock:
+            series = self._series.get(labels)
+            window = list(series[1]) if series else []
+        if not window:
+            return {}
+        return dict(zip(QUANTILES, _quantiles(window)))
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[0][0] if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = [(labels, tuple(totals), list(window))
+                      for labels, (totals, window) in sorted(self._series.items(), key=lambda item: item[0])]
+        lines = []
+        for labels, (count, total), window in series:
+            for quantile, value in zip(QUANTILES, _quantiles(window)):
+                quantile_label = _labels(self.labelnames + ('quantile',), labels + (str(quantile),))
+                lines.append(f'{self.name}{quantile_label} {value:.6g}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {total:.6g}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {count}')
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Named metrics plus collectors that turn counters kept elsewhere into
+    samples at scrape time
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, List[str]]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: LabelValues = ()) -> Counter:
+        return self._metrics.setdefault(PREFIX + name, Counter(PREFIX + name, documentation, labelnames))
+
+    def summary(self, name: str, documentation: str, labelnames: LabelValues = ()) -> Summary:
+        return self._metrics.setdefault(PREFIX + name, Summary(PREFIX + name, documentation, labelnames))
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, str, List[str]]]]) -> None:
+        """``collector()`` returns (name, type, help, sample lines) tuples"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        families = [(metric.name, metric.kind, metric.documentation, metric.samples())
+                    for metric in self._metrics.values()]
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logging.error(f"Metrics collector failed: {e}")
+
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+metrics = MetricsRegistry()
+
+request_seconds = metrics.summary('http_request_duration_seconds', 'Request latency by route',
+                                  ('method', 'route'))
+requests_total = metrics.counter('http_requests_total', 'Requests by route and status', ('method', 'route', 'status'))
+span_seconds = metrics.summary('span_duration_seconds', 'Dependency call latency by kind and target',
+                               ('kind', 'target'))
+route_span_seconds = metrics.summary('http_request_span_seconds',
+                                     'Time a request spent in each dependency kind', ('route', 'kind'))
+llm_calls_total = metrics.counter('llm_calls_total', 'LLM completions by call site and outcome',
+                                  ('call_site', 'outcome'))
+outbound_requests_total = metrics.counter('outbound_requests_total', 'Data-source HTTP calls by target and status',
+                                          ('target', 'status'))
+
+
+@contextmanager
+def span(kind: str, target: str) -> Iterator[None]:
+    """Time a dependency call (kind: 'llm', 'http' or 'db')"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_span(kind, target, time.perf_counter() - start)
+
+
+def _record_span(kind: str, target: str, elapsed: float) -> None:
+    span_seconds.observe(elapsed, kind, target)
+    totals = _request_spans.get()
+    if totals is not None:
+        totals[kind] = totals.get(kind, 0.0) + elapsed
+
+
+def record_llm_outcome(call_site: Optional[str], outcome: str) -> None:
+    """outcome: 'success', or why the caller will fall back ('unavailable', 'empty', 'error')"""
+    llm_calls_total.inc(call_site or 'unspecified', outcome)
+
+
+def record_outbound_status(target: str, status) -> None:
+    outbound_requests_total.inc(target, str(status))
+
+
+def llm_fallback_rate(call_site: Optional[str] = None) -> float:
+    """Share of LLM calls (optionally for one call site) that did not return content"""
+    calls = fallbacks = 0.0
+    for labels, value in list(llm_calls_total._values.items()):
+        if call_site is None or labels[0] == call_site:
+            calls += value
+            if labels[1] != 'success':
+                fallbacks += value
+    return fallbacks / calls if calls else 0.0
+
+
+_SQL_VERB = re.compile(r'^\s*(\w+)')
+
+
+def _statement_target(statement: str) -> str:
+    match = _SQL_VERB.match(statement or '')
+    return match.group(1).upper() if match else 'OTHER'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('query_start')
+    if not starts:
+        return
+    _record_span('db', _statement_target(statement), time.perf_counter() - starts.pop())
+
+
+def _collect_llm_counters():
+    from services.llm_json import parse_stats
+    from services.prompt_budget import token_usage_stats
+
+    usage = token_usage_stats()
+    tokens = [f'{PREFIX}llm_tokens_total{_labels(("call_site", "type"), (call_site, kind))} {counts[kind + "_tokens"]}'
+              for call_site, counts in usage.items() for kind in ('prompt', 'completion')]
+    parses = [f'{PREFIX}llm_json_parses_total{_labels(("call_site", "result"), (call_site, result))} {count}'
+              for call_site, counts in parse_stats().items() for result, count in counts.items()]
+    rate = [f'{PREFIX}llm_fallback_ratio {llm_fallback_rate():.6g}']
+    return [
+        (f'{PREFIX}llm_tokens_total', 'counter', 'LLM tokens by call site', tokens),
+        (f'{PREFIX}llm_json_parses_total', 'counter', 'LLM JSON responses parsed, repaired or failed', parses),
+        (f'{PREFIX}llm_fallback_ratio', 'gauge', 'Share of LLM calls that returned no content', rate),
+    ]
+
+
+metrics.add_collector(_collect_llm_counters)
+
+_engine_events_installed = False
+
+
+def instrument_engines() -> None:
+    """Time every SQL statement on every engine in the process"""
+    global _engine_events_installed
+    if _engine_events_installed:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _engine_events_installed = True
+
+
+def init_instrumentation(app) -> None:
+    """
+    Time every request and install the SQL statement listeners. Register
+    before other after_request hooks so the measured time includes them.
+    """
+    from flask import g, request
+
+    if not Config.INSTRUMENTATION_ENABLED:
+        return
+    instrument_engines()
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.request_spans_token = _request_spans.set({})
+
+    @app.after_request
+    def record_request_timing(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_seconds.observe(time.perf_counter() - started, request.method, route)
+        requests_total.inc(request.method, route, str(response.status_code))
+
+        for kind, seconds in (_request_spans.get() or {}).items():
+            route_span_seconds.observe(seconds, route, kind)
+        return response
+
+    @app.teardown_request
+    def clear_request_spans(exc):
+        token = g.pop('request_spans_token', None)
+        if token is not None:
+            _request_spans.reset(token)
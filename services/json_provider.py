@@ -0,0 +1,137 @@
+"""
+Fast JSON Provider
+
+Flask JSON provider backed by orjson when it is installed, falling back to the
+standard library otherwise. Both paths serialise datetimes as ISO 8601 and
+NumPy scalars/arrays as plain numbers and lists, so services can return
+simulation and backtest results without converting them first.
+
+``init_response_compression`` gzip-compresses (or brotli, when available)
+JSON responses above a size threshold for clients that accept it.
+"""
+
+import gzip
+import json
+import logging
+from datetime import date, time
+from typing import Any
+
+import numpy as np
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+from config import Config
+
+COMPRESSION_LEVEL = 6
+
+# Keyword arguments the orjson path can honour; anything else goes to the stdlib encoder
+_ORJSON_KWARGS = {'sort_keys', 'indent', 'separators'}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider using orjson for dumps/loads and responses
+    """
+
+    # Key order is preserved as built; sorting every response is wasted work
+    sort_keys = False
+    ensure_ascii = False
+
+    @staticmethod
+    def default(value: Any) -> Any:
+        """Types neither encoder handles natively"""
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, (date, time)):
+            # Only reached on the stdlib path; orjson writes the same ISO format itself
+            return value.isoformat()
+        if isinstance(value, (set, frozenset)):
+            return list(value)
+        return DefaultJSONProvider.default(value)  # Decimal, UUID, dataclasses, Markup
+
+    def _orjson_options(self, sort_keys: bool, indent) -> int:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        """Serialise to UTF-8 bytes without an intermediate str on the orjson path"""
+        if orjson is not None and kwargs.keys() <= _ORJSON_KWARGS and kwargs.get('indent') in (None, 2):
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options(
+                    kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent')))
+            except TypeError as e:
+                # orjson rejects e.g. integers beyond 64 bits; the stdlib encoder accepts them
+                logging.debug(f"orjson could not encode payload, using stdlib json: {e}")
+
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        return json.dumps(obj, **kwargs).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass  # Let the stdlib parser accept or report it (NaN literals, huge integers)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            dump_args = {'indent': 2}
+        else:
+            dump_args = {'separators': (',', ':')}
+        return self._app.response_class(self.dumps_bytes(obj, **dump_args), mimetype=self.mimetype)
+
+
+def compress_payload(data: bytes, accept_encoding) -> tuple:
+    """Pick the best accepted encoding; returns (encoding, body) or (None, data)"""
+    if brotli is not None and accept_encoding['br']:
+        return 'br', brotli.compress(data, quality=5)
+    if accept_encoding['gzip']:
+        return 'gzip', gzip.compress(data, compresslevel=COMPRESSION_LEVEL, mtime=0)
+    return None, data
+
+
+def init_response_compression(app) -> None:
+    """Compress large JSON responses for clients that accept gzip or brotli"""
+    if not Config.JSON_COMPRESSION_ENABLED:
+        return
+
+    @app.after_request
+    def compress_json_response(response):
+        if (response.mimetype != 'application/json' or response.is_streamed
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < Config.JSON_COMPRESSION_MIN_BYTES:
+            return response
+
+        encoding, body = compress_payload(data, request.accept_encodings)
+        if encoding:
+            response.set_data(body)
+            response.headers['Content-Encoding'] = encoding
+        return response
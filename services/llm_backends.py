@@ -0,0 +1,283 @@
+"""
+LLM Backends
+
+AzureOpenAIService talks to its client only through the OpenAI chat surface,
+``client.chat.completions.create(messages=..., model=..., stream=..., ...)``,
+returning an object with ``choices`` and ``usage`` (or, when streaming, an
+iterator of chunks with ``choices[0].delta.content``). Any object with that
+surface is a backend, selected with LLM_BACKEND:
+
+- ``azure``: the Azure OpenAI SDK client (default)
+- ``replay``: ReplayLLMClient, a deterministic local stand-in that answers
+  from recorded responses keyed by prompt hash, with configurable latency,
+  token rate, truncation and error injection
+- ``record``: the Azure client wrapped so every response is appended to the
+  recordings file for later replay
+
+Because the stand-in sits behind the real client surface, the services'
+prompt building, JSON parsing, token accounting and fallbacks all run exactly
+as they do against Azure.
+
+Recordings are JSON lines, matched in this order:
+
+    {"key": "<prompt_hash>", "response": "..."}          exact prompt
+    {"contains": "investment_position", "response": {}}  substring, file order
+    {"default": true, "response": "{}"}                  anything else
+
+``response`` may be a string or a JSON value (serialised on replay).
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import Config
+from services.prompt_budget import count_tokens
+
+LLM_BACKENDS = ('azure', 'replay', 'record')
+ERROR_KINDS = ('timeout', 'rate_limit', 'empty')
+
+
+class LLMTimeoutError(Exception):
+    """Injected stand-in for an API timeout"""
+
+
+class LLMRateLimitError(Exception):
+    """Injected stand-in for a 429 response"""
+
+
+def prompt_hash(messages: List[Dict[str, Any]]) -> str:
+    """Stable key for a prompt: SHA-256 of its roles and contents"""
+    normalised = [[message.get('role', ''), message.get('content', '')] for message in messages]
+    return hashlib.sha256(json.dumps(normalised, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    return '\n'.join(str(message.get('content', '')) for message in messages)
+
+
+class LatencyModel:
+    """
+    Sampled response latency in seconds from a spec string:
+    ``fixed:MS``, ``uniform:MIN_MS,MAX_MS`` or ``lognormal:MEDIAN_MS,SIGMA``
+    """
+
+    def __init__(self, spec: str = 'fixed:0'):
+        kind, _, args = spec.partition(':')
+        values = [float(value) for value in args.split(',') if value.strip()] or [0.0]
+        if kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        if kind == 'uniform' and len(values) != 2:
+            raise ValueError(f"uniform latency needs MIN_MS,MAX_MS: {spec}")
+        if kind == 'lognormal' and len(values) != 2:
+            raise ValueError(f"lognormal latency needs MEDIAN_MS,SIGMA: {spec}")
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'fixed':
+            return self.values[0] / 1000
+        if self.kind == 'uniform':
+            return rng.uniform(*self.values) / 1000
+        median, sigma = self.values
+        return rng.lognormvariate(math.log(max(median, 1e-6)), sigma) / 1000
+
+
+class _Completions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, messages, stream: bool = False, **kwargs):
+        return self._owner.create(messages, stream=stream, **kwargs)
+
+
+class ReplayLLMClient:
+    """
+    Deterministic local backend. Every random choice (latency, truncation,
+    injected errors) is drawn from an RNG seeded by the seed, the prompt hash
+    and how many times that prompt has been seen, so a run replays
+    identically however concurrent requests interleave.
+    """
+
+    def __init__(self, path: Optional[str] = None, entries: Optional[List[Dict[str, Any]]] = None,
+                 latency: Optional[str] = None, tokens_per_second: Optional[float] = None,
+                 truncation_rate: Optional[float] = None, error_rate: Optional[float] = None,
+                 error_kinds: Optional[List[str]] = None, seed: Optional[int] = None,
+                 sleep=time.sleep):
+        self.latency = LatencyModel(latency or Config.LLM_REPLAY_LATENCY)
+        self.tokens_per_second = Config.LLM_REPLAY_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+        self.truncation_rate = Config.LLM_REPLAY_TRUNCATION_RATE if truncation_rate is None else truncation_rate
+        self.error_rate = Config.LLM_REPLAY_ERROR_RATE if error_rate is None else error_rate
+        self.error_kinds = list(error_kinds or Config.LLM_REPLAY_ERROR_KINDS)
+        self.seed = Config.LLM_REPLAY_SEED if seed is None else seed
+        self.sleep = sleep
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+        self.exact: Dict[str, str] = {}
+        self.contains: List[tuple] = []
+        self.default = '{}'
+        if entries is None:
+            entries = self._read_entries(path or Config.LLM_REPLAY_PATH)
+        for entry in entries:
+            self.add(entry)
+
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.misses = 0
+
+    @staticmethod
+    def _read_entries(path: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(path):
+            logging.warning(f"LLM replay file {path} not found; every prompt gets the default response")
+            return []
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        response = entry.get('response', '')
+        response = response if isinstance(response, str) else json.dumps(response)
+        if 'key' in entry:
+            self.exact[entry['key']] = response
+        elif 'contains' in entry:
+            self.contains.append((entry['contains'], response))
+        elif entry.get('default'):
+            self.default = response
+
+    def lookup(self, messages: List[Dict[str, Any]]) -> Optional[str]:
+        key = prompt_hash(messages)
+        if key in self.exact:
+            return self.exact[key]
+        text = _prompt_text(messages)
+        for needle, response in self.contains:
+            if needle in text:
+                return response
+        return None
+
+    def _rng(self, key: str) -> random.Random:
+        with self._lock:
+            occurrence = self._seen.get(key, 0)
+            self._seen[key] = occurrence + 1
+            self.calls += 1
+        return random.Random(f'{self.seed}:{key}:{occurrence}')
+
+    def create(self, messages, stream: bool = False, max_tokens: Optional[int] = None,
+               max_completion_tokens: Optional[int] = None, **kwargs):
+        key = prompt_hash(messages)
+        rng = self._rng(key)
+        content = self.lookup(messages)
+        if content is None:
+            with self._lock:
+                self.misses += 1
+            content = self.default
+
+        prompt_tokens = count_tokens(_prompt_text(messages))
+        finish_reason = 'stop'
+        limit = max_completion_tokens or max_tokens
+        if limit and count_tokens(content) > limit:
+            content, finish_reason = self._truncate(content, limit), 'length'
+        elif content and rng.random() < self.truncation_rate:
+            content, finish_reason = content[:rng.randint(1, len(content))], 'length'
+
+        error = rng.choice(self.error_kinds) if self.error_kinds and rng.random() < self.error_rate else None
+        delay = self.latency.sample(rng)
+        if error in ('timeout', 'rate_limit'):
+            self.sleep(delay)
+            raise (LLMTimeoutError('Request timed out (injected)') if error == 'timeout'
+                   else LLMRateLimitError('Rate limit exceeded (injected)'))
+        if error == 'empty':
+            content = ''
+
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=count_tokens(content))
+        if stream:
+            return self._stream(content, finish_reason, usage, delay)
+
+        self.sleep(delay + self._generation_seconds(content))
+        message = SimpleNamespace(role='assistant', content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason=finish_reason)],
+                               usage=usage)
+
+    def _generation_seconds(self, content: str) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return count_tokens(content) / self.tokens_per_second
+
+    @staticmethod
+    def _truncate(content: str, max_tokens: int) -> str:
+        """Roughly the first ``max_tokens`` tokens, as a length-limited model returns"""
+        low, high = 0, len(content)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(content[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return content[:low]
+
+    def _stream(self, content: str, finish_reason: str, usage, delay: float) -> Iterator[SimpleNamespace]:
+        """Chunks of about four characters, paced at the configured token rate"""
+        self.sleep(delay)
+        pieces = [content[start:start + 4] for start in range(0, len(content), 4)]
+        for index, piece in enumerate(pieces):
+            if self.tokens_per_second:
+                self.sleep(1 / self.tokens_per_second)
+            last = index == len(pieces) - 1
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta,
+                                                           finish_reason=finish_reason if last else None)],
+                                  usage=usage if last else None)
+
+
+class RecordingLLMClient:
+    """
+    Wraps a real client and appends each (prompt hash, response) to the
+    recordings file, so a live session can be replayed offline
+    """
+
+    def __init__(self, client, path: Optional[str] = None):
+        self.client = client
+        self.path = path or Config.LLM_REPLAY_PATH
+        self.chat = SimpleNamespace(completions=_Completions(self))
+        self._lock = threading.Lock()
+
+    def create(self, messages, stream: bool = False, **kwargs):
+        response = self.client.chat.completions.create(messages=messages, stream=stream, **kwargs)
+        if not stream:
+            if response.choices:
+                self._record(messages, response.choices[0].message.content or '')
+            return response
+        return self._record_stream(messages, response)
+
+    def _record_stream(self, messages, stream) -> Iterator[Any]:
+        parts = []
+        for chunk in stream:
+            if chunk.choices and getattr(chunk.choices[0].delta, 'content', None):
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+        self._record(messages, ''.join(parts))
+
+    def _record(self, messages, content: str) -> None:
+        line = json.dumps({'key': prompt_hash(messages), 'response': content}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line + '\n')
+
+
+def build_llm_client(backend: str, azure_factory):
+    """Client for LLM_BACKEND; ``azure_factory`` builds the Azure SDK client"""
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{backend}' (expected one of {', '.join(LLM_BACKENDS)})")
+    if backend == 'replay':
+        logging.info("Using the local LLM replay backend")
+        return ReplayLLMClient()
+    client = azure_factory()
+    if backend == 'record' and client is not None:
+        return RecordingLLMClient(client)
+    return client
@@ -0,0 +1,255 @@
+"""
+LLM JSON Parsing
+
+Shared parser for JSON returned by the LLM services. Text is fed through an
+incremental scanner that tracks string/escape state and the open bracket
+stack, so the first complete top-level value is located exactly (no greedy
+regex) and output cut off by ``max_tokens`` can be repaired by closing the
+open string and brackets. Parsed values are checked against an optional
+lightweight schema.
+
+Every call site is named; successes, repairs and failures are counted per
+call site so wasted LLM calls show up in ``parse_stats()``.
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_stats_lock = threading.Lock()
+_parse_successes: Counter = Counter()
+_parse_repairs: Counter = Counter()
+_parse_failures: Counter = Counter()
+
+_CLOSERS = {'{': '}', '[': ']'}
+MAX_CANDIDATES = 5
+_JSON_NUMBER = re.compile(r'-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?')
+
+
+class StreamingJSONParser:
+    """
+    Incremental scanner for one top-level JSON value inside free text.
+    Feed chunks as they arrive; ``complete`` turns true once the value closes.
+    """
+
+    def __init__(self):
+        self.buffer: List[str] = []
+        self.stack: List[str] = []
+        self.started = False
+        self.complete = False
+        self.in_string = False
+        self.escaped = False
+        self.consumed = 0
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of text; returns True once a full value has been read"""
+        for char in chunk:
+            if self.complete:
+                break
+            self.consumed += 1
+
+            if not self.started:
+                if char in _CLOSERS:
+                    self.started = True
+                    self.stack.append(char)
+                    self.buffer.append(char)
+                continue
+
+            self.buffer.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in _CLOSERS:
+                self.stack.append(char)
+            elif char in '}]':
+                if self.stack and _CLOSERS[self.stack[-1]] == char:
+                    self.stack.pop()
+                if not self.stack:
+                    self.complete = True
+
+        return self.complete
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.buffer)
+
+    def repaired(self) -> Optional[str]:
+        """
+        Close a value that was cut off: finish the open string, drop a dangling
+        key, separator or partial literal, then close open brackets in order.
+        """
+        if not self.started:
+            return None
+        if self.complete:
+            return self.text
+
+        text = self.text
+        if self.in_string:
+            if self.escaped:
+                text = text[:-1]
+            text += '"'
+
+        stack = list(self.stack)
+        text = _trim_dangling(text, stack)
+        return text + ''.join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def _trim_dangling(text: str, stack: List[str]) -> str:
+    """Remove a trailing token that cannot be closed into valid JSON"""
+    while True:
+        stripped = text.rstrip()
+        if not stripped:
+            return stripped
+
+        last = stripped[-1]
+        if last in ',:':
+            text = stripped[:-1]
+            # A dangling ':' leaves its key behind; drop the key as well
+            if last == ':':
+                text = _drop_trailing_string(text)
+            continue
+
+        if last == '"' and stack and stack[-1] == '{':
+            # A string directly after '{' or ',' inside an object is a key without a value
+            before = _drop_trailing_string(stripped).rstrip()
+            if before.endswith(('{', ',')):
+                text = before
+                continue
+
+        if last.isalnum() or last in '-+.':
+            # Partial literal such as 'tru', 'nul' or '1.'
+            token_start = len(stripped)
+            while token_start > 0 and (stripped[token_start - 1].isalnum() or stripped[token_start - 1] in '-+.'):
+                token_start -= 1
+            token = stripped[token_start:]
+            if token not in ('true', 'false', 'null') and not _JSON_NUMBER.fullmatch(token):
+                text = stripped[:token_start]
+                continue
+
+        return stripped
+
+
+def _drop_trailing_string(text: str) -> str:
+    """Remove a trailing quoted string"""
+    stripped = text.rstrip()
+    if not stripped.endswith('"'):
+        return stripped
+
+    index = len(stripped) - 2
+    while index >= 0:
+        if stripped[index] == '"' and (index == 0 or stripped[index - 1] != '\\'):
+            return stripped[:index]
+        index -= 1
+    return stripped
+
+
+def strip_code_fences(response: str) -> str:
+    """Drop markdown code fences around a JSON payload"""
+    cleaned = response.strip()
+    if cleaned.startswith('```'):
+        cleaned = cleaned.split('\n', 1)[1] if '\n' in cleaned else cleaned[3:]
+    if cleaned.endswith('```'):
+        cleaned = cleaned[:-3]
+    return cleaned.strip()
+
+
+def matches_schema(value: Any, schema: Any) -> bool:
+    """
+    Check a parsed value against a lightweight schema:
+    a type or tuple of types, a dict of required key -> sub-schema,
+    or a one-element list giving the schema of every item.
+    """
+    if schema is None:
+        return True
+    if isinstance(schema, dict):
+        return isinstance(value, dict) and all(
+            key in value and matches_schema(value[key], sub_schema) for key, sub_schema in schema.items()
+        )
+    if isinstance(schema, list):
+        return isinstance(value, list) and all(matches_schema(item, schema[0]) for item in value)
+    return isinstance(value, schema)
+
+
+def _record(counter: Counter, call_site: str):
+    with _stats_lock:
+        counter[call_site] += 1
+
+
+def parse_llm_json(response: Optional[str], call_site: str, schema: Any = None) -> Optional[Any]:
+    """
+    Parse the first JSON value in an LLM response, repairing truncated output.
+    Returns None (and counts a failure for ``call_site``) when nothing usable
+    is found or the value does not match ``schema``.
+    """
+    if not response or not response.strip():
+        _record(_parse_failures, call_site)
+        logger.warning(f"Empty LLM response for {call_site}")
+        return None
+
+    remaining = strip_code_fences(response)
+    failure = 'No JSON found'
+
+    # A value that fails to parse or match the schema may be prose like "[1]";
+    # keep scanning later values before giving up
+    for _ in range(MAX_CANDIDATES):
+        parser = StreamingJSONParser()
+        parser.feed(remaining)
+        remaining = remaining[parser.consumed:]
+
+        candidate = parser.text if parser.complete else parser.repaired()
+        if candidate is None:
+            break
+
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError as e:
+            failure = f'JSON parsing failed: {str(e)}'
+        else:
+            if matches_schema(value, schema):
+                if parser.complete:
+                    _record(_parse_successes, call_site)
+                else:
+                    _record(_parse_repairs, call_site)
+                    logger.info(f"Repaired truncated LLM JSON for {call_site}")
+                return value
+            failure = 'JSON does not match the expected schema'
+
+        if not parser.complete:
+            break
+
+    _record(_parse_failures, call_site)
+    logger.warning(f"{failure} in LLM response for {call_site}")
+    return None
+
+
+def parse_stats() -> Dict[str, Dict[str, int]]:
+    """Per call site counts of parsed, repaired and failed LLM responses"""
+    with _stats_lock:
+        call_sites = set(_parse_successes) | set(_parse_repairs) | set(_parse_failures)
+        return {
+            call_site: {
+                'parsed': _parse_successes[call_site],
+                'repaired': _parse_repairs[call_site],
+                'failed': _parse_failures[call_site]
+            }
+            for call_site in sorted(call_sites)
+        }
+
+
+def reset_parse_stats():
+    with _stats_lock:
+        _parse_successes.clear()
+        _parse_repairs.clear()
+        _parse_failures.clear()
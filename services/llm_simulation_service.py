@@ -5,11 +5,11 @@ Uses Azure OpenAI exclusively for authentic simulation data generation,
 removing all algorithmic fallbacks to ensure data integrity.
 """
 
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from services.azure_openai_service import AzureOpenAIService
+from services.llm_json import parse_llm_json
 
 
 class LLMSimulationService:
@@ -122,15 +122,16 @@ Return JSON format only:
         
         try:
             response = self.ai_service.generate_completion(
-                messages, temperature=0.7, max_tokens=2000
+                messages, temperature=0.7, max_tokens=2000, json_mode=True
             )
             
             if not response:
                 raise Exception("Azure OpenAI returned empty response")
             
             # Parse the JSON response
-            cleaned_response = self._clean_json_response(response)
-            data = json.loads(cleaned_response)
+            data = parse_llm_json(response, "llm_simulation.performance", dict)
+            if data is None:
+                raise Exception("Could not parse performance forecast JSON")
             
             market_data = data.get('market_performance', [])
             thesis_data = data.get('thesis_performance', [])
@@ -198,10 +199,9 @@ Return JSON array only:
                 raise Exception("Azure OpenAI returned empty response for events")
             
             # Parse the JSON response
-            cleaned_response = self._clean_json_response(response)
-            events_data = json.loads(cleaned_response)
+            events_data = parse_llm_json(response, "llm_simulation.events", list)
             
-            if not isinstance(events_data, list):
+            if events_data is None:
                 raise Exception("Expected array of events")
             
             # Format events with additional metadata
@@ -272,15 +272,16 @@ Return JSON format:
         
         try:
             response = self.ai_service.generate_completion(
-                messages, temperature=0.6, max_tokens=1500
+                messages, temperature=0.6, max_tokens=1500, json_mode=True
             )
             
             if not response:
                 raise Exception("Azure OpenAI returned empty response for scenario analysis")
             
             # Parse the JSON response
-            cleaned_response = self._clean_json_response(response)
-            analysis = json.loads(cleaned_response)
+            analysis = parse_llm_json(response, "llm_simulation.scenario_analysis", dict)
+            if analysis is None:
+                raise Exception("Could not parse scenario analysis JSON")
             
             return analysis
             
@@ -288,35 +289,6 @@ Return JSON format:
             logging.error(f"LLM scenario analysis failed: {str(e)}")
             raise Exception(f"Failed to generate LLM scenario analysis: {str(e)}")
     
-    def _clean_json_response(self, response: str) -> str:
-        """
-        Clean Azure OpenAI response to extract valid JSON
-        """
-        cleaned = response.strip()
-        
-        # Remove markdown code blocks
-        if cleaned.startswith('```json'):
-            cleaned = cleaned[7:]
-        elif cleaned.startswith('```'):
-            cleaned = cleaned[3:]
-        
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]
-        
-        cleaned = cleaned.strip()
-        
-        # Find JSON object or array boundaries
-        if cleaned.startswith('{'):
-            end = cleaned.rfind('}')
-            if end != -1:
-                cleaned = cleaned[:end+1]
-        elif cleaned.startswith('['):
-            end = cleaned.rfind(']')
-            if end != -1:
-                cleaned = cleaned[:end+1]
-        
-        return cleaned
-    
     def _generate_timeline_labels(self, time_horizon: int) -> List[str]:
         """
         Generate timeline labels for the simulation
@@ -2,6 +2,7 @@ import logging
 import json
 from typing import Dict, Any, List, Optional
 from services.azure_openai_service import AzureOpenAIService
+from services.llm_json import parse_llm_json
 
 class MarketSentimentService:
     """
@@ -61,7 +62,7 @@ class MarketSentimentService:
             """
             
             messages = [{"role": "user", "content": prompt}]
-            response = self.openai_service.generate_completion(messages, temperature=0.3)
+            response = self.openai_service.generate_completion(messages, temperature=0.3, json_mode=True)
             
             return self._parse_json_response(response, "company_context")
             
@@ -116,7 +117,7 @@ class MarketSentimentService:
             """
             
             messages = [{"role": "user", "content": prompt}]
-            response = self.openai_service.generate_completion(messages, temperature=0.4)
+            response = self.openai_service.generate_completion(messages, temperature=0.4, json_mode=True)
             
             consensus_data = self._parse_json_response(response, "consensus_ratings")
             
@@ -173,7 +174,7 @@ class MarketSentimentService:
             """
             
             messages = [{"role": "user", "content": prompt}]
-            response = self.openai_service.generate_completion(messages, temperature=0.5)
+            response = self.openai_service.generate_completion(messages, temperature=0.5, json_mode=True)
             
             return self._parse_json_response(response, "market_positioning")
             
@@ -246,20 +247,10 @@ class MarketSentimentService:
     
     def _parse_json_response(self, response: str, step_name: str) -> Dict[str, Any]:
         """Parse JSON response with error handling"""
-        try:
-            # Extract JSON from response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = response[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                raise ValueError("No JSON found in response")
-                
-        except Exception as e:
-            self.logger.error(f"JSON parsing failed for {step_name}: {str(e)}")
+        parsed = parse_llm_json(response, f"market_sentiment.{step_name}", dict)
+        if parsed is None:
             return self._get_fallback_data(step_name)
+        return parsed
     
     def _get_fallback_data(self, step_name: str) -> Dict[str, Any]:
         """Provide fallback data when parsing fails"""
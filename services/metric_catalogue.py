@@ -0,0 +1,126 @@
+"""
+Metric Catalogue
+
+metric_dictionary.json compiled once into flat lookup tables so metric
+selection is a dictionary hit rather than a recursive walk of the nested JSON
+on every call:
+
+- entries: Eagle metric code -> where it sits (category, group, path, timeframe)
+- category_of: metric code -> category
+- primary_metrics / summary_metrics: per-category metric lists, precomputed
+  with MetricSelector's primary-metric extraction rules
+- by_use_case / by_timeframe: reverse indexes
+- an inverted token index for free-text lookup (``search``)
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+CATEGORIES = ('growth_metrics', 'valuation_metrics', 'profitability_metrics', 'risk_metrics', 'market_metrics')
+
+# Path keys that name a reporting period rather than a metric variant
+TIMEFRAME_KEYS = re.compile(r'^(current|forecast|forward(_\d+)?|historical|ytd|\d+yr)$')
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def extract_primary_metric_names(metric_group: Dict[str, Any], target_list: List[str]) -> None:
+    """
+    Primary metric codes in a nested group: plain values, the 'current' (else
+    'historical') variant of a timeframe dict, recursing into other dicts
+    """
+    for key, value in metric_group.items():
+        if isinstance(value, str) and not key.startswith('_') and key != 'use_cases':
+            target_list.append(value)
+        elif isinstance(value, dict) and key != 'use_cases':
+            if 'current' in value:
+                target_list.append(value['current'])
+            elif 'historical' in value:
+                target_list.append(value['historical'])
+            else:
+                extract_primary_metric_names(value, target_list)
+
+
+@dataclass(frozen=True)
+class CatalogueEntry:
+    """One Eagle metric code and where it sits in the dictionary"""
+    code: str
+    category: str
+    group: str
+    path: Tuple[str, ...]
+    timeframe: Optional[str]
+    use_cases: Tuple[str, ...]
+
+
+class MetricCatalogue:
+    """
+    Flat, indexed view of a parsed metric dictionary
+    """
+
+    def __init__(self, metric_dict: Dict[str, Any]):
+        self.metric_dict = metric_dict or {}
+        self.entries: Dict[str, CatalogueEntry] = {}
+        self.category_of: Dict[str, str] = {}
+        self.primary_metrics: Dict[str, List[str]] = {}
+        self.summary_metrics: Dict[str, List[str]] = {}
+        self.by_use_case: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.by_timeframe: Dict[str, List[str]] = defaultdict(list)
+        self._tokens: Dict[str, set] = defaultdict(set)
+
+        for category, category_data in self.metric_dict.get('metric_categories', {}).items():
+            groups = category_data.get('metrics', {})
+
+            # Per-group extraction feeds the comprehensive thesis set; the
+            # whole-category walk is the shorter list DataAdapter requests
+            self.primary_metrics[category] = []
+            for group in groups.values():
+                extract_primary_metric_names(group, self.primary_metrics[category])
+            self.summary_metrics[category] = []
+            extract_primary_metric_names(groups, self.summary_metrics[category])
+
+            for group_name, group in groups.items():
+                use_cases = tuple(group.get('use_cases', []))
+                for use_case in use_cases:
+                    self.by_use_case[use_case.lower()].append(group)
+                self._add_group(category, group_name, group, (), use_cases)
+
+        self.by_use_case = dict(self.by_use_case)
+        self.by_timeframe = dict(self.by_timeframe)
+        self._position = {code: position for position, code in enumerate(self.entries)}
+
+    def _add_group(self, category: str, group_name: str, node: Dict[str, Any],
+                   path: Tuple[str, ...], use_cases: Tuple[str, ...]) -> None:
+        for key, value in node.items():
+            if key == 'use_cases' or key.startswith('_'):
+                continue
+            if isinstance(value, dict):
+                self._add_group(category, group_name, value, path + (key,), use_cases)
+            elif isinstance(value, str) and value not in self.entries:
+                timeframe = key if TIMEFRAME_KEYS.match(key) else None
+                entry = CatalogueEntry(value, category, group_name, path + (key,), timeframe, use_cases)
+                self.entries[value] = entry
+                self.category_of[value] = category
+                if timeframe:
+                    self.by_timeframe[timeframe].append(value)
+
+                terms = [value, category, group_name, *entry.path, *use_cases]
+                for token in tokenize(' '.join(terms)):
+                    self._tokens[token].add(value)
+
+    @property
+    def all_metrics(self) -> List[str]:
+        return list(self.entries)
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Metric codes ranked by how many query tokens they match (ties in dictionary order)"""
+        hits: Dict[str, int] = defaultdict(int)
+        for token in set(tokenize(query)):
+            for code in self._tokens.get(token, ()):
+                hits[code] += 1
+        return sorted(hits, key=lambda code: (-hits[code], self._position[code]))[:limit]
@@ -7,22 +7,53 @@ import json
 from typing import List, Dict, Any
 import os
 import logging
+import threading
+from services.metric_catalogue import CATEGORIES, MetricCatalogue, extract_primary_metric_names
 
 class MetricSelector:
     """Helper class for selecting relevant metrics based on analysis needs"""
     
+    # Compiled catalogues keyed by (path, mtime); the file is read and indexed once per process
+    _catalogues: Dict[Any, MetricCatalogue] = {}
+    _catalogues_lock = threading.Lock()
+    
+    # Comprehensive category mapping for metric names
+    CATEGORY_ALIASES = {
+        'Growth': 'growth_metrics',
+        'Profitability': 'profitability_metrics', 
+        'Valuation': 'valuation_metrics',
+        'Risk': 'risk_metrics',
+        'Market': 'market_metrics',
+        'Revenue Growth Rate': 'growth_metrics',
+        'Return on Equity': 'profitability_metrics',
+        'Debt to Equity Ratio': 'risk_metrics',
+        'Operating Margin': 'profitability_metrics',
+        'Free Cash Flow': 'profitability_metrics',
+        'P/E Ratio': 'valuation_metrics',
+        'Price to Book': 'valuation_metrics'
+    }
+    
     def __init__(self, dictionary_path: str = 'metric_dictionary.json'):
         """Initialize the metric selector with the metric dictionary"""
+        self.catalogue = self._load_catalogue(dictionary_path)
+        self.metric_dict = self.catalogue.metric_dict
+    
+    @classmethod
+    def _load_catalogue(cls, dictionary_path: str) -> MetricCatalogue:
+        """Shared, read-only catalogue compiled from the metric dictionary"""
         try:
-            if os.path.exists(dictionary_path):
-                with open(dictionary_path, 'r') as f:
-                    self.metric_dict = json.load(f)
-            else:
+            if not os.path.exists(dictionary_path):
                 logging.error(f"Metric dictionary not found at {dictionary_path}")
-                self.metric_dict = {}
+                return MetricCatalogue({})
+            key = (os.path.abspath(dictionary_path), os.path.getmtime(dictionary_path))
+            with cls._catalogues_lock:
+                if key not in cls._catalogues:
+                    with open(dictionary_path, 'r') as f:
+                        cls._catalogues[key] = MetricCatalogue(json.load(f))
+                return cls._catalogues[key]
         except Exception as e:
             logging.error(f"Failed to load metric dictionary: {e}")
-            self.metric_dict = {}
+            return MetricCatalogue({})
     
     def get_metrics_for_analysis(self, analysis_type: str) -> Dict[str, List[str]]:
         """Get primary and supporting metrics for a specific analysis type"""
@@ -34,24 +65,8 @@ class MetricSelector:
     
     def get_metrics_by_category(self, category: str) -> Dict[str, Any]:
         """Get all metrics within a specific category"""
-        # Comprehensive category mapping for metric names
-        category_mapping = {
-            'Growth': 'growth_metrics',
-            'Profitability': 'profitability_metrics', 
-            'Valuation': 'valuation_metrics',
-            'Risk': 'risk_metrics',
-            'Market': 'market_metrics',
-            'Revenue Growth Rate': 'growth_metrics',
-            'Return on Equity': 'profitability_metrics',
-            'Debt to Equity Ratio': 'risk_metrics',
-            'Operating Margin': 'profitability_metrics',
-            'Free Cash Flow': 'profitability_metrics',
-            'P/E Ratio': 'valuation_metrics',
-            'Price to Book': 'valuation_metrics'
-        }
-        
         # Use mapping if available, otherwise use category as-is
-        mapped_category = category_mapping.get(category, category)
+        mapped_category = self.CATEGORY_ALIASES.get(category, category)
         
         if not self.metric_dict or mapped_category not in self.metric_dict.get('metric_categories', {}):
             # Return default structure instead of erroring
@@ -71,17 +86,23 @@ class MetricSelector:
     
     def find_metrics_by_use_case(self, use_case: str) -> List[Dict[str, Any]]:
         """Find metrics that support a specific use case"""
-        matching_metrics = []
-        
-        if not self.metric_dict:
-            return matching_metrics
-        
-        for category in self.metric_dict.get('metric_categories', {}).values():
-            for metric_group in category.get('metrics', {}).values():
-                if 'use_cases' in metric_group and use_case.lower() in [uc.lower() for uc in metric_group['use_cases']]:
-                    matching_metrics.append(metric_group)
-        
-        return matching_metrics
+        return list(self.catalogue.by_use_case.get(use_case.lower(), []))
+    
+    def get_metrics_by_timeframe(self, timeframe: str) -> List[str]:
+        """Metric codes reported for a timeframe ('current', 'forward_4', '3yr', ...)"""
+        return list(self.catalogue.by_timeframe.get(timeframe, []))
+    
+    def get_metric_category(self, metric_name: str) -> str:
+        """Category of a metric code, or None when it is not in the dictionary"""
+        return self.catalogue.category_of.get(metric_name)
+    
+    def get_category_metric_names(self, category: str) -> List[str]:
+        """Primary metric codes requested for a category (category names or aliases)"""
+        return list(self.catalogue.summary_metrics.get(self.CATEGORY_ALIASES.get(category, category), []))
+    
+    def search_metrics(self, query: str, limit: int = 10) -> List[str]:
+        """Free-text metric lookup, e.g. 'revenue growth forecast'"""
+        return self.catalogue.search(query, limit)
     
     def get_growth_metrics(self, timeframe: str = None) -> Dict[str, Any]:
         """Get growth-related metrics, optionally filtered by timeframe"""
@@ -130,20 +151,7 @@ class MetricSelector:
     
     def get_all_available_metrics(self) -> List[str]:
         """Get a flat list of all available metric names"""
-        metrics = []
-        
-        if not self.metric_dict:
-            return metrics
-        
-        def extract_metrics(data: Dict[str, Any]):
-            for key, value in data.items():
-                if isinstance(value, str) and not key.startswith('_'):
-                    metrics.append(value)
-                elif isinstance(value, dict):
-                    extract_metrics(value)
-        
-        extract_metrics(self.metric_dict.get('metric_categories', {}))
-        return list(set(metrics))  # Remove duplicates
+        return self.catalogue.all_metrics
 
     def generate_graphql_query(self, metrics: List[str], entity_id: str = "BDRXDB4") -> str:
         """Generate a GraphQL query for the specified metrics"""
@@ -171,34 +179,8 @@ class MetricSelector:
 
     def get_comprehensive_metrics_for_thesis(self, company_focus: str = None) -> Dict[str, List[str]]:
         """Get a comprehensive set of metrics for thesis analysis"""
-        comprehensive_metrics = {
-            'growth_metrics': [],
-            'valuation_metrics': [],
-            'profitability_metrics': [],
-            'risk_metrics': [],
-            'market_metrics': []
-        }
-        
-        # Get key metrics from each category
-        for category in comprehensive_metrics.keys():
-            category_data = self.get_metrics_by_category(category.replace('_metrics', '_metrics'))
-            if category_data and 'metrics' in category_data:
-                # Extract primary metric names from each category
-                for metric_group in category_data['metrics'].values():
-                    self._extract_primary_metric_names(metric_group, comprehensive_metrics[category])
-        
-        return comprehensive_metrics
+        return {category: list(self.catalogue.primary_metrics.get(category, [])) for category in CATEGORIES}
     
     def _extract_primary_metric_names(self, metric_group: Dict[str, Any], target_list: List[str]):
         """Helper to extract metric names from nested structure"""
-        for key, value in metric_group.items():
-            if isinstance(value, str) and not key.startswith('_') and key != 'use_cases':
-                target_list.append(value)
-            elif isinstance(value, dict) and key != 'use_cases':
-                if 'current' in value:
-                    target_list.append(value['current'])
-                elif 'historical' in value:
-                    target_list.append(value['historical'])
-                else:
-                    # Recursively extract from nested dicts
-                    self._extract_primary_metric_names(value, target_list)
\ No newline at end of file
+        extract_primary_metric_names(metric_group, target_list)
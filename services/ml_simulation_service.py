@@ -10,8 +10,10 @@ import logging
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 from services.azure_openai_service import AzureOpenAIService
+from services.event_kernel import EventKernel
+from services.llm_json import parse_llm_json
 
 
 class MLSimulationService:
@@ -19,69 +21,25 @@ class MLSimulationService:
     Hybrid simulation service combining LLM analysis with ML price modeling
     """
     
+    DEFAULT_SEED = 42
+    THESIS_SEED_OFFSET = 81  # Thesis path uses a different seed than the market baseline
+    
     def __init__(self):
         self.ai_service = AzureOpenAIService()
         
     def generate_thesis_simulation(self, thesis, time_horizon: int, scenario: str, 
                                  volatility: str, include_events: bool, 
-                                 monitoring_plan: Optional[Dict] = None) -> Dict[str, Any]:
+                                 monitoring_plan: Optional[Dict] = None,
+                                 seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Generate thesis simulation using intelligent analysis + ML price modeling
         """
         
         try:
-            # Step 1: Extract thesis parameters using intelligent analysis
-            thesis_params = self._extract_thesis_parameters_via_llm(thesis, scenario, volatility)
-            
-            # Step 2: Generate ML-based price forecast using extracted parameters
-            performance_data = self._generate_ml_price_forecast(
-                thesis_params, time_horizon, scenario, volatility
-            )
-            
-            # Step 3: Generate market events using monitoring plan or intelligent analysis
-            events = []
-            if include_events:
-                if monitoring_plan:
-                    events = self._generate_monitoring_based_events(
-                        thesis_params, time_horizon, scenario, monitoring_plan, performance_data
-                    )
-                else:
-                    events = self._generate_intelligent_events(thesis_params, time_horizon, scenario)
-            
-            # Step 4: Generate scenario analysis using intelligent analysis
-            scenario_analysis = self._generate_intelligent_scenario_analysis(
-                thesis_params, scenario, time_horizon, performance_data
-            )
-            
-            # Step 5: Generate alert triggers based on simulation results
-            alert_triggers = self._generate_alert_triggers(thesis, performance_data, events, scenario)
-            
-            # Create timeline
-            timeline = self._generate_timeline_labels(time_horizon)
-            
-            return {
-                'performance_data': performance_data,
-                'timeline': timeline,
-                'chart_data': {
-                    'performance_data': performance_data,
-                    'timeline': timeline
-                },
-                'events': events,
-                'alert_triggers': alert_triggers,
-                'scenario_analysis': scenario_analysis,
-                'thesis_parameters': thesis_params,
-                'simulation_metadata': {
-                    'thesis_id': getattr(thesis, 'id', 'test'),
-                    'thesis_title': getattr(thesis, 'title', 'Investment Thesis Analysis'),
-                    'scenario': scenario,
-                    'volatility': volatility,
-                    'time_horizon': time_horizon,
-                    'include_events': include_events,
-                    'generated_at': datetime.utcnow().isoformat(),
-                    'data_source': 'ML Mathematical Analysis',
-                    'ml_model': 'Geometric Brownian Motion with Thesis Parameters'
-                }
-            }
+            stages = dict(self.iter_simulation_stages(
+                thesis, time_horizon, scenario, volatility, include_events, monitoring_plan, seed
+            ))
+            return self.assemble_simulation_result(stages)
             
         except Exception as e:
             logging.error(f"ML simulation generation failed: {str(e)}")
@@ -92,6 +50,129 @@ class MLSimulationService:
                 'action_needed': 'Please try again or check Azure OpenAI service status.'
             }
     
+    def iter_simulation_stages(self, thesis, time_horizon: int, scenario: str,
+                               volatility: str, include_events: bool,
+                               monitoring_plan: Optional[Dict] = None,
+                               seed: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the simulation as a sequence of (stage, payload) pairs so callers can
+        stream the numeric forecast before the slower narrative parts are ready.
+        Stages: parameters, forecast, events, alerts, narrative, metadata.
+        """
+        if seed is None:
+            seed = self.DEFAULT_SEED
+        
+        # Step 1: Extract thesis parameters using intelligent analysis
+        thesis_params = self._extract_thesis_parameters_via_llm(thesis, scenario, volatility)
+        yield 'parameters', thesis_params
+        
+        # Step 2: Schedule market events from the monitoring plan or intelligent analysis
+        kernel = self._build_event_kernel(
+            thesis_params, time_horizon, scenario, include_events, monitoring_plan, seed
+        )
+        
+        # Step 3: Generate ML-based price forecast; the path and the fan share the kernel's jump draws
+        performance_data = self._generate_ml_price_forecast(
+            thesis_params, time_horizon, scenario, volatility, seed, event_kernel=kernel
+        )
+        yield 'forecast', {
+            'performance_data': performance_data,
+            'timeline': self._generate_timeline_labels(time_horizon),
+            'fan_bands': self._generate_price_fan(thesis_params, time_horizon, scenario, seed, kernel)
+        }
+        
+        events = self._format_kernel_events(kernel, scenario) if kernel is not None else []
+        yield 'events', events
+        
+        # Step 4: Generate alert triggers based on simulation results
+        yield 'alerts', self._generate_alert_triggers(thesis, performance_data, events, scenario)
+        
+        # Step 5: Generate scenario analysis using intelligent analysis
+        yield 'narrative', self._generate_intelligent_scenario_analysis(
+            thesis_params, scenario, time_horizon, performance_data
+        )
+        
+        yield 'metadata', {
+            'thesis_id': getattr(thesis, 'id', 'test'),
+            'thesis_title': getattr(thesis, 'title', 'Investment Thesis Analysis'),
+            'scenario': scenario,
+            'volatility': volatility,
+            'time_horizon': time_horizon,
+            'include_events': include_events,
+            'seed': seed,
+            'generated_at': datetime.utcnow().isoformat(),
+            'data_source': 'ML Mathematical Analysis',
+            'ml_model': 'Geometric Brownian Motion with Thesis Parameters'
+        }
+    
+    def assemble_simulation_result(self, stages: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the simulation response from the payloads of iter_simulation_stages"""
+        forecast = stages['forecast']
+        performance_data = forecast['performance_data']
+        timeline = forecast['timeline']
+        
+        return {
+            'performance_data': performance_data,
+            'timeline': timeline,
+            'chart_data': {
+                'performance_data': performance_data,
+                'timeline': timeline
+            },
+            'fan_bands': forecast.get('fan_bands', {}),
+            'events': stages['events'],
+            'alert_triggers': stages['alerts'],
+            'scenario_analysis': stages['narrative'],
+            'thesis_parameters': stages['parameters'],
+            'simulation_metadata': stages['metadata']
+        }
+    
+    def _build_event_kernel(self, thesis_params: Dict, time_horizon: int, scenario: str,
+                            include_events: bool, monitoring_plan: Optional[Dict],
+                            seed: int) -> Optional[EventKernel]:
+        """Create an event kernel with events queued from the monitoring plan or templates"""
+        if not include_events:
+            return None
+        
+        kernel = EventKernel(int(float(time_horizon) * 12), seed=seed)
+        if monitoring_plan:
+            self._schedule_monitoring_events(kernel, monitoring_plan)
+        else:
+            self._schedule_intelligent_events(kernel, thesis_params, time_horizon, scenario)
+        return kernel
+    
+    def _generate_price_fan(self, params: Dict, time_horizon: int, scenario: str, seed: int,
+                            event_kernel: Optional[EventKernel] = None,
+                            n_paths: int = 200) -> Dict[str, List[float]]:
+        """
+        Monte Carlo fan of thesis prices: monthly percentile bands over
+        ``n_paths`` vectorised GBM paths with the scheduled event jumps applied.
+        """
+        months = int(float(time_horizon) * 12)
+        days_per_month = 21
+        total_days = months * days_per_month
+        if total_days == 0:
+            return {}
+        
+        adjusted_return, adjusted_vol = self._scenario_adjusted(params, scenario)
+        starting_price = params['starting_price']
+        
+        rng = np.random.default_rng(seed)
+        shocks = rng.normal(adjusted_return / 252, adjusted_vol, size=(n_paths, total_days))
+        shocks[:, 0] = 0.0
+        paths = starting_price * np.cumprod(1 + shocks, axis=1)
+        np.maximum(paths, starting_price * 0.2, out=paths)
+        
+        if event_kernel is not None:
+            event_kernel.apply(paths, floor=starting_price * 0.2)
+        
+        monthly = paths[:, ::days_per_month][:, :months]
+        bands = np.percentile(monthly, [5, 25, 50, 75, 95], axis=0)
+        
+        return {
+            name: [round(float(value), 2) for value in band]
+            for name, band in zip(('p5', 'p25', 'p50', 'p75', 'p95'), bands)
+        }
+    
     def _extract_thesis_parameters_via_llm(self, thesis, scenario: str, volatility: str) -> Dict[str, Any]:
         """
         Use LLM to extract key parameters needed for ML price modeling with timeout handling
@@ -131,42 +212,42 @@ Return JSON:
             return self._get_default_parameters(scenario, volatility)
     
     def _generate_ml_price_forecast(self, params: Dict, time_horizon: int, 
-                                  scenario: str, volatility: str) -> Dict[str, Any]:
+                                  scenario: str, volatility: str,
+                                  seed: Optional[int] = None,
+                                  event_kernel: Optional[EventKernel] = None) -> Dict[str, Any]:
         """
-        Generate realistic price forecast using ML-inspired mathematical models
+        Generate realistic price forecast using ML-inspired mathematical models.
+        Events queued on ``event_kernel`` are applied as jumps to the thesis path.
         """
+        if seed is None:
+            seed = self.DEFAULT_SEED
+        
         months = int(float(time_horizon) * 12)
         days_per_month = 21  # Trading days
         total_days = months * days_per_month
         
         # Extract parameters
         starting_price = params['starting_price']
-        annual_return = params['expected_annual_return']
-        daily_vol = params['daily_volatility']
-        market_corr = params['market_correlation']
         
         # Adjust parameters based on scenario
-        scenario_adjustments = {
-            'bull': {'return_mult': 1.3, 'vol_mult': 0.8},
-            'bear': {'return_mult': 0.3, 'vol_mult': 1.5},
-            'stress': {'return_mult': -0.2, 'vol_mult': 2.0},
-            'base': {'return_mult': 1.0, 'vol_mult': 1.0}
-        }
-        
-        adj = scenario_adjustments.get(scenario, scenario_adjustments['base'])
-        adjusted_return = annual_return * adj['return_mult']
-        adjusted_vol = daily_vol * adj['vol_mult']
+        adjusted_return, adjusted_vol = self._scenario_adjusted(params, scenario)
         
         # Generate market baseline using geometric Brownian motion
         market_prices = self._generate_market_baseline(
-            starting_price, adjusted_return * 0.6, adjusted_vol * 0.8, total_days
+            starting_price, adjusted_return * 0.6, adjusted_vol * 0.8, total_days, seed
         )
         
         # Generate thesis-specific prices with enhanced modeling
         thesis_prices = self._generate_thesis_prices(
-            params, adjusted_return, adjusted_vol, market_prices, total_days
+            params, adjusted_return, adjusted_vol, market_prices, total_days,
+            seed + self.THESIS_SEED_OFFSET
         )
         
+        if event_kernel is not None and len(thesis_prices) > 0:
+            thesis_paths = np.asarray(thesis_prices, dtype=float)[None, :]
+            event_kernel.apply(thesis_paths, floor=starting_price * 0.2)
+            thesis_prices = thesis_paths[0].tolist()
+        
         # Convert daily prices to monthly averages
         if len(market_prices) == 0 or len(thesis_prices) == 0:
             logging.error(f"Price generation failed: market={len(market_prices)}, thesis={len(thesis_prices)}")
@@ -185,12 +266,25 @@ Return JSON:
             'performance_summary': f'ML-generated forecast: {adjusted_return*100:.1f}% annual target'
         }
     
+    def _scenario_adjusted(self, params: Dict, scenario: str) -> Tuple[float, float]:
+        """Scenario-adjusted annual return and daily volatility"""
+        scenario_adjustments = {
+            'bull': {'return_mult': 1.3, 'vol_mult': 0.8},
+            'bear': {'return_mult': 0.3, 'vol_mult': 1.5},
+            'stress': {'return_mult': -0.2, 'vol_mult': 2.0},
+            'base': {'return_mult': 1.0, 'vol_mult': 1.0}
+        }
+        
+        adj = scenario_adjustments.get(scenario, scenario_adjustments['base'])
+        return params['expected_annual_return'] * adj['return_mult'], params['daily_volatility'] * adj['vol_mult']
+    
     def _generate_market_baseline(self, starting_price: float, annual_return: float, 
-                                daily_vol: float, total_days: int) -> List[float]:
+                                daily_vol: float, total_days: int,
+                                seed: int = DEFAULT_SEED) -> List[float]:
         """
         Generate market baseline using geometric Brownian motion with realistic market patterns
         """
-        np.random.seed(42)  # For reproducible results
+        np.random.seed(seed)  # For reproducible results
         
         prices = [starting_price]
         daily_return = annual_return / 252  # 252 trading days per year
@@ -216,11 +310,12 @@ Return JSON:
     
     def _generate_thesis_prices(self, params: Dict, annual_return: float, 
                               daily_vol: float, market_prices: List[float], 
-                              total_days: int) -> List[float]:
+                              total_days: int,
+                              seed: int = DEFAULT_SEED + THESIS_SEED_OFFSET) -> List[float]:
         """
         Generate thesis-specific prices with correlation to market and unique drivers
         """
-        np.random.seed(123)  # Different seed for thesis
+        np.random.seed(seed)  # Different seed for thesis
         
         starting_price = params['starting_price']
         market_corr = params['market_correlation']
@@ -335,8 +430,7 @@ Return JSON array only:
             )
             
             if response:
-                cleaned_response = self._clean_json_response(response)
-                events_data = json.loads(cleaned_response)
+                events_data = parse_llm_json(response, "ml_simulation.events", list)
                 
                 if isinstance(events_data, list):
                     total_months = time_horizon * 12
@@ -368,155 +462,27 @@ Return JSON array only:
         
         return []
     
-    def _generate_monitoring_based_events(self, thesis_params: Dict, time_horizon: int, 
-                                        scenario: str, monitoring_plan: Dict, 
-                                        performance_data: Dict) -> List[Dict[str, Any]]:
+    def _schedule_monitoring_events(self, kernel: EventKernel, monitoring_plan: Dict) -> None:
+        """
+        Queue events from the comprehensive monitoring plan on the event kernel
+        """
+        kernel.schedule_monitoring_plan(monitoring_plan, limit=6)
+    
+    def _format_kernel_events(self, kernel: EventKernel, scenario: str) -> List[Dict[str, Any]]:
         """
-        Generate events based on the comprehensive monitoring plan data
+        Format events applied by the kernel for the simulation response
         """
         events = []
-        total_months = time_horizon * 12
         
-        # Extract events from comprehensive monitoring plan components
-        validation_events = self._extract_validation_events(monitoring_plan, total_months)
-        alert_events = self._extract_alert_events(monitoring_plan, total_months)
-        decision_events = self._extract_decision_events(monitoring_plan, total_months)
-        counter_thesis_events = self._extract_counter_thesis_events(monitoring_plan, total_months)
-        
-        # Combine all events
-        all_events = validation_events + alert_events + decision_events + counter_thesis_events
-        
-        # Filter out any None or invalid events before sorting
-        all_events = [event for event in all_events if event is not None and isinstance(event, dict) and 'month' in event and event['month'] is not None]
-        
-        # Sort by month and limit to reasonable number
-        all_events.sort(key=lambda x: x.get('month', 0))
-        
-        # Add performance impact values and format for simulation
-        thesis_performance = performance_data.get('thesis_performance', [100])
-        valid_events = []
-        
-        for event in all_events[:6]:  # Limit to 6 events max
-            # Final validation check
-            if event and isinstance(event, dict) and 'month' in event and 'title' in event:
-                month = event['month']
-                
-                if thesis_performance and month <= len(thesis_performance):
-                    event['impact_value'] = thesis_performance[month - 1]
-                else:
-                    event['impact_value'] = 100
-                
-                event['date'] = self._month_to_date_string(month)
+        for event in kernel.applied_events:
+            event = dict(event)
+            event['date'] = self._month_to_date_string(event['month'])
+            if event.get('event_category') in ('validation', 'assumption', 'alert', 'decision', 'risk'):
                 event['magnitude'] = self._get_event_magnitude(event.get('impact_type', 'neutral'))
                 event['market_context'] = f"Monitoring framework trigger: {event.get('event_category', 'general')}"
-                
-                valid_events.append(event)
-        
-        return valid_events
-    
-    def _extract_validation_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from validation framework"""
-        events = []
-        framework = monitoring_plan.get('validation_framework', {})
-        
-        # Core claim metrics events
-        core_metrics = framework.get('core_claim_metrics', [])
-        for i, metric in enumerate(core_metrics[:2]):
-            # Ensure valid month calculation
-            month = max(1, min((i + 1) * max(1, total_months // 4), total_months))
-            if month > 0 and month <= total_months:
-                events.append({
-                    'month': month,
-                    'title': f"Core Validation: {metric.get('metric', 'Performance')}",
-                    'description': f"Validating {metric.get('metric')} against {metric.get('target_threshold')} threshold using {metric.get('data_source')} data",
-                    'impact_type': 'positive',
-                    'signals_affected': [metric.get('metric', 'Core Signal')],
-                    'event_category': 'validation'
-                })
-        
-        # Assumption testing events
-        assumption_tests = framework.get('assumption_tests', [])
-        for i, test in enumerate(assumption_tests[:2]):
-            # Ensure valid month calculation
-            month = max(1, min((i + 2) * max(1, total_months // 5), total_months))
-            if month > 0 and month <= total_months:
-                events.append({
-                    'month': month,
-                    'title': f"Assumption Test: {test.get('test_metric', 'Market Test')}",
-                    'description': f"Testing key assumption via {test.get('test_metric')} - Success threshold: {test.get('success_threshold')}",
-                    'impact_type': 'neutral',
-                    'signals_affected': [test.get('test_metric', 'Assumption Signal')],
-                    'event_category': 'assumption'
-                })
-        
-        return events
-    
-    def _extract_alert_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from alert system"""
-        events = []
-        alert_system = monitoring_plan.get('alert_system', [])
-        
-        for i, alert in enumerate(alert_system[:3]):
-            # Ensure valid month calculation
-            month = max(1, min((i + 1) * max(1, total_months // 3), total_months))
-            if month > 0 and month <= total_months:
-                impact_type = 'negative' if alert.get('severity') == 'high' else 'neutral'
-                
-                trigger_name = alert.get('trigger_name', 'Performance Alert')
-                # Remove duplicate "Alert" if already present in trigger name
-                clean_title = trigger_name if 'Alert' in trigger_name else f"Alert: {trigger_name}"
-                
-                events.append({
-                    'month': month,
-                    'title': clean_title,
-                    'description': f"Triggered condition: {alert.get('condition')} | Required action: {alert.get('action')}",
-                    'impact_type': impact_type,
-                    'signals_affected': [trigger_name],
-                    'event_category': 'alert'
-                })
-        
-        return events
-    
-    def _extract_decision_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from decision framework"""
-        events = []
-        decision_framework = monitoring_plan.get('decision_framework', [])
-        
-        for i, decision in enumerate(decision_framework[:2]):
-            # Ensure valid month calculation
-            month = max(1, min((i + 1) * max(1, total_months // 2), total_months))
-            if month > 0 and month <= total_months:
-                action = decision.get('action', 'review')
-                impact_type = 'positive' if action == 'buy' else 'negative' if action == 'sell' else 'neutral'
-                
-                events.append({
-                    'month': month,
-                    'title': f"Decision Point: {decision.get('scenario', 'Performance Review')}",
-                    'description': f"Analysis indicates: {action.upper()} signal based on {decision.get('condition')} (Confidence: {decision.get('confidence_threshold')})",
-                    'impact_type': impact_type,
-                    'signals_affected': ['Decision Framework'],
-                    'event_category': 'decision'
-                })
-        
-        return events
-    
-    def _extract_counter_thesis_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from counter-thesis monitoring"""
-        events = []
-        counter_monitoring = monitoring_plan.get('counter_thesis_monitoring', [])
-        
-        for i, risk in enumerate(counter_monitoring[:2]):
-            # Ensure valid month calculation
-            month = max(1, min((total_months // 3) * (i + 2), total_months))
-            if month > 0 and month <= total_months:
-                events.append({
-                    'month': month,
-                    'title': f"Risk Alert: {risk.get('risk_scenario', 'Counter-Thesis Risk')}",
-                    'description': f"Early warning detected via {risk.get('early_warning_metric')} below {risk.get('threshold')} threshold. {risk.get('mitigation_action')}",
-                    'impact_type': 'negative',
-                    'signals_affected': [risk.get('early_warning_metric', 'Risk Signal')],
-                    'event_category': 'risk'
-                })
+            else:
+                event['market_context'] = f"Event relevant to {scenario} scenario conditions"
+            events.append(event)
         
         return events
     
@@ -574,12 +540,12 @@ Return JSON format:
         
         try:
             response = self.ai_service.generate_completion(
-                messages, temperature=0.6, max_tokens=1500
+                messages, temperature=0.6, max_tokens=1500, json_mode=True
             )
             
-            if response:
-                cleaned_response = self._clean_json_response(response)
-                return json.loads(cleaned_response)
+            analysis = parse_llm_json(response, "ml_simulation.scenario_analysis", dict)
+            if analysis is not None:
+                return analysis
             
         except Exception as e:
             logging.error(f"LLM scenario analysis failed: {str(e)}")
@@ -782,9 +748,9 @@ Return JSON format:
             risks = ['Market volatility', 'Execution risk']
         return risks[:3]
 
-    def _generate_intelligent_events(self, thesis_params: Dict, time_horizon: float, scenario: str) -> List[Dict[str, Any]]:
-        """Generate intelligent market events based on thesis parameters"""
-        events = []
+    def _schedule_intelligent_events(self, kernel: EventKernel, thesis_params: Dict,
+                                     time_horizon: float, scenario: str) -> None:
+        """Queue intelligent market events based on thesis parameters on the event kernel"""
         total_months = int(time_horizon * 12)
         num_events = min(4, max(2, int(time_horizon)))
         
@@ -815,21 +781,16 @@ Return JSON format:
         for i, month in enumerate(event_months):
             if i < len(templates):
                 template = templates[i]
-                event = {
-                    'month': month,
-                    'date': self._month_to_date_string(month),
-                    'title': template['title'],
-                    'description': f"Market event affecting thesis performance in month {month}",
-                    'impact_type': template['impact'],
-                    'magnitude': template['magnitude'],
-                    'signals_affected': thesis_params.get('key_drivers', ['Performance metrics'])[:2],
-                    'market_context': f"Event relevant to {scenario} scenario conditions",
-                    'impact_value': thesis_params['starting_price'] * (1.05 if template['impact'] == 'positive' else 0.95)
-                }
-                events.append(event)
-        
-        return events
-
+                kernel.schedule(
+                    month,
+                    template['title'],
+                    direction=template['impact'],
+                    magnitude=template['magnitude'],
+                    description=f"Market event affecting thesis performance in month {month}",
+                    signals_affected=thesis_params.get('key_drivers', ['Performance metrics'])[:2],
+                    event_category='market'
+                )
+    
     def _generate_intelligent_scenario_analysis(self, thesis_params: Dict, scenario: str, 
                                               time_horizon: int, performance_data: Dict) -> Dict[str, Any]:
         """Generate intelligent scenario analysis when LLM fails"""
@@ -881,31 +842,6 @@ Return JSON format:
         
         return base_params
     
-    def _clean_json_response(self, response: str) -> str:
-        """Clean Azure OpenAI response to extract valid JSON"""
-        cleaned = response.strip()
-        
-        if cleaned.startswith('```json'):
-            cleaned = cleaned[7:]
-        elif cleaned.startswith('```'):
-            cleaned = cleaned[3:]
-        
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]
-        
-        cleaned = cleaned.strip()
-        
-        if cleaned.startswith('{'):
-            end = cleaned.rfind('}')
-            if end != -1:
-                cleaned = cleaned[:end+1]
-        elif cleaned.startswith('['):
-            end = cleaned.rfind(']')
-            if end != -1:
-                cleaned = cleaned[:end+1]
-        
-        return cleaned
-    
     def _generate_timeline_labels(self, time_horizon: int) -> List[str]:
         """Generate timeline labels for the simulation"""
         months = time_horizon * 12
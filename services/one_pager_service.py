@@ -5,7 +5,7 @@ Consolidates all analysis data into comprehensive investment reports without tim
 
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from models import ThesisAnalysis, DocumentUpload, SignalMonitoring, NotificationLog
 from app import db
 
@@ -21,34 +21,26 @@ class OnePagerService:
         Generate comprehensive one-pager report organized around thesis validation framework
         """
         try:
-            # Generate core components efficiently without external dependencies
-            executive_summary = self._generate_executive_summary_fast(thesis)
-            key_findings = self._extract_key_findings_fast(thesis)
-            core_claim_validation = self._build_core_claim_validation_fast(thesis)
-            assumption_testing = self._build_assumption_testing_framework_fast(thesis)
-            causal_chain_tracking = self._build_causal_chain_tracking_fast(thesis)
-            data_acquisition_plan = self._build_data_acquisition_plan_fast(thesis)
-            thesis_structure = self._extract_thesis_structure_fast(thesis)
-            evaluation_criteria = self._generate_evaluation_criteria_fast(thesis)
-            
-            # Consolidate report data
-            report_data = {
-                'executive_summary': executive_summary,
-                'key_findings': key_findings,
-                'core_claim_validation': core_claim_validation,
-                'assumption_testing': assumption_testing,
-                'causal_chain_tracking': causal_chain_tracking,
-                'data_acquisition_plan': data_acquisition_plan,
-                'thesis_structure': thesis_structure,
-                'evaluation_criteria': evaluation_criteria
-            }
-            
-            return report_data
+            return dict(self.iter_report_sections(thesis))
             
         except Exception as e:
             print(f"Error generating comprehensive report: {e}")
             return self._generate_fallback_report(thesis)
     
+    def iter_report_sections(self, thesis: ThesisAnalysis) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Build report sections one at a time, yielding (section name, data) as each completes"""
+        for name, builder in (
+            ('executive_summary', self._generate_executive_summary_fast),
+            ('key_findings', self._extract_key_findings_fast),
+            ('core_claim_validation', self._build_core_claim_validation_fast),
+            ('assumption_testing', self._build_assumption_testing_framework_fast),
+            ('causal_chain_tracking', self._build_causal_chain_tracking_fast),
+            ('data_acquisition_plan', self._build_data_acquisition_plan_fast),
+            ('thesis_structure', self._extract_thesis_structure_fast),
+            ('evaluation_criteria', self._generate_evaluation_criteria_fast)
+        ):
+            yield name, builder(thesis)
+    
     def _generate_executive_summary_fast(self, thesis: ThesisAnalysis) -> Dict[str, Any]:
         """Generate executive summary quickly without AI calls"""
         return {
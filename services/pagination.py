@@ -0,0 +1,80 @@
+"""
+Keyset Pagination
+
+Newest-first pagination over (created_at, id) for list views. Each page is a
+single indexed range scan bounded by the last row of the previous page, so the
+cost of a page does not grow with the table or with how far the user pages,
+unlike OFFSET. Cursors are opaque URL-safe tokens encoding that last row.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows plus the cursor of the following page"""
+    items: List[Any]
+    next_cursor: Optional[str]
+    page_size: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    token = f"{created_at.isoformat()}|{row_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor; malformed cursors restart from the first page"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode('utf-8').rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def page_size_arg(value: Optional[int]) -> int:
+    """Clamp a requested page size"""
+    if not value or value < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(value, MAX_PAGE_SIZE)
+
+
+def keyset_page(query, model, cursor: Optional[str] = None,
+                page_size: int = DEFAULT_PAGE_SIZE) -> KeysetPage:
+    """
+    Fetch the page of ``query`` after ``cursor``, newest first. ``model`` must
+    have ``created_at`` and ``id`` columns; one extra row is read to know
+    whether another page follows.
+    """
+    position = decode_cursor(cursor)
+    if position:
+        created_at, row_id = position
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(page_size + 1).all()
+    items = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return KeysetPage(items=items, next_cursor=next_cursor, page_size=page_size)
@@ -0,0 +1,214 @@
+"""
+Peer Similarity Index
+
+Local peer discovery for AlternativeCompanyService. The security universe file
+(sector, business model and Eagle factor metrics per company) is loaded once
+into a row-normalised float32 matrix: one-hot sector and business-model
+columns plus z-scored growth, margin, profitability, valuation, size and
+momentum factors. Thesis characteristics map to a query vector in the same
+space and the nearest peers are found with a single matrix-vector product, so
+lookups take well under a millisecond and always return the same shortlist
+for the same thesis.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.alternative_scoring import top_k_indices
+
+DEFAULT_UNIVERSE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'security_universe.json')
+
+# factor -> (Eagle metric code, transform applied before z-scoring)
+FACTOR_METRICS = {
+    'growth': ('revenue_growth_this_yr', None),
+    'gross_margin': ('gross_margin_next_yr', None),
+    'profitability': ('operating_margin_this_yr', None),
+    'valuation': ('enterprise_value_over_sales_this_yr', 'log'),
+    'size': ('market_cap_billions_usd', 'log'),
+    'momentum': ('returns_usd_1_ytd', None),
+}
+FACTORS = tuple(FACTOR_METRICS)
+
+NAME_SUFFIXES = re.compile(r'[,.]|\b(Inc|Corp|Corporation|Holdings|Technologies|Technology|Limited|Ltd|SE|plc)\b')
+
+SECTOR_WEIGHT = 2.0
+BUSINESS_MODEL_WEIGHT = 1.5
+
+# Alternatives are meant to be overlooked names: cheaper, smaller and out of favour
+UNLOVED_TILT = {'valuation': -0.75, 'size': -0.5, 'momentum': -0.5}
+
+GROWTH_STAGE_TARGETS = {
+    'Early Growth': {'growth': 1.0},
+    'Scaling': {'growth': 0.5, 'gross_margin': 0.25},
+    'Mature Growth': {'profitability': 0.5},
+}
+VALUE_DRIVER_TARGETS = {
+    'Revenue Growth': {'growth': 0.5},
+    'Margin Expansion': {'gross_margin': 0.5, 'profitability': 0.25},
+    'Market Share Gains': {'growth': 0.25, 'momentum': 0.25},
+    'Customer Acquisition': {'growth': 0.25},
+    'Market Expansion': {'growth': 0.25},
+    'Product Innovation': {'gross_margin': 0.25},
+}
+
+
+class PeerIndex:
+    """
+    Cosine k-nearest-neighbour index over the security universe
+    """
+
+    _cache: Dict[Tuple[str, float], 'PeerIndex'] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, securities: List[Dict[str, Any]]):
+        self.securities = securities
+        self.sectors = sorted({security['sector'] for security in securities})
+        self.business_models = sorted({security['business_model'] for security in securities})
+        self._sector_column = {sector: i for i, sector in enumerate(self.sectors)}
+        self._model_column = {model: len(self.sectors) + i for i, model in enumerate(self.business_models)}
+        self._factor_offset = len(self.sectors) + len(self.business_models)
+
+        factors = self._factor_matrix(securities)
+        self.factor_mean = np.nanmean(factors, axis=0) if len(securities) else np.zeros(len(FACTORS))
+        self.factor_std = np.nanstd(factors, axis=0) if len(securities) else np.ones(len(FACTORS))
+        self.factor_std[~(self.factor_std > 0)] = 1.0
+        # Missing metrics sit at the universe mean
+        zscores = np.nan_to_num((factors - self.factor_mean) / self.factor_std)
+
+        matrix = np.zeros((len(securities), self._factor_offset + len(FACTORS)), dtype=np.float32)
+        for row, security in enumerate(securities):
+            matrix[row, self._sector_column[security['sector']]] = SECTOR_WEIGHT
+            matrix[row, self._model_column[security['business_model']]] = BUSINESS_MODEL_WEIGHT
+        matrix[:, self._factor_offset:] = zscores
+        self.matrix = self._normalise(matrix)
+        self._mention_patterns = [self._mention_pattern(security) for security in securities]
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'PeerIndex':
+        """Index for a universe file, rebuilt only when the file changes"""
+        path = path or DEFAULT_UNIVERSE_PATH
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            logging.warning(f"Security universe not found at {path}; peer index is empty")
+            return cls([])
+
+        with cls._cache_lock:
+            index = cls._cache.get(key)
+            if index is None:
+                with open(path) as f:
+                    index = cls(json.load(f).get('securities', []))
+                cls._cache = {key: index}
+            return index
+
+    @staticmethod
+    def _normalise(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    @staticmethod
+    def _factor_matrix(securities: List[Dict[str, Any]]) -> np.ndarray:
+        raw = np.full((len(securities), len(FACTORS)), np.nan)
+        for row, security in enumerate(securities):
+            metrics = security.get('metrics', {})
+            for column, (metric, _) in enumerate(FACTOR_METRICS.values()):
+                value = metrics.get(metric)
+                if isinstance(value, (int, float)):
+                    raw[row, column] = value
+        for column, (_, transform) in enumerate(FACTOR_METRICS.values()):
+            if transform == 'log':
+                values = raw[:, column]
+                raw[:, column] = np.where(values > 0, np.log(np.where(values > 0, values, 1.0)), np.nan)
+        return raw
+
+    def query_vector(self, characteristics: Dict[str, Any]) -> np.ndarray:
+        """Map _extract_thesis_characteristics output into the index space"""
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        if characteristics.get('sector') in self._sector_column:
+            vector[self._sector_column[characteristics['sector']]] = SECTOR_WEIGHT
+        if characteristics.get('business_model') in self._model_column:
+            vector[self._model_column[characteristics['business_model']]] = BUSINESS_MODEL_WEIGHT
+
+        targets = dict.fromkeys(FACTORS, 0.0)
+        tilts = [UNLOVED_TILT, GROWTH_STAGE_TARGETS.get(characteristics.get('growth_stage'), {})]
+        tilts += [VALUE_DRIVER_TARGETS.get(driver, {}) for driver in characteristics.get('value_drivers', [])]
+        if characteristics.get('market_characteristics', {}).get('growth_rate') == 'High':
+            tilts.append({'growth': 0.5})
+        for tilt in tilts:
+            for factor, amount in tilt.items():
+                targets[factor] += amount
+
+        vector[self._factor_offset:] = [targets[factor] for factor in FACTORS]
+        return self._normalise(vector)
+
+    def nearest(self, characteristics: Dict[str, Any], k: int = 8,
+                exclude_text: str = '') -> List[Dict[str, Any]]:
+        """
+        Top-``k`` securities by cosine similarity, best first, ties broken by
+        universe order. Companies named in ``exclude_text`` (the thesis
+        subject) are left out.
+        """
+        if not self.securities or k <= 0:
+            return []
+
+        scores = self.matrix @ self.query_vector(characteristics)
+        excluded = self._mentioned_rows(exclude_text)
+        if excluded:
+            scores[excluded] = -np.inf
+
+        candidates = len(self.securities) - len(excluded)
+        k = min(k, candidates)
+        if k <= 0:
+            return []
+        top = top_k_indices(scores, k)
+
+        return [dict(self.securities[row], similarity=round(float(scores[row]), 4)) for row in top]
+
+    @staticmethod
+    def _mention_pattern(security: Dict[str, Any]) -> re.Pattern:
+        name = NAME_SUFFIXES.sub('', security['name']).strip()
+        if ' ' in name:
+            name_pattern = f'(?i:{re.escape(name)})'
+        else:
+            # Single-word names ("Target", "Block") only count when capitalised
+            name_pattern = f'{re.escape(name[0])}(?i:{re.escape(name[1:])})'
+        return re.compile(rf'\b(?:{name_pattern}|{re.escape(security["ticker"])})\b')
+
+    def _mentioned_rows(self, text: str) -> List[int]:
+        if not text:
+            return []
+        return [row for row, pattern in enumerate(self._mention_patterns) if pattern.search(text)]
+
+def refresh_universe_metrics(path: Optional[str] = None, data_adapter=None) -> int:
+    """
+    Refresh the factor metrics in the universe file from Eagle. Securities
+    whose query fails keep their previous values; returns the number updated.
+    """
+    from services.data_adapter_service import DataAdapter
+
+    path = path or DEFAULT_UNIVERSE_PATH
+    data_adapter = data_adapter or DataAdapter()
+    metric_codes = [metric for metric, _ in FACTOR_METRICS.values()]
+    with open(path) as f:
+        universe = json.load(f)
+
+    updated = 0
+    for security in universe.get('securities', []):
+        result = data_adapter.fetch_metric_values(metric_codes, security['ticker'])
+        values = {name: value for name, value in result.get('metrics', {}).items() if name in metric_codes}
+        if result.get('success') and values:
+            security.setdefault('metrics', {}).update(values)
+            updated += 1
+
+    with open(path, 'w') as f:
+        json.dump(universe, f, indent=2)
+        f.write('\n')
+    logging.info(f"Refreshed Eagle metrics for {updated} of {len(universe.get('securities', []))} securities")
+    return updated
@@ -0,0 +1,312 @@
+"""
+Profiler
+
+On-demand profiling for live workers, switched on per request or at runtime
+without a restart:
+
+- Per request: an admin sends ``X-Profile: cprofile`` (or ``sample``) with
+  ``X-Profile-Token``, or the ``_profile``/``_profile_token`` query args. The
+  request runs under cProfile (saved as ``.pstats``) or a stack sampler on
+  its thread (saved as a speedscope ``.speedscope.json``). The response
+  carries ``X-Profile-Id`` naming the file to download. Streamed responses
+  are profiled until the stream closes.
+- Rolling: a daemon thread samples every thread's stack at a low rate and
+  writes one folded-stack flame graph file (``.folded``) per window.
+
+Profiling is off unless PROFILER_ADMIN_TOKEN is set. Files live in
+PROFILE_DIR; only the newest PROFILE_RETENTION are kept. Each gunicorn
+worker keeps its own sampler, so start/stop only affects the worker that
+serves the request.
+"""
+
+import cProfile
+import hmac
+import json
+import logging
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+
+PROFILE_MODES = ('cprofile', 'sample')
+PROFILE_EXTENSIONS = {'cprofile': '.pstats', 'sample': '.speedscope.json', 'rolling': '.folded'}
+PROFILE_NAME = re.compile(r'^[\w.-]+\.(pstats|speedscope\.json|folded)$')
+
+Frame = Tuple[str, str, int]
+
+
+def admin_authorized(token: Optional[str]) -> bool:
+    """Whether ``token`` matches the configured admin token (never, when none is set)"""
+    expected = Config.PROFILER_ADMIN_TOKEN
+    return bool(expected and token) and hmac.compare_digest(token, expected)
+
+
+class ProfileStore:
+    """
+    Profile files in one directory, newest PROFILE_RETENTION kept
+    """
+
+    def __init__(self, directory: Optional[str] = None, retention: Optional[int] = None):
+        self.directory = directory or Config.PROFILE_DIR
+        self.retention = retention or Config.PROFILE_RETENTION
+        self._lock = threading.Lock()
+
+    def new_name(self, label: str, kind: str) -> str:
+        label = re.sub(r'[^\w-]+', '_', label).strip('_')[:60] or 'root'
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}{PROFILE_EXTENSIONS[kind]}"
+
+    def path(self, name: str) -> Optional[str]:
+        """Absolute path of a stored profile, or None for unknown or unsafe names"""
+        if not PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(os.path.abspath(self.directory), name)
+        return path if os.path.isfile(path) else None
+
+    def write(self, name: str, data) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        mode = 'wb' if isinstance(data, bytes) else 'w'
+        with open(path, mode) as f:
+            f.write(data)
+        self._prune()
+        return name
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if PROFILE_NAME.match(name):
+                stat = os.stat(os.path.join(self.directory, name))
+                profiles.append({'name': name, 'bytes': stat.st_size, 'modified': stat.st_mtime})
+        return sorted(profiles, key=lambda profile: profile['modified'], reverse=True)
+
+    def _prune(self) -> None:
+        with self._lock:
+            for profile in self.list()[self.retention:]:
+                try:
+                    os.remove(os.path.join(self.directory, profile['name']))
+                except OSError:
+                    pass
+
+
+class StackSampler:
+    """
+    Samples Python stacks with sys._current_frames every ``interval``
+    seconds, for one thread or (``thread_id=None``) every thread but itself
+    """
+
+    def __init__(self, interval: float, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = self.stopped_at = None
+
+    def start(self) -> 'StackSampler':
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'StackSampler':
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.stopped_at = time.time()
+        return self
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(own)
+
+    def sample(self, own: Optional[int] = None) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or (self.thread_id is not None and thread_id != self.thread_id):
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def drain(self) -> Counter:
+        """Take the stacks collected so far and start a fresh count"""
+        stacks, self.stacks = self.stacks, Counter()
+        return stacks
+
+    def to_folded(self, stacks: Optional[Counter] = None) -> str:
+        """Brendan Gregg folded stacks: ``root;child;leaf count`` per line"""
+        stacks = self.stacks if stacks is None else stacks
+        lines = [';'.join(f'{name} ({os.path.basename(filename)}:{line})' for name, filename, line in stack)
+                 + f' {count}' for stack, count in stacks.most_common()]
+        return '\n'.join(lines) + '\n'
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """The samples as a speedscope 'sampled' profile, weights in seconds"""
+        frame_index: Dict[Frame, int] = {}
+        samples, weights = [], []
+        for stack, count in self.stacks.items():
+            samples.append([frame_index.setdefault(frame, len(frame_index)) for frame in stack])
+            weights.append(count * self.interval)
+        frames = [{'name': func, 'file': filename, 'line': line} for func, filename, line in frame_index]
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights
+            }],
+            'name': name,
+            'exporter': 'thesis-intelligence profiler'
+        }
+
+
+class RollingSampler:
+    """
+    Low-rate sampler over every thread that writes a folded flame graph per
+    window; start() and stop() can be called on a running worker
+    """
+
+    def __init__(self, store: ProfileStore, interval: Optional[float] = None,
+                 window_seconds: Optional[float] = None):
+        self.store = store
+        self.interval = interval or Config.ROLLING_SAMPLER_INTERVAL_MS / 1000
+        self.window_seconds = window_seconds or Config.ROLLING_SAMPLER_WINDOW_SECONDS
+        self._sampler: Optional[StackSampler] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.files_written = 0
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._sampler is not None:
+                return False
+            self._stop.clear()
+            self._sampler = StackSampler(self.interval).start()
+            self._flusher = threading.Thread(target=self._flush_loop, name='rolling-sampler-flush', daemon=True)
+            self._flusher.start()
+            logging.info(f"Rolling sampler started ({self.interval * 1000:.0f} ms interval)")
+            return True
+
+    def stop(self) -> bool:
+        with self._lock:
+            if self._sampler is None:
+                return False
+            self._stop.set()
+            self._flusher.join()
+            self._sampler.stop()
+            self.flush()
+            self._sampler = None
+            logging.info("Rolling sampler stopped")
+            return True
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.window_seconds):
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """Write the stacks sampled since the last flush; returns the file name"""
+        sampler = self._sampler
+        stacks = sampler.drain() if sampler else Counter()
+        if not stacks:
+            return None
+        self.files_written += 1
+        return self.store.write(self.store.new_name('rolling', 'rolling'), sampler.to_folded(stacks))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'interval_ms': round(self.interval * 1000, 3),
+            'window_seconds': self.window_seconds,
+            'files_written': self.files_written
+        }
+
+
+profile_store = ProfileStore()
+rolling_sampler = RollingSampler(profile_store)
+
+
+def requested_profile_mode(request) -> Optional[str]:
+    """The profiling mode an authorised request asked for, if any"""
+    mode = request.headers.get('X-Profile') or request.args.get('_profile')
+    if not mode:
+        return None
+    mode = 'cprofile' if mode in ('1', 'true') else mode
+    token = request.headers.get('X-Profile-Token') or request.args.get('_profile_token')
+    if mode not in PROFILE_MODES or not admin_authorized(token):
+        return None
+    return mode
+
+
+def init_profiler(app) -> None:
+    """Profile requests that ask for it and start the rolling sampler if configured"""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_profile():
+        mode = requested_profile_mode(request)
+        if mode == 'cprofile':
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                # Another profiler already owns this thread
+                logging.warning(f"Request profiling skipped: {e}")
+                return
+            g.request_profile = (mode, profile)
+        elif mode == 'sample':
+            sampler = StackSampler(Config.PROFILER_SAMPLE_INTERVAL_MS / 1000, threading.get_ident()).start()
+            g.request_profile = (mode, sampler)
+
+    @app.after_request
+    def attach_request_profile(response):
+        active = g.pop('request_profile', None)
+        if active is None:
+            return response
+        mode, profiler = active
+        label = f"{request.method}-{request.url_rule.rule if request.url_rule else request.path}"
+        name = profile_store.new_name(label, mode)
+        response.headers['X-Profile-Id'] = name
+        # Streamed bodies run after this hook; stop once the response is closed
+        response.call_on_close(lambda: _save_request_profile(mode, profiler, name))
+        return response
+
+    if Config.ROLLING_SAMPLER_ENABLED:
+        rolling_sampler.start()
+
+
+def _save_request_profile(mode: str, profiler, name: str) -> None:
+    try:
+        if mode == 'cprofile':
+            profiler.disable()
+            # Same payload Profile.dump_stats writes, so pstats.Stats(path) reads it
+            profiler.create_stats()
+            profile_store.write(name, marshal.dumps(profiler.stats))
+        else:
+            profiler.stop()
+            profile_store.write(name, json.dumps(profiler.to_speedscope(name)))
+        logging.info(f"Saved request profile {name}")
+    except Exception as e:
+        logging.error(f"Failed to save request profile {name}: {e}")
+
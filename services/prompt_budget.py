@@ -0,0 +1,201 @@
+"""
+Prompt Budget
+
+Builds compact thesis representations for LLM prompts under a per-call token
+budget. Values are serialised without indentation; when the thesis still does
+not fit, low-value fields (monitoring plan, tracked metrics, counter-thesis)
+are summarised, long text and lists are truncated, and finally the lowest
+priority fields are dropped. Compacted representations are cached per thesis
+version and budget.
+
+Token counts are estimated locally and, together with the usage reported by
+the API, recorded per call site.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Thesis fields from most to least valuable for scoring and evaluation prompts
+FIELD_PRIORITY = (
+    'core_claim', 'core_analysis', 'assumptions', 'causal_chain', 'mental_model',
+    'counter_thesis', 'metrics_to_track', 'monitoring_plan'
+)
+SUMMARISED_FIELDS = ('monitoring_plan', 'metrics_to_track', 'counter_thesis')
+
+CACHE_SIZE = 256
+_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+_usage_lock = threading.Lock()
+_token_usage: Dict[str, Dict[str, int]] = {}
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the token count of text: punctuation marks count as one token
+    and words as one token per four characters, which tracks the cl100k
+    tokenizer closely for English prose and JSON.
+    """
+    if not text:
+        return 0
+    return sum(-(-len(piece) // 4) if piece[0].isalnum() or piece[0] == '_' else 1
+               for piece in _TOKEN_PATTERN.findall(text))
+
+
+def compact_json(value: Any) -> str:
+    """Serialise a value for a prompt without indentation or padding"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """Truncate text to roughly max_tokens, preferring a sentence boundary"""
+    text = text or ''
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+
+    # Cut at this text's own characters-per-token ratio rather than a fixed one
+    cut = text[:len(text) * max_tokens // tokens]
+    sentence_end = max(cut.rfind('. '), cut.rfind('.\n'))
+    if sentence_end > len(cut) // 2:
+        cut = cut[:sentence_end + 1]
+    return cut.rstrip() + ' …'
+
+
+def summarise_field(name: str, value: Any) -> Any:
+    """Reduce a low-value field to the parts prompts actually use"""
+    if name == 'metrics_to_track' and isinstance(value, list):
+        return [
+            metric.get('name', 'metric') if isinstance(metric, dict) else str(metric)
+            for metric in value
+        ]
+
+    if name == 'monitoring_plan' and isinstance(value, dict):
+        summary = {}
+        for key, section in value.items():
+            if isinstance(section, list):
+                summary[key] = [_item_label(item) for item in section[:3]]
+                if len(section) > 3:
+                    summary[key].append(f'+{len(section) - 3} more')
+            elif isinstance(section, dict):
+                summary[key] = {
+                    sub_key: len(sub_value) if isinstance(sub_value, list) else _item_label(sub_value)
+                    for sub_key, sub_value in section.items()
+                }
+            else:
+                summary[key] = _item_label(section)
+        return summary
+
+    if name == 'counter_thesis' and isinstance(value, list):
+        return [_item_label(item) for item in value]
+
+    return value
+
+
+def _item_label(item: Any) -> str:
+    """Short label for a plan/scenario entry"""
+    if isinstance(item, dict):
+        for key in ('name', 'metric', 'trigger_name', 'scenario', 'risk_scenario', 'test_metric', 'title', 'signal'):
+            if item.get(key):
+                return fit_text(str(item[key]), 20)
+        return fit_text(compact_json(item), 20)
+    return fit_text(str(item), 30)
+
+
+def _truncate(value: Any, max_tokens: int, max_items: int) -> Any:
+    """Shorten long strings and lists, recursively"""
+    if isinstance(value, str):
+        return fit_text(value, max_tokens)
+    if isinstance(value, list):
+        shortened = [_truncate(item, max_tokens // 2, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            shortened.append(f'+{len(value) - max_items} more')
+        return shortened
+    if isinstance(value, dict):
+        return {key: _truncate(item, max_tokens // 2, max_items) for key, item in value.items()}
+    return value
+
+
+def _size(compacted: Dict[str, Any]) -> int:
+    return count_tokens(compact_json(compacted))
+
+
+def _cache_key(thesis: Dict[str, Any], budget: int, fields: Sequence[str]) -> str:
+    if thesis.get('id') is not None and thesis.get('updated_at'):
+        version = f"{thesis['id']}@{thesis['updated_at']}"
+    else:
+        version = hashlib.sha256(compact_json({field: thesis.get(field) for field in fields}).encode('utf-8')).hexdigest()
+    return f"{version}|{budget}|{','.join(fields)}"
+
+
+def compact_thesis(thesis: Dict[str, Any], budget: int,
+                   fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Return the requested thesis fields reduced to fit ``budget`` tokens when
+    serialised with compact_json. Cached per thesis version and budget; each
+    call gets its own copy, so callers may mutate the result.
+    """
+    fields = tuple(field for field in (fields or FIELD_PRIORITY))
+    key = _cache_key(thesis, budget, fields)
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return copy.deepcopy(_cache[key])
+
+    compacted = {field: thesis.get(field) for field in fields if thesis.get(field) not in (None, '', [], {})}
+
+    # 1. Summarise low-value structured fields
+    if _size(compacted) > budget:
+        for field in SUMMARISED_FIELDS:
+            if field in compacted:
+                compacted[field] = summarise_field(field, compacted[field])
+
+    # 2. Progressively truncate long text and lists
+    for max_tokens, max_items in ((300, 8), (150, 5), (80, 3)):
+        if _size(compacted) <= budget:
+            break
+        compacted = {field: _truncate(value, max_tokens, max_items) for field, value in compacted.items()}
+
+    # 3. Drop the lowest-priority fields until it fits
+    ordered = sorted(compacted, key=lambda field: FIELD_PRIORITY.index(field) if field in FIELD_PRIORITY else len(FIELD_PRIORITY))
+    while _size(compacted) > budget and len(ordered) > 1:
+        compacted.pop(ordered.pop())
+
+    # Untruncated values may still be the caller's own lists and dicts
+    compacted = copy.deepcopy(compacted)
+    with _cache_lock:
+        _cache[key] = compacted
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return copy.deepcopy(compacted)
+
+
+def record_token_usage(call_site: str, prompt_tokens: int, completion_tokens: int = 0,
+                       estimated: bool = False) -> None:
+    """Accumulate prompt/completion token counts for a call site and log them"""
+    with _usage_lock:
+        usage = _token_usage.setdefault(call_site, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0})
+        usage['calls'] += 1
+        usage['prompt_tokens'] += prompt_tokens
+        usage['completion_tokens'] += completion_tokens
+
+    source = 'estimated' if estimated else 'reported'
+    logger.info(f"LLM tokens for {call_site}: prompt={prompt_tokens} completion={completion_tokens} ({source})")
+
+
+def token_usage_stats() -> Dict[str, Dict[str, int]]:
+    """Per call site call and token totals"""
+    with _usage_lock:
+        return {call_site: dict(usage) for call_site, usage in sorted(_token_usage.items())}
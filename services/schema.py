@@ -0,0 +1,122 @@
+"""
+Startup Schema Sync
+
+db.create_all creates missing tables but leaves existing tables alone.
+sync_schema also brings existing tables up to the models:
+
+- missing nullable columns are added in place
+- missing indexes are created
+- on PostgreSQL, CompressedJSON columns still typed json/jsonb are retyped to
+  bytea (rows are readable either way; migrate_compressed_json.py compresses
+  them)
+
+Every gunicorn worker runs this when it imports the app, so each statement is
+idempotent (IF NOT EXISTS where the database supports it) and runs in its own
+transaction. A statement that loses a race with another worker fails on its
+own, is logged and skipped; the retype holds an advisory lock and re-checks
+the column type under it.
+"""
+
+import logging
+from typing import Dict, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+
+# Concurrent CREATE TABLE on PostgreSQL can also fail on pg_type's unique index
+DDL_ERRORS = (OperationalError, ProgrammingError, IntegrityError)
+
+# pg_advisory_xact_lock key serialising the CompressedJSON retype across workers
+RETYPE_LOCK_KEY = 73105
+
+
+def execute_ddl(engine, statement, description: str) -> bool:
+    """Run one DDL statement in its own transaction; False when the database refused it"""
+    try:
+        with engine.begin() as connection:
+            connection.execute(statement)
+        return True
+    except DDL_ERRORS as e:
+        logging.warning(f"Schema sync: skipped {description}: {getattr(e, 'orig', e)}")
+        return False
+
+
+def add_column_statement(table, column, dialect):
+    preparer = dialect.identifier_preparer
+    if_not_exists = 'IF NOT EXISTS ' if dialect.name == 'postgresql' else ''
+    return text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {if_not_exists}"
+                f"{preparer.format_column(column)} {column.type.compile(dialect=dialect)}")
+
+
+def compressed_columns(metadata) -> Dict[str, Tuple[str, ...]]:
+    """Table name -> CompressedJSON column names"""
+    from models import CompressedJSON
+
+    columns = {}
+    for table in metadata.sorted_tables:
+        names = tuple(column.name for column in table.columns if isinstance(column.type, CompressedJSON))
+        if names:
+            columns[table.name] = names
+    return columns
+
+
+def retype_postgres_columns(connection, table: str, columns) -> list:
+    """json -> bytea, keeping the JSON text as UTF-8 bytes; returns the columns retyped"""
+    retyped = []
+    for column in columns:
+        data_type = connection.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ), {'table': table, 'column': column}).scalar()
+        if data_type in ('json', 'jsonb'):
+            connection.execute(text(
+                f'ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea '
+                f"USING convert_to({column}::text, 'UTF8')"
+            ))
+            retyped.append(column)
+    return retyped
+
+
+def retype_compressed_columns(engine, metadata) -> None:
+    """Retype CompressedJSON columns still stored as json/jsonb (PostgreSQL only)"""
+    if engine.dialect.name != 'postgresql':
+        return
+    for table, columns in compressed_columns(metadata).items():
+        try:
+            with engine.begin() as connection:
+                connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': RETYPE_LOCK_KEY})
+                retyped = retype_postgres_columns(connection, table, columns)
+        except DDL_ERRORS as e:
+            logging.error(f"Schema sync: {table} columns {', '.join(columns)} could not be retyped to bytea "
+                          f"({getattr(e, 'orig', e)}); writes to them fail until "
+                          f"migrate_compressed_json.py has run")
+            continue
+        if retyped:
+            logging.warning(f"Schema sync: retyped {table}.{', '.join(retyped)} from json to bytea; "
+                            f"run migrate_compressed_json.py to compress existing rows")
+
+
+def sync_schema(engine, metadata) -> None:
+    """
+    Create missing tables, nullable columns and indexes and retype old
+    CompressedJSON columns; safe to run from every worker at once
+    """
+    try:
+        metadata.create_all(engine)
+    except DDL_ERRORS as e:
+        # Another worker created a table between the existence check and CREATE
+        logging.info(f"Schema sync: create_all raced another worker ({getattr(e, 'orig', e)}); retrying")
+        metadata.create_all(engine)
+
+    inspector = inspect(engine)
+    for table in metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                execute_ddl(engine, add_column_statement(table, column, engine.dialect),
+                            f"adding column {table.name}.{column.name}")
+        for index in table.indexes:
+            execute_ddl(engine, CreateIndex(index, if_not_exists=True), f"creating index {index.name}")
+
+    retype_compressed_columns(engine, metadata)
@@ -0,0 +1,155 @@
+"""
+Series Codec for Simulation Time Series
+
+Packs simulation price series into a compact response format: each series is
+sent once as a base64-encoded little-endian float32 array, optionally
+downsampled with Largest-Triangle-Three-Buckets (LTTB) to the pixel width of
+the chart that will draw it. Full-resolution series stay in the simulation
+store and can be fetched on demand.
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+COMPACT_FORMAT = 'compact'
+
+# LTTB keeps both endpoints plus at least one bucket point
+MIN_POINTS = 3
+
+# Keys of MLSimulationService performance_data that hold price series
+SERIES_KEYS = ('market_performance', 'thesis_performance', 'daily_market_data', 'daily_thesis_data')
+
+
+def encode_float32(values: Sequence[float]) -> str:
+    """Encode a numeric sequence as base64 little-endian float32"""
+    return base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+
+def decode_float32(encoded: str) -> List[float]:
+    """Decode a base64 float32 string back to a list of floats"""
+    return np.frombuffer(base64.b64decode(encoded), dtype='<f4').astype(float).tolist()
+
+
+def encode_uint32(values: Sequence[int]) -> str:
+    """Encode integer indices as base64 little-endian uint32"""
+    return base64.b64encode(np.asarray(values, dtype='<u4').tobytes()).decode('ascii')
+
+
+def decode_uint32(encoded: str) -> List[int]:
+    """Decode a base64 uint32 string back to a list of ints"""
+    return np.frombuffer(base64.b64decode(encoded), dtype='<u4').astype(int).tolist()
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> np.ndarray:
+    """
+    Select the indices Largest-Triangle-Three-Buckets keeps when reducing a
+    series to ``threshold`` points. The first and last points are always kept.
+    """
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Interior points are split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if end <= start:
+            end = start + 1
+
+        # Average of the next bucket (or the last point for the final bucket)
+        if bucket < threshold - 3:
+            next_start, next_end = edges[bucket + 1], max(edges[bucket + 2], edges[bucket + 1] + 1)
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Point in this bucket forming the largest triangle with the previous pick and next average
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def parse_max_points(value: Any) -> Optional[int]:
+    """
+    A requested ``max_points`` as an int of at least MIN_POINTS, or None when
+    absent. Raises ValueError for values that are not positive integers.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"max_points must be an integer, got {value!r}")
+    try:
+        points = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"max_points must be an integer, got {value!r}")
+    if points < 1:
+        raise ValueError(f"max_points must be positive, got {points}")
+    return max(points, MIN_POINTS)
+
+
+def pack_series(values: Sequence[float], max_points: Optional[int] = None) -> Dict[str, Any]:
+    """Pack one series, downsampling with LTTB when it exceeds ``max_points``"""
+    values = list(values or [])
+    packed = {
+        'dtype': 'float32',
+        'encoding': 'base64',
+        'source_length': len(values)
+    }
+
+    if max_points and len(values) > max_points:
+        indices = lttb_indices(values, max_points)
+        packed['index'] = encode_uint32(indices)
+        values = np.asarray(values, dtype=float)[indices]
+
+    packed['length'] = len(values)
+    packed['data'] = encode_float32(values)
+    return packed
+
+
+def unpack_series(packed: Dict[str, Any]) -> Dict[str, List]:
+    """Inverse of pack_series, returning the values and their source indices"""
+    values = decode_float32(packed['data'])
+    indices = decode_uint32(packed['index']) if 'index' in packed else list(range(len(values)))
+    return {'values': values, 'index': indices}
+
+
+def compact_simulation_payload(result: Dict[str, Any], max_points: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Convert an MLSimulationService result into the compact response format.
+    Price series are moved out of ``performance_data`` into a single ``series``
+    block and the duplicate ``chart_data`` copy is reduced to the timeline.
+    """
+    if not isinstance(result, dict) or result.get('error'):
+        return result
+
+    compact = dict(result)
+    performance_data = dict(compact.get('performance_data') or {})
+
+    series = {}
+    for key in SERIES_KEYS:
+        if key in performance_data:
+            series[key] = pack_series(performance_data.pop(key), max_points)
+
+    compact['performance_data'] = performance_data
+    compact['series'] = series
+    compact['chart_data'] = {'timeline': compact.get('timeline', [])}
+    compact['payload_format'] = COMPACT_FORMAT
+    return compact
@@ -0,0 +1,107 @@
+"""
+Service Registry
+
+Lazy, memoised construction of the process-wide service singletons. Routes
+hold a ``LazyService`` proxy per service instead of building every service
+(and importing its dependencies) at import time; the first attribute access
+imports the service module, constructs the instance once and caches it.
+Worker boot therefore only pays for the services a request actually uses.
+
+Factories are either callables or ``'module:attribute'`` strings, so modules
+such as the document processor (pandas, pypdf) are not imported until needed.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+Factory = Union[str, Callable[[], Any]]
+
+
+class ServiceRegistry:
+    """
+    Named factories plus the instances they have built
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Factory] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.construction_seconds: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Factory) -> None:
+        with self._lock:
+            self._factories[name] = factory
+
+    def lazy(self, name: str, factory: Optional[Factory] = None) -> 'LazyService':
+        """Register ``factory`` (when given) and return a proxy for the service"""
+        if factory is not None:
+            self.register(name, factory)
+        return LazyService(self, name)
+
+    def get(self, name: str) -> Any:
+        """The service instance, constructing it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories[name]
+                # Timed from before the import so the figure is the full first-use cost
+                start = time.perf_counter()
+                if isinstance(factory, str):
+                    module_name, attribute = factory.split(':')
+                    factory = getattr(importlib.import_module(module_name), attribute)
+                self._instances[name] = factory()
+                self.construction_seconds[name] = time.perf_counter() - start
+                logging.debug(f"Constructed service {name} in {self.construction_seconds[name] * 1000:.1f} ms")
+            return self._instances[name]
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Drop one (or every) constructed instance; the next access rebuilds it"""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'registered': sorted(self._factories),
+                'constructed': {name: round(seconds * 1000, 2)
+                                for name, seconds in self.construction_seconds.items()
+                                if name in self._instances}
+            }
+
+
+class LazyService:
+    """
+    Stand-in for a registered service that constructs it on first attribute
+    access; attribute assignment is forwarded too, so tests can patch methods
+    """
+
+    __slots__ = ('_registry', '_name')
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry.get(self._name), attribute)
+
+    def __setattr__(self, attribute: str, value: Any) -> None:
+        setattr(self._registry.get(self._name), attribute, value)
+
+    def __repr__(self) -> str:
+        state = 'built' if self._registry.is_built(self._name) else 'lazy'
+        return f"<LazyService {self._name} ({state})>"
+
+
+registry = ServiceRegistry()
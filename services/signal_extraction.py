@@ -4,10 +4,14 @@ from typing import List, Dict, Any, Optional
 from app import db
 from models import SignalMonitoring, NotificationLog
 from services.data_registry import DataRegistry
+from services.event_bus import event_bus
 from services.notification_service import NotificationService
 from services.signal_classifier import SignalClassifier
 from config import Config
 
+# Sweep results listed individually in signal_sweep events
+SWEEP_UPDATE_STATUSES = ('triggered', 'error')
+
 class SignalExtractor:
     """
     Service for extracting and monitoring signals from market data
@@ -33,7 +37,6 @@ class SignalExtractor:
                 
                 # Update last checked timestamp
                 signal.last_checked = datetime.utcnow()
-                db.session.commit()
                 
             except Exception as e:
                 logging.error(f"Error checking signal {signal.id}: {str(e)}")
@@ -43,8 +46,29 @@ class SignalExtractor:
                     'error': str(e)
                 })
         
+        # One commit per sweep: committing per signal expired every loaded
+        # signal each time, which made a sweep quadratic in the signal count
+        db.session.commit()
+        
+        self._publish_sweep(results)
         return results
     
+    def _publish_sweep(self, results: List[Dict[str, Any]]):
+        """Push a compact summary of a sweep to connected monitoring dashboards"""
+        statuses = [result.get('status') for result in results]
+        event_bus.publish('signal_sweep', {
+            'checked': len(results),
+            'triggered': statuses.count('triggered'),
+            'errors': statuses.count('error'),
+            'active_signals': SignalMonitoring.query.filter_by(status='active').count(),
+            # Only breaches and failures; most saved signals report unsupported or no_data every sweep
+            'updates': [
+                {key: result[key] for key in ('signal_id', 'status', 'current_value') if key in result}
+                for result in results if result.get('status') in SWEEP_UPDATE_STATUSES
+            ],
+            'checked_at': datetime.utcnow().isoformat()
+        })
+    
     def _check_signal(self, signal: SignalMonitoring) -> Dict[str, Any]:
         """
         Check a specific signal for threshold breach
@@ -3,13 +3,12 @@ Significance Mapping Service
 Creates visual connections between research elements and signal patterns
 """
 
-import json
 from typing import Dict, List, Any, Optional
-from services.azure_openai_service import AzureOpenAIService
+from services.thesis_scoring_service import ThesisScoringService, extract_research_elements, extract_signal_patterns
 
 class SignificanceMappingService:
-    def __init__(self):
-        self.ai_service = AzureOpenAIService()
+    def __init__(self, scoring_service: Optional[ThesisScoringService] = None):
+        self.scoring_service = scoring_service or ThesisScoringService()
     
     def generate_significance_map(self, thesis_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -47,129 +46,18 @@ class SignificanceMappingService:
     
     def _extract_research_elements(self, thesis_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract key research components from thesis analysis"""
-        elements = []
-        
-        # Core claim
-        if thesis_analysis.get('core_claim'):
-            elements.append({
-                'id': 'core_claim',
-                'type': 'research',
-                'category': 'thesis_foundation',
-                'title': 'Core Investment Claim',
-                'content': thesis_analysis['core_claim'][:200] + '...' if len(thesis_analysis['core_claim']) > 200 else thesis_analysis['core_claim'],
-                'importance_score': 0.95
-            })
-        
-        # Key assumptions
-        assumptions = thesis_analysis.get('assumptions', [])
-        if isinstance(assumptions, list):
-            for i, assumption in enumerate(assumptions[:5]):
-                elements.append({
-                    'id': f'assumption_{i}',
-                    'type': 'research',
-                    'category': 'key_assumption',
-                    'title': f'Key Assumption {i+1}',
-                    'content': assumption[:150] + '...' if len(assumption) > 150 else assumption,
-                    'importance_score': 0.8 - (i * 0.1)
-                })
-        
-        # Mental model
-        if thesis_analysis.get('mental_model'):
-            elements.append({
-                'id': 'mental_model',
-                'type': 'research',
-                'category': 'analytical_framework',
-                'title': 'Analytical Framework',
-                'content': thesis_analysis['mental_model'],
-                'importance_score': 0.85
-            })
-        
-        # Core analysis insights
-        if thesis_analysis.get('core_analysis'):
-            elements.append({
-                'id': 'core_analysis',
-                'type': 'research',
-                'category': 'analytical_depth',
-                'title': 'Core Analysis',
-                'content': thesis_analysis['core_analysis'][:200] + '...' if len(thesis_analysis['core_analysis']) > 200 else thesis_analysis['core_analysis'],
-                'importance_score': 0.9
-            })
-        
-        return elements
+        return extract_research_elements(thesis_analysis)
     
     def _extract_signal_patterns(self, thesis_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract signal patterns from monitoring data"""
-        signals = []
-        
-        # Extract from metrics_to_track
-        metrics = thesis_analysis.get('metrics_to_track', [])
-        if isinstance(metrics, list):
-            for i, metric in enumerate(metrics[:8]):
-                signals.append({
-                    'id': f'signal_{i}',
-                    'type': 'signal',
-                    'category': 'tracking_metric',
-                    'title': metric.get('name', f'Signal {i+1}') if isinstance(metric, dict) else str(metric),
-                    'signal_type': metric.get('type', 'quantitative') if isinstance(metric, dict) else 'quantitative',
-                    'confidence_score': 0.8 - (i * 0.05),
-                    'predictive_value': 0.75 + (i % 3) * 0.05
-                })
-        
-        # Extract from monitoring plan
-        monitoring_plan = thesis_analysis.get('monitoring_plan', [])
-        if isinstance(monitoring_plan, list):
-            for i, plan_item in enumerate(monitoring_plan[:5]):
-                signals.append({
-                    'id': f'monitor_{i}',
-                    'type': 'signal',
-                    'category': 'monitoring_signal',
-                    'title': plan_item.get('signal', f'Monitor {i+1}') if isinstance(plan_item, dict) else str(plan_item),
-                    'signal_type': 'qualitative',
-                    'confidence_score': 0.7 + (i % 2) * 0.1,
-                    'predictive_value': 0.65 + (i % 4) * 0.05
-                })
-        
-        return signals
+        return extract_signal_patterns(thesis_analysis)
     
     def _generate_connections(self, research_elements: List[Dict], signal_patterns: List[Dict], thesis_analysis: Dict) -> List[Dict[str, Any]]:
-        """Use AI to identify logical connections between research and signals"""
-        try:
-            prompt = f"""
-            Analyze the logical connections between research elements and signal patterns in this investment thesis.
-            
-            Research Elements:
-            {json.dumps([{'id': r['id'], 'title': r['title'], 'content': r['content']} for r in research_elements], indent=2)}
-            
-            Signal Patterns:
-            {json.dumps([{'id': s['id'], 'title': s['title'], 'type': s['signal_type']} for s in signal_patterns], indent=2)}
-            
-            For each meaningful connection, provide:
-            1. Which research element connects to which signal
-            2. The logical relationship type (validates, measures, indicates, contradicts)
-            3. Connection strength (0.0-1.0)
-            4. Brief explanation of the connection
-            
-            Respond with JSON array of connections:
-            [{{
-                "research_id": "string",
-                "signal_id": "string", 
-                "relationship_type": "validates|measures|indicates|contradicts",
-                "strength": 0.0-1.0,
-                "explanation": "brief explanation"
-            }}]
-            """
-            
-            response = self.ai_service.generate_completion(
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,
-                temperature=0.3
-            )
-            
-            connections_data = json.loads(response)
-            return connections_data if isinstance(connections_data, list) else []
-            
-        except Exception:
+        """Identify logical connections between research and signals from the combined scoring call"""
+        connections = self.scoring_service.score_thesis(thesis_analysis)['connections']
+        if connections is None:
             return self._generate_fallback_connections(research_elements, signal_patterns)
+        return connections
     
     def _generate_fallback_connections(self, research_elements: List[Dict], signal_patterns: List[Dict]) -> List[Dict]:
         """Generate logical connections using pattern matching"""
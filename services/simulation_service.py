@@ -10,7 +10,9 @@ import random
 import math
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
+import numpy as np
 from services.azure_openai_service import AzureOpenAIService
+from services.event_kernel import EventKernel
 
 
 class SimulationService:
@@ -23,9 +25,11 @@ class SimulationService:
         
     def generate_simulation(self, thesis, time_horizon: int, scenario: str, 
                           volatility: str, include_events: bool, simulation_type: str,
-                          monitoring_plan: Optional[Dict] = None) -> Dict[str, Any]:
+                          monitoring_plan: Optional[Dict] = None,
+                          seed: Optional[int] = None) -> Dict[str, Any]:
         """
-        Generate comprehensive thesis simulation with performance data and events
+        Generate comprehensive thesis simulation with performance data and events.
+        ``seed`` seeds the event kernel's jump draws.
         """
         # Generate base performance simulation
         performance_data = self._generate_performance_simulation(
@@ -54,7 +58,7 @@ class SimulationService:
                 # Use thesis-specific monitoring plan for events if available
                 if monitoring_plan:
                     events = self._generate_monitoring_based_events(
-                        thesis, time_horizon, scenario, monitoring_plan, performance_data
+                        thesis, time_horizon, scenario, monitoring_plan, performance_data, seed
                     )
                     print(f"Generated {len(events)} monitoring-based events")
                 else:
@@ -94,6 +98,7 @@ class SimulationService:
                 'time_horizon': time_horizon,
                 'include_events': include_events,
                 'simulation_type': simulation_type,
+                'seed': seed,
                 'generated_at': datetime.utcnow().isoformat()
             }
         }
@@ -570,139 +575,59 @@ JSON format: [{{"month": 6, "title": "Event Title", "description": "Brief descri
         return events
     
     def _generate_monitoring_based_events(self, thesis, time_horizon: int, scenario: str, 
-                                        monitoring_plan: Dict, performance_data: Any) -> List[Dict[str, Any]]:
+                                        monitoring_plan: Dict, performance_data: Any,
+                                        seed: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Generate events based on the comprehensive monitoring plan data
+        Generate events based on the comprehensive monitoring plan data.
+        Events are applied to the thesis series by the shared event kernel so
+        the reported impacts match the simulated performance.
         """
-        events = []
         total_months = time_horizon * 12
         
-        # Extract events from monitoring plan components
-        validation_events = self._extract_validation_events(monitoring_plan, total_months)
-        alert_events = self._extract_alert_events(monitoring_plan, total_months)
-        decision_events = self._extract_decision_events(monitoring_plan, total_months)
-        counter_thesis_events = self._extract_counter_thesis_events(monitoring_plan, total_months)
-        
-        # Combine all events
-        all_events = validation_events + alert_events + decision_events + counter_thesis_events
-        
-        # Sort by month and limit to reasonable number
-        all_events.sort(key=lambda x: x['month'])
-        
-        # Add performance impact values
-        for event in all_events[:8]:  # Limit to 8 events max
-            month = event['month']
-            if isinstance(performance_data, dict):
-                perf_data = performance_data.get('thesis_performance', performance_data.get('market_performance', []))
-            else:
-                perf_data = performance_data if isinstance(performance_data, list) else []
-            
-            if perf_data and month <= len(perf_data):
-                event['impact_value'] = perf_data[month - 1]
+        if isinstance(performance_data, dict):
+            series_key = 'thesis_performance' if performance_data.get('thesis_performance') else 'market_performance'
+            perf_data = performance_data.get(series_key, [])
+        else:
+            series_key = None
+            perf_data = performance_data if isinstance(performance_data, list) else []
+        
+        kernel = EventKernel(total_months, steps_per_month=1, seed=seed)
+        kernel.schedule_monitoring_plan(monitoring_plan, limit=8)
+        
+        if perf_data:
+            paths = np.asarray(perf_data, dtype=float)[None, :]
+            kernel.apply(paths)
+            adjusted = [round(value, 1) for value in paths[0].tolist()]
+            if series_key:
+                performance_data[series_key] = adjusted
             else:
-                event['impact_value'] = 100
-            
-            event['date'] = self._month_to_date(month, time_horizon)
-        
-        return all_events[:8]
-    
-    def _extract_validation_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from validation framework"""
-        events = []
-        framework = monitoring_plan.get('validation_framework', {})
-        
-        # Core claim metrics events
-        core_metrics = framework.get('core_claim_metrics', [])
-        for i, metric in enumerate(core_metrics[:2]):
-            month = (i + 1) * (total_months // 4)  # Spread across timeline
-            events.append({
-                'month': month,
-                'title': f"Core Metric Validation: {metric.get('metric', 'Performance')}",
-                'description': f"Validating {metric.get('metric')} against {metric.get('target_threshold')} threshold via {metric.get('data_source')}",
-                'impact_type': 'validation',
-                'notification_triggered': True,
-                'signals_affected': [metric.get('metric', 'Core Signal')],
-                'event_category': 'validation'
-            })
-        
-        # Assumption testing events
-        assumption_tests = framework.get('assumption_tests', [])
-        for i, test in enumerate(assumption_tests[:2]):
-            month = (i + 2) * (total_months // 5)
-            events.append({
-                'month': month,
-                'title': f"Assumption Test: {test.get('test_metric', 'Market Test')}",
-                'description': f"Testing assumption via {test.get('test_metric')} - Success: {test.get('success_threshold')}, Failure: {test.get('failure_threshold')}",
-                'impact_type': 'assumption_test',
-                'notification_triggered': True,
-                'signals_affected': [test.get('test_metric', 'Assumption Signal')],
-                'event_category': 'assumption'
-            })
-        
-        return events
-    
-    def _extract_alert_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from alert system"""
-        events = []
-        alert_system = monitoring_plan.get('alert_system', [])
-        
-        for i, alert in enumerate(alert_system[:3]):
-            month = (i + 1) * (total_months // 3)
-            severity_color = 'danger' if alert.get('severity') == 'high' else 'warning'
-            
-            events.append({
-                'month': month,
-                'title': f"Alert Triggered: {alert.get('trigger_name', 'Performance Alert')}",
-                'description': f"Condition: {alert.get('condition')} | Action: {alert.get('action')}",
-                'impact_type': severity_color,
-                'notification_triggered': True,
-                'signals_affected': [alert.get('trigger_name', 'Alert Signal')],
-                'event_category': 'alert'
-            })
+                perf_data[:] = adjusted
+        else:
+            kernel.apply(np.full((1, max(1, total_months)), 100.0))
         
-        return events
-    
-    def _extract_decision_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from decision framework"""
         events = []
-        decision_framework = monitoring_plan.get('decision_framework', [])
-        
-        for i, decision in enumerate(decision_framework[:2]):
-            month = (i + 1) * (total_months // 2)
-            action = decision.get('action', 'review')
-            impact_type = 'success' if action == 'buy' else 'danger' if action == 'sell' else 'warning'
-            
-            events.append({
-                'month': month,
-                'title': f"Decision Point: {decision.get('scenario', 'Performance Review')}",
-                'description': f"Condition: {decision.get('condition')} | Recommended Action: {action.upper()} | Confidence: {decision.get('confidence_threshold')}",
-                'impact_type': impact_type,
-                'notification_triggered': True,
-                'signals_affected': ['Decision Framework'],
-                'event_category': 'decision'
-            })
+        for event in kernel.applied_events:
+            event['impact_type'] = self._monitoring_impact_type(event)
+            event['notification_triggered'] = True
+            event['date'] = self._month_to_date(event['month'], time_horizon)
+            events.append(event)
         
         return events
     
-    def _extract_counter_thesis_events(self, monitoring_plan: Dict, total_months: int) -> List[Dict]:
-        """Extract events from counter-thesis monitoring"""
-        events = []
-        counter_monitoring = monitoring_plan.get('counter_thesis_monitoring', [])
-        
-        for i, risk in enumerate(counter_monitoring[:2]):
-            month = (total_months // 3) * (i + 2)  # Later in timeline
-            
-            events.append({
-                'month': month,
-                'title': f"Risk Monitor: {risk.get('risk_scenario', 'Counter-Thesis Risk')}",
-                'description': f"Early warning via {risk.get('early_warning_metric')} threshold {risk.get('threshold')} | Mitigation: {risk.get('mitigation_action')}",
-                'impact_type': 'warning',
-                'notification_triggered': True,
-                'signals_affected': [risk.get('early_warning_metric', 'Risk Signal')],
-                'event_category': 'risk'
-            })
-        
-        return events
+    def _monitoring_impact_type(self, event: Dict) -> str:
+        """Map a kernel event to the display impact type used by the simulation page"""
+        category = event.get('event_category')
+        
+        if category == 'validation':
+            return 'validation'
+        if category == 'assumption':
+            return 'assumption_test'
+        if category == 'alert':
+            return 'danger' if event.get('severity') == 'high' else 'warning'
+        if category == 'decision':
+            action = event.get('action')
+            return 'success' if action == 'buy' else 'danger' if action == 'sell' else 'warning'
+        return 'warning'
     
     def _extract_thesis_keywords(self, thesis) -> List[str]:
         """
@@ -797,20 +722,6 @@ JSON format: [{{"month": 6, "title": "Event Title", "description": "Brief descri
         
         return events
     
-    def _select_event_month(self, used_months: set, time_horizon: int, data_length: int) -> Optional[int]:
-        """
-        Select a realistic month for an event with proper spacing
-        """
-        max_month = min(time_horizon * 12, data_length)
-        available_months = []
-        
-        for month in range(1, max_month + 1):
-            # Ensure at least 2 months spacing between events
-            if month not in used_months and all(abs(month - used) >= 2 for used in used_months):
-                available_months.append(month)
-        
-        return random.choice(available_months) if available_months else None
-    
     def _generate_fallback_events(self, time_horizon: int, scenario: str, 
                                 performance_data: List[float]) -> List[Dict[str, Any]]:
         """
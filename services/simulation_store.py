@@ -0,0 +1,139 @@
+"""
+Simulation Result Store
+
+Memoises simulation and backtest output in the database so repeat views of the
+same thesis and parameters are served from storage instead of re-running the
+parameter extraction, price generation and event generation steps.
+
+Results are keyed by thesis id, thesis ``updated_at``, a hash of the request
+parameters and the random seed. Editing a thesis bumps ``updated_at`` which
+makes every stored result for the previous version unreachable; those rows are
+deleted in the same flush, and a deleted thesis takes its results with it.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, event, inspect
+
+from app import db
+from models import SimulationResult, ThesisAnalysis
+
+
+class SimulationStore:
+    """
+    Database-backed memo table for simulation and backtest results
+    """
+
+    COMPRESSION_LEVEL = 6
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def build_params_hash(params: Dict[str, Any]) -> str:
+        """Stable hash of the request parameters that shape a simulation"""
+        canonical = json.dumps(params or {}, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def compress_result(cls, result: Dict[str, Any]) -> bytes:
+        """Serialise a result dict to a compressed blob"""
+        raw = json.dumps(result, separators=(',', ':'), default=str).encode('utf-8')
+        return zlib.compress(raw, cls.COMPRESSION_LEVEL)
+
+    @staticmethod
+    def decompress_result(payload: bytes) -> Dict[str, Any]:
+        """Restore a result dict from a compressed blob"""
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def get(self, thesis, simulation_kind: str, params: Dict[str, Any],
+            seed: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored result for this thesis version and parameters, if any"""
+        return self.get_by_hash(thesis, simulation_kind, self.build_params_hash(params), seed)
+
+    def get_by_hash(self, thesis, simulation_kind: str, params_hash: str,
+                    seed: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored result for a previously computed parameters hash"""
+        try:
+            stored = SimulationResult.query.filter_by(
+                thesis_analysis_id=thesis.id,
+                simulation_kind=simulation_kind,
+                params_hash=params_hash,
+                seed=seed,
+                thesis_updated_at=thesis.updated_at
+            ).order_by(SimulationResult.created_at.desc()).first()
+
+            if not stored:
+                return None
+
+            return self.decompress_result(stored.payload)
+
+        except Exception as e:
+            self.logger.warning(f"Simulation store lookup failed for thesis {thesis.id}: {str(e)}")
+            return None
+
+    def put(self, thesis, simulation_kind: str, params: Dict[str, Any],
+            result: Dict[str, Any], seed: Optional[int] = None) -> None:
+        """Store a result and drop entries belonging to older thesis versions"""
+        try:
+            payload = self.compress_result(result)
+
+            SimulationResult.query.filter(
+                SimulationResult.thesis_analysis_id == thesis.id,
+                SimulationResult.simulation_kind == simulation_kind,
+                SimulationResult.thesis_updated_at != thesis.updated_at
+            ).delete(synchronize_session=False)
+
+            db.session.add(SimulationResult(
+                thesis_analysis_id=thesis.id,
+                simulation_kind=simulation_kind,
+                thesis_updated_at=thesis.updated_at,
+                params_hash=self.build_params_hash(params),
+                seed=seed,
+                payload=payload,
+                payload_size=len(payload)
+            ))
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.warning(f"Simulation store write failed for thesis {thesis.id}: {str(e)}")
+
+    def get_or_compute(self, thesis, simulation_kind: str, params: Dict[str, Any],
+                       compute: Callable[[], Dict[str, Any]],
+                       seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Serve a stored result or compute, store and return a fresh one.
+        Results carrying an ``error`` key are returned but never stored.
+        """
+        cached = self.get(thesis, simulation_kind, params, seed)
+        if cached is not None:
+            self.logger.info(f"Serving stored {simulation_kind} for thesis {thesis.id}")
+            return cached
+
+        result = compute()
+
+        if isinstance(result, dict) and not result.get('error'):
+            self.put(thesis, simulation_kind, params, result, seed)
+
+        return result
+
+
+def _delete_results(connection, thesis_id: int) -> None:
+    connection.execute(delete(SimulationResult).where(SimulationResult.thesis_analysis_id == thesis_id))
+
+
+@event.listens_for(ThesisAnalysis, 'after_update')
+def _drop_results_of_edited_thesis(mapper, connection, thesis):
+    state = inspect(thesis)
+    if any(state.attrs[attr.key].history.has_changes() for attr in mapper.column_attrs):
+        _delete_results(connection, thesis.id)
+
+
+@event.listens_for(ThesisAnalysis, 'before_delete')
+def _drop_results_of_deleted_thesis(mapper, connection, thesis):
+    _delete_results(connection, thesis.id)
@@ -3,24 +3,22 @@ Smart Prioritization Engine
 AI-powered ranking system for research elements and signal patterns
 """
 
-import json
 from typing import Dict, List, Any, Optional, Tuple
-from services.azure_openai_service import AzureOpenAIService
+from services.thesis_scoring_service import ThesisScoringService
 
 class SmartPrioritizationService:
-    def __init__(self):
-        self.ai_service = AzureOpenAIService()
+    def __init__(self, scoring_service: Optional[ThesisScoringService] = None):
+        self.scoring_service = scoring_service or ThesisScoringService()
     
     def generate_dual_prioritization(self, thesis_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate separate prioritization for research elements and signal patterns
         """
         try:
-            # Analyze research importance
-            research_priority = self._analyze_research_importance(thesis_analysis)
-            
-            # Analyze signal predictive value
-            signal_priority = self._analyze_signal_strength(thesis_analysis)
+            # Research importance and signal predictive value come from one combined scoring call
+            scores = self.scoring_service.score_thesis(thesis_analysis)
+            research_priority = scores['research_prioritization'] or self._fallback_research_priority()
+            signal_priority = scores['signal_prioritization'] or self._fallback_signal_priority()
             
             # Generate alignment analysis
             alignment_analysis = self._analyze_priority_alignment(research_priority, signal_priority)
@@ -38,100 +36,6 @@ class SmartPrioritizationService:
         except Exception as e:
             return self._fallback_prioritization()
     
-    def _analyze_research_importance(self, thesis_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze and rank research elements by analytical importance"""
-        try:
-            research_elements = {
-                'core_claim': thesis_analysis.get('core_claim', ''),
-                'core_analysis': thesis_analysis.get('core_analysis', ''),
-                'assumptions': thesis_analysis.get('assumptions', []),
-                'mental_model': thesis_analysis.get('mental_model', ''),
-                'causal_chain': thesis_analysis.get('causal_chain', [])
-            }
-            
-            prompt = f"""
-            Analyze the research quality and importance of these investment thesis elements.
-            Rate each element's analytical value on these criteria:
-
-            1. Depth of Analysis (1-10): How thorough and well-reasoned
-            2. Data Foundation (1-10): Quality of supporting evidence  
-            3. Logical Consistency (1-10): Internal coherence and reasoning
-            4. Market Relevance (1-10): Connection to actual market dynamics
-            5. Actionability (1-10): How useful for investment decisions
-
-            Research Elements:
-            {json.dumps(research_elements, indent=2)}
-
-            Respond with JSON:
-            {{
-                "element_scores": {{
-                    "core_claim": {{"depth": 0-10, "data_foundation": 0-10, "logical_consistency": 0-10, "market_relevance": 0-10, "actionability": 0-10, "overall_score": 0-10}},
-                    "core_analysis": {{"depth": 0-10, "data_foundation": 0-10, "logical_consistency": 0-10, "market_relevance": 0-10, "actionability": 0-10, "overall_score": 0-10}},
-                    "assumptions": {{"depth": 0-10, "data_foundation": 0-10, "logical_consistency": 0-10, "market_relevance": 0-10, "actionability": 0-10, "overall_score": 0-10}},
-                    "mental_model": {{"depth": 0-10, "data_foundation": 0-10, "logical_consistency": 0-10, "market_relevance": 0-10, "actionability": 0-10, "overall_score": 0-10}},
-                    "causal_chain": {{"depth": 0-10, "data_foundation": 0-10, "logical_consistency": 0-10, "market_relevance": 0-10, "actionability": 0-10, "overall_score": 0-10}}
-                }},
-                "priority_ranking": ["element1", "element2", "element3", "element4", "element5"],
-                "research_quality_summary": "brief assessment of overall research quality"
-            }}
-            """
-            
-            response = self.ai_service.generate_completion(
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1500,
-                temperature=0.2
-            )
-            
-            return json.loads(response)
-            
-        except Exception:
-            return self._fallback_research_priority()
-    
-    def _analyze_signal_strength(self, thesis_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze and rank signal patterns by predictive value"""
-        try:
-            signals_data = {
-                'metrics_to_track': thesis_analysis.get('metrics_to_track', []),
-                'monitoring_plan': thesis_analysis.get('monitoring_plan', [])
-            }
-            
-            prompt = f"""
-            Analyze the predictive strength and market value of these investment signals.
-            Rate each signal type on these criteria:
-
-            1. Historical Accuracy (1-10): Track record of predictive success
-            2. Market Correlation (1-10): Strength of connection to market movements
-            3. Data Availability (1-10): Ease of obtaining reliable data
-            4. Timeliness (1-10): How quickly signal provides actionable information
-            5. Risk Warning Value (1-10): Ability to predict downside scenarios
-
-            Signal Data:
-            {json.dumps(signals_data, indent=2)}
-
-            Respond with JSON:
-            {{
-                "signal_categories": {{
-                    "financial_metrics": {{"historical_accuracy": 0-10, "market_correlation": 0-10, "data_availability": 0-10, "timeliness": 0-10, "risk_warning": 0-10, "overall_strength": 0-10}},
-                    "market_indicators": {{"historical_accuracy": 0-10, "market_correlation": 0-10, "data_availability": 0-10, "timeliness": 0-10, "risk_warning": 0-10, "overall_strength": 0-10}},
-                    "operational_metrics": {{"historical_accuracy": 0-10, "market_correlation": 0-10, "data_availability": 0-10, "timeliness": 0-10, "risk_warning": 0-10, "overall_strength": 0-10}},
-                    "external_factors": {{"historical_accuracy": 0-10, "market_correlation": 0-10, "data_availability": 0-10, "timeliness": 0-10, "risk_warning": 0-10, "overall_strength": 0-10}}
-                }},
-                "signal_priority_ranking": ["category1", "category2", "category3", "category4"],
-                "predictive_strength_summary": "brief assessment of overall signal reliability"
-            }}
-            """
-            
-            response = self.ai_service.generate_completion(
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1500,
-                temperature=0.2
-            )
-            
-            return json.loads(response)
-            
-        except Exception:
-            return self._fallback_signal_priority()
-    
     def _analyze_priority_alignment(self, research_priority: Dict, signal_priority: Dict) -> Dict[str, Any]:
         """Analyze how research importance aligns with signal strength"""
         try:
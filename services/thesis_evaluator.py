@@ -7,8 +7,16 @@ import json
 import logging
 from typing import Dict, List, Any, Optional
 from services.azure_openai_service import AzureOpenAIService
+from services.prompt_budget import compact_json, compact_thesis
+
+EVALUATION_FIELDS = (
+    'core_claim', 'core_analysis', 'assumptions', 'causal_chain', 'mental_model',
+    'counter_thesis', 'metrics_to_track'
+)
 
 class ThesisEvaluator:
+    PROMPT_TOKEN_BUDGET = 1500
+
     def __init__(self):
         self.azure_service = AzureOpenAIService()
         
@@ -17,13 +25,14 @@ class ThesisEvaluator:
         Comprehensive evaluation of thesis strength across multiple dimensions
         """
         try:
-            # Extract key components for evaluation
-            core_claim = thesis_analysis.get('core_claim', '')
-            core_analysis = thesis_analysis.get('core_analysis', '')
-            assumptions = thesis_analysis.get('assumptions', [])
-            causal_chain = thesis_analysis.get('causal_chain', [])
-            counter_thesis = thesis_analysis.get('counter_thesis', [])
-            metrics_to_track = thesis_analysis.get('metrics_to_track', [])
+            # Extract key components for evaluation, compacted to the prompt budget
+            compact = compact_thesis(thesis_analysis, self.PROMPT_TOKEN_BUDGET, EVALUATION_FIELDS)
+            core_claim = compact.get('core_claim', '')
+            core_analysis = compact.get('core_analysis', '')
+            assumptions = compact.get('assumptions', [])
+            causal_chain = compact.get('causal_chain', [])
+            counter_thesis = compact.get('counter_thesis', [])
+            metrics_to_track = compact.get('metrics_to_track', [])
             
             # Create comprehensive evaluation prompt
             evaluation_prompt = self._build_evaluation_prompt(
@@ -55,7 +64,7 @@ Provide actionable insights for improving the thesis."""
             ]
             
             response = self.azure_service.generate_completion(
-                messages, temperature=0.3, max_tokens=3000
+                messages, temperature=0.3, max_tokens=3000, call_site='thesis_evaluation'
             )
             
             if isinstance(response, str):
@@ -91,13 +100,13 @@ Supporting Analysis:
 {core_analysis}
 
 Key Assumptions:
-{json.dumps(assumptions, indent=2)}
+{compact_json(assumptions)}
 
 Causal Chain:
-{json.dumps(causal_chain, indent=2)}
+{compact_json(causal_chain)}
 
 Counter-Thesis Considerations:
-{json.dumps(counter_thesis, indent=2)}
+{compact_json(counter_thesis)}
 
 Tracking Metrics ({len(metrics)} signals):
 {self._format_metrics_for_evaluation(metrics)}
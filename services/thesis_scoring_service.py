@@ -0,0 +1,320 @@
+"""
+Thesis Scoring Service
+Single structured LLM call scoring research elements, signal categories and
+research-signal connections for one thesis. SmartPrioritizationService and
+SignificanceMappingService both read their views from this result.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from services.azure_openai_service import AzureOpenAIService
+from services.llm_json import parse_llm_json
+from services.prompt_budget import compact_json, compact_thesis
+
+RESEARCH_ELEMENTS = ('core_claim', 'core_analysis', 'assumptions', 'mental_model', 'causal_chain')
+SIGNAL_CATEGORIES = ('financial_metrics', 'market_indicators', 'operational_metrics', 'external_factors')
+RESEARCH_CRITERIA = ('depth', 'data_foundation', 'logical_consistency', 'market_relevance', 'actionability', 'overall_score')
+SIGNAL_CRITERIA = ('historical_accuracy', 'market_correlation', 'data_availability', 'timeliness', 'risk_warning', 'overall_strength')
+RELATIONSHIP_TYPES = ('validates', 'measures', 'indicates', 'contradicts')
+
+
+def extract_research_elements(thesis_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract key research components from thesis analysis"""
+    elements = []
+
+    # Core claim
+    if thesis_analysis.get('core_claim'):
+        elements.append({
+            'id': 'core_claim',
+            'type': 'research',
+            'category': 'thesis_foundation',
+            'title': 'Core Investment Claim',
+            'content': thesis_analysis['core_claim'][:200] + '...' if len(thesis_analysis['core_claim']) > 200 else thesis_analysis['core_claim'],
+            'importance_score': 0.95
+        })
+
+    # Key assumptions
+    assumptions = thesis_analysis.get('assumptions', [])
+    if isinstance(assumptions, list):
+        for i, assumption in enumerate(assumptions[:5]):
+            elements.append({
+                'id': f'assumption_{i}',
+                'type': 'research',
+                'category': 'key_assumption',
+                'title': f'Key Assumption {i+1}',
+                'content': assumption[:150] + '...' if len(assumption) > 150 else assumption,
+                'importance_score': 0.8 - (i * 0.1)
+            })
+
+    # Mental model
+    if thesis_analysis.get('mental_model'):
+        elements.append({
+            'id': 'mental_model',
+            'type': 'research',
+            'category': 'analytical_framework',
+            'title': 'Analytical Framework',
+            'content': thesis_analysis['mental_model'],
+            'importance_score': 0.85
+        })
+
+    # Core analysis insights
+    if thesis_analysis.get('core_analysis'):
+        elements.append({
+            'id': 'core_analysis',
+            'type': 'research',
+            'category': 'analytical_depth',
+            'title': 'Core Analysis',
+            'content': thesis_analysis['core_analysis'][:200] + '...' if len(thesis_analysis['core_analysis']) > 200 else thesis_analysis['core_analysis'],
+            'importance_score': 0.9
+        })
+
+    return elements
+
+
+def extract_signal_patterns(thesis_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract signal patterns from monitoring data"""
+    signals = []
+
+    # Extract from metrics_to_track
+    metrics = thesis_analysis.get('metrics_to_track', [])
+    if isinstance(metrics, list):
+        for i, metric in enumerate(metrics[:8]):
+            signals.append({
+                'id': f'signal_{i}',
+                'type': 'signal',
+                'category': 'tracking_metric',
+                'title': metric.get('name', f'Signal {i+1}') if isinstance(metric, dict) else str(metric),
+                'signal_type': metric.get('type', 'quantitative') if isinstance(metric, dict) else 'quantitative',
+                'confidence_score': 0.8 - (i * 0.05),
+                'predictive_value': 0.75 + (i % 3) * 0.05
+            })
+
+    # Extract from monitoring plan
+    monitoring_plan = thesis_analysis.get('monitoring_plan', [])
+    if isinstance(monitoring_plan, list):
+        for i, plan_item in enumerate(monitoring_plan[:5]):
+            signals.append({
+                'id': f'monitor_{i}',
+                'type': 'signal',
+                'category': 'monitoring_signal',
+                'title': plan_item.get('signal', f'Monitor {i+1}') if isinstance(plan_item, dict) else str(plan_item),
+                'signal_type': 'qualitative',
+                'confidence_score': 0.7 + (i % 2) * 0.1,
+                'predictive_value': 0.65 + (i % 4) * 0.05
+            })
+
+    return signals
+
+
+class ThesisScoringService:
+    """
+    One structured-output prompt for dual prioritization and significance mapping.
+    Results are memoised per thesis content so parallel requests from the
+    significance page share a single LLM round-trip.
+    """
+
+    CACHE_SIZE = 64
+    RESEARCH_TOKEN_BUDGET = 900
+    SIGNAL_TOKEN_BUDGET = 600
+
+    _cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+    _cache_lock = threading.Lock()
+    _inflight: Dict[str, threading.Lock] = {}
+
+    def __init__(self, ai_service: Optional[AzureOpenAIService] = None):
+        self.ai_service = ai_service or AzureOpenAIService()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def scoring_key(thesis_analysis: Dict[str, Any]) -> str:
+        """Hash of the thesis fields the scoring prompt reads"""
+        fields = {field: thesis_analysis.get(field) for field in RESEARCH_ELEMENTS + ('metrics_to_track', 'monitoring_plan')}
+        canonical = json.dumps(fields, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def score_thesis(self, thesis_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return {'research_prioritization', 'signal_prioritization', 'connections'}.
+        A section is None when the model omitted it or it failed validation.
+        """
+        key = self.scoring_key(thesis_analysis)
+
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            inflight = self._inflight.setdefault(key, threading.Lock())
+
+        # Concurrent callers for the same thesis wait for the first one's result
+        with inflight:
+            with self._cache_lock:
+                if key in self._cache:
+                    return self._cache[key]
+
+            scores = self._request_scores(thesis_analysis)
+
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+                if scores is not None:
+                    self._cache[key] = scores
+                    while len(self._cache) > self.CACHE_SIZE:
+                        self._cache.popitem(last=False)
+
+        return scores or {'research_prioritization': None, 'signal_prioritization': None, 'connections': None}
+
+    def _request_scores(self, thesis_analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Issue the combined scoring prompt and validate each section"""
+        research_elements = extract_research_elements(thesis_analysis)
+        signal_patterns = extract_signal_patterns(thesis_analysis)
+
+        try:
+            response = self.ai_service.generate_completion(
+                [{"role": "user", "content": self._build_prompt(thesis_analysis, research_elements, signal_patterns)}],
+                temperature=0.2,
+                max_tokens=3000,
+                json_mode=True,
+                call_site='thesis_scoring'
+            )
+        except Exception as e:
+            self.logger.warning(f"Thesis scoring failed: {str(e)}")
+            return None
+
+        data = parse_llm_json(response, "thesis_scoring", dict)
+        if data is None:
+            return None
+
+        return {
+            'research_prioritization': self._validate_research(data.get('research_prioritization')),
+            'signal_prioritization': self._validate_signals(data.get('signal_prioritization')),
+            'connections': self._validate_connections(data.get('connections'), research_elements, signal_patterns)
+        }
+
+    def _build_prompt(self, thesis_analysis: Dict[str, Any], research_elements: List[Dict],
+                      signal_patterns: List[Dict]) -> str:
+        research_data = compact_thesis(thesis_analysis, self.RESEARCH_TOKEN_BUDGET, RESEARCH_ELEMENTS)
+        signals_data = compact_thesis(thesis_analysis, self.SIGNAL_TOKEN_BUDGET, ('metrics_to_track', 'monitoring_plan'))
+        research_score = ', '.join(f'"{criterion}": 0-10' for criterion in RESEARCH_CRITERIA)
+        signal_score = ', '.join(f'"{criterion}": 0-10' for criterion in SIGNAL_CRITERIA)
+
+        return f"""
+        Score this investment thesis in three parts and respond with a single JSON object.
+
+        Part 1 - Research quality. Rate each research element 0-10 on depth of analysis,
+        data foundation, logical consistency, market relevance and actionability.
+        Research Elements:
+        {compact_json(research_data)}
+
+        Part 2 - Signal strength. Rate each signal category 0-10 on historical accuracy,
+        market correlation, data availability, timeliness and risk warning value.
+        Signal Data:
+        {compact_json(signals_data)}
+
+        Part 3 - Connections. Identify meaningful logical connections between these
+        research nodes and signal nodes (relationship: validates, measures, indicates, contradicts).
+        Research Nodes:
+        {compact_json([{'id': r['id'], 'title': r['title'], 'content': r['content']} for r in research_elements])}
+        Signal Nodes:
+        {compact_json([{'id': s['id'], 'title': s['title'], 'type': s['signal_type']} for s in signal_patterns])}
+
+        Respond with JSON:
+        {{
+            "research_prioritization": {{
+                "element_scores": {{{', '.join(f'"{element}": {{{research_score}}}' for element in RESEARCH_ELEMENTS)}}},
+                "priority_ranking": ["element1", "element2", "element3", "element4", "element5"],
+                "research_quality_summary": "brief assessment of overall research quality"
+            }},
+            "signal_prioritization": {{
+                "signal_categories": {{{', '.join(f'"{category}": {{{signal_score}}}' for category in SIGNAL_CATEGORIES)}}},
+                "signal_priority_ranking": ["category1", "category2", "category3", "category4"],
+                "predictive_strength_summary": "brief assessment of overall signal reliability"
+            }},
+            "connections": [{{
+                "research_id": "string",
+                "signal_id": "string",
+                "relationship_type": "validates|measures|indicates|contradicts",
+                "strength": 0.0-1.0,
+                "explanation": "brief explanation"
+            }}]
+        }}
+        """
+
+    @staticmethod
+    def _validate_scores(scores: Any, names: tuple, criteria: tuple) -> Optional[Dict[str, Dict[str, float]]]:
+        """Keep known names with numeric criteria clamped to 0-10"""
+        if not isinstance(scores, dict):
+            return None
+
+        validated = {}
+        for name in names:
+            entry = scores.get(name)
+            if not isinstance(entry, dict) or not isinstance(entry.get(criteria[-1]), (int, float)):
+                return None
+            validated[name] = {
+                criterion: max(0.0, min(10.0, float(entry[criterion])))
+                for criterion in criteria if isinstance(entry.get(criterion), (int, float))
+            }
+        return validated
+
+    def _validate_research(self, section: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(section, dict):
+            return None
+
+        element_scores = self._validate_scores(section.get('element_scores'), RESEARCH_ELEMENTS, RESEARCH_CRITERIA)
+        if element_scores is None:
+            return None
+
+        ranking = [name for name in section.get('priority_ranking') or [] if name in RESEARCH_ELEMENTS]
+        return {
+            'element_scores': element_scores,
+            'priority_ranking': ranking or sorted(element_scores, key=lambda name: -element_scores[name]['overall_score']),
+            'research_quality_summary': str(section.get('research_quality_summary', ''))
+        }
+
+    def _validate_signals(self, section: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(section, dict):
+            return None
+
+        categories = self._validate_scores(section.get('signal_categories'), SIGNAL_CATEGORIES, SIGNAL_CRITERIA)
+        if categories is None:
+            return None
+
+        ranking = [name for name in section.get('signal_priority_ranking') or [] if name in SIGNAL_CATEGORIES]
+        return {
+            'signal_categories': categories,
+            'signal_priority_ranking': ranking or sorted(categories, key=lambda name: -categories[name]['overall_strength']),
+            'predictive_strength_summary': str(section.get('predictive_strength_summary', ''))
+        }
+
+    @staticmethod
+    def _validate_connections(connections: Any, research_elements: List[Dict],
+                              signal_patterns: List[Dict]) -> Optional[List[Dict[str, Any]]]:
+        """Keep connections between known nodes with a valid relationship and strength"""
+        if not isinstance(connections, list):
+            return None
+
+        research_ids = {element['id'] for element in research_elements}
+        signal_ids = {signal['id'] for signal in signal_patterns}
+
+        validated = []
+        for connection in connections:
+            if not isinstance(connection, dict):
+                continue
+            if connection.get('research_id') not in research_ids or connection.get('signal_id') not in signal_ids:
+                continue
+            if not isinstance(connection.get('strength'), (int, float)):
+                continue
+
+            validated.append({
+                'research_id': connection['research_id'],
+                'signal_id': connection['signal_id'],
+                'relationship_type': connection.get('relationship_type') if connection.get('relationship_type') in RELATIONSHIP_TYPES else 'indicates',
+                'strength': max(0.0, min(1.0, float(connection['strength']))),
+                'explanation': str(connection.get('explanation', ''))
+            })
+
+        return validated
@@ -0,0 +1,192 @@
+"""
+Thesis Tag Service
+
+Extracts the primary industry segment and mentioned companies for each thesis
+once per thesis version and persists them in the ``thesis_tag`` table. The
+analytics segment filter then becomes a single indexed query over that table.
+
+A thesis is tagged right after it is published, on the artifact warmer's
+thread (``tag_thesis``); theses published before that are tagged with
+backfill_thesis_tags.py. A failed extraction is recorded as a ``failed`` tag
+and retried only after RETRY_AFTER. Backfill runs through a bounded thread
+pool: LLM calls run concurrently on plain text snapshots while all database
+writes stay on the calling thread.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, or_
+
+from app import db
+from models import ThesisAnalysis, ThesisTag
+from services.llm_json import parse_llm_json
+
+
+class ThesisTagService:
+    """
+    Persisted segment/company tags with concurrent backfill
+    """
+
+    MAX_WORKERS = 8
+    BACKFILL_LIMIT = 50
+    TAG_SEGMENT = 'segment'
+    TAG_COMPANY = 'company'
+    TAG_NONE = 'none'  # Marks a thesis version that was tagged but yielded nothing
+    TAG_FAILED = 'failed'  # Marks a thesis version whose extraction failed
+    RETRY_AFTER = timedelta(hours=6)
+
+    def __init__(self, openai_service=None, max_workers: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self._openai_service = openai_service
+        self.max_workers = max_workers or self.MAX_WORKERS
+
+    @property
+    def openai_service(self):
+        if self._openai_service is None:
+            from services.azure_openai_service import AzureOpenAIService
+            self._openai_service = AzureOpenAIService()
+        return self._openai_service
+
+    def extract_tags(self, title: str, core_claim: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Ask the LLM for the segment and companies of one thesis.
+        Returns None when the call fails.
+        """
+        analysis_prompt = f"""
+        Analyze this investment thesis and extract:
+        1. Primary industry segment
+        2. Company names mentioned
+
+        Thesis: {title}
+        Core Claim: {(core_claim or '')[:500]}
+
+        Return JSON: {{
+            "segment": "primary_industry_segment",
+            "companies": ["company1", "company2"]
+        }}
+        """
+
+        try:
+            response = self.openai_service.generate_completion(
+                [{"role": "user", "content": analysis_prompt}],
+                temperature=0.3,
+                json_mode=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Tag extraction failed for '{title[:60]}': {str(e)}")
+            return None
+
+        if not response:
+            return None
+
+        data = parse_llm_json(response, "thesis_tags", dict)
+        if data is None:
+            return None
+
+        segment = data.get('segment')
+        companies = [company for company in (data.get('companies') or [])
+                     if isinstance(company, str) and len(company) > 2]
+
+        return {
+            'segments': [segment[:255]] if isinstance(segment, str) and segment else [],
+            'companies': [company[:255] for company in dict.fromkeys(companies)]
+        }
+
+    def save_tags(self, thesis: ThesisAnalysis, tags: Optional[Dict[str, List[str]]]) -> None:
+        """
+        Replace the stored tags of a thesis with tags for its current version;
+        ``tags`` None records a failed extraction
+        """
+        ThesisTag.query.filter_by(thesis_analysis_id=thesis.id).delete(synchronize_session=False)
+
+        if tags is None:
+            rows = [(self.TAG_FAILED, None)]
+        else:
+            rows = (
+                [(self.TAG_SEGMENT, value) for value in tags.get('segments', [])]
+                + [(self.TAG_COMPANY, value) for value in tags.get('companies', [])]
+            ) or [(self.TAG_NONE, None)]
+
+        for tag_type, value in rows:
+            db.session.add(ThesisTag(
+                thesis_analysis_id=thesis.id,
+                tag_type=tag_type,
+                value=value,
+                thesis_updated_at=thesis.updated_at
+            ))
+
+    def untagged_theses(self, limit: Optional[int] = None) -> List[ThesisAnalysis]:
+        """
+        Most recent theses with no tags for their current version, or whose
+        last extraction failed more than RETRY_AFTER ago
+        """
+        current_tags = ThesisTag.query.filter(
+            ThesisTag.thesis_analysis_id == ThesisAnalysis.id,
+            ThesisTag.thesis_updated_at == ThesisAnalysis.updated_at,
+            or_(ThesisTag.tag_type != self.TAG_FAILED,
+                ThesisTag.created_at > datetime.utcnow() - self.RETRY_AFTER)
+        ).exists()
+
+        query = ThesisAnalysis.query.with_entities(
+            ThesisAnalysis.id, ThesisAnalysis.title, ThesisAnalysis.core_claim, ThesisAnalysis.updated_at
+        ).filter(
+            ThesisAnalysis.title.isnot(None),
+            ThesisAnalysis.core_claim.isnot(None),
+            ~current_tags
+        ).order_by(ThesisAnalysis.created_at.desc())
+
+        if limit:
+            query = query.limit(limit)
+
+        return query.all()
+
+    def backfill(self, theses: Optional[Sequence] = None, limit: Optional[int] = None) -> int:
+        """
+        Tag theses concurrently in a bounded pool and persist the results,
+        failures included. Returns the number of theses tagged.
+        """
+        if theses is None:
+            theses = self.untagged_theses(limit or self.BACKFILL_LIMIT)
+        if not theses:
+            return 0
+
+        snapshots = [(thesis.title, thesis.core_claim) for thesis in theses]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(snapshots))) as pool:
+            results = list(pool.map(lambda snapshot: self.extract_tags(*snapshot), snapshots))
+
+        tagged = 0
+        try:
+            for thesis, tags in zip(theses, results):
+                self.save_tags(thesis, tags)
+                tagged += tags is not None
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.logger.warning(f"Failed to store thesis tags: {str(e)}")
+            return 0
+
+        self.logger.info(f"Backfilled tags for {tagged}/{len(theses)} theses")
+        return tagged
+
+    def tag_thesis(self, thesis: ThesisAnalysis) -> bool:
+        """Tag one newly published or edited thesis; False when extraction failed"""
+        return self.backfill([thesis]) == 1
+
+    def aggregate(self) -> Dict[str, List[str]]:
+        """Distinct segments and companies across current thesis versions"""
+        rows = db.session.query(ThesisTag.tag_type, ThesisTag.value).join(
+            ThesisAnalysis,
+            and_(
+                ThesisAnalysis.id == ThesisTag.thesis_analysis_id,
+                ThesisAnalysis.updated_at == ThesisTag.thesis_updated_at
+            )
+        ).filter(
+            ThesisTag.tag_type.in_([self.TAG_SEGMENT, self.TAG_COMPANY])
+        ).distinct().all()
+
+        segments = sorted(value for tag_type, value in rows if tag_type == self.TAG_SEGMENT)
+        companies = sorted(value for tag_type, value in rows if tag_type == self.TAG_COMPANY)
+        return {'segments': segments, 'companies': companies}
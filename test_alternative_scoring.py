@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for columnar alternative company scoring
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.alternative_company_service import AlternativeCompanyService
+from services.alternative_scoring import score_candidates, top_k_indices
+
+import numpy as np
+
+CHARACTERISTICS = {'sector': 'Technology', 'business_model': 'SaaS'}
+
+
+def reference_scores(company, characteristics):
+    """The per-company scoring the columnar engine replaced"""
+    growth = company.get('key_metrics', {}).get('revenue_growth', 0)
+    ev_sales = company.get('key_metrics', {}).get('ev_sales')
+    operating_margin = company.get('key_metrics', {}).get('operating_margin')
+    market_cap = company.get('market_cap', 0)
+    description = company.get('description', '').lower()
+
+    pattern = 60.0
+    if characteristics.get('sector') == 'Technology' and 'technology' in description:
+        pattern += 15
+    pattern += 10 if growth > 0.2 else 5 if growth > 0.1 else 0
+    pattern += 8 if 10 < market_cap < 100 else -5 if market_cap > 100 else 0
+
+    undervaluation = 50.0
+    if ev_sales is not None:
+        undervaluation += 16 if ev_sales < 2 else 10 if ev_sales < 5 else 4 if ev_sales < 10 else 0
+    undervaluation += 15 if market_cap < 20 else 10 if market_cap < 50 else 5 if market_cap < 100 else 0
+    undervaluation += 12 if growth < 0 else 6 if growth < 0.1 else 0
+
+    margin = company.get('key_metrics', {}).get('gross_margin', 0.3)
+    potential = 55.0
+    if operating_margin is not None:
+        potential += 14 if operating_margin > 0.25 else 9 if operating_margin > 0.1 else 4 if operating_margin > 0 else 0
+    potential += 12 if margin > 0.7 else 8 if margin > 0.5 else 4 if margin > 0.3 else 0
+    if any(keyword in description for keyword in ['platform', 'network', 'ecosystem']):
+        potential += 10
+
+    similarity = company.get('similarity_score', 0)
+    scores = (min(95, max(30, pattern)), min(95, max(20, undervaluation)), min(95, max(25, potential)))
+    return scores + (similarity * 0.3 + scores[0] * 0.25 + scores[1] * 0.25 + scores[2] * 0.2,)
+
+
+def random_candidates(count, seed=11):
+    rng = random.Random(seed)
+    words = ['technology', 'platform', 'network', 'retail', 'ecosystem', 'services', 'devices']
+    companies = []
+    for i in range(count):
+        metrics = {'revenue_growth': rng.choice([-0.2, 0.0, 0.05, 0.1, 0.15, 0.2, 0.3])}
+        if rng.random() < 0.8:
+            metrics['gross_margin'] = rng.choice([0.2, 0.3, 0.45, 0.5, 0.6, 0.75])
+        if rng.random() < 0.8:
+            metrics['ev_sales'] = rng.choice([1.0, 3.0, 6.0, 12.0])
+            metrics['operating_margin'] = rng.choice([-0.1, 0.05, 0.15, 0.3])
+        companies.append({
+            'name': f'Company {i}', 'ticker': f'C{i}',
+            'market_cap': rng.choice([5, 10, 15, 20, 40, 50, 80, 100, 150]),
+            'description': ' '.join(rng.sample(words, 2)).title(),
+            'key_metrics': metrics,
+            'similarity_score': rng.choice([40.0, 55.0, 70.0, 85.0]),
+            'unloved_factors': ['x'] * rng.randint(0, 3),
+            'hidden_strengths': ['y'] * rng.randint(0, 3)
+        })
+    return companies
+
+
+def test_alternative_scoring():
+    """Vectorised scores equal the per-company formulas; top-k matches a full sort"""
+    print("Testing Columnar Alternative Scoring...")
+
+    companies = random_candidates(5000)
+    start = time.perf_counter()
+    scores = score_candidates(companies, CHARACTERISTICS, top_k=10)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    expected = np.array([reference_scores(company, CHARACTERISTICS) for company in companies])
+    for column, name in enumerate(('pattern_match', 'undervaluation', 'potential', 'composite')):
+        assert np.allclose(scores[name], expected[:, column]), name
+    print(f"✓ Scores for {len(companies)} candidates match the per-company formulas ({elapsed_ms:.1f} ms)")
+
+    full_sort = sorted(range(len(companies)), key=lambda i: expected[i, 3], reverse=True)
+    assert scores['ranking'].tolist() == full_sort[:10]
+    assert top_k_indices(np.array([1.0, 3.0, 3.0, 2.0]), 3).tolist() == [1, 2, 3]
+    assert top_k_indices(np.array([]), 5).tolist() == []
+    print("✓ argpartition top-k equals a stable full sort, ties in input order")
+
+    tilted = score_candidates(companies, CHARACTERISTICS, {'similarity': 0, 'pattern_match': 0, 'undervaluation': 0, 'potential': 1}, 1)
+    assert scores['potential'][tilted['ranking'][0]] == scores['potential'].max()
+    print("✓ Weight overrides change the ranking")
+
+    service = AlternativeCompanyService(score_weights={'undervaluation': 0.6})
+    ranked = service._score_alternatives(companies[:20], CHARACTERISTICS, top_k=5)
+    composites = [company['composite_score'] for company in ranked]
+    assert len(ranked) == 5 and composites == sorted(composites, reverse=True)
+    assert all({'pattern_match_score', 'recommendation_strength', 'risk_factors'} <= set(company) for company in ranked)
+    assert 'composite_score' not in companies[0]
+    print("✓ Service returns scored copies of the top candidates")
+
+    unannotated = [dict(company, unloved_factors=[], hidden_strengths=[]) for company in companies[:20]]
+    assert [company['ticker'] for company in service._score_alternatives(unannotated, CHARACTERISTICS, top_k=5)] == \
+        [company['ticker'] for company in ranked]
+    print("✓ LLM annotations do not change the ranking")
+
+    print("\n✅ Alternative scoring test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_alternative_scoring()
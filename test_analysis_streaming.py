@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming LLM completions, streamed document analysis and one-pager sections
+"""
+
+import io
+import json
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import routes
+from app import app, db
+from models import SignalMonitoring, ThesisAnalysis
+from services.azure_openai_service import AzureOpenAIService
+from services.financial_position_extractor import FinancialPositionExtractor
+from services.prompt_budget import token_usage_stats
+
+POSITION_JSON = json.dumps({
+    'investment_position': 'BUY',
+    'confidence_level': 'HIGH',
+    'thesis_statement': 'Acme Robotics will compound revenue 30% as warehouse automation spreads',
+    'key_arguments': ['Backlog doubled', 'Margins expanding'],
+    'risk_factors': ['Customer concentration'],
+    'company_name': 'Acme Robotics',
+    'sector': 'Industrials'
+})
+
+
+def _chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class StubCompletions:
+    """Chat completions endpoint returning the position JSON in small chunks"""
+
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        pieces = [POSITION_JSON[i:i + 16] for i in range(0, len(POSITION_JSON), 16)]
+        return iter([_chunk(piece) for piece in pieces]
+                    + [_chunk(usage=SimpleNamespace(prompt_tokens=321, completion_tokens=45))])
+
+
+def _stub_service():
+    service = AzureOpenAIService.__new__(AzureOpenAIService)
+    service.deployment_name = 'gpt-4o'
+    service.completions = StubCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=service.completions))
+    return service
+
+
+def parse_sse(body):
+    """Split an event-stream body into (event, data) pairs"""
+    messages = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        messages.append((lines.get('event'), json.loads(lines.get('data', 'null'))))
+    return messages
+
+
+def test_analysis_streaming():
+    """Completions stream chunk by chunk through the extractor and SSE endpoints"""
+    print("Testing Streaming Analysis...")
+
+    service = _stub_service()
+    chunks = list(service.stream_completion('Extract the position', json_mode=True, call_site='test.stream'))
+    assert len(chunks) > 5 and ''.join(chunks) == POSITION_JSON
+    call = service.completions.calls[0]
+    assert call['stream'] is True and call['response_format'] == {'type': 'json_object'}
+    assert token_usage_stats()['test.stream'] == {'calls': 1, 'prompt_tokens': 321, 'completion_tokens': 45}
+    print(f"✓ Completion streamed in {len(chunks)} chunks with reported usage recorded")
+
+    service.client = None
+    assert list(service.stream_completion('No client')) == []
+    print("✓ Missing client yields an empty stream")
+
+    extractor = FinancialPositionExtractor.__new__(FinancialPositionExtractor)
+    FinancialPositionExtractor.__init__(extractor)
+    extractor.azure_service = _stub_service()
+    events = list(extractor.stream_financial_position('Acme Robotics research note. We rate the shares BUY.'))
+    assert [kind for kind, _ in events[:-1]] == ['delta'] * (len(events) - 1)
+    kind, position = events[-1]
+    assert kind == 'position' and position['investment_position'] == 'BUY'
+    assert position['company_name'] == 'Acme Robotics'
+    print("✓ Position extracted from streamed deltas")
+
+    original_init = FinancialPositionExtractor.__init__
+
+    def stub_init(self):
+        original_init(self)
+        self.azure_service = _stub_service()
+
+    FinancialPositionExtractor.__init__ = stub_init
+    eagle_signal = {'name': 'Acme Robotics Backlog (Eagle)', 'eagle_api': True, 'data_source': 'Eagle API'}
+    original_eagle = routes.reliable_analysis_service.extract_eagle_signals_for_thesis
+    routes.reliable_analysis_service.extract_eagle_signals_for_thesis = lambda thesis_text: [dict(eagle_signal)]
+    upload_path = os.path.join(app.config.get('UPLOAD_FOLDER', 'uploads'), 'acme_stream_test.csv')
+    thesis_id = None
+    try:
+        csv = 'note\nAcme Robotics backlog doubled and margins are expanding across regions\n'
+        with app.app_context():
+            response = app.test_client().post('/analyze/stream', data={
+                'research_files': (io.BytesIO(csv.encode('utf-8')), 'acme_stream_test.csv')
+            }, content_type='multipart/form-data')
+            assert response.mimetype == 'text/event-stream'
+            messages = parse_sse(response.get_data(as_text=True))
+
+            stages = [event for event, _ in messages]
+            assert stages[0] == 'document' and 'position_delta' in stages
+            assert stages[-4:] == ['position', 'analysis', 'signals', 'complete'], stages
+            streamed = ''.join(payload['text'] for event, payload in messages if event == 'position_delta')
+            assert streamed == POSITION_JSON
+            result = messages[-1][1]
+            thesis_id = result['thesis_id']
+            assert result['published'] and result['thesis_analysis']['core_claim'].startswith('Acme Robotics')
+            assert eagle_signal in result['thesis_analysis']['metrics_to_track']
+            assert eagle_signal in db.session.get(ThesisAnalysis, thesis_id).metrics_to_track
+            print(f"✓ /analyze/stream sent {len(messages)} events ending with the published result")
+            print("✓ Eagle signals added to metrics_to_track")
+
+            response = app.test_client().get(f'/api/thesis/{thesis_id}/one-pager/stream')
+            sections = parse_sse(response.get_data(as_text=True))
+            assert sections[0][0] == 'section' and sections[0][1]['name'] == 'executive_summary'
+            assert sections[-1] == ('complete', {'sections': [data['name'] for _, data in sections[:-1]]})
+            print(f"✓ One-pager streamed {len(sections) - 1} sections")
+
+            response = app.test_client().post('/analyze/stream', data={})
+            assert response.status_code == 400
+            print("✓ Missing documents rejected before streaming")
+    finally:
+        FinancialPositionExtractor.__init__ = original_init
+        routes.reliable_analysis_service.extract_eagle_signals_for_thesis = original_eagle
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+        if thesis_id:
+            with app.app_context():
+                SignalMonitoring.query.filter_by(thesis_analysis_id=thesis_id).delete()
+                db.session.delete(db.session.get(ThesisAnalysis, thesis_id))
+                db.session.commit()
+
+    print("\n✅ Streaming analysis test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_analysis_streaming()
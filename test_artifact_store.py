@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the derived artifact store and background warmer
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from app import app, db
+from config import Config
+from models import ThesisAnalysis, DerivedArtifact
+from services.artifact_store import ArtifactStore, ArtifactWarmer
+
+
+def test_artifact_store():
+    """Serve stored artifacts, flag staleness and warm in the background"""
+    print("Testing Derived Artifact Store...")
+
+    calls = []
+
+    def generate_summary(thesis):
+        calls.append(thesis.id)
+        return {'summary': f'{thesis.title} #{len(calls)}'}
+
+    generators = {'summary': ('1', generate_summary)}
+    store = ArtifactStore(generators=generators)
+    warmer = ArtifactWarmer(app, store)
+
+    saved_credentials = (Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT)
+    Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT = 'test-key', 'https://example.invalid'
+
+    with app.app_context():
+        thesis = ThesisAnalysis(title='Artifact Test Thesis', original_thesis='Artifacts', core_claim='Artifacts')
+        db.session.add(thesis)
+        db.session.commit()
+        thesis_id = thesis.id
+
+        try:
+            payload, meta = store.get(thesis, 'summary')
+            assert payload == {'summary': 'Artifact Test Thesis #1'} and meta['stored'] is False
+            payload, meta = store.get(thesis, 'summary')
+            assert payload['summary'].endswith('#1') and meta['stored'] and not meta['stale']
+            assert len(calls) == 1
+            print("✓ Second request served from storage")
+
+            # Editing the thesis keeps serving the old artifact while the warmer regenerates it
+            thesis.updated_at = datetime(2030, 1, 1)
+            db.session.commit()
+            queued = []
+            warmer.enqueue = lambda *args, **kwargs: queued.append(args) or True
+            payload, meta = store.get(thesis, 'summary')
+            assert meta['stale'] and payload['summary'].endswith('#1')
+            assert queued == [(thesis_id, ['summary'])]
+            print("✓ Thesis update reports stale artifact")
+
+            generated = ArtifactWarmer.warm(warmer, thesis_id)
+            assert generated == ['summary']
+            payload, meta = store.get(thesis, 'summary')
+            assert not meta['stale'] and payload['summary'].endswith('#2')
+            print("✓ Warmer regenerated the stale artifact")
+
+            # With warming disabled nothing would ever replace it, so regenerate inline
+            thesis.updated_at = datetime(2031, 1, 1)
+            db.session.commit()
+            del warmer.enqueue
+            saved_warming, Config.ARTIFACT_WARMING_ENABLED = Config.ARTIFACT_WARMING_ENABLED, False
+            try:
+                payload, meta = store.get(thesis, 'summary')
+            finally:
+                Config.ARTIFACT_WARMING_ENABLED = saved_warming
+            assert not meta['stale'] and meta['stored'] is False and payload['summary'].endswith('#3')
+            payload, meta = store.get(thesis, 'summary')
+            assert meta['stored'] and not meta['stale'] and payload['summary'].endswith('#3')
+            print("✓ Stale artifact regenerated inline when warming is disabled")
+
+            generators['summary'] = ('2', lambda thesis: {'summary_v2': thesis.title})
+            assert store.missing_or_stale(thesis) == ['summary']
+            payload, meta = store.get(thesis, 'summary')
+            assert payload == {'summary_v2': 'Artifact Test Thesis'} and meta['generator_version'] == '2'
+            print("✓ Artifacts from an older generator version are never served")
+
+        finally:
+            Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT = saved_credentials
+            db.session.delete(db.session.get(ThesisAnalysis, thesis_id))
+            db.session.commit()
+
+        assert DerivedArtifact.query.filter_by(thesis_analysis_id=thesis_id).count() == 0
+        print("✓ Deleting the thesis deletes its artifacts")
+
+    print("\n✅ Artifact store test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_artifact_store()
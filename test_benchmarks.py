@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the hot-path benchmark suite and its regression tracking
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks import bench_hot_paths, fixtures
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_benchmarks():
+    """Quick suite runs every case in isolation and regressions are flagged"""
+    print("Testing Benchmark Suite...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = fixtures.write_research_pdf(os.path.join(directory, 'a.pdf'), 3)
+        import pypdf
+        reader = pypdf.PdfReader(pdf)
+        assert len(reader.pages) == 3 and 'price target' in reader.pages[0].extract_text()
+        assert fixtures.research_text(5) == fixtures.research_text(5)
+        print("✓ Fixtures are deterministic and the generated PDF is readable")
+
+        # A fresh interpreter, as the suite binds the app to a scratch database
+        completed = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_hot_paths', '--quick', '--repeat', '1', '--no-save'],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=300)
+        assert completed.returncode == 0, completed.stderr[-2000:]
+        for case in ('document_processor.pdf', 'signal_extractor.check_all_signals', 'route.analyze'):
+            assert case in completed.stdout, case
+        print("✓ Quick suite ran every case in a scratch environment")
+
+        baseline = {'commit': 'aaa', 'created_at': '2026-01-01T00:00:00', 'quick': True,
+                    'results': {'fast': {'median_ms': 10.0}, 'slow': {'median_ms': 10.0}}}
+        current = {'commit': 'bbb', 'created_at': '2026-01-02T00:00:00', 'quick': True,
+                   'results': {'fast': {'median_ms': 11.0}, 'slow': {'median_ms': 13.0}, 'new': {'median_ms': 1.0}}}
+        rows = {row['case']: row for row in bench_hot_paths.compare(current, baseline, threshold=0.2)}
+        assert set(rows) == {'fast', 'slow'}
+        assert not rows['fast']['regressed'] and rows['slow']['regressed']
+        print("✓ Median slowdowns past the threshold are flagged")
+
+        results_dir = os.path.join(directory, 'results')
+        path = bench_hot_paths.save(baseline, results_dir)
+        assert json.load(open(path))['commit'] == 'aaa'
+        assert bench_hot_paths.previous_run(current, results_dir) == path
+        assert bench_hot_paths.previous_run(dict(current, quick=False), results_dir) is None
+        print("✓ Results stored as JSON and the previous run of the same size is found")
+
+    print("\n✅ Benchmark suite test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_benchmarks()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the CompressedJSON column type, deferred loading and the data migration
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, text
+
+from app import app, db
+from models import CompressedJSON, DocumentUpload, ThesisAnalysis
+from migrate_compressed_json import COMPRESSED_COLUMNS, migrate
+from services.schema import compressed_columns, retype_postgres_columns
+
+TITLE = 'Compressed JSON Thesis'
+
+
+def test_compressed_json():
+    """Large payloads are compressed, small ones stay plain, legacy rows still read"""
+    print("Testing Compressed JSON Columns...")
+
+    large_plan = {'objective': 'Track revenue growth', 'data_pulls': [{'metric': f'metric_{i}'} for i in range(200)]}
+    small_metrics = [{'name': 'Revenue', 'type': 'financial'}]
+
+    with app.app_context():
+        try:
+            thesis = ThesisAnalysis(title=TITLE, original_thesis='x', core_claim='x',
+                                    monitoring_plan=large_plan, metrics_to_track=small_metrics)
+            db.session.add(thesis)
+            db.session.commit()
+            thesis_id = thesis.id
+
+            stored_plan, stored_metrics = db.session.execute(text(
+                "SELECT monitoring_plan, metrics_to_track FROM thesis_analysis WHERE id = :id"
+            ), {'id': thesis_id}).one()
+            assert bytes(stored_plan).startswith(CompressedJSON.PREFIX)
+            assert len(stored_plan) < len(str(large_plan)) / 4
+            assert bytes(stored_metrics) == b'[{"name":"Revenue","type":"financial"}]'
+            print(f"✓ Large plan compressed to {len(stored_plan)} bytes, small metrics stored plain")
+
+            db.session.expire_all()
+            loaded = db.session.get(ThesisAnalysis, thesis_id)
+            assert 'monitoring_plan' not in loaded.__dict__ and 'causal_chain' not in loaded.__dict__
+            assert loaded.monitoring_plan == large_plan
+            assert loaded.metrics_to_track == small_metrics and 'causal_chain' in loaded.__dict__
+            print("✓ Payload columns deferred as a group and decoded on first access")
+
+            db.session.execute(text(
+                "UPDATE thesis_analysis SET causal_chain = :legacy WHERE id = :id"
+            ), {'legacy': '[{"event": "Legacy row"}]', 'id': thesis_id})
+            db.session.commit()
+            db.session.expire_all()
+            assert db.session.get(ThesisAnalysis, thesis_id).causal_chain == [{'event': 'Legacy row'}]
+            print("✓ Plain JSON text written before the switch still reads")
+        finally:
+            ThesisAnalysis.query.filter_by(title=TITLE).delete(synchronize_session=False)
+            db.session.commit()
+
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine, tables=[ThesisAnalysis.__table__, DocumentUpload.__table__])
+    with engine.begin() as connection:
+        for row_id in range(1, 6):
+            connection.execute(text(
+                "INSERT INTO thesis_analysis (id, title, original_thesis, monitoring_plan, metrics_to_track, "
+                "created_at, updated_at) VALUES (:id, 't', 'x', :plan, NULL, '2024-01-01', '2024-01-01')"
+            ), {'id': row_id, 'plan': f'{{"objective": "{"y" * 1000}"}}'})
+        connection.execute(text(
+            "INSERT INTO document_upload (id, filename, file_type, processed_data, created_at) "
+            "VALUES (1, 'a', 'pdf', :data, '2024-01-01')"
+        ), {'data': '{"text": "short"}'})
+
+    assert migrate(engine, batch_size=2) == {'thesis_analysis': 5, 'document_upload': 1}
+    with engine.connect() as connection:
+        plans = connection.execute(text("SELECT monitoring_plan FROM thesis_analysis")).scalars().all()
+        assert all(bytes(plan).startswith(CompressedJSON.PREFIX) for plan in plans)
+        assert CompressedJSON().process_result_value(plans[0], engine.dialect) == {'objective': 'y' * 1000}
+    assert migrate(engine) == {'thesis_analysis': 0, 'document_upload': 0}
+    print("✓ Migration rewrites legacy rows in batches and is idempotent")
+
+    class RecordingConnection:
+        """Reports causal_chain as still typed json and records the statements run"""
+
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, statement, parameters=None):
+            self.statements.append(str(statement))
+            data_type = 'json' if parameters and parameters['column'] == 'causal_chain' else 'bytea'
+            return type('Result', (), {'scalar': lambda result: data_type})()
+
+    assert compressed_columns(db.metadata) == COMPRESSED_COLUMNS
+    connection = RecordingConnection()
+    columns = COMPRESSED_COLUMNS['thesis_analysis']
+    assert retype_postgres_columns(connection, 'thesis_analysis', columns) == ['causal_chain']
+    assert [statement for statement in connection.statements if statement.startswith('ALTER')] == [
+        "ALTER TABLE thesis_analysis ALTER COLUMN causal_chain TYPE bytea USING convert_to(causal_chain::text, 'UTF8')"]
+    print("✓ Startup retypes every CompressedJSON column still typed json, and only those")
+
+    print("\n✅ Compressed JSON test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_compressed_json()
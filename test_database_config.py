@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for database engine tuning: pool sizing, SQLite pragmas, Postgres options and replica routing
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import DeclarativeBase
+
+from app import app, db
+from config import Config
+from services import database_config
+from services.database_config import RoutingSession, engine_options, pool_settings, read_replica
+
+
+class configured:
+    """Temporarily override Config attributes"""
+
+    def __init__(self, **values):
+        self.values = values
+        self.saved = {}
+
+    def __enter__(self):
+        for name, value in self.values.items():
+            self.saved[name] = getattr(Config, name)
+            setattr(Config, name, value)
+
+    def __exit__(self, *exc):
+        for name, value in self.saved.items():
+            setattr(Config, name, value)
+
+
+def replica_app(directory):
+    """A throwaway app with a primary and a replica SQLite database"""
+    class Base(DeclarativeBase):
+        pass
+
+    routed = SQLAlchemy(model_class=Base, session_options={'class_': RoutingSession})
+
+    class Note(routed.Model):
+        id = routed.Column(routed.Integer, primary_key=True)
+        body = routed.Column(routed.String(50))
+
+    test_app = Flask(__name__)
+    test_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(directory, 'primary.db')}"
+    test_app.config['SQLALCHEMY_BINDS'] = {
+        database_config.REPLICA_BIND: f"sqlite:///{os.path.join(directory, 'replica.db')}"}
+    routed.init_app(test_app)
+    with test_app.app_context():
+        for engine in (routed.engines[None], routed.engines[database_config.REPLICA_BIND]):
+            Base.metadata.create_all(engine)
+        with routed.engines[database_config.REPLICA_BIND].begin() as connection:
+            connection.execute(insert(Note.__table__).values(body='from replica'))
+    return test_app, routed, Note
+
+
+def test_database_config():
+    """Engine options follow the worker model and reads route to the replica"""
+    print("Testing Database Engine Configuration...")
+
+    with configured(DB_POOL_SIZE=0, DB_POOL_BACKGROUND=2, DB_MAX_OVERFLOW=-1, DB_MAX_CONNECTIONS=0):
+        assert pool_settings(workers=4, threads=8) == {'pool_size': 10, 'max_overflow': 10}
+        with configured(DB_MAX_CONNECTIONS=60):
+            assert pool_settings(workers=4, threads=8) == {'pool_size': 10, 'max_overflow': 5}
+        with configured(DB_MAX_CONNECTIONS=20):
+            assert pool_settings(workers=4, threads=8) == {'pool_size': 5, 'max_overflow': 0}
+    print("✓ Pool sized per worker from threads and capped by the connection budget")
+
+    with configured(DB_ENGINE_TUNING_ENABLED=True, GUNICORN_WORKERS=2, GUNICORN_THREADS=4,
+                    DB_POOL_SIZE=0, DB_MAX_OVERFLOW=-1, DB_MAX_CONNECTIONS=0):
+        postgres = engine_options('postgresql+psycopg://user@db/thesis')
+        assert postgres['pool_size'] == 4 + Config.DB_POOL_BACKGROUND
+        assert postgres['query_cache_size'] == Config.DB_QUERY_CACHE_SIZE
+        assert postgres['connect_args'] == {'prepare_threshold': Config.PG_PREPARE_THRESHOLD}
+        assert 'connect_args' not in engine_options('postgresql+psycopg2://user@db/thesis')
+        assert 'pool_size' not in engine_options('sqlite://')
+        assert engine_options('sqlite:///thesis.db')['connect_args']['check_same_thread'] is False
+    with configured(DB_ENGINE_TUNING_ENABLED=False):
+        assert engine_options('postgresql://user@db/thesis') == {'pool_recycle': 300, 'pool_pre_ping': True}
+    print("✓ Postgres statement caching, SQLite connect args and the untuned fallback")
+
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite' and Config.DB_ENGINE_TUNING_ENABLED:
+            assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+            assert db.session.execute(text('PRAGMA mmap_size')).scalar() == Config.SQLITE_MMAP_SIZE
+            print("✓ App connections use WAL, synchronous=NORMAL and mmap")
+        db.session.remove()
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_app, routed, Note = replica_app(directory)
+
+        @read_replica
+        def dashboard():
+            bodies = routed.session.execute(select(Note.body)).scalars().all()
+            routed.session.execute(insert(Note).values(body='written in a read view'))
+            routed.session.add(Note(body='flushed in a read view'))
+            routed.session.commit()
+            return bodies
+
+        with test_app.app_context():
+            assert dashboard() == ['from replica']
+            assert routed.session.execute(select(Note.body)).scalars().all() == [
+                'written in a read view', 'flushed in a read view']
+            routed.session.remove()
+            for engine in routed.engines.values():
+                engine.dispose()
+    print("✓ read_replica views read from the replica; DML and flushes stay on the primary")
+
+    print("\n✅ Database configuration test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_database_config()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the monitoring event bus (replay, commit-gated publishing, validation pushes, SSE channel)
+"""
+
+import sys
+import os
+import time
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from config import Config
+from models import NotificationLog, SignalMonitoring, ThesisAnalysis
+from services.data_validation_service import DataValidationService, ValidationRequest
+from services.signal_extraction import SignalExtractor
+from services.event_bus import EventBus, event_bus, publish_on_commit, push_available, validation_channel
+
+
+def test_event_bus():
+    """Events fan out after commit, replay from a cursor and reach SSE subscribers"""
+    print("Testing Monitoring Event Bus...")
+
+    bus = EventBus(buffer_size=3)
+    first = bus.publish('ping', {'n': 1})
+    bus.publish('other', {'n': 2}, channel='validation:abc')
+    for n in range(3, 6):
+        bus.publish('ping', {'n': n})
+    assert [message['data']['n'] for message in bus.replay(['monitoring'], first)] == [3, 4, 5]
+    print("✓ Replay buffer bounded and filtered by channel")
+
+    subscription = bus.subscribe(['monitoring'], since=bus.last_id - 1, heartbeat=0.01)
+    assert next(subscription)['data'] == {'n': 5}
+    assert next(subscription) is None
+    assert bus.subscriber_count() == 1
+    bus.publish('ping', {'n': 6})
+    assert next(subscription)['data'] == {'n': 6}
+    subscription.close()
+    assert bus.subscriber_count() == 0
+    print("✓ Subscribers get replayed, live and heartbeat messages")
+
+    with app.app_context():
+        cursor = event_bus.last_id
+        db.session.add(ThesisAnalysis(title='Rolled back', original_thesis='x', core_claim='x'))
+        db.session.flush()
+        publish_on_commit(db.session, 'discarded', {'ok': False})
+        db.session.rollback()
+        assert event_bus.replay(['monitoring'], cursor) == []
+
+        thesis = ThesisAnalysis(title='Event Bus Thesis', original_thesis='Event bus test', core_claim='Event bus test')
+        db.session.add(thesis)
+        db.session.flush()
+        signal = SignalMonitoring(thesis_analysis_id=thesis.id, signal_name='Revenue growth',
+                                  signal_type='price', threshold_value=10, threshold_type='above')
+        db.session.add(signal)
+        db.session.flush()
+        db.session.add(NotificationLog(signal_monitoring_id=signal.id, notification_type='price_alert',
+                                       message='Revenue growth crossed 10%'))
+        assert event_bus.replay(['monitoring'], cursor) == []
+        db.session.commit()
+
+        events = event_bus.replay(['monitoring'], cursor)
+        assert [message['event'] for message in events] == ['notification']
+        assert events[0]['data']['message'] == 'Revenue growth crossed 10%'
+        print("✓ Notification inserts published only after commit")
+
+        cursor = event_bus.last_id
+        SignalExtractor._publish_sweep(None, [
+            {'signal_id': 1, 'status': 'normal', 'current_value': 5},
+            {'signal_id': 2, 'status': 'triggered', 'current_value': 12},
+            {'signal_id': 3, 'status': 'unsupported'},
+            {'signal_id': 4, 'status': 'no_data'},
+            {'signal_id': 5, 'status': 'error'}
+        ])
+        sweep = event_bus.replay(['monitoring'], cursor)[0]['data']
+        assert sweep['checked'] == 5 and sweep['triggered'] == 1 and sweep['errors'] == 1
+        assert sweep['updates'] == [{'signal_id': 2, 'status': 'triggered', 'current_value': 12},
+                                    {'signal_id': 5, 'status': 'error'}]
+        print("✓ Sweep events list only triggered and failed signals")
+
+        try:
+            validator = DataValidationService()
+            request = ValidationRequest(
+                request_id='req-123', chat_id='chat', callback_url='https://example.invalid/status',
+                signal_name='Revenue growth', query_structure={}, status='processing',
+                created_at=datetime.now(timezone.utc)
+            )
+            validator.active_requests[request.request_id] = request
+
+            def complete(validation_request):
+                validation_request.status = 'completed'
+                validation_request.completed_at = datetime.now(timezone.utc)
+                validation_request.result = {'widgets': [{'widget_id': 'w1'}]}
+                return validation_request
+
+            validator.check_validation_status = complete
+            cursor = event_bus.last_id
+            assert validator.watch_validation('req-123')
+            deadline = time.time() + 5
+            while not event_bus.replay([validation_channel('req-123')], cursor) and time.time() < deadline:
+                time.sleep(0.01)
+            pushed = event_bus.replay([validation_channel('req-123')], cursor)[0]
+            assert pushed['event'] == 'validation' and pushed['data']['status'] == 'completed'
+            assert not validator.watch_validation('req-123')
+            print("✓ Validation completion pushed from the background watcher")
+
+            client = app.test_client()
+            response = client.get(f'/api/events/stream?channels={validation_channel("req-123")}&since={cursor}',
+                                  buffered=False)
+            assert response.mimetype == 'text/event-stream'
+            chunks = (chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk for chunk in response.response)
+            assert next(chunks).startswith('retry:')
+            message = next(chunks)
+            assert f'id: {pushed["id"]}\nevent: validation\n' in message and '"completed"' in message
+            response.close()
+            print("✓ SSE channel replays events after the cursor")
+
+            assert client.get('/api/events/stream?channels=secrets').status_code == 400
+            print("✓ Unknown channels rejected")
+
+            saved = (Config.GUNICORN_WORKERS, Config.GUNICORN_THREADS)
+            try:
+                Config.GUNICORN_WORKERS, Config.GUNICORN_THREADS = 1, 4
+                assert push_available()
+                subscriptions = [event_bus.subscribe(['monitoring'], heartbeat=0.01) for _ in range(2)]
+                for subscription in subscriptions:
+                    next(subscription)
+                assert event_bus.subscriber_count() == 2
+                assert client.get('/api/events/stream').status_code == 204
+                for subscription in subscriptions:
+                    subscription.close()
+                print("✓ Streams beyond the capacity refused with 204")
+
+                for workers, threads in ((2, 4), (1, 1)):
+                    Config.GUNICORN_WORKERS, Config.GUNICORN_THREADS = workers, threads
+                    assert not push_available()
+                    assert client.get('/api/events/stream').status_code == 204
+                print("✓ Pages poll instead of streaming with several workers or sync workers")
+            finally:
+                Config.GUNICORN_WORKERS, Config.GUNICORN_THREADS = saved
+        finally:
+            NotificationLog.query.filter_by(signal_monitoring_id=signal.id).delete()
+            SignalMonitoring.query.filter_by(thesis_analysis_id=thesis.id).delete()
+            db.session.delete(thesis)
+            db.session.commit()
+
+    print("\n✅ Event bus test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_event_bus()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared discrete-event simulation kernel
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from services.event_kernel import EventKernel
+from services.ml_simulation_service import MLSimulationService
+from services.simulation_service import SimulationService
+
+SAMPLE_MONITORING_PLAN = {
+    'validation_framework': {
+        'core_claim_metrics': [{'metric': 'Data Center Revenue', 'target_threshold': '20%', 'data_source': 'FactSet'}],
+        'assumption_tests': [{'test_metric': 'GPU Pricing', 'success_threshold': 'Stable'}]
+    },
+    'alert_system': [
+        {'trigger_name': 'Margin Compression', 'condition': 'Gross margin < 65%', 'action': 'Review', 'severity': 'high'},
+        {'trigger_name': 'Inventory Build', 'condition': 'DIO > 120', 'action': 'Monitor', 'severity': 'medium'}
+    ],
+    'decision_framework': [{'scenario': 'Thesis confirmed', 'action': 'buy', 'condition': 'Revenue beat', 'confidence_threshold': 0.8}],
+    'counter_thesis_monitoring': [{'risk_scenario': 'Custom silicon', 'early_warning_metric': 'Hyperscaler capex mix', 'threshold': '30%'}]
+}
+
+
+def test_event_kernel():
+    """Schedule monitoring-plan events and apply them to Monte Carlo paths"""
+    print("Testing event kernel...")
+
+    kernel = EventKernel(24, steps_per_month=21, seed=7)
+    scheduled = kernel.schedule_monitoring_plan(SAMPLE_MONITORING_PLAN)
+    assert scheduled == 6
+    print(f"✓ Scheduled {scheduled} monitoring-plan events")
+
+    paths = np.full((500, 24 * 21), 100.0)
+    kernel.apply(paths)
+    months = [event['month'] for event in kernel.applied_events]
+    assert months == sorted(months)
+    assert len(set(months)) == len(months)
+    print(f"✓ Events applied in time order at distinct months: {months}")
+
+    for event in kernel.applied_events:
+        if event['impact_type'] == 'positive':
+            assert event['applied_jump'] > 0
+        elif event['impact_type'] == 'negative':
+            assert event['applied_jump'] < 0
+    assert not np.allclose(paths[:, -1], 100.0)
+    print("✓ Jumps move every path in the event's direction")
+
+    # Same seed, same outcome
+    repeat = EventKernel(24, steps_per_month=21, seed=7)
+    repeat.schedule_monitoring_plan(SAMPLE_MONITORING_PLAN)
+    repeat_paths = repeat.apply(np.full((500, 24 * 21), 100.0))
+    assert np.allclose(paths, repeat_paths)
+    print("✓ Seeded kernel is deterministic")
+
+    # A second set of paths replays the same draws without changing the recorded impacts
+    impacts = [event['impact_value'] for event in kernel.applied_events]
+    replayed = kernel.apply(np.full((3, 24 * 21), 100.0))
+    for event in kernel.applied_events:
+        step = (event['month'] - 1) * 21
+        ratio = replayed[:, step] / replayed[:, step - 1] if step else replayed[:, 0] / 100.0
+        assert np.allclose(ratio, 1 + event['applied_jump'], atol=1e-4)
+    assert [event['impact_value'] for event in kernel.applied_events] == impacts
+    print("✓ Every set of paths sees the same jump draws")
+
+    class MockThesis:
+        def __init__(self):
+            self.core_claim = "NVIDIA is positioned for 25% growth driven by AI data center demand"
+            self.original_thesis = self.core_claim
+            self.mental_model = "Growth"
+            self.metrics_to_track = []
+
+    result = MLSimulationService().generate_thesis_simulation(
+        MockThesis(), 2, 'base', 'moderate', True, monitoring_plan=SAMPLE_MONITORING_PLAN
+    )
+    assert not result.get('error')
+    daily = result['performance_data']['daily_thesis_data']
+    assert result['events']
+    for event in result['events']:
+        step = (event['month'] - 1) * 21
+        assert abs(daily[step] - event['impact_value']) < 0.02
+    print(f"✓ {len(result['events'])} ML simulation events match the simulated price path")
+
+    service = MLSimulationService()
+    stages = dict(service.iter_simulation_stages(
+        MockThesis(), 2, 'base', 'moderate', True, SAMPLE_MONITORING_PLAN, seed=11
+    ))
+    kernel = EventKernel(24, seed=11)
+    kernel.schedule_monitoring_plan(SAMPLE_MONITORING_PLAN, limit=6)
+    kernel.draw()
+    assert [event['applied_jump'] for event in stages['events']] == \
+        [event['applied_jump'] for event in kernel.applied_events]
+    assert service._generate_price_fan(stages['parameters'], 2, 'base', 11, kernel) == stages['forecast']['fan_bands']
+    print("✓ Price fan uses the same event schedule and jumps as the path and events stage")
+
+    runs = [
+        SimulationService()._generate_monitoring_based_events(
+            MockThesis(), 2, 'base', SAMPLE_MONITORING_PLAN, [100.0] * 24, seed=5
+        )
+        for _ in range(2)
+    ]
+    assert runs[0] and runs[0] == runs[1]
+    print("✓ SimulationService seeds its event kernel from the request seed")
+
+    print("\n✅ Event kernel test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_event_kernel()
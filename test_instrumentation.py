@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for request, LLM, HTTP and SQL instrumentation exported at /metrics
+"""
+
+import sys
+import os
+import re
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from models import ThesisAnalysis
+from services import instrumentation
+from services.azure_openai_service import AzureOpenAIService
+from services.instrumentation import Summary, llm_fallback_rate, metrics, span
+
+
+class StubCompletions:
+    """Answers once, then returns an empty choice, then raises"""
+
+    def __init__(self):
+        self.responses = ['{"ok": true}', '', RuntimeError('timeout')]
+
+    def create(self, **kwargs):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        message = SimpleNamespace(content=response)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason='stop')], usage=None)
+
+
+def sample(text, name, **labels):
+    """Value of one exposition line, matched on its labels"""
+    for line in text.splitlines():
+        if line.startswith(name + '{') or line.startswith(name + ' '):
+            found = dict(re.findall(r'(\w+)="([^"]*)"', line.split(' ')[0]))
+            if all(found.get(key) == value for key, value in labels.items()):
+                return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+def test_instrumentation():
+    """Spans, route timings and LLM outcomes show up in the exposition"""
+    print("Testing Instrumentation...")
+
+    summary = Summary('latency', 'test')
+    for value in range(1, 101):
+        summary.observe(float(value))
+    quantiles = summary.quantiles()
+    assert round(quantiles[0.5], 2) == 50.5 and round(quantiles[0.99], 2) == 99.01
+    assert summary.count() == 100
+    print(f"✓ Rolling quantiles: p50={quantiles[0.5]:.1f} p95={quantiles[0.95]:.1f} p99={quantiles[0.99]:.1f}")
+
+    metrics.reset()
+    service = AzureOpenAIService()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions()))
+    assert service.generate_completion('hello', call_site='instrumentation_test') == '{"ok": true}'
+    assert service.generate_completion('hello', call_site='instrumentation_test') is None
+    assert service.generate_completion('hello', call_site='instrumentation_test') is None
+    assert abs(llm_fallback_rate('instrumentation_test') - 2 / 3) < 1e-9
+    print("✓ LLM outcomes counted: 1 success, 1 empty, 1 error")
+
+    with span('http', 'eagle'):
+        pass
+
+    client = app.test_client()
+    with app.app_context():
+        thesis = ThesisAnalysis(title='Instrumentation Test', original_thesis='Test', core_claim='Test')
+        db.session.add(thesis)
+        db.session.commit()
+        thesis_id = thesis.id
+    try:
+        for _ in range(3):
+            assert client.get(f'/api/thesis/{thesis_id}/status').status_code == 200
+        assert client.get('/no-such-page').status_code == 404
+
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+    finally:
+        with app.app_context():
+            db.session.delete(db.session.get(ThesisAnalysis, thesis_id))
+            db.session.commit()
+
+    route = '/api/thesis/<int:id>/status'
+    assert sample(text, 'thesis_http_request_duration_seconds_count', route=route) == 3
+    assert sample(text, 'thesis_http_request_duration_seconds', route=route, quantile='0.99') is not None
+    assert sample(text, 'thesis_http_requests_total', route='unmatched', status='404') == 1
+    print("✓ Per-route request counts and p50/p95/p99 exported")
+
+    assert sample(text, 'thesis_span_duration_seconds_count', kind='db', target='SELECT') >= 3
+    assert sample(text, 'thesis_http_request_span_seconds_count', route=route, kind='db') == 3
+    assert sample(text, 'thesis_span_duration_seconds_count', kind='http', target='eagle') == 1
+    assert sample(text, 'thesis_span_duration_seconds_count', kind='llm', target='instrumentation_test') == 3
+    print("✓ SQL, HTTP and LLM spans recorded, SQL attributed to its route")
+
+    assert sample(text, 'thesis_llm_calls_total', call_site='instrumentation_test', outcome='error') == 1
+    assert sample(text, 'thesis_llm_tokens_total', call_site='instrumentation_test', type='prompt') >= 1
+    assert sample(text, 'thesis_llm_fallback_ratio') is not None
+    assert '# TYPE thesis_http_request_duration_seconds summary' in text
+    print("✓ LLM token counts and fallback ratio exported")
+
+    assert instrumentation._request_spans.get() is None
+    print("✓ Span accumulator cleared after the request")
+
+    print("\n✅ Instrumentation test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_instrumentation()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the fast JSON provider and response compression
+"""
+
+import sys
+import os
+import gzip
+import json
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from flask import Flask
+
+from app import app
+from services import json_provider
+from services.json_provider import FastJSONProvider, init_response_compression
+
+
+def test_json_provider():
+    """Datetimes and NumPy values serialise natively; large JSON responses are gzipped"""
+    print("Testing Fast JSON Provider...")
+
+    assert isinstance(app.json, FastJSONProvider)
+    payload = {
+        'created_at': datetime(2024, 3, 1, 9, 30, 0, 123456),
+        'prices': np.array([1.5, 2.25]),
+        'count': np.int64(3),
+        'ratio': np.float32(0.5),
+        1: 'numeric key',
+        'big': 2 ** 70
+    }
+    expected = {'created_at': '2024-03-01T09:30:00.123456', 'prices': [1.5, 2.25], 'count': 3,
+                'ratio': 0.5, '1': 'numeric key', 'big': 2 ** 70}
+    assert json.loads(app.json.dumps(payload)) == expected
+
+    # The stdlib fallback produces the same document
+    encoder = json_provider.orjson
+    json_provider.orjson = None
+    try:
+        assert json.loads(app.json.dumps(payload)) == expected
+    finally:
+        json_provider.orjson = encoder
+    print("✓ Datetimes, NumPy values, non-string keys and huge integers serialise on both paths")
+
+    assert app.json.loads(b'{"a": [1, 2]}') == {'a': [1, 2]}
+    assert app.json.loads('{"a": NaN}')['a'] != 0  # Accepted by the stdlib fallback
+    print("✓ loads accepts bytes and falls back for non-standard JSON")
+
+    # A separate app, since routes cannot be added once the main app has served requests
+    test_app = Flask(__name__)
+    test_app.json = FastJSONProvider(test_app)
+    init_response_compression(test_app)
+
+    @test_app.route('/payload/<int:size>')
+    def payload_route(size):
+        return {'series': np.arange(size, dtype=float), 'as_of': datetime(2024, 1, 1)}
+
+    client = test_app.test_client()
+    small = client.get('/payload/5', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    assert small.get_json() == {'series': [0.0, 1.0, 2.0, 3.0, 4.0], 'as_of': '2024-01-01T00:00:00'}
+
+    large = client.get('/payload/5000', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert large.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in large.headers['Vary']
+    body = gzip.decompress(large.get_data())
+    assert len(large.get_data()) < len(body) / 2
+    assert len(json.loads(body)['series']) == 5000
+
+    plain = client.get('/payload/5000')
+    assert 'Content-Encoding' not in plain.headers and len(plain.get_json()['series']) == 5000
+    print(f"✓ Large response gzipped ({len(body)} -> {len(large.get_data())} bytes), small and non-accepting clients untouched")
+
+    print("\n✅ JSON provider test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_json_provider()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable LLM backend and its deterministic replay stand-in
+"""
+
+import sys
+import os
+import json
+import random
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.azure_openai_service import AzureOpenAIService
+from services.llm_backends import (ReplayLLMClient, RecordingLLMClient, LatencyModel, LLMTimeoutError,
+                                   build_llm_client, prompt_hash)
+from services.llm_json import parse_llm_json
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+POSITION = {'position': 'long', 'ticker': 'NVDA', 'target_price': 1150, 'horizon_months': 12}
+
+
+def messages(text):
+    return [{'role': 'user', 'content': text}]
+
+
+def replay(**options):
+    settings = {'entries': [{'key': prompt_hash(messages('exact prompt')), 'response': 'exact answer'},
+                            {'contains': 'investment_position', 'response': POSITION},
+                            {'default': True, 'response': '{"default": true}'}],
+                'latency': 'fixed:0', 'truncation_rate': 0, 'error_rate': 0, 'seed': 1}
+    settings.update(options)
+    return ReplayLLMClient(**settings)
+
+
+def content(response):
+    return response.choices[0].message.content
+
+
+def test_llm_backends():
+    """Replay answers deterministically and drives the real service code paths"""
+    print("Testing LLM Backends...")
+
+    client = replay()
+    assert content(client.chat.completions.create(messages=messages('exact prompt'))) == 'exact answer'
+    assert json.loads(content(client.chat.completions.create(
+        messages=messages('Extract the investment_position from this note')))) == POSITION
+    assert content(client.chat.completions.create(messages=messages('anything else'))) == '{"default": true}'
+    assert client.calls == 3 and client.misses == 1
+    print("✓ Exact, substring and default recordings matched in order")
+
+    sleeps = []
+    slow = replay(latency='lognormal:800,0.4', error_rate=0.3, seed=7, sleep=sleeps.append)
+    rerun = replay(latency='lognormal:800,0.4', error_rate=0.3, seed=7, sleep=lambda seconds: None)
+    outcomes = []
+    for run in (slow, rerun):
+        results = []
+        for i in range(20):
+            try:
+                results.append(content(run.chat.completions.create(messages=messages(f'prompt {i % 5}'))))
+            except Exception as e:
+                results.append(type(e).__name__)
+        outcomes.append(results)
+    assert outcomes[0] == outcomes[1]
+    assert any(result in ('LLMTimeoutError', 'LLMRateLimitError', '') for result in outcomes[0])
+    assert len(sleeps) == 20 and 0.2 < sorted(sleeps)[10] < 3
+    assert LatencyModel('uniform:10,20').sample(random.Random(0)) * 1000 >= 10
+    print(f"✓ Latency, errors and content replay identically per seed (median sleep {sorted(sleeps)[10]:.2f}s)")
+
+    truncated = replay().chat.completions.create(
+        messages=messages('investment_position please'), max_tokens=8)
+    assert truncated.choices[0].finish_reason == 'length'
+    assert len(content(truncated)) < len(json.dumps(POSITION))
+    repaired = parse_llm_json(content(truncated), 'llm_backends_test')
+    assert isinstance(repaired, dict) and repaired['position'] == 'long'
+    print("✓ max_tokens truncation returns finish_reason 'length' and the JSON repair path recovers it")
+
+    service = AzureOpenAIService()
+    service.client = replay()
+    prompt = 'Return the investment_position as JSON'
+    assert json.loads(service.generate_completion(prompt, call_site='llm_backends_test')) == POSITION
+    assert ''.join(service.stream_completion(prompt, call_site='llm_backends_test')) == json.dumps(POSITION)
+    service.client = replay(error_rate=1.0, error_kinds=['timeout'])
+    assert service.generate_completion(prompt, call_site='llm_backends_test') is None
+    service.client = replay(error_rate=1.0, error_kinds=['empty'])
+    assert service.generate_completion(prompt, call_site='llm_backends_test') is None
+    try:
+        replay(error_rate=1.0, error_kinds=['timeout']).chat.completions.create(messages=messages(prompt))
+        assert False, 'expected an injected timeout'
+    except LLMTimeoutError:
+        pass
+    print("✓ AzureOpenAIService completes, streams and falls back to None on injected failures")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'recordings.jsonl')
+        recorder = RecordingLLMClient(replay(), path)
+        live = content(recorder.chat.completions.create(messages=messages('investment_position live')))
+        streamed = ''.join(chunk.choices[0].delta.content for chunk in recorder.chat.completions.create(
+            messages=messages('streamed prompt'), stream=True))
+        offline = ReplayLLMClient(path=path, latency='fixed:0', error_rate=0, truncation_rate=0)
+        assert content(offline.chat.completions.create(messages=messages('investment_position live'))) == live
+        assert content(offline.chat.completions.create(messages=messages('streamed prompt'))) == streamed
+        assert offline.misses == 0
+    assert isinstance(build_llm_client('replay', lambda: None), ReplayLLMClient)
+    assert build_llm_client('azure', lambda: 'sdk client') == 'sdk client'
+    print("✓ Recorded sessions replay offline by prompt hash")
+
+    # A fresh interpreter, as the local server binds the app to a scratch database
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.load_scenario', '--local', '--users', '2', '--duration', '2',
+         '--llm-latency', 'fixed:5'],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    assert 'view_thesis' in completed.stdout and 'p99 ms' in completed.stdout
+    print("✓ Load scenario ran against the replay backend")
+
+    print("\n✅ LLM backends test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_llm_backends()
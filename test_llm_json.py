@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared LLM JSON parser (incremental repair, schemas, per-call-site counters)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.llm_json import StreamingJSONParser, parse_llm_json, parse_stats, reset_parse_stats
+
+
+def test_llm_json():
+    """Parse, repair and count LLM JSON responses"""
+    print("Testing LLM JSON Parser...")
+    reset_parse_stats()
+
+    # First complete value is found exactly, even with braces inside strings and trailing text
+    response = 'Here is the analysis: {"claim": "growth {fast}", "items": [1, 2]} Let me know! {"extra": 1}'
+    assert parse_llm_json(response, 'test.complete') == {'claim': 'growth {fast}', 'items': [1, 2]}
+    print("✓ Extracted the first complete value from prose")
+
+    assert parse_llm_json('```json\n[{"name": "A"}]\n```', 'test.fenced', [dict]) == [{'name': 'A'}]
+    print("✓ Markdown fences stripped")
+
+    # Truncated output is repaired
+    truncated = '{"core_claim": "AI demand", "assumptions": ["capex grows", "pricing hol'
+    assert parse_llm_json(truncated, 'test.truncated', dict) == {
+        'core_claim': 'AI demand', 'assumptions': ['capex grows', 'pricing hol']
+    }
+    assert parse_llm_json('{"a": 1, "b": tru', 'test.truncated') == {'a': 1}
+    assert parse_llm_json('{"a": 1, "dangling_key', 'test.truncated') == {'a': 1}
+    assert parse_llm_json('[{"n": 1}, {"n": 2}, {"n":', 'test.truncated', [dict]) == [{'n': 1}, {'n': 2}, {}]
+    print("✓ Truncated strings, literals and keys repaired")
+
+    # Streaming: feed chunk by chunk
+    parser = StreamingJSONParser()
+    chunks = ['noise {"a"', ': [1, 2', ']}', ' tail']
+    done = [parser.feed(chunk) for chunk in chunks]
+    assert done == [False, False, True, True] and parser.text == '{"a": [1, 2]}'
+    print("✓ Incremental feeding detects completion")
+
+    # Schema mismatch skips prose brackets and falls through to the real value
+    assert parse_llm_json('Step [1] done. {"recommendations": ["hedge"]}', 'test.schema',
+                          {'recommendations': list}) == {'recommendations': ['hedge']}
+    assert parse_llm_json('["not", "an", "object"]', 'test.schema', dict) is None
+    assert parse_llm_json('', 'test.empty') is None
+    print("✓ Schema validation and failures")
+
+    stats = parse_stats()
+    assert stats['test.complete'] == {'parsed': 1, 'repaired': 0, 'failed': 0}
+    assert stats['test.truncated']['repaired'] == 4
+    assert stats['test.schema'] == {'parsed': 1, 'repaired': 0, 'failed': 1}
+    assert stats['test.empty']['failed'] == 1
+    print(f"✓ Per-call-site counters: {len(stats)} call sites")
+
+    print("\n✅ LLM JSON parser test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_llm_json()
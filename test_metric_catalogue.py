@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the indexed metric catalogue behind MetricSelector
+"""
+
+import sys
+import os
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.metric_catalogue import MetricCatalogue, extract_primary_metric_names
+from services.metric_selector import MetricSelector
+from services.data_adapter_service import DataAdapter
+
+
+def walk_string_leaves(data, found):
+    """The recursive scan get_all_available_metrics used to do"""
+    for key, value in data.items():
+        if isinstance(value, str) and not key.startswith('_'):
+            found.append(value)
+        elif isinstance(value, dict):
+            walk_string_leaves(value, found)
+
+
+def test_metric_catalogue():
+    """Catalogue lookups match walks of the nested dictionary"""
+    print("Testing Metric Catalogue...")
+
+    with open('metric_dictionary.json') as f:
+        metric_dict = json.load(f)
+    categories = metric_dict['metric_categories']
+    selector = MetricSelector()
+    catalogue = selector.catalogue
+
+    assert MetricSelector().catalogue is catalogue
+    print(f"✓ Catalogue compiled once and shared: {len(catalogue.entries)} metrics")
+
+    for category, category_data in categories.items():
+        expected = []
+        for group in category_data['metrics'].values():
+            extract_primary_metric_names(group, expected)
+        assert catalogue.primary_metrics[category] == expected, category
+
+        summary = []
+        extract_primary_metric_names(category_data['metrics'], summary)
+        assert selector.get_category_metric_names(category) == summary, category
+    comprehensive = selector.get_comprehensive_metrics_for_thesis()
+    assert set(comprehensive) == {'growth_metrics', 'valuation_metrics', 'profitability_metrics',
+                                  'risk_metrics', 'market_metrics'}
+    comprehensive['growth_metrics'].append('mutated')
+    assert 'mutated' not in selector.get_comprehensive_metrics_for_thesis()['growth_metrics']
+    print("✓ Per-category primary metrics match the recursive extraction")
+
+    for category, category_data in categories.items():
+        leaves = []
+        walk_string_leaves(category_data['metrics'], leaves)
+        codes = [leaf for leaf in leaves if leaf in catalogue.entries]
+        assert codes and all(catalogue.category_of[code] == category for code in codes)
+    assert set(selector.get_all_available_metrics()) == set(catalogue.entries)
+    assert all(code in selector.get_all_available_metrics() for code in comprehensive['valuation_metrics'])
+    assert selector.get_metric_category('revenue_growth_this_yr') == 'growth_metrics'
+    assert selector.get_metric_category('not_a_metric') is None
+    print("✓ Reverse metric -> category index covers every metric code")
+
+    for use_case in ('Peer comparison', 'PEER COMPARISON', 'Trend analysis'):
+        expected = [group for category_data in categories.values()
+                    for group in category_data['metrics'].values()
+                    if use_case.lower() in [uc.lower() for uc in group.get('use_cases', [])]]
+        assert expected and selector.find_metrics_by_use_case(use_case) == expected, use_case
+    assert selector.find_metrics_by_use_case('no such use case') == []
+    print("✓ Use-case index matches the linear scan")
+
+    forward = selector.get_metrics_by_timeframe('forward_4')
+    assert forward and all(catalogue.entries[code].timeframe == 'forward_4' for code in forward)
+    assert selector.get_metrics_by_timeframe('decade') == []
+    print(f"✓ Timeframe index: {len(forward)} forward_4 metrics")
+
+    results = selector.search_metrics('revenue growth forecast', limit=5)
+    assert results and all('revenue' in code for code in results[:2]), results
+    assert selector.search_metrics('') == []
+    print(f"✓ Text search: {results[:3]}")
+
+    organized = DataAdapter()._organize_metrics_by_category(
+        {'revenue_growth_this_yr': 0.12, 'volatility_1_yr': 0.3, 'unknown_code': 1}, selector)
+    assert organized['growth_metrics'] == {'revenue_growth_this_yr': 0.12}
+    assert organized['risk_metrics'] == {'volatility_1_yr': 0.3}
+    assert 'unknown_code' not in str(organized)
+    assert selector.get_category_metric_names('Unknown Category') == []
+    assert MetricCatalogue({}).all_metrics == []
+    print("✓ DataAdapter organizes metrics through the catalogue")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        selector.get_comprehensive_metrics_for_thesis()
+        selector.find_metrics_by_use_case('Peer comparison')
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✓ 1,000 selections in {elapsed:.1f} ms")
+
+    print("\n✅ Metric catalogue test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_metric_catalogue()
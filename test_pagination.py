@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination and column projection on the list views
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import load_only
+
+from app import app, db
+from models import DocumentUpload, SignalMonitoring, ThesisAnalysis
+from services.pagination import decode_cursor, encode_cursor, keyset_page, page_size_arg
+
+TITLE = 'Keyset Pagination Thesis'
+
+
+def test_pagination():
+    """Pages cover every row exactly once and list views skip the JSON columns"""
+    print("Testing Keyset Pagination...")
+
+    # Far-future timestamps put the test rows on the first page of the live views
+    stamp = datetime(2100, 1, 1, 12, 0, 0)
+    assert decode_cursor(encode_cursor(stamp, 42)) == (stamp, 42)
+    assert decode_cursor('not-a-cursor') is None and decode_cursor(None) is None
+    assert page_size_arg(None) == 24 and page_size_arg(10_000) == 100
+    print("✓ Cursor round trip and page size clamping")
+
+    with app.app_context():
+        try:
+            # Several rows share a timestamp so the id tie-breaker is exercised
+            theses = [
+                ThesisAnalysis(title=TITLE, original_thesis='x', core_claim=f'Claim {i}',
+                               monitoring_plan={'objective': 'x' * 1000},
+                               created_at=stamp + timedelta(minutes=i // 3))
+                for i in range(20)
+            ]
+            db.session.add_all(theses)
+            db.session.flush()
+            db.session.add_all([
+                SignalMonitoring(thesis_analysis_id=theses[-1].id, signal_name=f'Signal {i}',
+                                 signal_type='price', threshold_value=1, threshold_type='above')
+                for i in range(3)
+            ])
+            db.session.commit()
+            expected = [thesis.id for thesis in sorted(theses, key=lambda t: (t.created_at, t.id), reverse=True)]
+            db.session.expire_all()
+
+            query = ThesisAnalysis.query.filter_by(title=TITLE).options(
+                load_only(ThesisAnalysis.id, ThesisAnalysis.title, ThesisAnalysis.created_at)
+            )
+            seen, cursor, pages = [], None, 0
+            while True:
+                page = keyset_page(query, ThesisAnalysis, cursor, 7)
+                seen.extend(thesis.id for thesis in page.items)
+                pages += 1
+                if not page.has_more:
+                    break
+                cursor = page.next_cursor
+            assert seen == expected and pages == 3, (seen, expected)
+            print(f"✓ {len(seen)} rows over {pages} pages with no gaps or repeats")
+
+            assert 'monitoring_plan' not in page.items[0].__dict__
+            print("✓ JSON columns not loaded by the projected query")
+
+            client = app.test_client()
+            response = client.get('/monitoring?limit=5')
+            assert response.status_code == 200
+            body = response.get_data(as_text=True)
+            assert 'Older' in body and 'cursor=' in body
+            assert '3 signals' in body
+            print("✓ /monitoring renders one page with SQL signal counts")
+
+            assert client.get('/monitoring?cursor=garbage').status_code == 200
+            assert client.get('/documents?limit=5').status_code == 200
+            print("✓ /documents renders and bad cursors fall back to the first page")
+        finally:
+            ids = [thesis.id for thesis in ThesisAnalysis.query.filter_by(title=TITLE).all()]
+            SignalMonitoring.query.filter(SignalMonitoring.thesis_analysis_id.in_(ids)).delete(synchronize_session=False)
+            DocumentUpload.query.filter(DocumentUpload.thesis_analysis_id.in_(ids)).delete(synchronize_session=False)
+            ThesisAnalysis.query.filter_by(title=TITLE).delete(synchronize_session=False)
+            db.session.commit()
+
+    print("\n✅ Keyset pagination test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_pagination()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the local peer-similarity index behind alternative companies
+"""
+
+import sys
+import os
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.alternative_company_service import AlternativeCompanyService
+from services.peer_index import PeerIndex
+
+THESIS = {
+    'core_claim': 'Snowflake cloud software subscription revenue will accelerate as AI workloads grow',
+    'original_thesis': 'Long Snowflake'
+}
+SIGNALS = [{'signal_name': 'Revenue growth', 'status': 'active'}, {'signal_name': 'Customer count', 'status': 'active'}]
+
+
+class StubAnnotator:
+    """Annotates two shortlisted tickers and tries to slip in an invented one"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.prompts = []
+
+    def generate_completion(self, prompt, temperature=1.0, max_tokens=2000, json_mode=False, call_site=None):
+        self.prompts.append(prompt[-1]['content'])
+        if self.fail:
+            raise RuntimeError('LLM unavailable')
+        return json.dumps([
+            {'ticker': 'PATH', 'unloved_factors': ['Slowing growth', 'Churn'], 'hidden_strengths': ['Agentic automation'],
+             'thesis_fit': 'Automation spend rides the same AI budget'},
+            {'ticker': 'box', 'unloved_factors': ['Low growth'], 'hidden_strengths': ['AI content tooling']},
+            {'ticker': 'FAKE', 'unloved_factors': ['Invented'], 'hidden_strengths': []}
+        ])
+
+
+def test_peer_index():
+    """Shortlists are deterministic, fast and exclude the thesis subject; the LLM only annotates"""
+    print("Testing Peer Similarity Index...")
+
+    index = PeerIndex.load()
+    assert PeerIndex.load() is index
+    characteristics = AlternativeCompanyService()._extract_thesis_characteristics(THESIS, SIGNALS)
+    assert characteristics['sector'] == 'Technology' and characteristics['business_model'] == 'SaaS'
+
+    start = time.perf_counter()
+    for _ in range(100):
+        shortlist = index.nearest(characteristics, 8, exclude_text=THESIS['core_claim'])
+    per_lookup_ms = (time.perf_counter() - start) * 10
+    assert per_lookup_ms < 5, per_lookup_ms
+    print(f"✓ Peer lookup over {len(index.securities)} securities in {per_lookup_ms:.3f} ms")
+
+    tickers = [security['ticker'] for security in shortlist]
+    assert len(tickers) == 8 and 'SNOW' not in tickers
+    assert tickers == [security['ticker'] for security in index.nearest(characteristics, 8, THESIS['core_claim'])]
+    similarities = [security['similarity'] for security in shortlist]
+    assert similarities == sorted(similarities, reverse=True)
+    assert all(security['sector'] == 'Technology' for security in shortlist[:5])
+    print(f"✓ Deterministic shortlist without the thesis subject: {tickers}")
+
+    assert index._mentioned_rows('price target raised at a key block trade') == []
+    assert len(index._mentioned_rows('Target and Block both beat')) == 2
+    print("✓ Only capitalised single-word company names count as mentions")
+
+    twins = PeerIndex([dict(index.securities[0], ticker=f'TWIN{i}', name=f'Twin {i}') for i in range(12)])
+    assert [security['ticker'] for security in twins.nearest(characteristics, 3)] == ['TWIN0', 'TWIN1', 'TWIN2']
+    assert [security['ticker'] for security in twins.nearest(characteristics, 2, 'TWIN0')] == ['TWIN1', 'TWIN2']
+    print("✓ Ties broken by universe order")
+
+    service = AlternativeCompanyService()
+    service.azure_service = StubAnnotator()
+    result = service.find_alternative_companies(THESIS, SIGNALS)
+    companies = {company['ticker']: company for company in result['alternative_companies']}
+    assert result['peer_source'] == 'security_universe' and set(companies) == set(tickers)
+    assert companies['PATH']['unloved_factors'] == ['Slowing growth', 'Churn']
+    assert companies['PATH']['thesis_fit'].startswith('Automation')
+    assert companies['BOX']['hidden_strengths'] == ['AI content tooling']
+    assert 'FAKE' not in companies and all('composite_score' in company for company in companies.values())
+    assert 'PATH: UiPath' in service.azure_service.prompts[0]
+    print("✓ LLM annotations merged onto the shortlist; invented tickers ignored")
+
+    service.azure_service = StubAnnotator(fail=True)
+    fallback = service.find_alternative_companies(THESIS, SIGNALS)
+    assert {company['ticker'] for company in fallback['alternative_companies']} == set(tickers)
+    assert all(company['unloved_factors'] == [] for company in fallback['alternative_companies'])
+    assert [company['ticker'] for company in fallback['alternative_companies']] == \
+        [company['ticker'] for company in result['alternative_companies']]
+    print("✓ LLM failure still returns the scored shortlist, in the same order")
+
+    print("\n✅ Peer index test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_peer_index()
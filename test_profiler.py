@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for on-demand request profiling and the rolling sampler
+"""
+
+import sys
+import os
+import json
+import pstats
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, Response
+
+from app import app
+from config import Config
+from services import profiler
+from services.profiler import RollingSampler, StackSampler, init_profiler, profile_store
+
+TOKEN = 'test-admin-token'
+
+
+def busy_loop(seconds):
+    """Keep the request thread on-CPU so the sampler has frames to see"""
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def profiled_app():
+    """Separate app so test routes can be added after the main app has served requests"""
+    test_app = Flask(__name__)
+    init_profiler(test_app)
+
+    @test_app.route('/slow')
+    def slow():
+        return {'total': busy_loop(0.1)}
+
+    @test_app.route('/stream')
+    def stream():
+        return Response((str(busy_loop(0.02)) for _ in range(3)), mimetype='text/plain')
+
+    return test_app
+
+
+def test_profiler():
+    """Profiles are captured only for admins and saved in the requested format"""
+    print("Testing Profiler...")
+
+    original_token, original_directory = Config.PROFILER_ADMIN_TOKEN, profile_store.directory
+    with tempfile.TemporaryDirectory() as directory:
+        Config.PROFILER_ADMIN_TOKEN = TOKEN
+        profile_store.directory = directory
+        try:
+            client = profiled_app().test_client()
+
+            response = client.get('/slow', headers={'X-Profile': 'cprofile'})
+            assert 'X-Profile-Id' not in response.headers
+            response = client.get('/slow', headers={'X-Profile': 'cprofile', 'X-Profile-Token': 'wrong'})
+            assert 'X-Profile-Id' not in response.headers and profile_store.list() == []
+            print("✓ Profiling ignored without the admin token")
+
+            response = client.get('/slow', headers={'X-Profile': 'cprofile', 'X-Profile-Token': TOKEN})
+            response.close()
+            name = response.headers['X-Profile-Id']
+            assert name.endswith('.pstats')
+            stats = pstats.Stats(profile_store.path(name))
+            functions = {function for _, _, function in stats.stats}
+            assert 'busy_loop' in functions
+            print(f"✓ cProfile request saved as {name.split('-', 1)[1]}")
+
+            response = client.get(f'/slow?_profile=sample&_profile_token={TOKEN}')
+            response.close()
+            name = response.headers['X-Profile-Id']
+            with open(profile_store.path(name)) as f:
+                speedscope = json.load(f)
+            frames = [frame['name'] for frame in speedscope['shared']['frames']]
+            assert speedscope['profiles'][0]['type'] == 'sampled' and 'busy_loop' in frames
+            assert len(speedscope['profiles'][0]['samples']) == len(speedscope['profiles'][0]['weights'])
+            print(f"✓ Sampled request saved as speedscope ({len(speedscope['profiles'][0]['samples'])} stacks)")
+
+            response = client.get('/stream', headers={'X-Profile': 'cprofile', 'X-Profile-Token': TOKEN})
+            name = response.headers['X-Profile-Id']
+            assert response.get_data(as_text=True)
+            response.close()
+            assert 'busy_loop' in {function for _, _, function in pstats.Stats(profile_store.path(name)).stats}
+            print("✓ Streamed response profiled until the stream closed")
+
+            main = app.test_client()
+            assert main.get('/admin/profiles').status_code == 403
+            listing = main.get('/admin/profiles', headers={'X-Profile-Token': TOKEN}).get_json()
+            assert len(listing['profiles']) == 3
+            download = main.get(f"/admin/profiles/{listing['profiles'][0]['name']}",
+                                headers={'X-Profile-Token': TOKEN})
+            assert download.status_code == 200 and download.data
+            download.close()
+            assert main.get('/admin/profiles/..%2Fapp.py', headers={'X-Profile-Token': TOKEN}).status_code == 404
+            print("✓ Admin listing and download, unsafe names rejected")
+
+            sampler = RollingSampler(profile_store, interval=0.002, window_seconds=60)
+            assert sampler.start() and not sampler.start()
+            busy_loop(0.1)
+            assert sampler.stop() and not sampler.running
+            folded = [p['name'] for p in profile_store.list() if p['name'].endswith('.folded')]
+            assert len(folded) == 1
+            with open(profile_store.path(folded[0])) as f:
+                lines = f.read().splitlines()
+            assert any('busy_loop' in line for line in lines)
+            assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+            print(f"✓ Rolling sampler wrote {len(lines)} folded stacks")
+
+            status = main.post('/admin/profiler/sampler', json={'action': 'start'},
+                               headers={'X-Profile-Token': TOKEN}).get_json()
+            assert status['rolling_sampler']['running']
+            status = main.post('/admin/profiler/sampler', json={'action': 'stop'},
+                               headers={'X-Profile-Token': TOKEN}).get_json()
+            assert not status['rolling_sampler']['running']
+            print("✓ Rolling sampler started and stopped on a live app")
+
+            profile_store.retention = 2
+            profile_store.write(profile_store.new_name('extra', 'rolling'), 'a 1\n')
+            assert len(profile_store.list()) == 2
+            print("✓ Retention keeps only the newest profiles")
+
+        finally:
+            profiler.rolling_sampler.stop()
+            Config.PROFILER_ADMIN_TOKEN = original_token
+            profile_store.directory = original_directory
+            profile_store.retention = Config.PROFILE_RETENTION
+
+    assert StackSampler(0.01).to_folded() == '\n'
+
+    print("\n✅ Profiler test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_profiler()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for prompt budgeting (token estimates, thesis compaction, per-call-site token usage)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services import prompt_budget
+from services.prompt_budget import (
+    compact_json, compact_thesis, count_tokens, fit_text, record_token_usage, summarise_field, token_usage_stats
+)
+
+
+def _large_thesis():
+    return {
+        'id': 7,
+        'updated_at': '2026-01-01T00:00:00',
+        'core_claim': 'Cloud infrastructure demand will outgrow supply for three years. ' * 10,
+        'core_analysis': 'Hyperscaler capex, power constraints and GPU lead times compound. ' * 40,
+        'assumptions': [f'Assumption {i}: enterprise AI adoption keeps accelerating across sectors' for i in range(12)],
+        'causal_chain': [{'chain_link': i, 'event': f'Event {i} drives utilisation', 'explanation': 'x ' * 60}
+                         for i in range(8)],
+        'counter_thesis': [{'scenario': f'Risk {i}', 'description': 'Demand pull-forward reverses. ' * 8}
+                           for i in range(6)],
+        'metrics_to_track': [{'name': f'Metric {i}', 'description': 'Quarterly cloud revenue growth ' * 5,
+                              'frequency': 'quarterly', 'threshold': 20} for i in range(15)],
+        'monitoring_plan': {
+            'objective': 'Track capacity and demand',
+            'data_pulls': [{'metric': f'Pull {i}', 'query_template': 'SELECT * ' * 20} for i in range(10)],
+            'alert_logic': [{'trigger_name': f'Alert {i}', 'condition': 'growth < 10%'} for i in range(6)]
+        }
+    }
+
+
+def test_prompt_budget():
+    """Compact theses to a token budget and account token usage"""
+    print("Testing Prompt Budget...")
+
+    assert count_tokens('') == 0
+    assert count_tokens('{"a":1}') == 7
+    indented = '{\n  "core_claim": "x",\n  "assumptions": [\n    "a"\n  ]\n}'
+    assert count_tokens(compact_json({'core_claim': 'x', 'assumptions': ['a']})) == count_tokens(indented)
+    assert len(compact_json({'core_claim': 'x', 'assumptions': ['a']})) < len(indented)
+    print("✓ Token estimates and compact serialisation")
+
+    long_text = 'Margins expand. ' * 200
+    assert count_tokens(fit_text(long_text, 50)) <= 60
+    assert fit_text('short', 50) == 'short'
+    print("✓ Text truncation")
+
+    thesis = _large_thesis()
+    assert summarise_field('metrics_to_track', thesis['metrics_to_track'])[:2] == ['Metric 0', 'Metric 1']
+    plan = summarise_field('monitoring_plan', thesis['monitoring_plan'])
+    assert plan['data_pulls'][:3] == ['Pull 0', 'Pull 1', 'Pull 2'] and plan['data_pulls'][-1] == '+7 more'
+    print("✓ Low-value fields summarised")
+
+    full_tokens = count_tokens(compact_json(thesis))
+    for budget in (2000, 800, 300):
+        compact = compact_thesis(thesis, budget)
+        assert count_tokens(compact_json(compact)) <= budget, budget
+        assert 'core_claim' in compact
+    print(f"✓ Compacted {full_tokens} tokens to fit 2000/800/300 token budgets")
+
+    small = {'core_claim': 'Short claim', 'assumptions': ['one']}
+    assert compact_thesis(small, 500) == small
+    print("✓ Small theses pass through unchanged")
+
+    first = compact_thesis(thesis, 800)
+    cached_entries = len(prompt_budget._cache)
+    second = compact_thesis(thesis, 800)
+    assert second == first and second is not first
+    assert len(prompt_budget._cache) == cached_entries
+    changed = dict(thesis, updated_at='2026-02-01T00:00:00')
+    compact_thesis(changed, 800)
+    assert len(prompt_budget._cache) == cached_entries + 1
+    print("✓ Compact thesis cached per version")
+
+    first['core_claim'] = 'mutated'
+    for value in first.values():
+        if isinstance(value, list):
+            value.append('mutated')
+    assert compact_thesis(thesis, 800) == second
+    print("✓ Callers mutating a result do not change later prompts")
+
+    record_token_usage('test.site', 120, 30)
+    record_token_usage('test.site', 80, 20, estimated=True)
+    usage = token_usage_stats()['test.site']
+    assert usage == {'calls': 2, 'prompt_tokens': 200, 'completion_tokens': 50}
+    print("✓ Token usage recorded per call site")
+
+    print("\n✅ Prompt budget test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_prompt_budget()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact simulation series payload format
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.ml_simulation_service import MLSimulationService
+from services.series_codec import (
+    compact_simulation_payload, decode_float32, encode_float32, lttb_indices, parse_max_points, unpack_series
+)
+
+
+def test_series_codec():
+    """Encode, downsample and compact a multi-year simulation payload"""
+    print("Testing compact series codec...")
+
+    values = [100.0, 101.5, 99.25, 102.75]
+    assert decode_float32(encode_float32(values)) == values
+    print("✓ float32 round-trip")
+
+    # LTTB keeps the endpoints and the extreme spike
+    spike = [1.0] * 1000
+    spike[500] = 50.0
+    indices = lttb_indices(spike, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert 500 in indices
+    assert list(indices) == sorted(indices)
+    print("✓ LTTB keeps endpoints and peaks")
+
+    service = MLSimulationService()
+    params = service._get_default_parameters('base', 'moderate')
+    performance_data = service._generate_ml_price_forecast(params, 5, 'base', 'moderate')
+    result = {
+        'performance_data': performance_data,
+        'timeline': ['Jan'] * 60,
+        'chart_data': {'performance_data': performance_data, 'timeline': ['Jan'] * 60}
+    }
+
+    compact = compact_simulation_payload(result, max_points=800)
+    full_size = len(json.dumps(result))
+    compact_size = len(json.dumps(compact))
+    print(f"Full payload: {full_size} bytes, compact payload: {compact_size} bytes")
+    assert compact_size < full_size / 2
+    assert 'daily_thesis_data' not in compact['performance_data']
+    assert 'performance_data' not in compact['chart_data']
+
+    daily = unpack_series(compact['series']['daily_thesis_data'])
+    assert compact['series']['daily_thesis_data']['source_length'] == len(performance_data['daily_thesis_data'])
+    assert len(daily['values']) == 800
+    first_index = daily['index'][0]
+    assert abs(daily['values'][0] - performance_data['daily_thesis_data'][first_index]) < 0.01
+
+    monthly = unpack_series(compact['series']['thesis_performance'])
+    assert len(monthly['values']) == 60
+    print("✓ Compact payload carries each series once")
+
+    assert parse_max_points(None) is None and parse_max_points('') is None
+    assert parse_max_points('100') == 100 and parse_max_points(1) == 3
+    for bad in ('abc', '10.5', 0, -4, True, [100]):
+        try:
+            parse_max_points(bad)
+            assert False, f'{bad!r} accepted'
+        except ValueError:
+            pass
+    print("✓ max_points coerced to an int, clamped to 3 and rejected when invalid")
+
+    print("\n✅ Series codec test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_series_codec()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for lazy service construction and the shared LLM client
+"""
+
+import sys
+import os
+import subprocess
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from services.azure_openai_service import AzureOpenAIService
+from services.metric_selector import MetricSelector
+from services.service_registry import ServiceRegistry
+
+
+class SlowService:
+    instances = 0
+
+    def __init__(self):
+        time.sleep(0.05)
+        SlowService.instances += 1
+        self.label = 'slow'
+
+
+def test_service_registry():
+    """Services are built once on first use; the LLM client and metric dictionary are shared"""
+    print("Testing Service Registry...")
+
+    registry = ServiceRegistry()
+    proxy = registry.lazy('slow', SlowService)
+    assert not registry.is_built('slow') and 'lazy' in repr(proxy)
+
+    threads = [threading.Thread(target=lambda: proxy.label) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert SlowService.instances == 1 and registry.get('slow') is registry.get('slow')
+    assert registry.stats()['constructed']['slow'] >= 50
+    print("✓ Concurrent first use constructs the service once")
+
+    proxy.label = 'patched'
+    assert registry.get('slow').label == 'patched'
+    registry.reset('slow')
+    assert proxy.label == 'slow' and SlowService.instances == 2
+    print("✓ Proxies forward attribute writes; reset rebuilds")
+
+    string_registry = ServiceRegistry()
+    selector = string_registry.lazy('metric_selector', 'services.metric_selector:MetricSelector')
+    assert selector.get_metrics_for_analysis('nonexistent') == {'primary_metrics': [], 'supporting_metrics': []}
+    assert MetricSelector().metric_dict is MetricSelector().metric_dict
+    print("✓ 'module:attribute' factories resolve lazily; the metric dictionary is parsed once")
+
+    saved = (Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT,
+             AzureOpenAIService._shared_client, AzureOpenAIService._shared_client_ready)
+    try:
+        Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT = 'test-key', 'https://example.invalid'
+        AzureOpenAIService._shared_client, AzureOpenAIService._shared_client_ready = None, False
+        first, second = AzureOpenAIService(), AzureOpenAIService()
+        assert first.client is not None and first.client is second.client
+        second.client = None
+        assert second.client is None and first.client is not None
+    finally:
+        (Config.AZURE_OPENAI_API_KEY, Config.AZURE_OPENAI_ENDPOINT,
+         AzureOpenAIService._shared_client, AzureOpenAIService._shared_client_ready) = saved
+    print("✓ Service instances share one Azure OpenAI client")
+
+    probe = subprocess.run(
+        [sys.executable, '-c', "import sys, app; print(sorted(m for m in ('openai', 'pypdf', 'pandas') if m in sys.modules))"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+    )
+    assert probe.stdout.strip().splitlines()[-1] == '[]', probe.stdout
+    print("✓ Booting the app imports neither the OpenAI SDK nor pandas/pypdf")
+
+    print("\n✅ Service registry test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_service_registry()
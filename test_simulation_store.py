@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the simulation result store (memoised simulations per thesis version)
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from app import app, db
+from models import ThesisAnalysis, SimulationResult
+from services.backtesting_service import BacktestingService
+from services.simulation_store import SimulationStore
+
+
+def test_simulation_store():
+    """Store, serve and invalidate simulation results"""
+    print("Testing Simulation Result Store...")
+
+    store = SimulationStore()
+
+    # Parameter hashing must not depend on key order
+    assert store.build_params_hash({'a': 1, 'b': 2}) == store.build_params_hash({'b': 2, 'a': 1})
+    assert store.build_params_hash({'a': 1}) != store.build_params_hash({'a': 2})
+    print("✓ Parameter hash is order-independent")
+
+    payload = {'performance_data': {'daily_thesis_data': [100.0 + i * 0.01 for i in range(2500)]}}
+    blob = store.compress_result(payload)
+    assert store.decompress_result(blob) == payload
+    print(f"✓ Compressed round-trip: {len(blob)} bytes")
+
+    with app.app_context():
+        thesis = ThesisAnalysis(title='Store Test Thesis', original_thesis='Store test', core_claim='Store test')
+        db.session.add(thesis)
+        db.session.commit()
+
+        try:
+            calls = []
+
+            def compute():
+                calls.append(1)
+                return {'value': len(calls)}
+
+            params = {'time_horizon': 2, 'scenario': 'base'}
+            first = store.get_or_compute(thesis, 'ml_simulation', params, compute, seed=42)
+            second = store.get_or_compute(thesis, 'ml_simulation', params, compute, seed=42)
+            assert first == second == {'value': 1}
+            assert len(calls) == 1
+            print("✓ Repeat request served from storage")
+
+            store.get_or_compute(thesis, 'ml_simulation', params, compute, seed=7)
+            assert len(calls) == 2
+            print("✓ Different seed recomputes")
+
+            # Editing the thesis changes updated_at and drops the stored results with it
+            thesis.updated_at = datetime(2030, 1, 1)
+            db.session.commit()
+            assert SimulationResult.query.filter_by(thesis_analysis_id=thesis.id).count() == 0
+            third = store.get_or_compute(thesis, 'ml_simulation', params, compute, seed=42)
+            assert third == {'value': 3}
+            stale = SimulationResult.query.filter(
+                SimulationResult.thesis_analysis_id == thesis.id,
+                SimulationResult.thesis_updated_at != thesis.updated_at
+            ).count()
+            assert stale == 0
+            print("✓ Thesis update invalidates and purges stale results")
+
+            thesis.title = thesis.title
+            db.session.commit()
+            assert store.get(thesis, 'ml_simulation', params, seed=42) == {'value': 3}
+            print("✓ A flush without changes keeps stored results")
+
+            backtesting = BacktestingService()
+            backtest_params = {'time_horizon': 6, 'scenarios': ['bull_market', 'bear_market'],
+                               'stress_tests': False, 'seed': 42}
+            random.seed(1)
+            expected_draw = random.random()
+            random.seed(1)
+            first_backtest = backtesting.run_thesis_backtest(thesis.id, backtest_params)
+            assert random.random() == expected_draw
+            second_backtest = backtesting.run_thesis_backtest(thesis.id, backtest_params)
+            assert 'error' not in first_backtest and first_backtest == second_backtest
+            print("✓ Backtests reproduce from their seed without touching the global random state")
+
+            error_result = store.get_or_compute(thesis, 'backtest', params, lambda: {'error': 'failed'})
+            assert error_result == {'error': 'failed'}
+            assert store.get(thesis, 'backtest', params) is None
+            print("✓ Error results are not stored")
+
+        finally:
+            thesis_id = thesis.id
+            db.session.delete(thesis)
+            db.session.commit()
+            assert SimulationResult.query.filter_by(thesis_analysis_id=thesis_id).count() == 0
+            print("✓ Deleting the thesis deletes its stored results")
+
+    print("\n✅ Simulation store test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_simulation_store()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming simulation stages over Server-Sent Events
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from models import ThesisAnalysis
+from services.ml_simulation_service import MLSimulationService
+from services.simulation_store import SimulationStore
+
+
+def parse_sse(body):
+    """Split an event-stream body into (event, data) pairs"""
+    messages = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        messages.append((lines.get('event'), lines.get('data')))
+    return messages
+
+
+def test_simulation_streaming():
+    """Stages stream in order and match the one-shot result"""
+    print("Testing Streaming Simulation...")
+
+    with app.app_context():
+        thesis = ThesisAnalysis(
+            title='Streaming Test Thesis',
+            original_thesis='NVIDIA will grow 25% on AI data center demand',
+            core_claim='NVIDIA will grow 25% on AI data center demand'
+        )
+        db.session.add(thesis)
+        db.session.commit()
+        thesis_id = thesis.id
+
+        try:
+            service = MLSimulationService()
+            stages = list(service.iter_simulation_stages(thesis, 1, 'base', 'medium', True, seed=42))
+            names = [name for name, _ in stages]
+            assert names == ['parameters', 'forecast', 'events', 'alerts', 'narrative', 'metadata'], names
+            print(f"✓ Stages yielded in order: {names}")
+
+            bands = dict(stages)['forecast']['fan_bands']
+            for lower, middle, upper in zip(bands['p5'], bands['p50'], bands['p95']):
+                assert lower <= middle <= upper
+            print(f"✓ Fan bands ordered over {len(bands['p50'])} points")
+
+            one_shot = service.generate_thesis_simulation(thesis, 1, 'base', 'medium', True, seed=42)
+            assembled = service.assemble_simulation_result(dict(stages))
+            assert assembled['performance_data'] == one_shot['performance_data']
+            print("✓ Assembled stages match the one-shot simulation")
+
+            client = app.test_client()
+            url = f'/api/thesis/{thesis_id}/simulate/stream?time_horizon=1&scenario=base&volatility=medium'
+
+            response = client.get(url)
+            assert response.mimetype == 'text/event-stream'
+            messages = parse_sse(response.get_data(as_text=True))
+            assert [event for event, _ in messages][-1] == 'complete'
+            assert json.loads(messages[-1][1])['cached'] is False
+            print(f"✓ Stream delivered {len(messages)} events")
+
+            repeat = parse_sse(client.get(url).get_data(as_text=True))
+            assert json.loads(repeat[-1][1])['cached'] is True
+            print("✓ Repeat stream served from the simulation store")
+
+            assert client.get(url + '&max_points=abc').status_code == 400
+            response = client.post(f'/api/thesis/{thesis_id}/simulate',
+                                   json={'payload_format': 'compact', 'max_points': 'many'})
+            assert response.status_code == 400 and 'max_points' in response.get_json()['error']
+            print("✓ Invalid max_points rejected with 400")
+
+            # A float horizon posted as JSON keys the same stored result as the stream
+            posted = client.post(f'/api/thesis/{thesis_id}/simulate', json={
+                'time_horizon': 2.0, 'scenario': 'base', 'volatility': 'medium', 'seed': 42})
+            assert posted.status_code == 200, posted.get_data(as_text=True)[:200]
+            streamed = parse_sse(client.get(
+                f'/api/thesis/{thesis_id}/simulate/stream?time_horizon=2&scenario=base&volatility=medium&seed=42'
+            ).get_data(as_text=True))
+            assert json.loads(streamed[-1][1])['cached'] is True
+            assert client.post(f'/api/thesis/{thesis_id}/simulate', json={'time_horizon': 'soon'}).status_code == 400
+            print("✓ POST and stream requests share stored simulations")
+
+        finally:
+            db.session.delete(db.session.get(ThesisAnalysis, thesis_id))
+            db.session.commit()
+
+    print("\n✅ Streaming simulation test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_simulation_streaming()
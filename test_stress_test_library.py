@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the historical stress-test library
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from services.stress_test_library import FACTORS, SCENARIOS, SHOCK_MATRIX, StressTestLibrary, UnknownScenarioError
+
+
+class MockThesis:
+    def __init__(self, thesis_id, title, core_claim, mental_model):
+        self.id = thesis_id
+        self.title = title
+        self.core_claim = core_claim
+        self.mental_model = mental_model
+
+
+def test_stress_test_library():
+    """Apply historical shocks to single and portfolio-wide thesis exposures"""
+    print("Testing stress-test library...")
+
+    assert SHOCK_MATRIX.shape == (len(SCENARIOS), len(FACTORS))
+    library = StressTestLibrary()
+
+    tech = MockThesis(1, 'NVIDIA AI thesis', 'GPU and data center demand from AI drives semiconductor growth', 'Growth')
+    energy = MockThesis(2, 'Energy income', 'Integrated oil and gas producer with pipeline cash flows', 'Dividend value')
+    exposures = library.build_exposures([tech, energy])
+    assert exposures.shape == (2, len(FACTORS))
+
+    results = library.run(exposures, [10, 2])
+    rate_shock = SCENARIOS.index('rate_shock_2022')
+    dot_com = SCENARIOS.index('dot_com_bubble_2000')
+    assert results['drawdowns'][0, dot_com] < results['drawdowns'][1, dot_com]
+    assert results['drawdowns'][1, rate_shock] > 0
+    print("✓ Sector exposures drive scenario drawdowns")
+
+    report = library.thesis_report(results, 0)
+    assert set(report['scenario_results']) == set(SCENARIOS)
+    assert report['stress_resistance'] in ('high', 'medium', 'low')
+    print(f"✓ Tech thesis overall stress score {report['overall_stress_score']} ({report['worst_scenario']} worst)")
+
+    # Portfolio-wide run across hundreds of theses is one matrix product
+    portfolio = [
+        MockThesis(i, f'Thesis {i}', [tech.core_claim, energy.core_claim, 'regional bank lending'][i % 3], 'Growth')
+        for i in range(500)
+    ]
+    start = time.time()
+    portfolio_report = library.portfolio_report(portfolio, [i % 20 for i in range(500)])
+    elapsed = time.time() - start
+    assert portfolio_report['thesis_count'] == 500
+    assert len(portfolio_report['thesis_results']) == 500
+    print(f"✓ Portfolio stress over 500 theses in {elapsed * 1000:.1f} ms")
+
+    subset = StressTestLibrary(['market_crash_2008', 'covid_pandemic_2020'])
+    assert subset.scenarios == ['market_crash_2008', 'covid_pandemic_2020']
+    assert np.allclose(subset.shocks, SHOCK_MATRIX[:2])
+    try:
+        StressTestLibrary(['market_crash_2008', 'nope'])
+        assert False, 'unknown scenario accepted'
+    except UnknownScenarioError as e:
+        assert e.names == ['nope']
+
+    from app import app
+    response = app.test_client().get('/api/stress-test/portfolio?scenarios=nope')
+    assert response.status_code == 400
+    assert response.get_json()['unknown_scenarios'] == ['nope']
+    print("✓ Unknown scenario names rejected with 400")
+
+    from services.backtesting_service import BacktestingService
+    backtest_stress = BacktestingService()._run_mathematical_stress_tests(tech, [object()] * 10)
+    assert backtest_stress['overall_stress_score'] == report['overall_stress_score']
+    print("✓ Backtest stress tests use the shock library")
+
+    print("\n✅ Stress-test library test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_stress_test_library()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk, idempotent thesis publishing (save_thesis_analysis and /publish_thesis)
+"""
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+import routes
+from app import app, db
+from models import SignalMonitoring, ThesisAnalysis
+from services.event_bus import event_bus
+
+
+def analysis(claim):
+    return {'core_claim': claim, 'core_analysis': 'Bulk publish analysis', 'mental_model': 'Growth',
+            'causal_chain': [{'step': 1}], 'counter_thesis_scenarios': [{'scenario': 'Downside'}],
+            'metrics_to_track': [{'name': 'Revenue'}], 'monitoring_plan': {'frequency': 'weekly'}}
+
+
+def signals(count):
+    return {'raw_signals': [{'name': f'Signal {i}', 'level': f'Level {i % 6}', 'threshold': i,
+                             'threshold_type': 'above'} for i in range(count)]}
+
+
+class StatementCounter:
+    """INSERT statements sent to the database while active"""
+
+    def __init__(self):
+        self.inserts = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('INSERT'):
+            self.inserts.append(statement)
+
+    def __enter__(self):
+        event.listen(db.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self)
+
+
+def test_thesis_publish():
+    """A thesis and its signals insert in bulk, once per idempotency key"""
+    print("Testing Thesis Publishing...")
+
+    routes.artifact_warmer.enqueue = lambda thesis_id: None
+    created = []
+    with app.app_context():
+        try:
+            cursor = event_bus.last_id
+            with StatementCounter() as counter:
+                thesis_id = routes.save_thesis_analysis('Bulk thesis text', analysis('Bulk publish'), signals(45))
+            created.append(thesis_id)
+            assert len(counter.inserts) == 2, counter.inserts
+            assert SignalMonitoring.query.filter_by(thesis_analysis_id=thesis_id).count() == 45
+            thesis = db.session.get(ThesisAnalysis, thesis_id)
+            assert thesis.counter_thesis == [{'scenario': 'Downside'}]
+            assert thesis.monitoring_plan == {'frequency': 'weekly'} and thesis.created_at is not None
+            published = [message for message in event_bus.replay(['monitoring'], cursor)
+                         if message['event'] == 'thesis_published']
+            assert [message['data']['signal_count'] for message in published] == [45]
+            print("✓ Thesis and 45 signals written with 2 INSERT statements in one transaction")
+
+            again = routes.save_thesis_analysis('Keyed thesis', analysis('Keyed'), signals(3), 'publish-1')
+            created.append(again)
+            assert routes.save_thesis_analysis('Keyed thesis', analysis('Keyed'), signals(3), 'publish-1') == again
+            assert ThesisAnalysis.query.filter_by(title='Keyed').count() == 1
+            assert SignalMonitoring.query.filter_by(thesis_analysis_id=again).count() == 3
+            print("✓ A repeated idempotency key returns the existing thesis")
+
+            # The first attempt fails after its statements ran; the retry publishes once
+            original_commit, failures = db.session.commit, [OperationalError('COMMIT', {}, Exception('gone'))]
+
+            def flaky_commit():
+                if failures:
+                    raise failures.pop()
+                original_commit()
+
+            db.session.commit = flaky_commit
+            try:
+                retried = routes.save_thesis_analysis('Retried thesis', analysis('Retried'), signals(5))
+            finally:
+                db.session.commit = original_commit
+            created.append(retried)
+            assert ThesisAnalysis.query.filter_by(title='Retried').count() == 1
+            assert SignalMonitoring.query.filter_by(thesis_analysis_id=retried).count() == 5
+            print("✓ A failed attempt rolls back and the retry publishes a single thesis")
+        finally:
+            db.session.remove()
+
+    client = app.test_client()
+    payload = {'thesis_analysis': dict(analysis('Published via route'), original_thesis='Route thesis'),
+               'signal_extraction': signals(2)}
+    clock = [routes.PUBLISH_DEDUP_WINDOW * 1000 - 1.0]
+    routes.time = SimpleNamespace(time=lambda: clock[0])
+    try:
+        first = client.post('/publish_thesis', json=payload).get_json()
+        second = client.post('/publish_thesis', json=payload).get_json()
+        clock[0] += 2  # resubmitted just after a window boundary
+        boundary = client.post('/publish_thesis', json=payload).get_json()
+        keyed = client.post('/publish_thesis', json=payload, headers={'Idempotency-Key': 'route-key'}).get_json()
+        clock[0] += routes.PUBLISH_DEDUP_WINDOW * 2
+        later = client.post('/publish_thesis', json=payload).get_json()
+    finally:
+        routes.time = time
+    created.extend({first['thesis_id'], keyed['thesis_id'], later['thesis_id']})
+    assert first['success'] and first['thesis_id'] == second['thesis_id'] == boundary['thesis_id']
+    assert len({first['thesis_id'], keyed['thesis_id'], later['thesis_id']}) == 3
+    print("✓ /publish_thesis deduplicates resubmitted payloads and honours Idempotency-Key")
+    print("✓ An identical payload published after the dedup window creates a new thesis")
+
+    with app.app_context():
+        SignalMonitoring.query.filter(SignalMonitoring.thesis_analysis_id.in_(created)).delete()
+        ThesisAnalysis.query.filter(ThesisAnalysis.id.in_(created)).delete()
+        db.session.commit()
+
+    print("\n✅ Thesis publishing test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_thesis_publish()
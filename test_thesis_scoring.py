@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the combined thesis scoring call shared by prioritization and significance mapping
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.thesis_scoring_service import ThesisScoringService
+from services.smart_prioritization_service import SmartPrioritizationService
+from services.significance_mapping_service import SignificanceMappingService
+
+
+SAMPLE_THESIS = {
+    'core_claim': 'Cloud adoption will drive 20% revenue growth',
+    'core_analysis': 'Enterprise migration continues to accelerate',
+    'assumptions': ['IT budgets keep growing', 'Pricing holds'],
+    'mental_model': 'Growth',
+    'causal_chain': [],
+    'metrics_to_track': [{'name': 'Cloud Revenue', 'type': 'quantitative'}, {'name': 'Gross Margin'}],
+    'monitoring_plan': []
+}
+
+
+class StubAIService:
+    """Returns one combined scoring response, slowly, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_completion(self, prompt, temperature=1.0, max_tokens=2000, json_mode=False, call_site=None):
+        self.calls += 1
+        time.sleep(0.05)
+        research = {name: {'depth': 8, 'overall_score': 8} for name in
+                    ('core_claim', 'core_analysis', 'assumptions', 'mental_model', 'causal_chain')}
+        signals = {name: {'timeliness': 6, 'overall_strength': 6} for name in
+                   ('financial_metrics', 'market_indicators', 'operational_metrics', 'external_factors')}
+        return 'Here you go: ' + json.dumps({
+            'research_prioritization': {'element_scores': research, 'priority_ranking': ['core_claim', 'bogus']},
+            'signal_prioritization': {'signal_categories': signals, 'signal_priority_ranking': []},
+            'connections': [
+                {'research_id': 'core_claim', 'signal_id': 'signal_0', 'relationship_type': 'validates', 'strength': 1.4},
+                {'research_id': 'unknown', 'signal_id': 'signal_0', 'relationship_type': 'measures', 'strength': 0.5}
+            ]
+        })
+
+
+def test_thesis_scoring():
+    """One LLM call feeds both prioritization and significance mapping"""
+    print("Testing Combined Thesis Scoring...")
+
+    ThesisScoringService._cache.clear()
+    stub = StubAIService()
+    scoring = ThesisScoringService(ai_service=stub)
+    prioritizer = SmartPrioritizationService(scoring_service=scoring)
+    mapper = SignificanceMappingService(scoring_service=scoring)
+
+    results = {}
+    threads = [
+        threading.Thread(target=lambda: results.update(priority=prioritizer.generate_dual_prioritization(SAMPLE_THESIS))),
+        threading.Thread(target=lambda: results.update(mapping=mapper.generate_significance_map(SAMPLE_THESIS)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub.calls == 1, stub.calls
+    print("✓ Parallel prioritization and mapping shared one LLM call")
+
+    research = results['priority']['research_prioritization']
+    assert research['priority_ranking'] == ['core_claim']
+    assert results['priority']['priority_matrix']['research_score'] == 8
+    signal = results['priority']['signal_prioritization']
+    assert len(signal['signal_priority_ranking']) == 4
+    print("✓ Prioritization sections validated and ranked")
+
+    connections = results['mapping']['connections']
+    assert len(connections) == 1 and connections[0]['strength'] == 1.0
+    print("✓ Connections to unknown nodes dropped and strengths clamped")
+
+    changed = dict(SAMPLE_THESIS, core_claim='Different claim')
+    prioritizer.generate_dual_prioritization(changed)
+    assert stub.calls == 2
+    print("✓ Changed thesis content is rescored")
+
+    print("\n✅ Thesis scoring test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_thesis_scoring()
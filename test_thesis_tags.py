@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for persisted thesis segment/company tags and concurrent backfill
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from app import app, db
+from models import ThesisAnalysis, ThesisTag
+from services.artifact_store import ArtifactStore, ArtifactWarmer
+from services.thesis_tag_service import ThesisTagService
+import backfill_thesis_tags
+
+
+class StubOpenAIService:
+    """Returns a fixed tag response and records which threads called it"""
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def generate_completion(self, prompt, temperature=1.0, max_tokens=2000, json_mode=False, call_site=None):
+        with self.lock:
+            self.calls += 1
+            self.threads.add(threading.get_ident())
+        content = prompt[0]['content']
+        if 'Failing Thesis' in content:
+            return None
+        if 'Empty Thesis' in content:
+            return '{"segment": "", "companies": []}'
+        return '{"segment": "Semiconductors", "companies": ["NVIDIA", "AMD", "X"]}'
+
+
+def test_thesis_tags():
+    """Backfill tags once per thesis version and aggregate them in SQL"""
+    print("Testing Thesis Tag Service...")
+
+    with app.app_context():
+        theses = [
+            ThesisAnalysis(title=f'Tag Test Thesis {i}', original_thesis='GPU demand', core_claim='GPU demand')
+            for i in range(5)
+        ]
+        theses.append(ThesisAnalysis(title='Empty Thesis', original_thesis='Nothing', core_claim='Nothing'))
+        theses.append(ThesisAnalysis(title='Failing Thesis', original_thesis='Nothing', core_claim='Nothing'))
+        db.session.add_all(theses)
+        db.session.commit()
+        thesis_ids = [thesis.id for thesis in theses]
+
+        try:
+            stub = StubOpenAIService()
+            service = ThesisTagService(openai_service=stub, max_workers=3)
+
+            tagged = service.backfill(theses=service.untagged_theses(limit=500))
+            assert tagged >= len(theses) - 1
+            assert len(stub.threads) <= 3
+            print(f"✓ Backfilled {tagged} theses using {len(stub.threads)} worker threads")
+
+            tags = service.aggregate()
+            assert 'Semiconductors' in tags['segments']
+            assert 'NVIDIA' in tags['companies'] and 'X' not in tags['companies']
+            print(f"✓ Aggregate returned {len(tags['segments'])} segments, {len(tags['companies'])} companies")
+
+            calls = stub.calls
+            assert service.backfill(limit=500) == 0
+            assert stub.calls == calls
+            print("✓ Tagged theses (including empty results and failures) are not re-extracted")
+
+            failing = theses[-1]
+            marker = ThesisTag.query.filter_by(thesis_analysis_id=failing.id).one()
+            assert marker.tag_type == ThesisTagService.TAG_FAILED
+            marker.created_at = datetime.utcnow() - ThesisTagService.RETRY_AFTER * 2
+            db.session.commit()
+            assert [row.id for row in service.untagged_theses(limit=500)] == [failing.id]
+            assert service.backfill(limit=500) == 0 and service.untagged_theses(limit=500) == []
+            calls = stub.calls
+            print("✓ Failed extractions recorded and retried only after the backoff")
+
+            response = app.test_client().get('/api/analytics/segments').get_json()
+            assert response['success'] and 'Semiconductors' in response['segments']
+            assert 'backfilled' not in response and stub.calls == calls
+            print("✓ Segments endpoint only aggregates stored tags")
+
+            theses[0].updated_at = datetime(2030, 1, 1)
+            db.session.commit()
+            stale = [row.id for row in service.untagged_theses(limit=500)]
+            assert theses[0].id in stale
+            print("✓ Editing a thesis marks its tags for re-extraction")
+
+            store = ArtifactStore(generators={'noop': ('1', lambda thesis: {})})
+            warmer = ArtifactWarmer(app, store, tasks=[service.tag_thesis])
+            warmer.warm(theses[0].id, ['noop'])
+            assert theses[0].id in [row.id for row in service.untagged_theses(limit=500)]
+            warmer.warm(theses[0].id)
+            assert theses[0].id not in [row.id for row in service.untagged_theses(limit=500)]
+            print("✓ A full warm after publishing tags the thesis")
+
+            theses[1].updated_at = datetime(2030, 1, 1)
+            db.session.commit()
+            assert backfill_thesis_tags.backfill(service, limit=1) == {'tagged': 1, 'failed': 0}
+            assert theses[1].id not in [row.id for row in service.untagged_theses(limit=500)]
+            print("✓ Backfill script tags theses published before tagging moved to publish time")
+
+        finally:
+            ThesisTag.query.filter(ThesisTag.thesis_analysis_id.in_(thesis_ids)).delete(synchronize_session=False)
+            ThesisAnalysis.query.filter(ThesisAnalysis.id.in_(thesis_ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+    print("\n✅ Thesis tag test completed successfully!")
+
+
+if __name__ == "__main__":
+    test_thesis_tags()